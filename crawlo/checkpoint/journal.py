@@ -0,0 +1,188 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+检查点增量日志（``CHECKPOINT_STORAGE = 'journal'``）
+
+CheckpointJournal 挂接在 Scheduler 与内存去重过滤器上，记录三类事件：
+- 入队：请求入队成功时分配单调递增的 key
+- 出队：请求从队列取出时按 key 记录
+- 新指纹：过滤器首次见到的指纹
+
+事件先在内存中缓冲，同一刷新周期内入队又出队的请求直接抵消、不落盘；其余事件攒满
+``batch_size`` 条或每隔 ``flush_interval`` 秒在专用的单线程执行器上一次 executemany 追加到 JournalStorage，
+累计超过 ``compact_threshold`` 条时折叠进快照。检查点开销与两次刷新之间的增量成正比，
+不再从队列中取出 / 放回全部请求。
+
+崩溃语义：最近一个刷新周期内的事件会丢失；已出队但尚未处理完成的请求不会被恢复
+（正常关闭时引擎先等待在途任务结束，再写入最终检查点）。
+"""
+import asyncio
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from crawlo.checkpoint.storage import JournalStorage, encode_request_row
+from crawlo.logging import get_logger
+
+
+class CheckpointJournal:
+    """
+    检查点增量日志记录器。
+
+    Args:
+        storage: 增量存储后端
+        encode_request: Request → 可序列化 dict（与 ``CheckpointManager.restore_request`` 对应）
+        batch_size: 缓冲事件数上限，攒满立即刷新
+        flush_interval: 缓冲中首个事件最多等待的秒数
+        compact_threshold: 日志累计事件数超过该值时折叠进快照（0 = 只在保存检查点时折叠）
+    """
+
+    def __init__(
+        self,
+        storage: JournalStorage,
+        encode_request: Callable[[Any], Dict[str, Any]],
+        batch_size: int = 1000,
+        flush_interval: float = 1.0,
+        compact_threshold: int = 100000,
+    ):
+        self.storage = storage
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = flush_interval
+        self.compact_threshold = compact_threshold
+        self.logger = get_logger('CheckpointJournal')
+        self._encode_request = encode_request
+        self._keys = itertools.count(storage.max_key() + 1)
+        self._live: Dict[int, int] = {}                 # id(request) → key，仍在队列中的请求
+        self._enqueued: Dict[int, Any] = {}             # key → request，尚未落盘的入队
+        self._events: List[Tuple[int, Optional[int], Optional[int], Any]] = []  # 尚未落盘的出队 / 指纹 / 失败重试
+        self._journaled = 0                             # 上次折叠后追加的事件数
+        self._flush_lock = asyncio.Lock()
+        self._full = asyncio.Event()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._closed = False
+        # 单线程执行器：存储的持久连接只在该线程上写入，追加 / 折叠 / 元数据按提交顺序执行
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='checkpoint-journal')
+
+    @property
+    def pending_events(self) -> int:
+        """内存中尚未落盘的事件数"""
+        return len(self._enqueued) + len(self._events)
+
+    @property
+    def live_requests(self) -> int:
+        """当前记录为在队列中的请求数"""
+        return len(self._live)
+
+    # ---- 事件记录（同步调用，不等待 I/O）----
+
+    def record_enqueue(self, request: Any) -> None:
+        if self._closed or id(request) in self._live:
+            return
+        key = next(self._keys)
+        self._live[id(request)] = key
+        self._enqueued[key] = request
+        self._after_record()
+
+    def record_dequeue(self, request: Any) -> None:
+        key = self._live.pop(id(request), None)
+        if key is None or self._closed:
+            return
+        if self._enqueued.pop(key, None) is None:
+            self._events.append((JournalStorage.OP_DEQUEUE, key, None, None))
+            self._after_record()
+
+    def record_fingerprint(self, fingerprint: str) -> None:
+        if self._closed:
+            return
+        self._events.append((JournalStorage.OP_FINGERPRINT, None, None, fingerprint))
+        self._after_record()
+
+    def track(self, request: Any, key: Optional[int]) -> None:
+        """登记从检查点恢复的请求：沿用原 key（快照中已存在），不再写入入队事件
+
+        key 为 None 时取消登记（恢复入队失败，请求仍留在快照中）。
+        """
+        if key is None:
+            self._live.pop(id(request), None)
+        else:
+            self._live[id(request)] = key
+
+    def _after_record(self) -> None:
+        if self.pending_events >= self.batch_size:
+            self._full.set()
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        try:
+            await asyncio.wait_for(self._full.wait(), self.flush_interval)
+        except asyncio.TimeoutError:
+            pass
+        self._full.clear()
+        await self.flush()
+
+    # ---- 落盘 ----
+
+    async def _run(self, func, *args):
+        """在 flush 执行器上执行同步存储操作"""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, partial(func, *args))
+
+    async def flush(self) -> int:
+        """把缓冲事件追加到日志（flush 执行器上一次 executemany），返回写入条数"""
+        async with self._flush_lock:
+            if not self._enqueued and not self._events:
+                return 0
+            enqueued, self._enqueued = self._enqueued, {}
+            rows, self._events = self._events, []
+            for key, request in enqueued.items():
+                data = self._encode_request(request)
+                rows.append((JournalStorage.OP_ENQUEUE, key, data.get('priority', 0), encode_request_row(data)))
+            try:
+                written = await self._run(self.storage.append, rows)
+            except Exception as e:
+                self.logger.error(f"Failed to append {len(rows)} checkpoint journal events: {e}")
+                self._events[:0] = rows
+                return 0
+            self._journaled += written
+            if self.compact_threshold and self._journaled >= self.compact_threshold:
+                await self._compact()
+            return written
+
+    async def _compact(self) -> None:
+        folded = await self._run(self.storage.compact)
+        self._journaled = 0
+        self.logger.debug(f"Compacted {folded} checkpoint journal events")
+
+    async def checkpoint(self, metadata: Dict[str, Any]) -> None:
+        """保存检查点：刷新缓冲、折叠日志并写入元数据"""
+        await self.flush()
+        async with self._flush_lock:
+            await self._compact()
+        metadata = dict(metadata, pending_count=len(self._live))
+        await self._run(self.storage.write_metadata, metadata)
+
+    async def close(self) -> None:
+        """停止定时刷新、落盘剩余事件并关闭存储连接（重复调用无操作）"""
+        if self._closed:
+            return
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_task.cancel()
+        try:
+            await self.flush()
+            await self._run(self.storage.close)
+        finally:
+            self._closed = True
+            self._executor.shutdown(wait=False)
+
+    def discard(self) -> None:
+        """丢弃缓冲并停止记录（检查点被清除时调用）"""
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_task.cancel()
+        self._enqueued.clear()
+        self._events.clear()
+        self._closed = True
+        self._executor.shutdown(wait=False)
+
+
+__all__ = ['CheckpointJournal']
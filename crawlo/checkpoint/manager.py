@@ -8,17 +8,24 @@
 1. Ctrl+C 时：保存内存队列中的待处理请求 + 去重指纹 + 统计信息
 2. 重启时：检测检查点文件，加载恢复队列和指纹，跳过已完成的请求
 
+增量模式（``CHECKPOINT_STORAGE = 'journal'``）下，启动时 ``attach`` 到调度器，
+运行期间持续把入队 / 出队 / 新指纹事件追加到日志（见 ``crawlo.checkpoint.journal``），
+保存检查点只需刷新增量；恢复时流式读取，不整体载入内存。
+
 注意：Redis 队列模式下请求天然持久化（已在 Redis 中），
 检查点主要解决单机模式（Memory 队列）的持久化问题。
 """
 import json
 import time
-from typing import Any, Dict, List, Optional, Set, TYPE_CHECKING
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, TYPE_CHECKING
 
 from crawlo.logging import get_logger
 from crawlo.http.request import Request
 from crawlo.utils.misc import safe_get_config
-from crawlo.checkpoint.storage import BaseStorage, JsonStorage, SqliteStorage
+from crawlo.checkpoint.journal import CheckpointJournal
+from crawlo.checkpoint.storage import BaseStorage, JournalStorage, JsonStorage, SqliteStorage
+from crawlo.filters.fingerprint_store import CompactFingerprintStore
+from crawlo.queue.queue_types import QueueType
 
 if TYPE_CHECKING:
     from crawlo.commands.scheduler import SchedulerDaemon  # noqa: F401
@@ -28,6 +35,8 @@ if TYPE_CHECKING:
 class CheckpointManager:
     """检查点管理器 - 负责爬取状态的保存与恢复"""
 
+    _journal: Optional[CheckpointJournal] = None  # 增量模式下由 attach() 创建
+
     def __init__(self, spider_name: str, settings: Any = None):
         """
         初始化检查点管理器
@@ -64,6 +73,12 @@ class CheckpointManager:
         checkpoint_dir: Optional[str],
     ) -> BaseStorage:
         """根据配置创建存储后端"""
+        if storage_type == 'journal':
+            return JournalStorage(
+                spider_name=spider_name,
+                project_name=project_name,
+                checkpoint_dir=checkpoint_dir,
+            )
         if storage_type == 'sqlite':
             return SqliteStorage(
                 spider_name=spider_name,
@@ -94,6 +109,8 @@ class CheckpointManager:
         """
         if self.storage is None:
             return False
+        if self._journal is not None:
+            return await self._save_incremental(stats)
         try:
             # 1. 提取去重指纹（必须在提取请求之前，防止
             #    提取间隙产生的新请求被遗漏）
@@ -131,6 +148,24 @@ class CheckpointManager:
             self.logger.error(f"Failed to save checkpoint: {e}")
             return False
 
+    async def _save_incremental(self, stats: Optional['StatsCollector']) -> bool:
+        """增量模式保存：只刷新日志增量并写入元数据，不接触队列"""
+        try:
+            await self._journal.checkpoint({
+                'project_name': safe_get_config(self.settings, 'PROJECT_NAME', 'default', str),
+                'spider_name': self.spider_name,
+                'saved_at': time.time(),
+                'stats': self._extract_stats(stats),
+            })
+            self.logger.info(
+                f"Checkpoint saved incrementally: {self._journal.live_requests} pending requests "
+                f"-> {self.storage.filepath}"
+            )
+            return True
+        except Exception as e:
+            self.logger.error(f"Failed to save checkpoint: {e}")
+            return False
+
     async def load(self) -> Optional[Dict[str, Any]]:
         """加载检查点
 
@@ -142,9 +177,12 @@ class CheckpointManager:
         try:
             data = self.storage.load()
             if data:
+                fingerprint_count = data.get('fingerprint_count')
+                if fingerprint_count is None:
+                    fingerprint_count = len(data.get('fingerprints') or ())
                 self.logger.info(
-                    f"Checkpoint loaded: {len(data.get('requests', []))} pending requests, "
-                    f"{len(data.get('fingerprints', set()))} fingerprints, "
+                    f"Checkpoint loaded: {data.get('pending_count', 0)} pending requests, "
+                    f"{fingerprint_count} fingerprints, "
                     f"saved at {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(data.get('saved_at', 0)))}"
                 )
             else:
@@ -166,6 +204,9 @@ class CheckpointManager:
         """
         if self.storage is None:
             return False
+        if self._journal is not None:
+            self._journal.discard()
+            self._journal = None
         try:
             success = self.storage.clear()
             if success:
@@ -175,14 +216,90 @@ class CheckpointManager:
             self.logger.error(f"Failed to clear checkpoint: {e}")
             return False
 
+    # ==================== 增量模式 ====================
+
+    def attach(self, scheduler: Optional['SchedulerDaemon']) -> bool:
+        """增量模式下挂接到调度器与内存去重过滤器，开始记录日志
+
+        只支持内存队列：Redis 队列的请求已持久化在 Redis 中；磁盘队列出队返回反序列化出的新对象，
+        无法与入队事件对应（其本身已持久化）。非 journal 存储下同样不挂接。
+
+        Returns:
+            bool: 是否已挂接
+        """
+        if not isinstance(self.storage, JournalStorage) or scheduler is None or self._journal is not None:
+            return False
+        if getattr(scheduler, 'queue_type', None) != QueueType.MEMORY:
+            return False
+        self._journal = CheckpointJournal(
+            self.storage,
+            self._journal_request_dict,
+            batch_size=safe_get_config(self.settings, 'CHECKPOINT_JOURNAL_BATCH_SIZE', 1000, int),
+            flush_interval=safe_get_config(self.settings, 'CHECKPOINT_JOURNAL_FLUSH_INTERVAL', 1.0, float),
+            compact_threshold=safe_get_config(self.settings, 'CHECKPOINT_JOURNAL_COMPACT_THRESHOLD', 100000, int),
+        )
+        scheduler.checkpoint_journal = self._journal
+        dupe_filter = getattr(scheduler, 'dupe_filter', None)
+        if hasattr(dupe_filter, 'set_fingerprint_listener'):
+            dupe_filter.set_fingerprint_listener(self._journal.record_fingerprint)
+        self.logger.debug(f"Checkpoint journal attached -> {self.storage.filepath}")
+        return True
+
+    async def detach(self, scheduler: Optional['SchedulerDaemon'] = None) -> None:
+        """落盘剩余日志并解除挂接"""
+        journal, self._journal = self._journal, None
+        if journal is None:
+            return
+        if scheduler is not None and getattr(scheduler, 'checkpoint_journal', None) is journal:
+            scheduler.checkpoint_journal = None
+        dupe_filter = getattr(scheduler, 'dupe_filter', None)
+        if hasattr(dupe_filter, 'set_fingerprint_listener'):
+            dupe_filter.set_fingerprint_listener(None)
+        await journal.close()
+
+    def iter_pending_requests(self, checkpoint: Dict[str, Any]) -> Iterator[Tuple[Optional[int], Any]]:
+        """遍历检查点中的待处理请求 (key, 请求 dict)；增量存储为流式读取，key 用于 ``track_restored``"""
+        requests = checkpoint.get('requests') or []
+        if isinstance(requests, list):
+            return ((None, req_data) for req_data in requests)
+        return requests
+
+    def iter_fingerprint_batches(self, checkpoint: Dict[str, Any]) -> Iterator[Iterable[str]]:
+        """分批遍历检查点中的指纹"""
+        fingerprints = checkpoint.get('fingerprints') or ()
+        if isinstance(fingerprints, (set, frozenset, list, tuple)):
+            return iter([fingerprints] if fingerprints else [])
+        return fingerprints
+
+    def track_restored(self, request: Any, key: Optional[int]) -> None:
+        """登记从增量检查点恢复的请求（沿用原 key，避免重复写入）；恢复失败时以 key=None 取消登记"""
+        if self._journal is not None:
+            self._journal.track(request, key)
+
+    def _journal_request_dict(self, request: Any) -> Dict[str, Any]:
+        """入队事件的请求 dict：``_serialize_request`` + restore_request 会恢复的字段"""
+        try:
+            data = self._serialize_request(request) or {}
+        except Exception as e:
+            self.logger.debug(f"Failed to serialize request {getattr(request, 'url', '?')}: {e}")
+            data = {}
+        data.setdefault('url', str(getattr(request, 'url', '')))
+        for attr in ('priority', 'dont_filter', 'timeout', 'proxy'):
+            value = getattr(request, attr, None)
+            if value is not None:
+                data[attr] = value
+        cookies = getattr(request, 'cookies', None)
+        if cookies:
+            data['cookies'] = dict(cookies)
+        return data
+
     # ==================== 内部方法 ====================
 
     async def _extract_pending_requests(self, scheduler: Optional['SchedulerDaemon']) -> List[Dict[str, Any]]:
         """从调度器中提取所有待处理请求
 
-        注意：此方法会临时从队列中取出请求，序列化后再放回。
-        如果调度器同时也在消费队列，可能存在竞态条件。
-        建议在保存检查点时暂停调度器。
+        队列支持快照（内存队列）时直接读取，不改动队列；否则回退为临时取出请求、
+        序列化后再放回（如果调度器同时也在消费队列，可能存在竞态条件）。
 
         Args:
             scheduler: 调度器实例
@@ -200,31 +317,14 @@ class CheckpointManager:
             if queue_manager is None:
                 return []
 
-            # 获取队列大小
-            queue_size = await queue_manager.size()
-            if queue_size == 0:
-                return []
-
-            self.logger.debug(f"Extracting {queue_size} pending requests from queue")
-
-            # 从队列中逐个取出请求并序列化
-            extracted = []
-            for _ in range(queue_size):
-                try:
-                    request = await queue_manager.get()
-                    if request is None:
-                        break
-                    extracted.append(request)
-                except Exception:
-                    break
-
-            # 记录实际取出的数量（可能少于 queue_size，如果有其他消费者）
-            actual_count = len(extracted)
-            if actual_count < queue_size:
-                self.logger.warning(
-                    f"Queue size changed during extraction: expected {queue_size}, "
-                    f"got {actual_count}. Another consumer may be active."
-                )
+            # 非破坏性快照：不取出 / 放回，不重复计算优先级与背压
+            snapshot = await queue_manager.snapshot_requests() if hasattr(queue_manager, 'snapshot_requests') else None
+            if isinstance(snapshot, list):
+                extracted = snapshot
+                drained = False
+            else:
+                extracted = await self._drain_queue(queue_manager)
+                drained = True
 
             # 序列化请求
             serializer = getattr(scheduler, 'request_serializer', None)
@@ -247,27 +347,59 @@ class CheckpointManager:
                     except Exception as e:
                         self.logger.debug("Suppressed exception: %s", e)
 
-            # 将取出的请求放回队列
-            returned_count = 0
-            for request in extracted:
-                try:
-                    await queue_manager.put(request, priority=getattr(request, 'priority', 0))
-                    returned_count += 1
-                except Exception as e:
-                    self.logger.debug("Suppressed exception: %s", e)
-
-            # 验证是否全部放回
-            if returned_count < actual_count:
-                self.logger.error(
-                    f"Failed to return all requests to queue: {actual_count} extracted, "
-                    f"{returned_count} returned. {actual_count - returned_count} requests may be lost!"
-                )
+            if drained:
+                await self._return_to_queue(queue_manager, extracted)
 
         except Exception as e:
             self.logger.error(f"Failed to extract pending requests: {e}")
 
         return requests_data
 
+    async def _drain_queue(self, queue_manager: Any) -> List[Any]:
+        """回退路径：逐个取出队列中的请求"""
+        # 获取队列大小
+        queue_size = await queue_manager.size()
+        if queue_size == 0:
+            return []
+
+        self.logger.debug(f"Extracting {queue_size} pending requests from queue")
+
+        # 从队列中逐个取出请求并序列化
+        extracted = []
+        for _ in range(queue_size):
+            try:
+                request = await queue_manager.get()
+                if request is None:
+                    break
+                extracted.append(request)
+            except Exception:
+                break
+
+        # 记录实际取出的数量（可能少于 queue_size，如果有其他消费者）
+        if len(extracted) < queue_size:
+            self.logger.warning(
+                f"Queue size changed during extraction: expected {queue_size}, "
+                f"got {len(extracted)}. Another consumer may be active."
+            )
+        return extracted
+
+    async def _return_to_queue(self, queue_manager: Any, extracted: List[Any]) -> None:
+        """回退路径：将取出的请求放回队列"""
+        returned_count = 0
+        for request in extracted:
+            try:
+                await queue_manager.put(request, priority=getattr(request, 'priority', 0))
+                returned_count += 1
+            except Exception as e:
+                self.logger.debug("Suppressed exception: %s", e)
+
+        # 验证是否全部放回
+        if returned_count < len(extracted):
+            self.logger.error(
+                f"Failed to return all requests to queue: {len(extracted)} extracted, "
+                f"{returned_count} returned. {len(extracted) - returned_count} requests may be lost!"
+            )
+
     def _serialize_request(self, request: Any) -> Optional[Dict[str, Any]]:
         """将 Request 对象序列化为字典
 
@@ -340,6 +472,9 @@ class CheckpointManager:
                 fps = dupe_filter.fingerprints
                 if isinstance(fps, set):
                     return fps.copy()
+                # 紧凑存储（MEMORY_FILTER_COMPACT）：导出 16 位摘要，restore 时可直接 update 回去
+                if isinstance(fps, CompactFingerprintStore):
+                    return set(fps)
 
             # Redis 过滤器：无法直接提取（数据在 Redis 中）
             # 检查是否是 Redis 过滤器
@@ -2,17 +2,36 @@
 # -*- coding: UTF-8 -*-
 """
 检查点存储后端
-提供 JSON 和 SQLite 两种存储方式，用于持久化爬取状态。
+提供 JSON、SQLite 两种全量存储方式，以及基于追加日志的增量存储（journal），用于持久化爬取状态。
 """
 import json
 import os
 import sqlite3
 import tempfile
+import threading
 import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from crawlo.logging import get_logger
+from crawlo.utils.request.request_codec import RequestCodec, get_request_codec
+
+
+def encode_request_row(req_data: Any):
+    """请求 dict 用二进制编解码器存储（BLOB），无法编码时回退为 JSON 文本"""
+    if not isinstance(req_data, dict):
+        return str(req_data)
+    try:
+        return get_request_codec().encode_dict(req_data)
+    except (TypeError, ValueError, RuntimeError):
+        return json.dumps(req_data, ensure_ascii=False)
+
+
+def decode_request_row(raw: Any) -> Dict[str, Any]:
+    """``encode_request_row`` 的逆操作（codec 载荷按前缀识别，其余按 JSON 解析）"""
+    if RequestCodec.is_encoded(raw):
+        return get_request_codec().decode_dict(raw)
+    return json.loads(raw)
 
 
 class BaseStorage(ABC):
@@ -218,8 +237,7 @@ class SqliteStorage(BaseStorage):
                     'spider_name': data.get('spider_name', ''),
                     'pending_count': str(data.get('pending_count', 0)),
                 }
-                for k, v in metadata.items():
-                    c.execute('INSERT INTO metadata (key, value) VALUES (?, ?)', (k, v))
+                c.executemany('INSERT INTO metadata (key, value) VALUES (?, ?)', metadata.items())
 
                 # 写入统计信息
                 stats = data.get('stats', {})
@@ -227,17 +245,17 @@ class SqliteStorage(BaseStorage):
                     c.execute('INSERT INTO metadata (key, value) VALUES (?, ?)',
                               ('stats', json.dumps(stats, ensure_ascii=False)))
 
-                # 写入待处理请求
+                # 写入待处理请求（批量）
                 requests = data.get('requests', [])
-                for req_data in requests:
-                    priority = req_data.get('priority', 0) if isinstance(req_data, dict) else 0
-                    c.execute('INSERT INTO pending_requests (priority, data) VALUES (?, ?)',
-                              (priority, json.dumps(req_data, ensure_ascii=False) if isinstance(req_data, dict) else str(req_data)))
+                c.executemany(
+                    'INSERT INTO pending_requests (priority, data) VALUES (?, ?)',
+                    ((req_data.get('priority', 0) if isinstance(req_data, dict) else 0,
+                      encode_request_row(req_data)) for req_data in requests))
 
-                # 写入指纹
+                # 写入指纹（批量）
                 fingerprints = data.get('fingerprints', set())
-                for fp in fingerprints:
-                    c.execute('INSERT OR IGNORE INTO fingerprints (fingerprint) VALUES (?)', (fp,))
+                c.executemany('INSERT OR IGNORE INTO fingerprints (fingerprint) VALUES (?)',
+                              ((fp,) for fp in fingerprints))
 
                 conn.commit()
 
@@ -274,7 +292,7 @@ class SqliteStorage(BaseStorage):
                 requests = []
                 for row in c.fetchall():
                     try:
-                        requests.append(json.loads(row[0]))
+                        requests.append(decode_request_row(row[0]))
                     except (json.JSONDecodeError, TypeError):
                         requests.append(row[0])
 
@@ -311,3 +329,264 @@ class SqliteStorage(BaseStorage):
         except Exception as e:
             self.logger.error(f"Failed to clear checkpoint: {e}")
             return False
+
+
+class JournalStorage(BaseStorage):
+    """增量检查点存储后端（追加日志 + 定期压缩，适合大规模 / 长时间运行）
+
+    文件路径：.checkpoints/{project_name}/{spider_name}.journal.db
+
+    - journal：追加写入的事件（入队 / 出队 / 新指纹），每批一次 executemany
+    - pending_requests / fingerprints：压缩后的快照；``compact()`` 把日志折叠进快照并截断日志
+    - metadata：元数据与统计信息
+
+    入队事件以单调递增的整数 key 标识一次入队，出队事件按 key 删除对应请求；
+    同一 key 不会在出队后再次入队，折叠时与事件顺序无关。写入开销只与两次写入之间的增量有关，
+    与队列总长度无关。
+
+    首次访问时打开一个持久连接并建表，之后所有读写共用该连接（加锁，可在任意线程调用），
+    ``close()`` 关闭连接；关闭后再次访问会重新打开。
+    """
+
+    OP_ENQUEUE = 1
+    OP_DEQUEUE = 2
+    OP_FINGERPRINT = 3
+
+    def __init__(self, spider_name: str, project_name: str = 'default', checkpoint_dir: Optional[str] = None):
+        self.logger = get_logger('JournalStorage')
+
+        if checkpoint_dir:
+            self._dir = checkpoint_dir
+        else:
+            # 默认使用当前工作目录（项目根目录）下的 .checkpoints
+            self._dir = os.path.join(os.getcwd(), '.checkpoints')
+
+        self._dir = os.path.join(self._dir, project_name)
+        self._path = os.path.join(self._dir, f'{spider_name}.journal.db')
+
+        # 确保目录存在
+        os.makedirs(self._dir, exist_ok=True)
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    @property
+    def filepath(self) -> str:
+        """检查点文件路径（公开只读属性）"""
+        return self._path
+
+    def _connection(self) -> sqlite3.Connection:
+        """持久连接（调用方须持有 ``_lock``）；首次访问时打开并建表"""
+        if self._conn is None:
+            conn = sqlite3.connect(self._path, timeout=30.0, check_same_thread=False)
+            try:
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.execute('PRAGMA synchronous=NORMAL')
+                self._create_tables(conn)
+            except Exception:
+                conn.close()
+                raise
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _create_tables(conn: sqlite3.Connection) -> None:
+        conn.executescript('''
+            CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS journal (
+                seq INTEGER PRIMARY KEY,
+                op INTEGER NOT NULL,
+                key INTEGER,
+                priority INTEGER,
+                data BLOB
+            );
+            CREATE TABLE IF NOT EXISTS pending_requests (
+                key INTEGER PRIMARY KEY,
+                priority INTEGER DEFAULT 0,
+                data BLOB NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_pending_order ON pending_requests (priority, key);
+            CREATE TABLE IF NOT EXISTS fingerprints (fingerprint TEXT PRIMARY KEY);
+        ''')
+
+    def close(self) -> None:
+        """关闭持久连接"""
+        with self._lock:
+            conn, self._conn = self._conn, None
+            if conn is not None:
+                conn.close()
+
+    # ==================== 增量写入 ====================
+
+    def append(self, events: Iterable[Tuple[int, Optional[int], Optional[int], Any]]) -> int:
+        """追加一批事件 (op, key, priority, data)，一次事务 executemany 写入，返回写入条数"""
+        rows = list(events)
+        if not rows:
+            return 0
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany('INSERT INTO journal (op, key, priority, data) VALUES (?, ?, ?, ?)', rows)
+        return len(rows)
+
+    def compact(self) -> int:
+        """把日志折叠进快照表并截断日志，返回折叠的事件数"""
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                (last_seq,) = conn.execute('SELECT MAX(seq) FROM journal').fetchone()
+                if last_seq is None:
+                    return 0
+                conn.execute(
+                    'INSERT OR REPLACE INTO pending_requests (key, priority, data) '
+                    'SELECT key, COALESCE(priority, 0), data FROM journal WHERE op = ? AND seq <= ?',
+                    (self.OP_ENQUEUE, last_seq))
+                conn.execute(
+                    'DELETE FROM pending_requests WHERE key IN '
+                    '(SELECT key FROM journal WHERE op = ? AND seq <= ?)',
+                    (self.OP_DEQUEUE, last_seq))
+                conn.execute(
+                    'INSERT OR IGNORE INTO fingerprints (fingerprint) '
+                    'SELECT data FROM journal WHERE op = ? AND seq <= ?',
+                    (self.OP_FINGERPRINT, last_seq))
+                folded = conn.execute('DELETE FROM journal WHERE seq <= ?', (last_seq,)).rowcount
+            return folded
+
+    def write_metadata(self, metadata: Dict[str, Any]) -> None:
+        """写入元数据（值按 JSON 存储）"""
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    'INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)',
+                    [(key, json.dumps(value, ensure_ascii=False, default=str)) for key, value in metadata.items()])
+
+    def max_key(self) -> int:
+        """已使用的最大请求 key（新进程从其后继续编号）"""
+        if self._conn is None and not os.path.exists(self._path):
+            return 0
+        with self._lock:
+            row = self._connection().execute(
+                'SELECT MAX(k) FROM (SELECT MAX(key) AS k FROM pending_requests '
+                'UNION ALL SELECT MAX(key) FROM journal)').fetchone()
+            return row[0] or 0
+
+    # ==================== 流式读取 ====================
+
+    def iter_requests(self, batch_size: int = 1000) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """压缩后按优先级流式读取待处理请求 (key, 请求 dict)，每次只取 batch_size 行
+
+        按 (priority, key) 分页读取，两页之间不占用连接，期间的日志追加不受影响。
+        """
+        self.compact()
+        position = None
+        while True:
+            with self._lock:
+                conn = self._connection()
+                if position is None:
+                    rows = conn.execute(
+                        'SELECT priority, key, data FROM pending_requests '
+                        'ORDER BY priority ASC, key ASC LIMIT ?', (batch_size,)).fetchall()
+                else:
+                    rows = conn.execute(
+                        'SELECT priority, key, data FROM pending_requests WHERE (priority, key) > (?, ?) '
+                        'ORDER BY priority ASC, key ASC LIMIT ?', (*position, batch_size)).fetchall()
+            if not rows:
+                break
+            position = rows[-1][:2]
+            for _, key, data in rows:
+                try:
+                    yield key, decode_request_row(data)
+                except (ValueError, TypeError, RuntimeError) as e:
+                    self.logger.debug(f"Skipping undecodable checkpoint request {key}: {e}")
+
+    def iter_fingerprints(self, batch_size: int = 10000) -> Iterator[List[str]]:
+        """流式读取指纹，每次产出至多 batch_size 个（按指纹分页）"""
+        self.compact()
+        last = ''
+        while True:
+            with self._lock:
+                rows = self._connection().execute(
+                    'SELECT fingerprint FROM fingerprints WHERE fingerprint > ? ORDER BY fingerprint LIMIT ?',
+                    (last, batch_size)).fetchall()
+            if not rows:
+                break
+            last = rows[-1][0]
+            yield [row[0] for row in rows]
+
+    # ==================== BaseStorage ====================
+
+    def save(self, data: Dict[str, Any]) -> bool:
+        """全量保存（与其他后端接口一致）：以快照替换现有内容，请求与指纹批量写入"""
+        try:
+            with self._lock:
+                conn = self._connection()
+                with conn:
+                    for table in ('journal', 'pending_requests', 'fingerprints', 'metadata'):
+                        conn.execute(f'DELETE FROM {table}')  # nosec B608
+                    conn.executemany(
+                        'INSERT INTO pending_requests (key, priority, data) VALUES (?, ?, ?)',
+                        [(key, req.get('priority') or 0, encode_request_row(req))
+                         for key, req in enumerate(data.get('requests', []), 1) if isinstance(req, dict)])
+                    conn.executemany('INSERT OR IGNORE INTO fingerprints (fingerprint) VALUES (?)',
+                                     [(fp,) for fp in data.get('fingerprints', set())])
+            self.write_metadata(self._metadata(data))
+            self.logger.debug(f"Checkpoint saved to {self._path}")
+            return True
+        except Exception as e:
+            self.logger.error(f"Failed to save checkpoint: {e}")
+            return False
+
+    @staticmethod
+    def _metadata(data: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'version': 2,
+            'saved_at': time.time(),
+            'project_name': data.get('project_name', ''),
+            'spider_name': data.get('spider_name', ''),
+            'pending_count': data.get('pending_count', 0),
+            'stats': data.get('stats', {}),
+        }
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """加载元数据；请求与指纹不整体载入，以 ``iter_requests`` / ``iter_fingerprints`` 惰性读取"""
+        try:
+            if not os.path.exists(self._path):
+                return None
+            self.compact()
+            with self._lock:
+                conn = self._connection()
+                metadata = {key: json.loads(value) for key, value in conn.execute('SELECT key, value FROM metadata')}
+                (pending_count,) = conn.execute('SELECT COUNT(*) FROM pending_requests').fetchone()
+                (fingerprint_count,) = conn.execute('SELECT COUNT(*) FROM fingerprints').fetchone()
+            return {
+                'version': metadata.get('version', 2),
+                'saved_at': metadata.get('saved_at', 0),
+                'project_name': metadata.get('project_name', ''),
+                'spider_name': metadata.get('spider_name', ''),
+                'pending_count': pending_count,
+                'fingerprint_count': fingerprint_count,
+                'requests': self.iter_requests(),
+                'fingerprints': self.iter_fingerprints(),
+                'stats': metadata.get('stats', {}),
+            }
+        except Exception as e:
+            self.logger.error(f"Failed to load checkpoint: {e}")
+            return None
+
+    def exists(self) -> bool:
+        """检查点数据库是否存在"""
+        return os.path.exists(self._path)
+
+    def clear(self) -> bool:
+        """删除检查点数据库（含 WAL 文件）；先关闭持久连接"""
+        try:
+            self.close()
+            for path in (self._path, f'{self._path}-wal', f'{self._path}-shm'):
+                if os.path.exists(path):
+                    os.unlink(path)
+            self.logger.debug(f"Checkpoint cleared: {self._path}")
+            return True
+        except Exception as e:
+            self.logger.error(f"Failed to clear checkpoint: {e}")
+            return False
@@ -25,6 +25,9 @@ async def _ack_message(request, engine, success: bool, error: Optional[Exception
 
     Sends XACK on success, NACK on failure (with error classification).
     Called from crawl_task() to confirm task completion in distributed mode.
+
+    STREAM_ACK_BATCH_SIZE > 1 时 ACK / RETRY 在队列内合并提交（见 RedisStreamQueue.flush_acks），
+    此处返回时消息可能仍在 PEL 中；集群关闭时 _shutdown_cluster 会先提交缓冲。
     """
     if not engine._cluster_state.worker_id:
         return
@@ -205,6 +205,12 @@ class ClusterLifecycleMixin:
                 default_rate=rate_limit_rate,
                 default_capacity=rate_limit_capacity,
             )
+            lease_size = safe_get_config(self.settings, 'DISTRIBUTED_RATE_LIMIT_LEASE_SIZE', 0, int)
+            if lease_size > 1:
+                self._cluster_state.rate_limiter.set_lease(
+                    lease_size,
+                    safe_get_config(self.settings, 'DISTRIBUTED_RATE_LIMIT_LEASE_TTL', 1.0, float),
+                )
 
             # 7. ClusterMonitor
             self._cluster_state.monitor = ClusterMonitor(
@@ -311,7 +317,9 @@ class ClusterLifecycleMixin:
         3. 停止心跳
         4. 停止故障检测
         5. 等待在途任务 drain（超时保护）
-        6. 注销 Worker
+        6. 提交合并缓冲中的 ACK（STREAM_ACK_BATCH_SIZE > 1）
+        7. 归还限流租约中未用完的令牌
+        8. 注销 Worker
         """
         if not self._cluster_state.worker_id:
             return
@@ -347,6 +355,10 @@ class ClusterLifecycleMixin:
             await self._release_leader_lock()
 
             await self._drain_inflight_tasks()
+            await self._flush_pending_acks()
+
+            if self._cluster_state.rate_limiter:
+                await self._cluster_state.rate_limiter.release_leases()
 
             if self._cluster_state.registry:
                 await self._cluster_state.registry.deregister(self._cluster_state.worker_id)
@@ -356,6 +368,23 @@ class ClusterLifecycleMixin:
         except Exception as e:
             self.logger.debug(f"Cluster shutdown error: {e}")
 
+    async def _flush_pending_acks(self):
+        """
+        提交 Stream 队列中合并缓冲的 ACK / 重试。
+
+        必须在注销 Worker 之前完成：否则已处理完的消息留在本 Consumer 的 PEL 中，
+        会被其他 Worker 的 failover 回收并重复处理。
+        """
+        queue_manager = getattr(self.scheduler, 'queue_manager', None) if self.scheduler is not None else None
+        if queue_manager is None:
+            return
+        try:
+            flushed = await queue_manager.flush_acks()
+            if flushed:
+                self.logger.debug(f"Flushed {flushed} coalesced ACKs before shutdown")
+        except Exception as e:
+            self.logger.warning(f"Flush coalesced ACKs failed (messages will be reclaimed): {e}")
+
     async def _drain_inflight_tasks(self):
         """
         等待在途任务完成后再注销 Worker。
@@ -10,7 +10,7 @@
 2. 清理过期心跳记录（ZREMRANGEBYSCORE）
 3. 检测心跳超时的 Worker（初次检测）
 4. 标记为 suspect 状态，等待二次确认（30s）
-5. 二次确认后 XCLAIM 其 pending 消息，回收任务
+5. 二次确认后按页 XCLAIM 其 pending 消息，每页一次 pipeline 重新入队 / 转入死信
 6. 注销崩溃 Worker
 
 安全冗余：
@@ -39,6 +39,9 @@ class FailoverManager:
                 await asyncio.sleep(30)  # 每 30s 检测一次
     """
 
+    # 每次 claim 的消息条数（每页一次 claim + 一次 pipeline 提交）
+    claim_page_size = 500
+
     def __init__(
         self,
         registry: WorkerRegistry,
@@ -186,60 +189,47 @@ class FailoverManager:
         """
         回收崩溃 Worker 的未完成任务。
 
-        使用 XAUTOCLAIM（Redis 6.2+）或 XPENDING+XCLAIM（Redis 5.0-6.1）。
-        回收策略：XCLAIM 后 XACK+XDEL 原消息，再 XADD 重新入队（增加 retry_count）。
+        使用 XAUTOCLAIM（Redis 6.2+）或 XPENDING+XCLAIM（Redis 5.0-6.1）按页（``claim_page_size`` 条）回收，
+        每页交给 ``RedisStreamQueue.requeue_claimed`` 一次往返处理：复用 claim 返回的字段，
+        XACK+XDEL 原消息后带 retry_count+1 重新 XADD，超过投递上限的转入死信。
         重新入队的消息可被任何活跃 Worker 通过 XREADGROUP 消费。
 
         Returns:
-            回收的任务数量
+            回收的任务数量（含转入死信的）
         """
-        if not hasattr(self._stream_queue, 'claim_pending'):
-            self.logger.warning("Stream queue does not support claim_pending, cannot recover tasks")
+        if not hasattr(self._stream_queue, 'claim_pending_entries'):
+            self.logger.warning("Stream queue does not support batch claim, cannot recover tasks")
             return 0
 
         total_claimed = 0
-        group = self._stream_queue.group_name
-        max_len = self._stream_queue.max_length
+        total_dead = 0
+        extra_fields = {"failover_from": dead_worker_id}
+        dead_reason = f"Worker {dead_worker_id} crashed, max retries exceeded"
 
         try:
-            # 回收两个 Stream 的 pending 消息：高优 + 普通
-            for stream_key in (self._stream_queue.high_stream, self._stream_queue.stream):
+            # 回收两个 Stream 的 pending 消息：高优 + 普通（priority 关闭时两者相同）
+            for stream_key in dict.fromkeys((self._stream_queue.high_stream, self._stream_queue.stream)):
                 while True:
-                    claimed_messages = await self._stream_queue.claim_pending(
+                    entries = await self._stream_queue.claim_pending_entries(
                         min_idle_ms=self._stream_queue.consumer_idle_timeout,
-                        count=100,
+                        count=self.claim_page_size,
                         stream=stream_key,
                     )
-                    if not claimed_messages:
+                    if not entries:
                         break
 
-                    for msg_id, request, retry_count in claimed_messages:
-                        try:
-                            if retry_count >= self._stream_queue.delivery_count_limit:
-                                await self._stream_queue._escalate_to_dead_letter(
-                                    msg_id, f"Worker {dead_worker_id} crashed, max retries exceeded"
-                                )
-                                self.logger.debug(f"Message {msg_id} escalated to dead letter (retries={retry_count})")
-                            else:
-                                msgs = await self._redis.xrange(stream_key, min=msg_id, max=msg_id, count=1)
-                                if not msgs:
-                                    await self._redis.xack(stream_key, group, msg_id)
-                                    continue
-
-                                _, fields = msgs[0]
-
-                                await self._redis.xack(stream_key, group, msg_id)
-                                await self._redis.xdel(stream_key, msg_id)
-
-                                new_fields = {k: v for k, v in fields.items() if k != b"retry_count"}
-                                new_fields[b"retry_count"] = str(retry_count + 1).encode()
-                                new_fields[b"reenqueued_at"] = str(time.time()).encode()
-                                new_fields[b"failover_from"] = dead_worker_id.encode()
-                                await self._redis.xadd(stream_key, new_fields, maxlen=max_len, approximate=True)
-                                total_claimed += 1
-                        except Exception as e:
-                            self.logger.warning(f"Failed to re-enqueue claimed message {msg_id}: {e}")
-                            total_claimed += 1
+                    try:
+                        requeued, dead = await self._stream_queue.requeue_claimed(
+                            stream_key, entries, extra_fields=extra_fields, dead_reason=dead_reason,
+                        )
+                    except Exception as e:
+                        # 整页保持 pending（已归当前 Worker），空闲超时后由下一轮回收
+                        self.logger.warning(
+                            f"Failed to re-enqueue {len(entries)} claimed messages from {stream_key}: {e}"
+                        )
+                        break
+                    total_claimed += requeued + dead
+                    total_dead += dead
 
         except Exception as e:
             self.logger.error(f"Claim worker tasks failed for {dead_worker_id}: {e}")
@@ -247,7 +237,7 @@ class FailoverManager:
         if total_claimed > 0:
             self.logger.info(
                 f"Failover: recovered {total_claimed} tasks from dead worker {dead_worker_id}, "
-                f"re-enqueued for processing"
+                f"re-enqueued for processing ({total_dead} escalated to dead letter)"
             )
 
         return total_claimed
@@ -5,12 +5,39 @@
 
 提供集群状态总览、队列详情、Worker 列表、Pending 任务查询等功能。
 聚合 WorkerRegistry + ProgressAggregator + Stream Queue 的数据。
+
+状态快照（``status()`` / ``crawlo cluster state``）在一个非事务 pipeline 中读取全部 key：
+Worker 计数由服务端脚本遍历存活心跳汇总，只返回计数而不是每个 Worker 的 JSON；
+进度、各 Stream 长度与 Pending 数随同一次往返返回。集群模式下注册表两个 key 分属不同槽，
+脚本失败时改为 ZRANGEBYSCORE + HMGET 两次往返在客户端汇总。
 """
-from typing import Dict, Any, List
+import json
+import time
+from typing import Dict, Any, List, Optional, Tuple
 
+from crawlo.cluster.progress import ProgressAggregator
 from crawlo.logging import get_logger
 
 
+# Lua 脚本：统计存活 Worker（心跳未超时且仍在注册表中）及其中 idle 的数量（只读）
+# KEYS[1] = registry:workers, KEYS[2] = registry:heartbeats, ARGV[1] = 心跳截止时间
+_WORKER_SUMMARY_LUA = """
+local alive = redis.call('ZRANGEBYSCORE', KEYS[2], ARGV[1], '+inf')
+local total, idle = 0, 0
+for _, field in ipairs(alive) do
+    local raw = redis.call('HGET', KEYS[1], field)
+    if raw then
+        total = total + 1
+        local ok, info = pcall(cjson.decode, raw)
+        if ok and type(info) == 'table' and info['status'] == 'idle' then
+            idle = idle + 1
+        end
+    end
+end
+return {total, idle, redis.call('HLEN', KEYS[1])}
+"""
+
+
 class ClusterMonitor:
     """
     集群监控。
@@ -21,6 +48,12 @@ class ClusterMonitor:
         print(status["workers"]["active"], status["queue"]["pending"])
     """
 
+    # 状态快照涉及的 key 名称（见 snapshot_keys）
+    SNAPSHOT_KEYS = (
+        "workers", "heartbeats", "stats", "first_report",
+        "stream", "high_stream", "failed_stream", "group",
+    )
+
     def __init__(
         self,
         registry,
@@ -39,47 +72,151 @@ class ClusterMonitor:
 
     async def status(self) -> Dict[str, Any]:
         """
-        集群状态总览。
+        集群状态总览（一次 pipeline 往返，见 ``read_snapshot``）。
 
         Returns:
             {
-                "workers": {"active": N, "idle": M, "total": K},
-                "queue": {"pending": X, "processing": Y, "failed": Z},
+                "workers": {"active": N, "idle": M, "total": K, "registered": R},
+                "queue": {"pending": X, "processing": Y, "failed": Z, "streams": {...}},
                 "progress": {"completed": A, "items_per_sec": B, "elapsed": C},
                 "dead_letter": {"total": D},
             }
         """
-        # Worker 统计
-        active_workers = await self._registry.get_active_workers() if self._registry else []
-        idle_count = sum(1 for w in active_workers if w.get("status") == "idle")
-        total_workers = len(active_workers)
-
-        # 队列统计
-        pending = await self._stream_queue.size() if self._stream_queue else 0
-        processing = 0
+        return await self.read_snapshot(
+            self._redis_client(),
+            self._snapshot_keys(),
+            worker_timeout=getattr(self._registry, "worker_timeout", 90),
+        )
+
+    def _redis_client(self):
+        for component in (self._registry, self._progress, self._stream_queue):
+            client = getattr(component, "_redis", None)
+            if client is not None:
+                return client
+        return None
+
+    def _snapshot_keys(self) -> Dict[str, Optional[str]]:
+        """从各组件取快照涉及的 key（组件缺失时对应 key 为 None，跳过读取）"""
+        keys: Dict[str, Optional[str]] = dict.fromkeys(self.SNAPSHOT_KEYS)
+        if self._registry:
+            keys["workers"] = self._registry.workers_key
+            keys["heartbeats"] = self._registry.heartbeats_key
+        if self._progress:
+            keys["stats"] = self._progress._stats_key
+            keys["first_report"] = self._progress._first_report_key
         if self._stream_queue:
-            info = await self._stream_queue.pending_info()
-            processing = info.get("total", 0) if isinstance(info, dict) else 0
+            keys["stream"] = self._stream_queue.stream
+            keys["high_stream"] = self._stream_queue.high_stream
+            keys["failed_stream"] = self._stream_queue.failed_stream
+            keys["group"] = self._stream_queue.group_name
+        return keys
 
-        # 死信统计
-        dead_letter = (
-            await self._failover.get_dead_letter_stats()
-            if self._failover else {"total": 0}
-        )
+    # ---- 状态快照 ----
+
+    @staticmethod
+    def snapshot_keys(namespace: str, priority_enabled: bool = True) -> Dict[str, Optional[str]]:
+        """
+        按命名空间推导快照涉及的 key（与 WorkerRegistry / ProgressAggregator / RedisStreamQueue 的 key 设计一致）。
+
+        Args:
+            namespace: ``{project}:{spider}``（即 ``RedisKeyManager.namespace``，不含 ``crawlo:`` 前缀）
+            priority_enabled: 是否启用了高优先级 Stream
+        """
+        prefix = f"crawlo:{namespace}"
+        stream = f"{prefix}:stream:tasks"
+        return {
+            "workers": f"{prefix}:registry:workers",
+            "heartbeats": f"{prefix}:registry:heartbeats",
+            "stats": f"{prefix}:progress:stats",
+            "first_report": f"{prefix}:progress:first_report",
+            "stream": stream,
+            "high_stream": f"{stream}:high" if priority_enabled else stream,
+            "failed_stream": f"{prefix}:stream:failed",
+            "group": f"{prefix}:group:workers",
+        }
+
+    @classmethod
+    async def read_snapshot(
+        cls,
+        redis_client,
+        keys: Dict[str, Optional[str]],
+        worker_timeout: int = 90,
+    ) -> Dict[str, Any]:
+        """
+        一次 pipeline 往返读取集群状态快照，返回结构与 ``status()`` 相同。
 
-        # 进度统计
-        progress = await self._progress.get_global_stats() if self._progress else {}
+        Args:
+            redis_client: Redis 异步客户端（None 时返回全零快照）
+            keys: ``snapshot_keys()`` 的返回值，值为 None 的部分跳过
+            worker_timeout: Worker 心跳超时（秒）
+        """
+        keys = dict(dict.fromkeys(cls.SNAPSHOT_KEYS), **keys)
+        deadline = time.time() - worker_timeout
+        streams = [s for s in dict.fromkeys((keys["stream"], keys["high_stream"])) if s]
+        # 管道结果按 (种类, Stream 名) 标记，与 Stream 无关的结果 Stream 名为空串
+        results: Dict[Tuple[str, str], Any] = {}
+
+        if redis_client is not None:
+            pipe = redis_client.pipeline(transaction=False)
+            labels: List[Tuple[str, str]] = []
+            if keys["workers"] and keys["heartbeats"]:
+                pipe.eval(_WORKER_SUMMARY_LUA, 2, keys["workers"], keys["heartbeats"], deadline)
+                labels.append(("workers", ""))
+            if keys["stats"]:
+                pipe.hgetall(keys["stats"])
+                labels.append(("stats", ""))
+            if keys["first_report"]:
+                pipe.get(keys["first_report"])
+                labels.append(("first_report", ""))
+            for stream in streams:
+                pipe.xlen(stream)
+                labels.append(("length", stream))
+                if keys["group"]:
+                    pipe.xpending(stream, keys["group"])
+                    labels.append(("pending", stream))
+            if keys["failed_stream"]:
+                pipe.xlen(keys["failed_stream"])
+                labels.append(("failed", ""))
+            if labels:
+                results = dict(zip(labels, await pipe.execute(raise_on_error=False)))
+            if isinstance(results.get(("workers", "")), Exception):
+                results[("workers", "")] = await cls._summarize_workers(redis_client, keys, deadline)
+
+        def value(kind: str, default: Any, stream: str = "") -> Any:
+            result = results.get((kind, stream), default)
+            return default if isinstance(result, Exception) or result is None else result
+
+        total, idle, registered = (int(n) for n in value("workers", (0, 0, 0)))
+        stats = value("stats", {})
+        first_report = value("first_report", None)
+        progress = ProgressAggregator.compose_global_stats(stats, first_report)
+
+        stream_info = {}
+        for name, stream in zip(("main", "high"), streams):
+            pending = value("pending", {}, stream)
+            if not isinstance(pending, dict):
+                pending = {}
+            consumers = [c.get("name") for c in pending.get("consumers") or []]
+            stream_info[name] = {
+                "length": int(value("length", 0, stream)),
+                "pending": pending.get("pending", 0),
+                "consumers": [c.decode("utf-8") if isinstance(c, bytes) else c for c in consumers],
+            }
+        main = stream_info.get("main", {"length": 0, "pending": 0, "consumers": []})
+        dead_letter = {"total": int(value("failed", 0))}
 
         return {
             "workers": {
-                "active": total_workers - idle_count,
-                "idle": idle_count,
-                "total": total_workers,
+                "active": total - idle,
+                "idle": idle,
+                "total": total,
+                "registered": registered,
             },
             "queue": {
-                "pending": pending,
-                "processing": processing,
-                "failed": dead_letter.get("total", 0),
+                "pending": sum(info["length"] for info in stream_info.values()),
+                "processing": main["pending"],
+                "failed": dead_letter["total"],
+                "streams": stream_info,
             },
             "progress": {
                 "completed": progress.get("total_completed", 0),
@@ -91,6 +228,20 @@ class ClusterMonitor:
             "dead_letter": dead_letter,
         }
 
+    @staticmethod
+    async def _summarize_workers(redis_client, keys: Dict[str, Optional[str]], deadline: float):
+        """脚本不可用（如集群模式 CROSSSLOT）时在客户端汇总 Worker 计数"""
+        try:
+            alive = await redis_client.zrangebyscore(keys["heartbeats"], deadline, "+inf")
+            raws = await redis_client.hmget(keys["workers"], alive) if alive else []
+            registered = await redis_client.hlen(keys["workers"])
+        except Exception as e:
+            get_logger(ClusterMonitor.__name__).debug("Suppressed exception: %s", e)
+            return 0, 0, 0
+        infos = [json.loads(raw) for raw in raws if raw]
+        idle = sum(1 for info in infos if info.get("status") == "idle")
+        return len(infos), idle, registered
+
     # ---- Worker ----
 
     async def workers(self) -> List[Dict[str, Any]]:
@@ -7,12 +7,22 @@
 基于 Redis HASH 存储全局统计和各 Worker 分项统计。
 
 Key 设计：
-    crawlo:{project}:{spider}:progress:stats   HASH  全局统计
-    crawlo:{project}:{spider}:progress:items   HASH  各 Worker 产出统计
+    crawlo:{project}:{spider}:progress:stats         HASH    全局统计
+    crawlo:{project}:{spider}:progress:items         HASH    各 Worker 产出统计
+    crawlo:{project}:{spider}:progress:first_report  STRING  首次上报时间
+
+一次上报（HINCRBY × N + HSET + SET NX）放在同一 pipeline 中提交：单机 / 哨兵模式下为
+MULTI/EXEC 事务，集群模式下各 key 分属不同槽，退化为非事务 pipeline。
 """
+import json
 import time
 from typing import Dict, Any, Optional
 
+try:
+    from redis.asyncio.cluster import RedisCluster
+except ImportError:  # pragma: no cover - redis 为分布式模式依赖
+    RedisCluster = None
+
 from crawlo.logging import get_logger
 
 
@@ -55,33 +65,53 @@ class ProgressAggregator:
             worker_id: Worker 标识
             stats: 统计字段（completed/failed/processing 等）
         """
+        now = time.time()
+        if RedisCluster is not None and isinstance(self._redis, RedisCluster):
+            pipe = self._redis.pipeline()
+        else:
+            pipe = self._redis.pipeline(transaction=True)
+
         # 全局累计统计（HINCRBY 原子增量）
         for field in ("completed", "failed", "items"):
             if field in stats:
-                await self._redis.hincrby(
-                    self._stats_key, f"total_{field}", int(stats[field])
-                )
+                pipe.hincrby(self._stats_key, f"total_{field}", int(stats[field]))
 
         # Worker 分项统计
         worker_data = {
-            "last_report": time.time(),
+            "last_report": now,
             **{k: int(v) for k, v in stats.items() if isinstance(v, (int, float))},
         }
-        import json
-        await self._redis.hset(
+        pipe.hset(
             self._items_key,
             f"worker:{worker_id}",
             json.dumps(worker_data, ensure_ascii=False),
         )
 
-        # 记录首次上报时间
-        if not await self._redis.exists(self._first_report_key):
-            await self._redis.set(self._first_report_key, time.time())
+        # 记录首次上报时间（SET NX 取代 EXISTS + SET）
+        pipe.set(self._first_report_key, now, nx=True)
+        await pipe.execute()
 
     # ---- 全局统计 ----
 
     async def get_global_stats(self) -> Dict[str, Any]:
         """获取全局统计"""
+        raw, first_ts = {}, None
+        try:
+            pipe = self._redis.pipeline(transaction=False)
+            pipe.hgetall(self._stats_key)
+            pipe.get(self._first_report_key)
+            raw, first_ts = await pipe.execute()
+        except Exception as e:
+            self.logger.debug("Suppressed exception: %s", e)
+        return self.compose_global_stats(raw, first_ts)
+
+    @staticmethod
+    def compose_global_stats(raw: Dict[Any, Any], first_report: Any = None) -> Dict[str, Any]:
+        """
+        由 progress:stats 的 HGETALL 结果与首次上报时间计算全局统计（含速率）。
+
+        供 ``ClusterMonitor.read_snapshot`` 等在自己的 pipeline 中读取原始数据后复用。
+        """
         stats: Dict[str, Any] = {
             "total_completed": 0,
             "total_failed": 0,
@@ -89,29 +119,20 @@ class ProgressAggregator:
             "items_per_sec": 0,
             "elapsed": 0,
         }
-
-        try:
-            raw = await self._redis.hgetall(self._stats_key)
-            for k, v in raw.items():
-                k_str = k.decode("utf-8") if isinstance(k, bytes) else k
-                v_int = int(v.decode("utf-8") if isinstance(v, bytes) else v)
-                stats[k_str] = v_int
-
-            # 计算速率
-            first_ts = await self._redis.get(self._first_report_key)
-            if first_ts:
-                elapsed = time.time() - float(first_ts)
-                stats["elapsed"] = round(elapsed, 1)
-                if elapsed > 0 and stats["total_completed"] > 0:
-                    stats["items_per_sec"] = round(stats["total_completed"] / elapsed, 2)
-        except Exception as e:
-            self.logger.debug("Suppressed exception: %s", e)
-
+        for k, v in (raw or {}).items():
+            k_str = k.decode("utf-8") if isinstance(k, bytes) else k
+            stats[k_str] = int(v.decode("utf-8") if isinstance(v, bytes) else v)
+
+        # 计算速率
+        if first_report:
+            elapsed = time.time() - float(first_report)
+            stats["elapsed"] = round(elapsed, 1)
+            if elapsed > 0 and stats["total_completed"] > 0:
+                stats["items_per_sec"] = round(stats["total_completed"] / elapsed, 2)
         return stats
 
     async def get_worker_stats(self, worker_id: str) -> Optional[Dict[str, Any]]:
         """获取指定 Worker 的统计"""
-        import json
         raw = await self._redis.hget(self._items_key, f"worker:{worker_id}")
         if raw:
             raw_str = raw.decode("utf-8") if isinstance(raw, bytes) else raw
@@ -120,7 +141,6 @@ class ProgressAggregator:
 
     async def get_all_workers(self) -> Dict[str, Dict[str, Any]]:
         """获取所有 Worker 的统计"""
-        import json
         raw = await self._redis.hgetall(self._items_key)
         result = {}
         for k, v in raw.items():
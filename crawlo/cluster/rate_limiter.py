@@ -9,12 +9,18 @@
 Key 设计：
     crawlo:{project}:{spider}:rate:{domain}     String  令牌计数
     crawlo:{project}:{spider}:rate:{domain}:ts  String  上次补充时间戳
+
+租约模式（``set_lease``）：
+    每次 Redis 往返预留 N 个令牌在本地消费，租约到期（lease_ttl）后把未用完的令牌归还；
+    令牌不足时记下脚本返回的 wait_ms，本地等待者到点再申请，期间不访问 Redis。
+    所有脚本通过 EVALSHA 执行（首次 NOSCRIPT 时回退 EVAL 并缓存）。
 """
 import asyncio
 import time
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 from crawlo.logging import get_logger
+from crawlo.utils.redis.scripts import run_script
 
 
 # Lua 脚本：原子令牌桶操作
@@ -47,6 +53,64 @@ end
 """
 
 
+# Lua 脚本：租约（一次预留至多 ARGV[4] 个令牌，不足 ARGV[5] 个时返回等待时间）
+_LEASE_LUA = """
+local key = KEYS[1]
+local ts_key = KEYS[2]
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local requested = tonumber(ARGV[4])
+local minimum = tonumber(ARGV[5])
+
+local tokens = tonumber(redis.call('GET', key)) or capacity
+local last_ts = tonumber(redis.call('GET', ts_key)) or now
+tokens = math.min(capacity, tokens + math.max(0, now - last_ts) * rate)
+
+local granted = 0
+if tokens >= minimum then
+    granted = math.min(requested, math.floor(tokens))
+end
+redis.call('SET', key, tokens - granted)
+redis.call('SET', ts_key, now)
+if granted > 0 then
+    return {granted, 0}
+end
+return {0, math.ceil((minimum - tokens) / rate * 1000)}  -- 未授予, wait_ms
+"""
+
+# Lua 脚本：归还租约中未使用的令牌（不超过桶容量）
+_RETURN_LUA = """
+local key = KEYS[1]
+local ts_key = KEYS[2]
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local returned = tonumber(ARGV[4])
+
+local tokens = tonumber(redis.call('GET', key)) or capacity
+local last_ts = tonumber(redis.call('GET', ts_key)) or now
+tokens = math.min(capacity, tokens + math.max(0, now - last_ts) * rate + returned)
+redis.call('SET', key, tokens)
+redis.call('SET', ts_key, now)
+return math.floor(tokens)
+"""
+
+
+class _Lease:
+    """单个域名的本地令牌租约"""
+
+    __slots__ = ('tokens', 'expires_at', 'retry_at', 'rate', 'capacity', 'lock')
+
+    def __init__(self):
+        self.tokens = 0
+        self.expires_at = 0.0
+        self.retry_at = 0.0     # 桶已空时，到此时间前不再访问 Redis
+        self.rate = 0.0
+        self.capacity = 0
+        self.lock = asyncio.Lock()
+
+
 class DistributedRateLimiter:
     """
     跨节点的分布式限流（Redis 令牌桶）。
@@ -57,6 +121,9 @@ class DistributedRateLimiter:
         allowed = await limiter.acquire("example.com", rate=2.0, capacity=5)
         if not allowed:
             await limiter.wait_and_acquire("example.com", rate=2.0, timeout=10)
+
+        # 租约模式：每次往返预留至多 20 个令牌，1 秒内未用完的归还
+        limiter.set_lease(20, lease_ttl=1.0)
     """
 
     def __init__(
@@ -87,8 +154,87 @@ class DistributedRateLimiter:
         self._domain_rates: Dict[str, float] = {}
         self._domain_capacities: Dict[str, int] = {}
 
+        # 租约模式（lease_size <= 1 时关闭，每个请求一次脚本调用）
+        self._lease_size = 0
+        self._lease_ttl = 1.0
+        self._leases: Dict[str, _Lease] = {}
+
+        # 脚本执行计数（基准/监控用）
+        self.script_calls = 0
+
         self.logger = get_logger(self.__class__.__name__)
 
+    # ---- 脚本执行 ----
+
+    async def _run_script(self, script: str, domain: str, *args):
+        """对域名的令牌桶键执行脚本（EVALSHA，NOSCRIPT 时回退 EVAL）"""
+        key = f"{self._ns}:rate:{domain}"
+        self.script_calls += 1
+        return await run_script(self._redis, script, 2, key, f"{key}:ts", *args)
+
+    def _resolve(self, domain: str, rate: Optional[float], capacity: Optional[int]) -> Tuple[float, int]:
+        effective_rate = rate or self._domain_rates.get(domain, self._default_rate)
+        effective_capacity = capacity or self._domain_capacities.get(domain, self._default_capacity)
+        return effective_rate, effective_capacity
+
+    async def _take(self, domain: str, rate: float, capacity: int, count: int) -> float:
+        """申请 count 个令牌，返回 0.0（已获得）或建议等待秒数"""
+        if self._lease_size > 1:
+            return await self._take_leased(domain, rate, capacity, count)
+        result = await self._run_script(
+            _TOKEN_BUCKET_LUA, domain, rate, capacity, time.time(), count,
+        )
+        if result[0] == 1:
+            return 0.0
+        wait_ms = result[2] if len(result) > 2 else 100
+        return max(0.01, wait_ms / 1000)
+
+    async def _take_leased(self, domain: str, rate: float, capacity: int, count: int) -> float:
+        """从本地租约扣减令牌，租约耗尽或到期时续租（同一域名同时只有一个协程访问 Redis）"""
+        lease = self._leases.get(domain)
+        if lease is None:
+            lease = self._leases[domain] = _Lease()
+
+        now = time.monotonic()
+        if lease.tokens >= count and now < lease.expires_at:
+            lease.tokens -= count
+            return 0.0
+        if now < lease.retry_at:
+            return lease.retry_at - now
+
+        async with lease.lock:
+            # 等锁期间可能已被其它协程续租
+            now = time.monotonic()
+            if lease.tokens >= count and now < lease.expires_at:
+                lease.tokens -= count
+                return 0.0
+            if now < lease.retry_at:
+                return lease.retry_at - now
+
+            if lease.tokens:
+                await self._return_lease(domain, lease)
+
+            # 租约大小不超过 lease_ttl 内的产出，避免单个 Worker 囤积令牌；
+            # 桶中不足半个租约时等待补充而不是逐个领取，否则限速稳态下每次往返只拿到 1 个令牌
+            size = max(count, min(self._lease_size, capacity, max(1, int(rate * self._lease_ttl))))
+            granted, wait_ms = await self._run_script(
+                _LEASE_LUA, domain, rate, capacity, time.time(), size, max(count, size // 2),
+            )
+            lease.rate, lease.capacity = rate, capacity
+            if granted >= count:
+                lease.tokens = granted - count
+                lease.expires_at = now + self._lease_ttl
+                return 0.0
+            wait = max(0.01, wait_ms / 1000)
+            lease.retry_at = now + wait
+            return wait
+
+    async def _return_lease(self, domain: str, lease: _Lease) -> None:
+        returned, lease.tokens = lease.tokens, 0
+        await self._run_script(
+            _RETURN_LUA, domain, lease.rate, lease.capacity, time.time(), returned,
+        )
+
     # ---- 令牌申请 ----
 
     async def acquire(
@@ -110,28 +256,36 @@ class DistributedRateLimiter:
         Returns:
             True = 允许，False = 拒绝（需等待）
         """
-        if not self._enabled:
-            return True
+        return await self.reserve(domain, rate, capacity, count) == 0.0
 
-        effective_rate = rate or self._domain_rates.get(domain, self._default_rate)
-        if effective_rate <= 0:
-            return True  # 不限速
+    async def reserve(
+        self,
+        domain: str,
+        rate: Optional[float] = None,
+        capacity: Optional[int] = None,
+        count: int = 1,
+    ) -> float:
+        """
+        申请令牌（非阻塞），返回还需等待的秒数。
 
-        effective_capacity = capacity or self._domain_capacities.get(domain, self._default_capacity)
+        与 acquire 相同的一次脚本往返（租约模式下多数请求无需往返），
+        拒绝时带回令牌补足所需时间，供调用方（如 DomainSlotDispatcher）把请求延后而不是轮询。
 
-        key = f"{self._ns}:rate:{domain}"
-        ts_key = f"{key}:ts"
+        Returns:
+            0.0 = 已获得令牌；>0 = 建议等待秒数
+        """
+        if not self._enabled:
+            return 0.0
+
+        effective_rate, effective_capacity = self._resolve(domain, rate, capacity)
+        if effective_rate <= 0:
+            return 0.0
 
         try:
-            result = await self._redis.eval(
-                _TOKEN_BUCKET_LUA, 2,
-                key, ts_key,
-                effective_rate, effective_capacity, time.time(), count,
-            )
-            return result[0] == 1
+            return await self._take(domain, effective_rate, effective_capacity, count)
         except Exception as e:
             self.logger.debug(f"Rate limiter check failed for {domain}: {e}")
-            return True  # 降级：Redis 不可用时放行
+            return 0.0  # 降级：Redis 不可用时放行
 
     async def wait_and_acquire(
         self,
@@ -144,6 +298,8 @@ class DistributedRateLimiter:
         """
         阻塞等待直到获取令牌（带超时）。
 
+        按脚本返回的 wait_ms 休眠到令牌补足时刻，不做固定间隔轮询。
+
         Args:
             domain: 域名
             rate: 速率
@@ -154,41 +310,43 @@ class DistributedRateLimiter:
         Returns:
             True = 成功获取，False = 超时
         """
-        if not self._enabled:
-            return True
-
-        effective_rate = rate or self._domain_rates.get(domain, self._default_rate)
-        if effective_rate <= 0:
-            return True
+        deadline = time.monotonic() + timeout
+        while True:
+            wait_s = await self.reserve(domain, rate, capacity, count)
+            if wait_s <= 0:
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            await asyncio.sleep(min(wait_s, remaining, 2.0))
 
-        effective_capacity = capacity or self._domain_capacities.get(domain, self._default_capacity)
-        key = f"{self._ns}:rate:{domain}"
-        ts_key = f"{key}:ts"
+    # ---- 租约 ----
 
-        start = time.time()
+    def set_lease(self, lease_size: int, lease_ttl: float = 1.0) -> None:
+        """
+        开启/调整租约模式。
 
-        while True:
-            try:
-                result = await self._redis.eval(
-                    _TOKEN_BUCKET_LUA, 2,
-                    key, ts_key,
-                    effective_rate, effective_capacity, time.time(), count,
-                )
-                if result[0] == 1:
-                    return True
-
-                # 计算等待时间
-                wait_ms = result[2] if len(result) > 2 else 100
-                wait_s = max(0.05, min(wait_ms / 1000, 2.0))  # 最多等 2s
-
-                if time.time() - start >= timeout:
-                    return False
-
-                await asyncio.sleep(wait_s)
-
-            except Exception as e:
-                self.logger.debug(f"Rate limiter wait failed: {e}")
-                return True  # 降级放行
+        Args:
+            lease_size: 每次往返预留的最大令牌数（<=1 关闭租约，恢复逐请求申请）
+            lease_ttl: 租约有效期（秒），到期未用完的令牌归还
+        """
+        self._lease_size = max(0, int(lease_size))
+        self._lease_ttl = max(0.01, float(lease_ttl))
+
+    async def release_leases(self) -> int:
+        """归还所有本地租约中未使用的令牌（关闭时调用），返回归还的令牌数"""
+        returned = 0
+        for domain, lease in list(self._leases.items()):
+            if not lease.tokens:
+                continue
+            async with lease.lock:
+                count = lease.tokens
+                try:
+                    await self._return_lease(domain, lease)
+                    returned += count
+                except Exception as e:
+                    self.logger.debug(f"Rate limiter lease return failed for {domain}: {e}")
+        return returned
 
     # ---- 配置 ----
 
@@ -9,6 +9,11 @@ Worker 注册中心
 Key 设计：
     crawlo:{project}:{spider}:registry:workers     HASH   Worker 注册表
     crawlo:{project}:{spider}:registry:heartbeats  ZSET   心跳时间戳（score=timestamp）
+
+往返次数：
+    心跳 / 状态更新把 ZADD 与注册表合并脚本放在同一 pipeline（1 次往返），脚本在服务端
+    合并 JSON 字段，避免 HGET → HSET 之间覆盖其他节点写入的字段（如 FailoverManager 标记的 suspect）；
+    活跃 Worker 查询为清理 + 范围查询 1 次、HMGET 1 次，与 Worker 数无关。
 """
 import json
 import time
@@ -16,6 +21,24 @@ from typing import Optional, Dict, List, Any
 
 from crawlo.logging import get_logger
 from crawlo.utils.redis.keys import RedisKeyManager
+from crawlo.utils.redis.scripts import is_noscript, script_sha
+
+
+# Lua 脚本：把 JSON 补丁合并进注册表中的 Worker 信息（Worker 不存在时不创建）
+# 只访问注册表一个 key，集群模式下同样可用
+_MERGE_WORKER_LUA = """
+local raw = redis.call('HGET', KEYS[1], ARGV[1])
+if not raw then
+    return 0
+end
+local info = cjson.decode(raw)
+for k, v in pairs(cjson.decode(ARGV[2])) do
+    info[k] = v
+end
+redis.call('HSET', KEYS[1], ARGV[1], cjson.encode(info))
+return 1
+"""
+_MERGE_WORKER_SHA = script_sha(_MERGE_WORKER_LUA)
 
 
 class WorkerRegistry:
@@ -78,6 +101,11 @@ class WorkerRegistry:
         """心跳 ZSET 的 Redis key"""
         return self._heartbeats_key
 
+    @property
+    def workers_key(self) -> str:
+        """注册表 HASH 的 Redis key"""
+        return self._workers_key
+
     # ---- 注册 / 注销 ----
 
     async def register(self, worker_info: Dict[str, Any]) -> str:
@@ -152,23 +180,9 @@ class WorkerRegistry:
             worker_id: Worker ID
             extra: 额外更新的字段（如 tasks_completed, tasks_processing 等）
         """
-        field = f"worker:{worker_id}"
         now = time.time()
-
-        # 更新心跳 ZSET
-        await self._redis.zadd(self._heartbeats_key, {field: now})
-
-        # 更新注册表中的心跳时间戳
-        worker_info = await self._get_worker_info_raw(field)
-        if worker_info:
-            worker_info["last_heartbeat"] = now
-            if extra:
-                worker_info.update(extra)
-            await self._redis.hset(
-                self._workers_key,
-                field,
-                json.dumps(worker_info, ensure_ascii=False),
-            )
+        patch = {"last_heartbeat": now, **(extra or {})}
+        await self._merge_worker_info(f"worker:{worker_id}", patch, now)
 
     async def update_status(self, worker_id: str, status: str, **extra):
         """
@@ -179,18 +193,9 @@ class WorkerRegistry:
             status: 新状态
             **extra: 额外字段（如 suspect_since）
         """
-        field = f"worker:{worker_id}"
-        worker_info = await self._get_worker_info_raw(field)
-        if worker_info:
-            worker_info["status"] = status
-            worker_info.update(extra)
-            await self._redis.hset(
-                self._workers_key,
-                field,
-                json.dumps(worker_info, ensure_ascii=False),
-            )
+        patch = {"status": status, **extra}
         # 同步更新心跳
-        await self._redis.zadd(self._heartbeats_key, {field: time.time()})
+        await self._merge_worker_info(f"worker:{worker_id}", patch, time.time())
 
     # ---- 查询 ----
 
@@ -204,28 +209,18 @@ class WorkerRegistry:
         now = time.time()
         deadline = now - self._worker_timeout
 
-        # 清理过期心跳
-        await self._redis.zremrangebyscore(
-            self._heartbeats_key, 0, deadline
-        )
-
-        # 获取存活的心跳记录
-        alive = await self._redis.zrangebyscore(
-            self._heartbeats_key, deadline, "+inf"
-        )
+        # 清理过期心跳 + 获取存活的心跳记录（一次往返）
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.zremrangebyscore(self._heartbeats_key, 0, deadline)
+        pipe.zrangebyscore(self._heartbeats_key, deadline, "+inf")
+        _, alive = await pipe.execute()
 
         if not alive:
             return []
 
-        # 批量获取 Worker 信息
-        workers = []
-        for field in alive:
-            field_str = field.decode("utf-8") if isinstance(field, bytes) else field
-            info = await self._get_worker_info_raw(field_str)
-            if info:
-                workers.append(info)
-
-        return workers
+        # 一次 HMGET 批量获取 Worker 信息
+        raws = await self._redis.hmget(self._workers_key, alive)
+        return [self._decode_info(raw) for raw in raws if raw]
 
     async def get_worker_info(self, worker_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -291,10 +286,29 @@ class WorkerRegistry:
         """从 Redis HASH 读取 Worker 信息（原始字段名）"""
         raw = await self._redis.hget(self._workers_key, field)
         if raw:
-            raw_str = raw.decode("utf-8") if isinstance(raw, bytes) else raw
-            return json.loads(raw_str)
+            return self._decode_info(raw)
         return None
 
+    @staticmethod
+    def _decode_info(raw) -> Dict[str, Any]:
+        raw_str = raw.decode("utf-8") if isinstance(raw, bytes) else raw
+        return json.loads(raw_str)
+
+    async def _merge_worker_info(self, field: str, patch: Dict[str, Any], now: float) -> bool:
+        """ZADD 心跳 + 服务端合并注册表字段，一次 pipeline 往返；返回 Worker 是否存在"""
+        args = (field, json.dumps(patch, ensure_ascii=False))
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.zadd(self._heartbeats_key, {field: now})
+        pipe.evalsha(_MERGE_WORKER_SHA, 1, self._workers_key, *args)
+        zadd_result, merged = await pipe.execute(raise_on_error=False)
+        if isinstance(zadd_result, Exception):
+            raise zadd_result
+        if isinstance(merged, Exception):
+            if not is_noscript(merged):
+                raise merged
+            merged = await self._redis.eval(_MERGE_WORKER_LUA, 1, self._workers_key, *args)
+        return bool(merged)
+
 
 __all__ = [
     "WorkerRegistry",
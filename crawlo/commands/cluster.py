@@ -92,43 +92,38 @@ async def _show_state(project, spider, redis_url):
         print(f"[cluster state] 无法创建 Redis 客户端: {e}")
         sys.exit(1)
 
+    from crawlo.cluster.monitor import ClusterMonitor
+
     control_key = f"{ns}:control:state"
     leader_key = f"{ns}:cluster:leader"
-    workers_key = f"crawlo:{ns}:registry:workers"
-    heartbeats_key = f"crawlo:{ns}:registry:heartbeats"
 
-    # ---- 控制状态 ----
-    state = await r.get(control_key)
+    # ---- 控制状态 + 集群快照：两次往返，与 Worker / 消息数量无关 ----
+    pipe = r.pipeline(transaction=False)
+    pipe.get(control_key)
+    pipe.get(leader_key)
+    state, leader = await pipe.execute()
     if isinstance(state, bytes):
         state = state.decode("utf-8")
-    leader = await r.get(leader_key)
     if isinstance(leader, bytes):
         leader = leader.decode("utf-8")[:32] + ("..." if len(leader) > 32 else "")
-    alive_cnt = await r.zcard(heartbeats_key)
-    workers_cnt = await r.hlen(workers_key)
 
-    stream_main = f"{ns}:stream:tasks"
-    stream_high = f"{ns}:stream:tasks_high"
-    stream_failed = f"{ns}:stream:failed"
-    xlen_main = await r.xlen(stream_main)
-    xlen_high = await r.xlen(stream_high)
-    xlen_dead = await r.xlen(stream_failed)
+    snapshot = await ClusterMonitor.read_snapshot(
+        r, ClusterMonitor.snapshot_keys(f"{project}:{spider}"),
+    )
+    w, q, p = snapshot["workers"], snapshot["queue"], snapshot["progress"]
+    streams = q["streams"]
 
     print(f"[cluster] project={project} spider={spider} namespace={ns}")
     print(f"  control:state      = {state or '<running (no key)>'}")
     print(f"  cluster:leader     = {leader or '<none>'}")
-    print(f"  registry workers   = {workers_cnt} total / {alive_cnt} alive (heartbeats)")
-    print(f"  stream xlen        = main:{xlen_main}  high:{xlen_high}  dead_letter:{xlen_dead}")
-
-    # ---- XPENDING 概览（仅在有消息时执行，避免 INFO 级报错）----
-    try:
-        for sname, skey in (("main", stream_main), ("high", stream_high)):
-            if xlen_main or sname != "main":
-                pending = await r.xpending(skey)
-                if pending and pending.get("pending"):
-                    print(f"  pending[{sname}] total={pending['pending']}  consumers={list(pending.get('consumers', {}).keys())[:3]}")
-    except Exception as e:
-        logger.debug(f"XPENDING overview failed: {e}")
+    print(f"  registry workers   = {w['registered']} total / {w['total']} alive ({w['idle']} idle)")
+    print(f"  stream xlen        = main:{streams.get('main', {}).get('length', 0)}  "
+          f"high:{streams.get('high', {}).get('length', 0)}  dead_letter:{q['failed']}")
+    for sname, info in streams.items():
+        if info["pending"]:
+            print(f"  pending[{sname}] total={info['pending']}  consumers={info['consumers'][:3]}")
+    print(f"  progress           = {p['completed']} completed / {p['failed']} failed "
+          f"({p['items_per_sec']}/s, {p['elapsed']}s elapsed)")
 
     await r.aclose()
 
@@ -29,6 +29,41 @@ class CheckpointCoordinator:
     def __init__(self, settings: Any, logger: Optional[Any] = None):
         self._settings = settings
         self._logger = logger or get_logger('CheckpointCoordinator')
+        self._manager: Optional[CheckpointManager] = None
+
+    def _get_manager(self, spider_name: str) -> CheckpointManager:
+        """同一爬虫复用一个 CheckpointManager（增量模式的日志状态保存在其中）"""
+        if self._manager is None or self._manager.spider_name != spider_name:
+            self._manager = CheckpointManager(spider_name, self._settings)
+        return self._manager
+
+    def attach(self, spider: Any, scheduler: Any, resume: bool = True) -> bool:
+        """增量检查点（``CHECKPOINT_STORAGE = 'journal'``）：开始记录入队 / 出队 / 指纹日志。
+
+        须在恢复检查点与 start_requests 之前调用；不恢复时先清空旧日志，避免混入上次的待处理请求。
+
+        Returns:
+            bool: 是否已挂接
+        """
+        try:
+            checkpoint_mgr = self._get_manager(spider.name)
+            if not checkpoint_mgr.enabled or not checkpoint_mgr.attach(scheduler):
+                return False
+            if not resume:
+                checkpoint_mgr.storage.clear()
+            return True
+        except Exception as e:
+            self._logger.warning(f"Failed to attach checkpoint journal: {e}")
+            return False
+
+    async def detach(self, scheduler: Any) -> None:
+        """落盘剩余的增量日志并解除挂接（未挂接时为空操作）"""
+        if self._manager is None:
+            return
+        try:
+            await self._manager.detach(scheduler)
+        except Exception as e:
+            self._logger.warning(f"Failed to flush checkpoint journal: {e}")
 
     async def resume_from_checkpoint(self, spider: Any, scheduler: Any) -> bool:
         """尝试从检查点恢复爬取状态。
@@ -43,7 +78,7 @@ class CheckpointCoordinator:
             bool: 是否成功从检查点恢复
         """
         try:
-            checkpoint_mgr = CheckpointManager(spider.name, self._settings)
+            checkpoint_mgr = self._get_manager(spider.name)
             if not checkpoint_mgr.enabled or not await checkpoint_mgr.has_checkpoint():
                 return False
 
@@ -51,28 +86,36 @@ class CheckpointCoordinator:
             if checkpoint is None:
                 return False
 
-            # 恢复请求到调度器
-            requests_data = checkpoint.get('requests', [])
-            restored_count = 0
-            for req_data in requests_data:
+            # 恢复请求到调度器（增量存储为流式读取）
+            restored_count = total_count = 0
+            for key, req_data in checkpoint_mgr.iter_pending_requests(checkpoint):
+                total_count += 1
                 try:
                     request = checkpoint_mgr.restore_request(req_data, spider)
                     if request and scheduler is not None:
                         # 设置 dont_filter=True 避免被过滤器拦截
                         request.dont_filter = True
-                        await scheduler.enqueue_request(request)
+                        checkpoint_mgr.track_restored(request, key)
+                        enqueued = False
+                        try:
+                            enqueued = await scheduler.enqueue_request(request)
+                        finally:
+                            if enqueued is False:
+                                checkpoint_mgr.track_restored(request, None)
                         restored_count += 1
                 except Exception as e:
                     self._logger.debug(f"Failed to restore request: {e}")
 
-            # 恢复去重指纹
-            fingerprints = checkpoint.get('fingerprints', set())
-            if fingerprints and scheduler is not None:
-                checkpoint_mgr.restore_fingerprints(fingerprints, scheduler)
+            # 恢复去重指纹（分批）
+            fingerprint_count = 0
+            for fingerprints in checkpoint_mgr.iter_fingerprint_batches(checkpoint):
+                fingerprint_count += len(fingerprints)
+                if scheduler is not None:
+                    checkpoint_mgr.restore_fingerprints(fingerprints, scheduler)
 
             # 关键修复：只有当真的恢复了请求 OR 恢复了指纹时才算恢复成功
             # 否则（空 checkpoint：0 请求、0 指纹）应返回 False，让 start_requests 正常执行
-            if restored_count == 0 and not fingerprints:
+            if restored_count == 0 and not fingerprint_count:
                 self._logger.info(
                     "Checkpoint file exists but no requests/fingerprints to restore, "
                     "treating as no-resume so start_requests will execute normally"
@@ -80,8 +123,8 @@ class CheckpointCoordinator:
                 return False
 
             self._logger.info(
-                f"Resumed from checkpoint: {restored_count}/{len(requests_data)} requests restored, "
-                f"{len(fingerprints)} fingerprints recovered"
+                f"Resumed from checkpoint: {restored_count}/{total_count} requests restored, "
+                f"{fingerprint_count} fingerprints recovered"
             )
             return True
 
@@ -106,15 +149,14 @@ class CheckpointCoordinator:
         """
         try:
             spider_name = spider.name if spider else 'unknown'
-            checkpoint_mgr = CheckpointManager(spider_name, self._settings)
+            checkpoint_mgr = self._get_manager(spider_name)
 
             if not checkpoint_mgr.enabled:
                 return
 
-            if not save_on_signal:
-                return
-
-            await checkpoint_mgr.save(scheduler, stats)
+            if save_on_signal:
+                await checkpoint_mgr.save(scheduler, stats)
+            await self.detach(scheduler)
 
         except Exception as e:
             self._logger.warning(f"Failed to save checkpoint on shutdown: {e}")
@@ -127,7 +169,7 @@ class CheckpointCoordinator:
         """
         try:
             spider_name = spider.name if spider else 'unknown'
-            checkpoint_mgr = CheckpointManager(spider_name, self._settings)
+            checkpoint_mgr = self._get_manager(spider_name)
 
             if checkpoint_mgr.enabled:
                 await checkpoint_mgr.clear()
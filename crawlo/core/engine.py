@@ -51,13 +51,14 @@ from crawlo.core.engine_helpers import (
 
 # 组合模式的 Coordinator / Dispatcher
 from crawlo.core.engine_distributed import DistributedCoordinator
-from crawlo.core.engine_dispatch import RequestDispatcher
+from crawlo.core.engine_dispatch import RequestDispatcher, SlotDispatcher
 
 __all__ = [
     'Engine',
     'RequestGenerationMixin',
     'DistributedCoordinator',
     'RequestDispatcher',
+    'SlotDispatcher',
     'resolve_start_requests',
     'process_callback_output',
     'GenerationStats',
@@ -262,6 +263,7 @@ class Engine(RequestGenerationMixin, ClusterMixin):
         self.engine_start()
         await self._init_cluster()
 
+        self._checkpoint.attach(spider, self.scheduler, resume)
         checkpoint_resumed = False
         if resume:
             checkpoint_resumed = await self._checkpoint.resume_from_checkpoint(spider, self.scheduler)
@@ -367,6 +369,8 @@ class Engine(RequestGenerationMixin, ClusterMixin):
     async def _crawl(self, request):
         async def crawl_task():
             start_time = time.time()
+            response_time = None
+            failed = False
             try:
                 outputs = await self._fetch(request)
                 response_time = time.time() - start_time
@@ -410,11 +414,16 @@ class Engine(RequestGenerationMixin, ClusterMixin):
 
                 await _ack_message(request, self, success=False, error=e)
 
+                failed = True
                 if ErrorClassifier.is_critical(e):
                     self.logger.critical(f"遇到关键错误，停止爬虫: {type(e).__name__}: {e}")
                     raise
 
                 return None
+            finally:
+                if response_time is None:
+                    response_time = time.time() - start_time
+                self._request_done(request, response_time, failed)
 
         if self.task_manager:
             coro = crawl_task()
@@ -425,10 +434,18 @@ class Engine(RequestGenerationMixin, ClusterMixin):
                     self.logger.info("爬取任务被取消")
                     self._cancel_logged = True
                 coro.close()
+                self._request_done(request, 0.0, False)
                 raise
             except Exception as e:
                 self.logger.error(f"创建爬取任务时发生错误: {e}")
                 coro.close()
+                self._request_done(request, 0.0, False)
+
+    def _request_done(self, request, elapsed: float, failed: bool) -> None:
+        """请求处理结束（含未能创建任务）：通知派发器释放按请求占用的资源（如域名槽位）"""
+        dispatcher = getattr(self, '_dispatcher', None)
+        if dispatcher is not None:
+            dispatcher.request_done(request, elapsed, failed)
 
     async def _fetch(self, request):
         if self.spider is None:
@@ -467,6 +484,23 @@ class Engine(RequestGenerationMixin, ClusterMixin):
         else:
             self.logger.warning("Scheduler 未初始化，无法入队请求")
 
+    async def enqueue_requests(self, requests):
+        """批量入队（整批去重一次往返，见 Scheduler.enqueue_requests）"""
+        if self.scheduler is None:
+            self.logger.warning("Scheduler 未初始化，无法入队请求")
+            return
+        if not hasattr(self.scheduler, 'enqueue_requests'):
+            for request in requests:
+                await self._schedule_request(request)
+            return
+        results = await self.scheduler.enqueue_requests(requests)
+        scheduled = [request for request, ok in zip(requests, results) if ok]
+        if scheduled:
+            self._request_available.set()
+            if self.crawler is not None and self.crawler.spider is not None:
+                for request in scheduled:
+                    self._create_background_task(self.crawler.subscriber.notify(CrawlerEvent.REQUEST_SCHEDULED, request, self.crawler.spider))
+
     async def _schedule_request(self, request):
         if self.scheduler is not None and await self.scheduler.enqueue_request(request):
             self._request_available.set()
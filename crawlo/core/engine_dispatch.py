@@ -6,6 +6,8 @@ Engine 调度派发子模块（组合模式）
 RequestDispatcher 封装 Engine 的主循环与请求派发逻辑，将「调度算法」从 Engine 骨架中解耦：
 - 主循环 _run_main_loop()            → run_main_loop()
 - 派发请求 _dispatch_requests()       → dispatch_requests()
+- 槽位式派发（可选）                   → SlotDispatcher（ENGINE_DISPATCHER_CLASS 选择）
+- 按主机分槽位派发（可选）             → DomainSlotDispatcher（per-host 并发 / 延迟 / AIMD）
 - 组件空闲检查 / 退出判断              → check_components_idle() / should_exit() / check_all_idle() / exit_fast()
 
 Engine 主骨架保留同名薄代理方法，对外签名 100% 兼容。
@@ -13,10 +15,11 @@ Engine 主骨架保留同名薄代理方法，对外签名 100% 兼容。
 from __future__ import annotations
 
 import asyncio
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Dict, Optional
 
 from crawlo.utils.misc import safe_get_config
 from crawlo.core.engine_helpers import has_pending_enqueues
+from crawlo.core.scheduling.domain_slots import DomainSlot, DomainSlots
 
 if TYPE_CHECKING:
     from crawlo.core.engine import Engine
@@ -31,6 +34,9 @@ class RequestDispatcher:
       3. 所有退出相关的组件 idle 一致性检查（standalone / auto 模式的正常退出判据）。
     """
 
+    # 为 True 时空闲等待改走 wait_for_work()（子类可同时等待在途任务完成信号）
+    wakes_on_completion = False
+
     def __init__(self, engine: "Engine"):
         self.engine = engine
         self._logger = engine.logger
@@ -66,12 +72,7 @@ class RequestDispatcher:
                     continue
 
             # 批量获取请求
-            requests = []
-            for _ in range(batch_size):
-                if request := await engine._get_next_request():
-                    requests.append(request)
-                else:
-                    break
+            requests = await self.next_batch(batch_size, max_inflight)
 
             if requests:
                 idle_count = 0
@@ -80,7 +81,8 @@ class RequestDispatcher:
             else:
                 idle_count += 1
                 run_mode = safe_get_config(self._settings, 'RUN_MODE', 'standalone')
-                if run_mode == 'distributed' and self._start_requests_source() is None:
+                if (run_mode == 'distributed' and self._start_requests_source() is None
+                        and not self.has_deferred()):
                     if await engine._handle_distributed_idle(idle_count):
                         break
                     continue
@@ -102,6 +104,10 @@ class RequestDispatcher:
 
             if requests:
                 await asyncio.sleep(0.000001)
+            elif self.wakes_on_completion:
+                if await self.wait_for_work(idle_count):
+                    # 在途任务已全部完成：下一轮立即复查退出条件，不等检查周期
+                    last_exit_check = loop_count - exit_check_interval
             else:
                 try:
                     await asyncio.wait_for(
@@ -114,6 +120,24 @@ class RequestDispatcher:
 
         self._logger.debug(f"主爬取循环结束，总共执行了 {loop_count} 次")
 
+    def has_deferred(self) -> bool:
+        """是否有已出队、暂缓派发的请求（DomainSlotDispatcher 覆写）"""
+        return False
+
+    def request_done(self, request, elapsed: float, failed: bool) -> None:
+        """单个请求处理结束的回调（Engine._crawl 调用；基类无操作）"""
+
+    async def next_batch(self, batch_size: int, max_inflight: int) -> list:
+        """逐个 ``_get_next_request()`` 取出至多 batch_size 个请求（子类可覆写为批量出队）"""
+        engine = self.engine
+        requests = []
+        for _ in range(batch_size):
+            if request := await engine._get_next_request():
+                requests.append(request)
+            else:
+                break
+        return requests
+
     # ------------------------------------------------------------------
     # 派发（对应旧 Engine._dispatch_requests）
     # ------------------------------------------------------------------
@@ -206,4 +230,257 @@ class RequestDispatcher:
         return False, current_states
 
 
-__all__ = ['RequestDispatcher']
+class SlotGate:
+    """完成信号驱动的容量闸门。
+
+    替代 ``len(engine._background_tasks) >= max_inflight`` + ``sleep(0.01)`` 轮询：
+    派发时 ``occupy(task)`` 占用一个槽位，任务结束的 done_callback 释放槽位并
+    唤醒等待者，满载时协程挂在 Event 上而不是定时醒来检查。
+    """
+
+    __slots__ = ('capacity', '_inflight', '_freed')
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, capacity)
+        self._inflight = 0
+        self._freed = asyncio.Event()
+
+    @property
+    def inflight(self) -> int:
+        return self._inflight
+
+    @property
+    def free(self) -> int:
+        return max(0, self.capacity - self._inflight)
+
+    async def wait_for_slot(self) -> None:
+        """等待至少一个空闲槽位（有空位时立即返回，不让出事件循环）"""
+        while self._inflight >= self.capacity:
+            self._freed.clear()
+            await self._freed.wait()
+
+    def occupy(self, task: "asyncio.Future") -> None:
+        """占用一个槽位，task 完成时自动释放"""
+        self._inflight += 1
+        task.add_done_callback(self._release)
+
+    def _release(self, _task) -> None:
+        self._inflight -= 1
+        self._freed.set()
+
+
+class SlotDispatcher(RequestDispatcher):
+    """槽位式请求派发器（事件驱动，替代轮询流控）。
+
+    与 RequestDispatcher 的区别：
+      1. 在途上限由 SlotGate 控制，满载时等待任务完成信号，不再 10ms 轮询；
+      2. 每轮只按空闲槽位数通过 ``Scheduler.next_requests()`` 批量出队，
+         内存队列一次排空，不再为每个请求单独 await 一次 0.01s 超时出队。
+
+    启用方式::
+
+        ENGINE_DISPATCHER_CLASS = 'crawlo.core.engine_dispatch.SlotDispatcher'
+    """
+
+    wakes_on_completion = True
+
+    def __init__(self, engine: "Engine"):
+        super().__init__(engine)
+        self._gate: Optional[SlotGate] = None
+
+    def _get_gate(self, max_inflight: int) -> SlotGate:
+        if self._gate is None:
+            self._gate = SlotGate(max_inflight)
+        else:
+            self._gate.capacity = max(1, max_inflight)
+        return self._gate
+
+    async def next_batch(self, batch_size: int, max_inflight: int) -> list:
+        gate = self._get_gate(max_inflight)
+        await gate.wait_for_slot()
+        count = min(batch_size, gate.free)
+        scheduler = self.engine.scheduler
+        if scheduler is not None and hasattr(scheduler, 'next_requests'):
+            return await scheduler.next_requests(count)
+        return await super().next_batch(count, max_inflight)
+
+    async def wait_for_work(self, idle_count: int, timeout: Optional[float] = None, extra_events=()) -> bool:
+        """同时等待「新请求入队」与「在途任务全部完成」两个信号（带超时兜底）
+
+        在途任务结束后不必再等 0.1/0.5s 超时才进入退出检查。
+
+        Args:
+            idle_count: 连续空闲轮数（决定默认超时 0.1/0.5s）
+            timeout: 覆盖默认超时
+            extra_events: 额外的唤醒事件（子类使用）
+
+        Returns:
+            True 表示等待期间在途任务全部完成，主循环应立即复查退出条件
+        """
+        task_manager = self.engine.task_manager
+        available = self._request_available()
+        waiters = [asyncio.ensure_future(available.wait())]
+        waiters.extend(asyncio.ensure_future(event.wait()) for event in extra_events)
+        watch_done = task_manager is not None and not task_manager.all_done()
+        if task_manager is not None and watch_done:
+            waiters.append(asyncio.ensure_future(task_manager.wait_all_done()))
+        if timeout is None:
+            timeout = 0.5 if idle_count > 10 else 0.1
+        try:
+            await asyncio.wait(
+                waiters,
+                timeout=timeout,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+        if available.is_set():
+            available.clear()
+            return False
+        return watch_done and task_manager is not None and task_manager.all_done()
+
+    async def dispatch_requests(self, requests, max_inflight):
+        """按槽位派发请求：满载时等待完成信号"""
+        engine = self.engine
+        gate = self._get_gate(max_inflight)
+        self._request_available().clear()
+        for req in requests:
+            if gate.inflight >= gate.capacity:
+                if not getattr(engine, '_fc_logged', False):
+                    self._logger.debug(
+                        f"[流控] 在途={gate.inflight}/{gate.capacity}，等待槽位释放后派发"
+                    )
+                    engine._fc_logged = True
+                await gate.wait_for_slot()
+            else:
+                engine._fc_logged = False
+            gate.occupy(engine._create_background_task(engine._crawl(req)))
+
+
+class DomainSlotDispatcher(SlotDispatcher):
+    """按主机分槽位的请求派发器（per-host 并发 / 延迟 / AIMD 自动限速）。
+
+    在 SlotDispatcher 的全局槽位之上，每个请求派发前先经 ``DomainSlots`` 准入：
+      1. 主机并发已满或未到启动间隔 → 请求暂存于该主机的等待队列，
+         不创建任务、不占用 TaskManager 全局并发，其它主机照常派发；
+      2. 请求结束（``request_done``）释放主机槽位，开启 autothrottle 时按 AIMD 调整该主机并发；
+      3. 分布式模式下 ``DistributedRateLimiter`` 启用时，准入前向令牌桶申请令牌，
+         被拒绝的请求按返回的等待时间延后，不阻塞主循环。
+
+    主机延迟由本派发器负责（``DOMAIN_SLOT_DELAY``，未配置时沿用 ``DOWNLOAD_DELAY`` /
+    ``RANDOMNESS`` / ``DOWNLOAD_DELAY_OVERRIDES``），DownloadDelayMiddleware 对已准入请求不再 sleep。
+
+    启用方式::
+
+        ENGINE_DISPATCHER_CLASS = 'crawlo.core.engine_dispatch.DomainSlotDispatcher'
+        DOMAIN_SLOT_CONCURRENCY = 4
+        DOMAIN_SLOT_AUTOTHROTTLE = True
+    """
+
+    def __init__(self, engine: "Engine"):
+        super().__init__(engine)
+        settings = self._settings
+        delay = safe_get_config(settings, 'DOMAIN_SLOT_DELAY', None)
+        if delay is None:
+            delay = safe_get_config(settings, 'DOWNLOAD_DELAY', 0.0, float)
+        random_range = safe_get_config(settings, 'RANDOM_RANGE', None) or (0.5, 1.5)
+        self.slots = DomainSlots(
+            concurrency=safe_get_config(settings, 'DOMAIN_SLOT_CONCURRENCY', 8, int),
+            delay=float(delay),
+            randomize=safe_get_config(settings, 'RANDOMNESS', False, bool),
+            random_range=(float(random_range[0]), float(random_range[1])),
+            delay_overrides=safe_get_config(settings, 'DOWNLOAD_DELAY_OVERRIDES', None) or {},
+            autothrottle=safe_get_config(settings, 'DOMAIN_SLOT_AUTOTHROTTLE', False, bool),
+            target_latency=safe_get_config(settings, 'DOMAIN_SLOT_TARGET_LATENCY', 2.0, float),
+        )
+        self.max_deferred = safe_get_config(settings, 'DOMAIN_SLOT_MAX_DEFERRED', 10000, int)
+        # id(request) → 已占用的槽位（request_done 时释放）
+        self._started: Dict[int, DomainSlot] = {}
+        self._slot_freed = asyncio.Event()
+
+    def has_deferred(self) -> bool:
+        return self.slots.deferred_count > 0
+
+    def request_done(self, request, elapsed: float, failed: bool) -> None:
+        slot = self._started.pop(id(request), None)
+        if slot is None:
+            return
+        self.slots.release(slot, elapsed, failed)
+        if slot.deferred:
+            self._slot_freed.set()
+
+    async def next_batch(self, batch_size: int, max_inflight: int) -> list:
+        """先取等待队列中已可启动的请求，再按剩余空位从调度器出队
+
+        等待请求达到 DOMAIN_SLOT_MAX_DEFERRED 时暂停从调度器出队（背压）。
+        """
+        gate = self._get_gate(max_inflight)
+        await gate.wait_for_slot()
+        count = min(batch_size, gate.free)
+        ready = self.slots.pop_ready(count)
+        for request in ready:
+            self._started[id(request)] = self.slots.slot_for(request)
+        room = count - len(ready)
+        if room > 0 and self.slots.deferred_count < self.max_deferred:
+            ready.extend(await super().next_batch(room, max_inflight))
+        return ready
+
+    async def _admit(self, request) -> Optional[DomainSlot]:
+        """准入：返回已占用的槽位；主机忙碌 / 令牌不足时请求进入等待队列并返回 None"""
+        slot = self._started.get(id(request))
+        if slot is None:
+            slot = self.slots.slot_for(request)
+            if not self.slots.admit(slot, request):
+                return None
+            self._started[id(request)] = slot
+        rate_limiter = self._cluster_state.rate_limiter
+        if rate_limiter is not None and rate_limiter.enabled and slot.key:
+            wait = await rate_limiter.reserve(slot.key)
+            if wait > 0:
+                del self._started[id(request)]
+                self.slots.postpone(slot, request, wait)
+                return None
+        return slot
+
+    async def wait_for_work(self, idle_count: int, timeout: Optional[float] = None, extra_events=()) -> bool:
+        """空闲等待额外监听「主机槽位释放」，超时不超过最近一个主机延迟到期时间"""
+        if timeout is None:
+            timeout = 0.5 if idle_count > 10 else 0.1
+        next_ready = self.slots.next_ready_in()
+        if next_ready is not None:
+            timeout = min(timeout, next_ready)
+        try:
+            return await super().wait_for_work(
+                idle_count, timeout=timeout, extra_events=(self._slot_freed, *extra_events)
+            )
+        finally:
+            self._slot_freed.clear()
+
+    async def dispatch_requests(self, requests, max_inflight):
+        """按主机槽位准入后派发；被暂缓的请求留在槽位等待队列"""
+        engine = self.engine
+        gate = self._get_gate(max_inflight)
+        self._request_available().clear()
+        for req in requests:
+            slot = await self._admit(req)
+            if slot is None:
+                continue
+            req.meta['_domain_slot'] = slot.key
+            if gate.inflight >= gate.capacity:
+                await gate.wait_for_slot()
+            gate.occupy(engine._create_background_task(engine._crawl(req)))
+
+    async def exit_fast(self) -> bool:
+        return not self.has_deferred() and await super().exit_fast()
+
+    async def should_exit(self, last_component_states=None) -> tuple[bool, Optional[tuple]]:
+        if self.has_deferred():
+            return False, last_component_states
+        return await super().should_exit(last_component_states)
+
+    def get_stats(self) -> dict:
+        return self.slots.get_stats()
+
+
+__all__ = ['RequestDispatcher', 'SlotDispatcher', 'SlotGate', 'DomainSlotDispatcher']
@@ -17,6 +17,7 @@ from crawlo import Request, Item
 from crawlo.event import CrawlerEvent
 from crawlo.core.errors import OutputError
 from crawlo.core.engine_helpers import _as_item
+from crawlo.utils.misc import safe_get_config
 
 __all__ = ['RequestGenerationMixin']
 
@@ -32,6 +33,7 @@ class RequestGenerationMixin:
     _backpressure_ctrl: Any
     logger: Any
     running: bool
+    settings: Any
 
     async def enqueue_request(self, request, **kwargs):  # 由 Engine 提供
         raise NotImplementedError
@@ -269,23 +271,41 @@ class RequestGenerationMixin:
 
         if self.processor is None:
             return
-        async for spider_output in outputs:
-            if isinstance(spider_output, Request):
-                # 框架级 depth 传播：子请求 depth = 父请求 depth + 1
-                # 仅在子请求未手动设置 depth 时自动注入
-                if 'depth' not in spider_output.meta:
-                    spider_output.meta['depth'] = parent_depth + 1
-                await self.processor.enqueue(spider_output)
-            elif isinstance(spider_output, Item):
-                await self.processor.enqueue(spider_output)
-            elif isinstance(spider_output, Exception):
-                if self.crawler is not None and self.spider is not None:
-                    self._create_background_task(
-                        self.crawler.subscriber.notify(CrawlerEvent.SPIDER_ERROR, spider_output, self.spider)
-                    )
-                raise spider_output
-            else:
-                raise OutputError(f'{type(self.spider)} must return `Request` or `Item`.')
+        # ENQUEUE_BATCH_SIZE > 1：连续产出的 Request 攒批后一次去重入队
+        batch_size = safe_get_config(getattr(self, 'settings', None), 'ENQUEUE_BATCH_SIZE', 1, int)
+        pending = []
+        try:
+            async for spider_output in outputs:
+                if isinstance(spider_output, Request):
+                    # 框架级 depth 传播：子请求 depth = 父请求 depth + 1
+                    # 仅在子请求未手动设置 depth 时自动注入
+                    if 'depth' not in spider_output.meta:
+                        spider_output.meta['depth'] = parent_depth + 1
+                    if batch_size <= 1:
+                        await self.processor.enqueue(spider_output)
+                        continue
+                    pending.append(spider_output)
+                    if len(pending) >= batch_size:
+                        await self.processor.enqueue_requests(pending)
+                        pending = []
+                    continue
+                # 非 Request 输出前先冲刷已攒的请求，保持产出顺序
+                if pending:
+                    await self.processor.enqueue_requests(pending)
+                    pending = []
+                if isinstance(spider_output, Item):
+                    await self.processor.enqueue(spider_output)
+                elif isinstance(spider_output, Exception):
+                    if self.crawler is not None and self.spider is not None:
+                        self._create_background_task(
+                            self.crawler.subscriber.notify(CrawlerEvent.SPIDER_ERROR, spider_output, self.spider)
+                        )
+                    raise spider_output
+                else:
+                    raise OutputError(f'{type(self.spider)} must return `Request` or `Item`.')
+        finally:
+            if pending:
+                await self.processor.enqueue_requests(pending)
 
     async def _handle_errback_output(self, result, parent_request=None):
         """
@@ -12,6 +12,8 @@ Core improvements:
 - Changed from blocking to continuous monitoring mode
 - Supports background task execution
 - Added graceful shutdown mechanism
+- Batch mode (PROCESSOR_BATCH_MODE): drains up to PROCESSOR_BATCH_SIZE results per wakeup,
+  hands consecutive items to ``PipelineManager.process_items`` and updates counters without locks
 """
 import asyncio
 from asyncio import Queue
@@ -57,7 +59,7 @@ class Processor:
         # Shutdown
         await processor.stop()
     """
-    
+
     def __init__(self, crawler):
         """
         Initialize processor
@@ -70,6 +72,8 @@ class Processor:
         self.crawler = crawler
         self.queue: Queue = Queue()
         self.pipelines = None
+        # PIPELINE_SINKS 配置的终端管道（open() 后赋值）：队列未写完时不算空闲
+        self._sinks: tuple = ()
         self.logger = get_logger(self.__class__.__name__)
         
         # Async-safe lock
@@ -92,13 +96,17 @@ class Processor:
         self._processing_counter = 0
         
         # Configuration - use safe_get_config instead of getattr chain
-        self._batch_size = safe_get_config(crawler.settings, 'PROCESSOR_BATCH_SIZE', 10, int)
+        self._batch_mode: bool = safe_get_config(crawler.settings, 'PROCESSOR_BATCH_MODE', False, bool)
+        self._batch_size = max(safe_get_config(crawler.settings, 'PROCESSOR_BATCH_SIZE', 100, int), 1)
         self._timeout = safe_get_config(crawler.settings, 'PROCESSOR_TIMEOUT', 1.0, float)
+        # 批量模式：不足一批的剩余数据由该任务在生产者让出事件循环后处理
+        self._flush_task: Optional[asyncio.Task] = None
     
     async def open(self) -> None:
         """Initialize processor"""
         from crawlo.pipelines.manager import PipelineManager
         self.pipelines = await PipelineManager.from_crawler(self.crawler)
+        self._sinks = tuple(self.pipelines.sinks)
         
         # Call open_spider method of all pipelines (if exists)
         if self.crawler.spider and hasattr(self.pipelines, 'pipelines'):
@@ -152,7 +160,10 @@ class Processor:
                     # 超时后继续检查停止信号
                     continue
                 
-                await self._handle_result(result)
+                if self._batch_mode:
+                    await self._handle_batch(self._take_batch([result]))
+                else:
+                    await self._handle_result(result)
                 
             except asyncio.CancelledError:
                 self.logger.debug("Processor cancelled")
@@ -218,6 +229,9 @@ class Processor:
     
     async def _drain_queue(self) -> None:
         """排空队列中的剩余项"""
+        if self._batch_mode:
+            await self._drain_batches()
+            return
         while True:
             try:
                 result = self.queue.get_nowait()
@@ -263,15 +277,49 @@ class Processor:
         await self.queue.put(output)
         
         # 如果处理器未运行，启动一次性处理
-        if self._state == ProcessorState.IDLE:
+        if self._state != ProcessorState.IDLE:
+            return
+        if not self._batch_mode or self.queue.qsize() >= self._batch_size:
             await self.process_once()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._deferred_flush())
     
+    async def enqueue_requests(self, requests: list) -> None:
+        """
+        批量提交 Request（整批交给 ``engine.enqueue_requests`` 一次去重）
+
+        Args:
+            requests: Request 列表
+        """
+        if not requests:
+            return
+        async with self._lock:
+            processing_id = self._processing_counter
+            self._processing_counter += 1
+            self._processing[processing_id] = requests
+
+        try:
+            await self.crawler.engine.enqueue_requests(requests)
+            async with self._lock:
+                self._request_count += len(requests)
+                self._processed_count += len(requests)
+        except Exception as e:
+            async with self._lock:
+                self._error_count += 1
+            self.logger.error(f"Error processing {len(requests)} requests: {e}")
+        finally:
+            async with self._lock:
+                self._processing.pop(processing_id, None)
+
     async def process_once(self) -> None:
         """
         一次性处理队列中的所有数据
         
         处理完当前队列中的所有数据后返回。
         """
+        if self._batch_mode:
+            await self._drain_batches()
+            return
         while True:
             try:
                 result = self.queue.get_nowait()
@@ -279,6 +327,75 @@ class Processor:
             except asyncio.QueueEmpty:
                 break
     
+    # ------------------------------------------------------------------
+    # 批量模式（单协程事件循环内执行，计数不加锁）
+    # ------------------------------------------------------------------
+
+    def _take_batch(self, batch: list) -> list:
+        """用 get_nowait 从队列补足至多 _batch_size 条"""
+        queue = self.queue
+        limit = self._batch_size
+        while len(batch) < limit and not queue.empty():
+            batch.append(queue.get_nowait())
+        return batch
+
+    async def _drain_batches(self) -> None:
+        while not self.queue.empty():
+            await self._handle_batch(self._take_batch([]))
+
+    async def _deferred_flush(self) -> None:
+        try:
+            await self._drain_batches()
+        except Exception as e:
+            self._error_count += 1
+            self.logger.error(f"Error flushing processor batch: {e}")
+        finally:
+            self._flush_task = None
+
+    async def _handle_batch(self, batch: list) -> None:
+        """
+        处理一批结果：连续的 Item 整批交给管道，Request 按产出顺序逐个入队
+
+        Args:
+            batch: Request / Item 列表
+        """
+        processing_id = self._processing_counter
+        self._processing_counter += 1
+        self._processing[processing_id] = batch
+        items = []
+        try:
+            for result in batch:
+                if isinstance(result, Item):
+                    items.append(result)
+                    continue
+                if items:
+                    await self._process_items(items)
+                    items = []
+                try:
+                    if isinstance(result, Request):
+                        await self.crawler.engine.enqueue_request(result)
+                        self._request_count += 1
+                    else:
+                        self.logger.warning(f"Unknown result type: {type(result)}")
+                    self._processed_count += 1
+                except Exception as e:
+                    self._error_count += 1
+                    self.logger.error(f"Error processing {result}: {e}")
+            if items:
+                await self._process_items(items)
+        finally:
+            self._processing.pop(processing_id, None)
+
+    async def _process_items(self, items: list) -> None:
+        try:
+            errors = await self.pipelines.process_items(items)
+        except Exception as e:
+            errors = len(items)
+            self.logger.error(f"Error processing {len(items)} items: {e}")
+        self._item_count += len(items) - errors
+        self._processed_count += len(items) - errors
+        self._error_count += errors
+
     async def idle_async(self) -> bool:
         """
         异步安全地检查处理器是否空闲
@@ -287,7 +404,10 @@ class Processor:
             bool: 是否空闲
         """
         async with self._lock:
-            return len(self._processing) == 0 and self.queue.empty()
+            if self._processing or not self.queue.empty():
+                return False
+        # 未经 __init__ 构造（测试中直接 __new__）时没有 _sinks，视为没有终端管道
+        return not any(sink.pending for sink in getattr(self, '_sinks', ()))
     
     async def close(self) -> None:
         """
@@ -0,0 +1,268 @@
+#!/usr/bin/python
+# -*- coding:UTF-8 -*-
+"""
+域名槽位（per-host 并发 / 延迟 / AIMD 自动限速）
+================================================
+全局并发由 TaskManager 控制；DomainSlots 在派发前按主机名分槽位：
+
+- 并发：每个主机同时在途的请求数不超过 ``concurrency``
+- 延迟：同一主机相邻两次启动间隔不小于 ``delay``（支持随机化、按域名覆盖）
+- AIMD：开启 autothrottle 时，慢响应/失败将槽位并发减半，
+  连续一轮（= 当前并发数）快速完成后并发 +1
+
+主机忙碌时请求进入该槽位的等待队列（不占用全局并发），
+槽位释放或延迟到期后由 ``pop_ready()`` 按 FIFO 取出。
+
+使用示例：
+    slots = DomainSlots(concurrency=4, delay=0.5)
+    slot = slots.slot_for(request)
+    if slots.admit(slot, request):
+        ...            # 立即派发
+    slots.release(slot, elapsed=0.8, failed=False)
+    ready = slots.pop_ready(limit=10)
+"""
+import heapq
+import time
+from collections import deque
+from random import uniform
+from typing import Deque, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+
+# 槽位空闲超过该时间（秒）且无在途/等待请求时可被回收
+SLOT_IDLE_TTL = 60.0
+# 槽位数超过该值时才触发回收扫描
+SLOT_SWEEP_THRESHOLD = 1024
+
+
+class DomainSlot:
+    """单个主机的槽位状态"""
+
+    __slots__ = (
+        'key', 'concurrency', 'max_concurrency', 'delay', 'active', 'next_start',
+        'last_seen', 'deferred', 'scheduled', '_fast_streak', '_last_decrease',
+    )
+
+    def __init__(self, key: str, concurrency: int, delay: float):
+        self.key = key
+        self.concurrency = concurrency
+        self.max_concurrency = concurrency
+        self.delay = delay
+        self.active = 0
+        self.next_start = 0.0
+        self.last_seen = time.monotonic()
+        self.deferred: Deque = deque()
+        self.scheduled = False          # 已在 runnable 队列或定时堆中
+        self._fast_streak = 0
+        self._last_decrease = float('-inf')
+
+    def can_start(self, now: float) -> bool:
+        return self.active < self.concurrency and now >= self.next_start
+
+    def __repr__(self) -> str:
+        return (f"<DomainSlot {self.key} active={self.active}/{self.concurrency} "
+                f"delay={self.delay} deferred={len(self.deferred)}>")
+
+
+class DomainSlots:
+    """
+    按主机名分配的下载槽位集合
+
+    Args:
+        concurrency: 每主机最大并发
+        delay: 每主机启动间隔（秒）
+        randomize: 是否在 ``random_range`` 范围内随机化延迟
+        random_range: 随机延迟系数范围
+        delay_overrides: 按域名覆盖延迟，支持 ``*.example.com`` 通配
+        autothrottle: 是否启用 AIMD 自动调整每主机并发
+        target_latency: AIMD 目标耗时（秒），超过视为拥塞
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 8,
+        delay: float = 0.0,
+        randomize: bool = False,
+        random_range: Tuple[float, float] = (0.5, 1.5),
+        delay_overrides: Optional[Dict[str, float]] = None,
+        autothrottle: bool = False,
+        target_latency: float = 2.0,
+    ):
+        self.concurrency = max(1, concurrency)
+        self.delay = max(0.0, delay)
+        self.randomize = randomize
+        self.random_range = random_range
+        self.delay_overrides = delay_overrides or {}
+        self.autothrottle = autothrottle
+        self.target_latency = target_latency
+
+        self._slots: Dict[str, DomainSlot] = {}
+        self._runnable: Deque[DomainSlot] = deque()
+        self._timers: List[Tuple[float, int, DomainSlot]] = []
+        self._timer_seq = 0
+        self._last_sweep = time.monotonic()
+        self.deferred_count = 0
+
+    # ------------------------------------------------------------------
+    # 槽位查找
+    # ------------------------------------------------------------------
+    @staticmethod
+    def slot_key(request) -> str:
+        """槽位 key：``meta['download_slot']`` 优先，否则为主机名"""
+        meta = getattr(request, 'meta', None) or {}
+        key = meta.get('download_slot')
+        if key:
+            return str(key)
+        return urlparse(request.url).hostname or ''
+
+    def _delay_for(self, key: str) -> float:
+        if key in self.delay_overrides:
+            return float(self.delay_overrides[key])
+        for pattern, delay in self.delay_overrides.items():
+            if pattern.startswith('*.') and key.endswith(pattern[2:]):
+                return float(delay)
+        return self.delay
+
+    def slot_for(self, request) -> DomainSlot:
+        key = self.slot_key(request)
+        slot = self._slots.get(key)
+        if slot is None:
+            if len(self._slots) >= SLOT_SWEEP_THRESHOLD:
+                self._sweep()
+            slot = DomainSlot(key, self.concurrency, self._delay_for(key))
+            self._slots[key] = slot
+        return slot
+
+    def get(self, key: str) -> Optional[DomainSlot]:
+        return self._slots.get(key)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    # ------------------------------------------------------------------
+    # 准入 / 等待 / 释放
+    # ------------------------------------------------------------------
+    def admit(self, slot: DomainSlot, request, now: Optional[float] = None) -> bool:
+        """槽位空闲且无排队请求时占用槽位并返回 True，否则加入等待队列"""
+        now = time.monotonic() if now is None else now
+        if not slot.deferred and slot.can_start(now):
+            self.start(slot, now)
+            return True
+        self.defer(slot, request, now)
+        return False
+
+    def start(self, slot: DomainSlot, now: Optional[float] = None) -> None:
+        """占用槽位：在途 +1，并按延迟推迟下一次启动时间"""
+        now = time.monotonic() if now is None else now
+        slot.active += 1
+        slot.last_seen = now
+        delay = slot.delay
+        if delay and self.randomize:
+            delay = uniform(delay * self.random_range[0], delay * self.random_range[1])  # nosec B311
+        slot.next_start = now + delay
+
+    def defer(self, slot: DomainSlot, request, now: Optional[float] = None, front: bool = False) -> None:
+        """把请求放入槽位等待队列（front=True 时放回队首，保持 FIFO）"""
+        if front:
+            slot.deferred.appendleft(request)
+        else:
+            slot.deferred.append(request)
+        self.deferred_count += 1
+        self._schedule(slot, time.monotonic() if now is None else now)
+
+    def postpone(self, slot: DomainSlot, request, seconds: float) -> None:
+        """已占用槽位的请求被外部限速（如分布式令牌桶）拒绝：归还槽位、放回队首并推迟启动"""
+        now = time.monotonic()
+        slot.active = max(0, slot.active - 1)
+        slot.next_start = max(slot.next_start, now + seconds)
+        self.defer(slot, request, now, front=True)
+
+    def release(self, slot: DomainSlot, elapsed: float, failed: bool = False) -> None:
+        """请求结束：释放槽位，autothrottle 时按 AIMD 调整并发"""
+        now = time.monotonic()
+        slot.active = max(0, slot.active - 1)
+        slot.last_seen = now
+        if self.autothrottle:
+            self._adjust(slot, elapsed, failed, now)
+        if slot.deferred:
+            self._schedule(slot, now)
+
+    def _adjust(self, slot: DomainSlot, elapsed: float, failed: bool, now: float) -> None:
+        if failed or elapsed > self.target_latency:
+            slot._fast_streak = 0
+            # 同一拥塞窗口内只减半一次，避免一批慢响应把并发压到 1
+            if now - slot._last_decrease >= self.target_latency:
+                slot.concurrency = max(1, slot.concurrency // 2)
+                slot._last_decrease = now
+        else:
+            slot._fast_streak += 1
+            if slot._fast_streak >= slot.concurrency and slot.concurrency < slot.max_concurrency:
+                slot.concurrency += 1
+                slot._fast_streak = 0
+
+    def _schedule(self, slot: DomainSlot, now: float) -> None:
+        if slot.scheduled:
+            return
+        if slot.active >= slot.concurrency:
+            # 并发已满：等 release() 再调度
+            return
+        slot.scheduled = True
+        if now >= slot.next_start:
+            self._runnable.append(slot)
+        else:
+            self._timer_seq += 1
+            heapq.heappush(self._timers, (slot.next_start, self._timer_seq, slot))
+
+    def pop_ready(self, limit: int, now: Optional[float] = None) -> list:
+        """取出至多 limit 个可立即启动的等待请求（已占用槽位）"""
+        now = time.monotonic() if now is None else now
+        timers = self._timers
+        while timers and timers[0][0] <= now:
+            slot = heapq.heappop(timers)[2]
+            self._runnable.append(slot)
+
+        ready: list = []
+        runnable = self._runnable
+        while runnable and len(ready) < limit:
+            slot = runnable.popleft()
+            slot.scheduled = False
+            while slot.deferred and len(ready) < limit and slot.can_start(now):
+                ready.append(slot.deferred.popleft())
+                self.deferred_count -= 1
+                self.start(slot, now)
+            if slot.deferred:
+                self._schedule(slot, now)
+        return ready
+
+    def next_ready_in(self, now: Optional[float] = None) -> Optional[float]:
+        """距下一个延迟到期槽位的秒数；有可立即启动的槽位时为 0；无等待时为 None"""
+        if self._runnable:
+            return 0.0
+        if not self._timers:
+            return None
+        now = time.monotonic() if now is None else now
+        return max(0.0, self._timers[0][0] - now)
+
+    def _sweep(self) -> None:
+        """回收长时间空闲的槽位（限频）"""
+        now = time.monotonic()
+        if now - self._last_sweep < SLOT_IDLE_TTL / 6:
+            return
+        self._last_sweep = now
+        stale = [key for key, slot in self._slots.items()
+                 if not slot.active and not slot.deferred and not slot.scheduled
+                 and now - slot.last_seen > SLOT_IDLE_TTL]
+        for key in stale:
+            del self._slots[key]
+
+    def get_stats(self) -> Dict[str, int]:
+        busiest = max(self._slots.values(), key=lambda s: len(s.deferred), default=None)
+        return {
+            'slots': len(self._slots),
+            'active': sum(slot.active for slot in self._slots.values()),
+            'deferred': self.deferred_count,
+            'busiest_slot_deferred': len(busiest.deferred) if busiest else 0,
+        }
+
+
+__all__ = ['DomainSlot', 'DomainSlots']
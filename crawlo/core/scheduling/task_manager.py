@@ -414,9 +414,12 @@ class TaskManager(Generic[T]):
                     if self.current_task:
                         await asyncio.gather(*self.current_task, return_exceptions=True)
     
-    async def _wait_all_done(self) -> None:
+    async def wait_all_done(self) -> None:
         """等待所有任务完成（通过 Event 避免忙轮询）"""
         await self._all_done_event.wait()
+
+    async def _wait_all_done(self) -> None:
+        await self.wait_all_done()
     
     def __enter__(self):
         """上下文管理器入口"""
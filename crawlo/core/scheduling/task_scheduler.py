@@ -48,13 +48,16 @@ _MODE_CONFIG = {
     QueueType.MEMORY: {
         'filter_class': _DEFAULT_FILTER_CLASS,
         'dedup_pipeline': _DEFAULT_DEDUP_MEMORY,
-        'source_filter_patterns': ['aioredis_filter', 'redis_filter'],
+        'source_filter_patterns': ['aioredis_filter', 'redis_filter', 'redis_bloom_filter'],
         'source_dedup_pattern': 'redis_dedup_pipeline',
     },
 }
 
 
 class Scheduler:
+    # 增量检查点日志（CHECKPOINT_STORAGE='journal' 时由 CheckpointManager.attach 设置）
+    checkpoint_journal = None
+
     def __init__(self, crawler, dupe_filter, stats, priority):
         self.crawler = crawler
         self.queue_manager: Optional[QueueManager] = None
@@ -220,7 +223,7 @@ class Scheduler:
         if self._is_redis_queue():  # includes REDIS and REDIS_STREAM
             return 'memory_filter' in current_filter
         elif self._is_memory_queue():
-            return 'aioredis_filter' in current_filter or 'redis_filter' in current_filter
+            return any(pattern in current_filter for pattern in _MODE_CONFIG[QueueType.MEMORY]['source_filter_patterns'])
         return False
 
     def _switch_to_correct_mode(self, current_filter: str) -> bool:
@@ -326,6 +329,8 @@ class Scheduler:
             request = await self.queue_manager.get()
             # notify 逻辑已下沉到 QueueManager.get（_notify_space_available）
             if request:
+                if self.checkpoint_journal is not None:
+                    self.checkpoint_journal.record_dequeue(request)
                 try:
                     spider = getattr(self.crawler, 'spider', None)
                     request = self.request_serializer.restore_after_deserialization(request, spider)
@@ -339,6 +344,28 @@ class Scheduler:
             self.error_handler.handle_error(e, context=ErrorContext(context="Failed to get next request"), raise_error=False)
             return None
 
+    async def next_requests(self, batch_size: int):
+        """Get up to ``batch_size`` requests from queue in one call (SlotDispatcher 批量出队)"""
+        if not self.queue_manager:
+            return []
+        try:
+            requests = await self.queue_manager.get_batch(batch_size)
+        except Exception as e:
+            self.error_handler.handle_error(e, context=ErrorContext(context="Failed to get next requests"), raise_error=False)
+            return []
+        spider = getattr(self.crawler, 'spider', None)
+        restored = []
+        for request in requests:
+            if self.checkpoint_journal is not None:
+                self.checkpoint_journal.record_dequeue(request)
+            try:
+                restored.append(self.request_serializer.restore_after_deserialization(request, spider))
+            except Exception as deser_error:
+                self.logger.error(
+                    f"[队列] 请求反序列化失败: {deser_error} | 请求数据: {repr(request)}"
+                )
+        return restored
+
     async def next_request_blocking(self, timeout: float = 30.0):
         """阻塞式获取下一个请求（分布式模式专用）"""
         if not self.queue_manager:
@@ -346,6 +373,8 @@ class Scheduler:
         try:
             # notify 逻辑已下沉到 QueueManager.get_blocking
             request = await self.queue_manager.get_blocking(timeout=timeout)
+            if request is not None and self.checkpoint_journal is not None:
+                self.checkpoint_journal.record_dequeue(request)
             return request
         except Exception as e:
             self.error_handler.handle_error(
@@ -371,27 +400,95 @@ class Scheduler:
             else:
                 is_duplicate = await common_call(self.dupe_filter.requested, request)
             if is_duplicate:
-                self.dupe_filter.log_stats(request)
-                self._duplicate_filtered_count += 1
-                self.logger.debug(f"Filtered duplicate request: {request.url}")
+                self._record_duplicate(request)
                 return False
 
+        return await self._put_request(request)
+
+    async def enqueue_requests(self, requests) -> list:
+        """Add many requests to queue, deduplicating the whole batch at once.
+
+        过滤器提供 ``requested_many`` 时（如 AioRedisFilter），整批指纹在一次
+        pipeline 往返内完成判重+写入，非重复请求再经 ``QueueManager.put_batch``
+        批量入队（Stream 队列）；否则逐个走 ``enqueue_request``。
+
+        Returns:
+            list[bool]: 与输入顺序一致的入队结果
+        """
+        requests = list(requests)
+        if not hasattr(self.dupe_filter, 'requested_many'):
+            return [await self.enqueue_request(request) for request in requests]
+
+        filterable = [request for request in requests if not request.dont_filter]
+        flags = await self.dupe_filter.requested_many(filterable) if filterable else []
+        duplicates = {id(request) for request, flag in zip(filterable, flags) if flag}
+
+        accepted = []
+        for request in requests:
+            if id(request) in duplicates:
+                self._record_duplicate(request)
+            else:
+                accepted.append(request)
+        enqueued = await self._put_requests(accepted)
+        return [enqueued.get(id(request), False) for request in requests]
+
+    def _record_duplicate(self, request) -> None:
+        self.dupe_filter.log_stats(request)
+        self._duplicate_filtered_count += 1
+        self.logger.debug(f"Filtered duplicate request: {request.url}")
+
+    async def _put_requests(self, requests) -> dict:
+        """去重之后的批量入队：Stream 队列先整批 ``put_batch``，未写入的部分逐个 ``put``
+
+        Returns:
+            dict: id(request) → 入队结果
+        """
+        if not requests or not self.queue_manager or not self._is_stream_queue():
+            return {id(request): await self._put_request(request) for request in requests}
+
+        for request in requests:
+            set_request(request, self.priority)
+        enqueued = await self.queue_manager.put_batch(
+            [(request, getattr(request, 'priority', 0)) for request in requests]
+        )
+        results = {}
+        for request in requests[:enqueued]:
+            if hasattr(self.queue_manager, '_priority_calculator'):
+                self.queue_manager._priority_calculator.update_crawl_frequency(request)
+            if self.checkpoint_journal is not None:
+                self.checkpoint_journal.record_enqueue(request)
+            results[id(request)] = True
+        for request in requests[enqueued:]:
+            results[id(request)] = await self._put_prepared(request)
+        return results
+
+    async def _put_request(self, request) -> bool:
+        """去重之后的入队：设置优先级 → put → 按策略处理 QueueFullTimeout"""
         if not self.queue_manager:
             self.logger.error("Queue manager not initialized")
             return False
 
         set_request(request, self.priority)
+        return await self._put_prepared(request)
 
+    async def _put_prepared(self, request) -> bool:
+        """已设置优先级的请求入队（put + QueueFullTimeout 策略）"""
         # 根据 ENQUEUE_FULL_POLICY 决定 put 的 timeout
+        queue_manager = self.queue_manager
+        if queue_manager is None:
+            self.logger.error("Queue manager not initialized")
+            return False
         policy = self._get_enqueue_full_policy()
         put_timeout = self._resolve_put_timeout(policy)
 
         try:
-            success = await self.queue_manager.put(
+            success = await queue_manager.put(
                 request, priority=getattr(request, 'priority', 0), timeout=put_timeout
             )
-            if success and hasattr(self.queue_manager, '_priority_calculator'):
-                self.queue_manager._priority_calculator.update_crawl_frequency(request)
+            if success and hasattr(queue_manager, '_priority_calculator'):
+                queue_manager._priority_calculator.update_crawl_frequency(request)
+            if success and self.checkpoint_journal is not None:
+                self.checkpoint_journal.record_enqueue(request)
             return success
         except QueueFullTimeout as e:
             return await self._handle_queue_full_timeout(e, request, policy)
@@ -484,6 +581,9 @@ class Scheduler:
                 )
             if isinstance(closed := getattr(self.dupe_filter, 'closed', None), Callable):
                 await closed()
+            if self.checkpoint_journal is not None:
+                # 增量检查点：落盘最后一个刷新周期内的事件
+                await self.checkpoint_journal.close()
             if self.queue_manager:
                 await self.queue_manager.close()
         except Exception as e:
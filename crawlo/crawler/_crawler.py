@@ -394,6 +394,10 @@ class Crawler:
                 close_result = self._stats.close()
                 if asyncio.iscoroutine(close_result):
                     await close_result
+                # 写回缓冲类统计后端：等待最终写入
+                wait_closed = getattr(self._stats, 'wait_closed', None)
+                if asyncio.iscoroutinefunction(wait_closed):
+                    await wait_closed()
             except Exception as e:
                 self._logger.warning(f"Stats cleanup failed: {e}")
 
@@ -16,15 +16,14 @@ Crawlo Downloader Module
 """
 
 from abc import abstractmethod, ABC
-from typing import Final, Set, Optional, TYPE_CHECKING, Dict, Any
+from typing import Final, Set, Optional, Dict, Any
 
+from crawlo.http.response import Response
 from crawlo.logging import get_logger
 from crawlo.middleware.middleware_manager import MiddlewareManager
+from crawlo.utils.encoding import EncodingDetector
 from crawlo.utils.misc import safe_get_config
 
-if TYPE_CHECKING:
-    from crawlo import Response
-
 
 class _ActivatedRequest:
     """类式上下文管理器（非生成器），避免 Python 3.12 asynccontextmanager + athrow(CancelledError) bug"""
@@ -109,6 +108,16 @@ class DownloaderBase(ABC):
         self.logger = get_logger(self.__class__.__name__)
         self._closed = False
         self._stats_enabled = safe_get_config(crawler.settings, "DOWNLOAD_STATS", True, bool)
+        # 流式响应：>0 时所有响应按块读取并在超过阈值时落盘；request.meta['stream'] 可单独开启
+        self._stream_threshold = safe_get_config(crawler.settings, "DOWNLOAD_STREAM_THRESHOLD", 0, int)
+        # 流式响应体上限：未设置 DOWNLOAD_STREAM_MAXSIZE 时沿用 DOWNLOAD_MAXSIZE
+        stream_maxsize = safe_get_config(crawler.settings, "DOWNLOAD_STREAM_MAXSIZE", None, int)
+        if stream_maxsize is None:
+            stream_maxsize = safe_get_config(crawler.settings, "DOWNLOAD_MAXSIZE", 10 * 1024 * 1024, int)
+        self._stream_maxsize = stream_maxsize
+        self._stream_dir = safe_get_config(crawler.settings, "DOWNLOAD_STREAM_DIR", None)
+        # 本下载器返回的响应共用的编码检测器（按主机缓存只在同一爬虫内共享）
+        self._encoding_detector = EncodingDetector()
 
     @classmethod
     def create_instance(cls, *args, **kwargs):
@@ -173,11 +182,29 @@ class DownloaderBase(ABC):
         async with self._active(request):
             try:
                 response = await self.middleware.download(request)
+                if isinstance(response, Response) and response.encoding_detector is None:
+                    response.encoding_detector = self._encoding_detector
                 return response
             except Exception as e:
                 self.logger.debug(f"Download failed for {request.url}: {type(e).__name__}: {e}")
                 raise
 
+    def _new_body_spool(self, request):
+        """
+        流式读取响应体时返回 BodySpool，否则返回 None（整体读入内存）
+
+        meta['stream'] 为 False 时即使配置了 DOWNLOAD_STREAM_THRESHOLD 也不流式读取。
+        """
+        stream = request.meta.get('stream')
+        if stream is False or (not stream and self._stream_threshold <= 0):
+            return None
+        from crawlo.http.body_spool import BodySpool, DEFAULT_SPILL_THRESHOLD
+        return BodySpool(
+            self._stream_threshold if self._stream_threshold > 0 else DEFAULT_SPILL_THRESHOLD,
+            max_size=self._stream_maxsize,
+            directory=self._stream_dir,
+        )
+
     @abstractmethod
     async def download(self, request) -> 'Response':
         """Download method that subclasses must implement"""
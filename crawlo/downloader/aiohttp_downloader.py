@@ -330,17 +330,32 @@ class AioHttpDownloader(DownloaderBase):
         Returns:
             Response: 框架响应对象
         """
+        spool = self._new_body_spool(request)
+        max_size = spool.max_size if spool else self.max_download_size
+
         # 安全检查：防止大响应体导致 OOM
         content_length = resp.headers.get("Content-Length")
-        if content_length and int(content_length) > self.max_download_size:
-            raise OverflowError(f"Response too large: {content_length} > {self.max_download_size}")
+        if content_length and int(content_length) > max_size:
+            raise OverflowError(f"Response too large: {content_length} > {max_size}")
 
-        body = await resp.read()
-        response = self._structure_response(request, resp, body)
+        if spool is None:
+            body = await resp.read()
+            response = self._structure_response(request, resp, body)
+        else:
+            # 流式读取：超过阈值落盘，响应体不整体驻留内存
+            try:
+                async for chunk in resp.content.iter_chunked(64 * 1024):
+                    await spool.write(chunk)
+                response = await spool.to_response(
+                    str(resp.url), headers=dict(resp.headers), status=resp.status, request=request,
+                )
+            except BaseException:
+                await spool.discard()
+                raise
 
         # HTTP 级别下载结果（状态码 + 大小）
         self.logger.debug(
-            f"[HTTP] {request.url} {resp.status} ({len(body)}B)"
+            f"[HTTP] {request.url} {resp.status} ({response.body_size}B)"
         )
 
         return response
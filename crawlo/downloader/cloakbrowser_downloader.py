@@ -34,6 +34,8 @@ from crawlo.logging import get_logger
 from crawlo.http.response import Response
 from crawlo.downloader import DownloaderBase
 from crawlo.downloader.wait_strategies import SmartWaitMixin, WaitStrategy
+from crawlo.downloader.context_pool import BrowserContextPool, ContextPoolMixin
+from crawlo.downloader.resource_blocker import ResourceBlocker
 from crawlo.utils.parsing import PageActionHandler, SelectorConverter
 from crawlo.constants import BROWSER_PAGE_GOTO_BLANK_TIMEOUT_MS
 from crawlo.utils.misc import (
@@ -52,7 +54,7 @@ CLOUDFLARE_CHALLENGE_PATTERNS = [
 ]
 
 
-class CloakBrowserDownloader(DownloaderBase, SmartWaitMixin):
+class CloakBrowserDownloader(DownloaderBase, SmartWaitMixin, ContextPoolMixin):
     """
     基于 CloakBrowser 的隐身动态内容下载器
 
@@ -88,7 +90,7 @@ class CloakBrowserDownloader(DownloaderBase, SmartWaitMixin):
         self._page_semaphore_lock = asyncio.Lock()
         self._init_lock = asyncio.Lock()  # 浏览器初始化锁，防止并发重复初始化
 
-        # 当前上下文使用的代理（用于检测代理变化，触发 Context 重建）
+        # 默认上下文使用的代理（请求代理与之不同时路由到上下文池）
         self._current_proxy: Optional[str] = None
 
         s = crawler.settings
@@ -103,6 +105,7 @@ class CloakBrowserDownloader(DownloaderBase, SmartWaitMixin):
         self.viewport_width = get_browser_config_int(s, "CLOAKBROWSER", "VIEWPORT_WIDTH", 1280)
         self.viewport_height = get_browser_config_int(s, "CLOAKBROWSER", "VIEWPORT_HEIGHT", 720)
         self.max_pages = get_browser_config_int(s, "CLOAKBROWSER", "MAX_PAGES", 10)
+        self.max_contexts = get_browser_config_int(s, "CLOAKBROWSER", "MAX_CONTEXTS", 8)
         self.humanize = get_browser_config_bool(s, "CLOAKBROWSER", "HUMANIZE", False)
         self.wait_strategy = get_browser_config(s, "CLOAKBROWSER", "WAIT_STRATEGY", WaitStrategy.AUTO)
         self.wait_timeout = get_browser_config_int(s, "CLOAKBROWSER", "WAIT_TIMEOUT", 10000)
@@ -128,6 +131,17 @@ class CloakBrowserDownloader(DownloaderBase, SmartWaitMixin):
         self.persistent_context = s.get_bool("CLOAKBROWSER_PERSISTENT_CONTEXT", False)
         self.user_data_dir = s.get("CLOAKBROWSER_USER_DATA_DIR", None)
 
+        # 资源屏蔽：规则预编译一次，路由按上下文安装
+        self._resource_blocker = ResourceBlocker.from_settings(s, "CLOAKBROWSER", logger=self.logger)
+
+        # 按代理的上下文池（每个上下文独立页面池）
+        self._context_pool = BrowserContextPool(
+            self._create_context,
+            max_contexts=self.max_contexts,
+            max_pages=self.max_pages,
+            logger=self.logger,
+        )
+
     def open(self):
         super().open()
         self.logger.info("Opening CloakBrowserDownloader (lazy initialization)")
@@ -210,6 +224,7 @@ class CloakBrowserDownloader(DownloaderBase, SmartWaitMixin):
                 )
                 self.logger.info("CloakBrowser launched, creating context...")
                 self._context = await self._create_context(proxy)
+                self._current_proxy = proxy
 
             # 初始化信号量
             self._page_semaphore = asyncio.Semaphore(self.max_pages)
@@ -299,18 +314,16 @@ class CloakBrowserDownloader(DownloaderBase, SmartWaitMixin):
                         self.logger.error(f"Failed to initialize CloakBrowser for {request.url}: {e}")
                         return None
 
-        # 检测代理变化：如果 request.proxy 与当前 Context 的代理不同，重建 Context
-        await self._check_proxy_change(request)
-
         start_time = None
         if self.crawler.settings.get_bool("DOWNLOAD_STATS", True):
             start_time = time.time()
 
+        entry = None
         page = None
         cf_bypassed = False
         try:
-            # 获取页面
-            page = await self._get_page()
+            # 按请求代理获取页面（默认上下文或上下文池中对应代理的上下文）
+            entry, page = await self._acquire_routed_page(request)
 
             # 设置超时
             page.set_default_timeout(self.timeout)
@@ -410,7 +423,7 @@ class CloakBrowserDownloader(DownloaderBase, SmartWaitMixin):
             # CF 绕过后，状态码改为 200（原 response 仍为 403）
             status_code = 200 if cf_bypassed else (response.status if response else 200)
             headers = dict(response.headers) if response else {}
-            cookies = await self._get_cookies()
+            cookies = await self._get_cookies(entry.context if entry else None)
 
             # 构造响应
             crawlo_response = Response(
@@ -439,7 +452,8 @@ class CloakBrowserDownloader(DownloaderBase, SmartWaitMixin):
                         await page.wait_for_timeout(3000)
                     except Exception as e:
                         self.logger.debug("Suppressed exception: %s", e)
-                await self._release_page(page)
+                await self._resource_blocker.deactivate(page)
+                await self._release_routed_page(entry, page)
 
     # ---- 页面池管理 ----
 
@@ -465,91 +479,12 @@ class CloakBrowserDownloader(DownloaderBase, SmartWaitMixin):
                 context_kwargs["proxy"] = proxy
 
         context = await self._browser.new_context(**context_kwargs)
-        self._current_proxy = proxy
         self.logger.info(f"Created browser context (proxy={proxy or 'direct'})")
         return context
 
-    async def _check_proxy_change(self, request):
-        """检测代理变化，必要时重建 Context
-
-        代理来源优先级：
-        1. request.proxy（由 ProxyMiddleware 设置，支持中途切换）
-        2. request.meta['proxy_downgraded']（代理降级为直连）
-        3. CLOAKBROWSER_PROXY 配置（静态代理，仅在初始化时使用）
-        4. 无代理（直连）
-
-        代理切换触发条件：
-        - request.proxy 有值且与当前 Context 代理不同 → 切换到新代理
-        - request.meta['proxy_downgraded'] 为 True → 降级为直连
-
-        注意：request.proxy 为 None 且无 proxy_downgraded 标记时，
-        视为"未指定代理"，保持当前 Context 不变（兼容无 ProxyMiddleware 的场景）。
-        """
-        request_proxy = getattr(request, 'proxy', None)
-        proxy_downgraded = request.meta.get('proxy_downgraded', False)
-
-        # 持久化模式无法重建 Context
-        if self.persistent_context and self.user_data_dir:
-            if (request_proxy and request_proxy != self._current_proxy) or proxy_downgraded:
-                self.logger.warning(
-                    f"Proxy change detected but persistent context "
-                    f"does not support context rebuild. Current proxy: {self._current_proxy}"
-                )
-            return
-
-        # 非持久化模式：检测代理变化
-        if not self._browser:
-            return
-
-        # 确定目标代理
-        if proxy_downgraded:
-            # 代理降级：切换到直连
-            target_proxy = None
-        elif request_proxy:
-            # 有新代理：切换到新代理
-            target_proxy = request_proxy
-        else:
-            # 未指定代理：保持当前 Context 不变
-            return
-
-        if target_proxy != self._current_proxy:
-            old_proxy = self._current_proxy
-            self.logger.info(
-                f"Proxy changed: {old_proxy or 'direct'} → {target_proxy or 'direct'}, "
-                f"rebuilding context..."
-            )
-            await self._rebuild_context(target_proxy)
-
-    async def _rebuild_context(self, new_proxy=None):
-        """重建浏览器上下文（关闭旧的，创建新的）
-
-        Args:
-            new_proxy: 新代理地址，None 表示直连
-        """
-        # 1. 关闭所有页面
-        for page in self._page_pool:
-            try:
-                await page.close()
-            except Exception as e:
-                self.logger.debug("Suppressed exception: %s", e)
-        self._page_pool.clear()
-        self._used_pages.clear()
-
-        # 2. 关闭旧 Context
-        if self._context:
-            try:
-                await self._context.close()
-            except Exception as e:
-                self.logger.debug("Suppressed exception: %s", e)
-            self._context = None
-
-        # 3. 创建新 Context
-        self._context = await self._create_context(new_proxy)
-
-        # 4. 重置信号量
-        self._page_semaphore = asyncio.Semaphore(self.max_pages)
-
-        self.logger.info(f"Context rebuilt with proxy: {new_proxy or 'direct'}")
+    def _supports_context_pool(self) -> bool:
+        """持久化模式无独立 Browser，无法按代理创建额外上下文"""
+        return self._browser is not None
 
     async def _resolve_proxy(self):
         """解析代理地址
@@ -727,19 +662,10 @@ class CloakBrowserDownloader(DownloaderBase, SmartWaitMixin):
     # ---- 资源屏蔽（覆盖 SmartWaitMixin，使用 cloakbrowser_ 前缀）----
 
     async def _setup_resource_blocking(self, page, request):
-        """设置资源屏蔽"""
+        """设置资源屏蔽（CloakBrowser 不内置广告黑名单，自定义规则见 BROWSER_BLOCK_RULES）"""
         block_resources = request.meta.get("cloakbrowser_block_resources", self.block_resources)
-
-        if not block_resources:
-            return
-
-        async def route_handler(route):
-            if route.request.resource_type in block_resources:
-                await route.abort()
-            else:
-                await route.continue_()
-
-        await page.route("**/*", route_handler)
+        blocker = self._resource_blocker.compile(block_resources)
+        await self._resource_blocker.activate(page, blocker)
 
     # ---- 自动滚动（覆盖 SmartWaitMixin，使用 cloakbrowser_ 前缀 + humanize 适配）----
 
@@ -978,11 +904,12 @@ class CloakBrowserDownloader(DownloaderBase, SmartWaitMixin):
 
     # ---- Cookies ----
 
-    async def _get_cookies(self) -> Dict[str, str]:
-        """获取 Cookies"""
+    async def _get_cookies(self, context=None) -> Dict[str, str]:
+        """获取 Cookies（context 为空时读取默认上下文）"""
+        context = context or self._context
         try:
-            if self._context:
-                cookies = await self._context.cookies()
+            if context:
+                cookies = await context.cookies()
                 return {c['name']: c['value'] for c in cookies}
             return {}
         except Exception as e:
@@ -1004,6 +931,9 @@ class CloakBrowserDownloader(DownloaderBase, SmartWaitMixin):
         self._page_pool.clear()
         self._used_pages.clear()
 
+        # 关闭上下文池中按代理创建的上下文
+        await self._context_pool.close()
+
         # 关闭上下文
         if self._context:
             try:
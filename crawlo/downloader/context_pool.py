@@ -0,0 +1,278 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+浏览器上下文池
+=============
+按代理维护多个 BrowserContext（LRU + 数量上限），每个上下文有独立的页面池与并发信号量。
+
+PlaywrightDownloader / CloakBrowserDownloader 共用：
+- 默认上下文（初始化时按静态代理配置创建）仍使用下载器自身的页面池
+- request.proxy 与默认上下文不同（或代理降级为直连）的请求路由到池中对应代理的上下文，
+  不再关闭其他请求正在使用的页面、也不再重置信号量
+- 上下文数量达到 BROWSER_MAX_CONTEXTS 时淘汰最久未使用且无在途请求的上下文；
+  全部在用时等待，直到有上下文空闲
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+from crawlo.constants import BROWSER_PAGE_GOTO_BLANK_TIMEOUT_MS
+from crawlo.logging import get_logger
+
+# 路由结果：使用下载器的默认上下文
+DEFAULT_CONTEXT = object()
+
+
+def proxy_key(proxy) -> str:
+    """代理配置归一化为池的 key（str / dict 均可，None 表示直连）"""
+    if not proxy:
+        return ''
+    if isinstance(proxy, dict):
+        return json.dumps(proxy, sort_keys=True)
+    return str(proxy)
+
+
+class PooledContext:
+    """单个代理对应的浏览器上下文及其页面池"""
+
+    def __init__(self, proxy, max_pages: Optional[int]):
+        self.proxy = proxy
+        self.context: Any = None
+        self.pages: List[Any] = []
+        self.used_pages: set = set()
+        # max_pages 为空时不复用页面（每个请求新建、用完关闭）
+        self.semaphore = asyncio.Semaphore(max_pages) if max_pages else None
+        self.leases = 0  # 在途请求数（含等待页面的请求），为 0 时才可被淘汰
+        self.ready = asyncio.Event()
+
+
+class BrowserContextPool:
+    """按代理分组的浏览器上下文池"""
+
+    def __init__(
+        self,
+        factory: Callable[[Any], Awaitable[Any]],
+        max_contexts: int = 8,
+        max_pages: Optional[int] = 10,
+        logger=None,
+    ):
+        """
+        Args:
+            factory: 异步工厂，按代理创建 BrowserContext
+            max_contexts: 池中上下文数量上限
+            max_pages: 每个上下文的最大页面数（None 表示不复用页面）
+        """
+        self._factory = factory
+        self.max_contexts = max(1, max_contexts)
+        self.max_pages = max_pages
+        self._contexts: "OrderedDict[str, PooledContext]" = OrderedDict()
+        self._cond = asyncio.Condition()
+        self.logger = logger or get_logger(self.__class__.__name__)
+        self.created = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._contexts)
+
+    def __contains__(self, proxy) -> bool:
+        return proxy_key(proxy) in self._contexts
+
+    async def acquire(self, proxy) -> Tuple[PooledContext, Any]:
+        """获取代理对应上下文中的页面，返回 (上下文条目, 页面)"""
+        entry = await self._lease(proxy)
+        try:
+            page = await self._checkout(entry)
+        except BaseException:
+            await self._unlease(entry)
+            raise
+        return entry, page
+
+    async def release(self, entry: PooledContext, page):
+        """归还页面"""
+        try:
+            await self._checkin(entry, page)
+        finally:
+            await self._unlease(entry)
+
+    async def close(self):
+        """关闭池中所有上下文"""
+        async with self._cond:
+            entries = list(self._contexts.values())
+            self._contexts.clear()
+            self._cond.notify_all()
+        for entry in entries:
+            await self._close_entry(entry)
+
+    # ── 上下文租用 ──
+
+    async def _lease(self, proxy) -> PooledContext:
+        key = proxy_key(proxy)
+        evicted = None
+        creating = False
+        async with self._cond:
+            while True:
+                entry = self._contexts.get(key)
+                if entry is not None:
+                    self._contexts.move_to_end(key)
+                    entry.leases += 1
+                    break
+                if len(self._contexts) >= self.max_contexts:
+                    evicted = self._pop_idle()
+                    if evicted is None:
+                        # 全部上下文都有在途请求，等待其中一个空闲
+                        await self._cond.wait()
+                        continue
+                # 先占位再在锁外创建，创建期间不阻塞其他代理的路由
+                entry = PooledContext(proxy, self.max_pages)
+                entry.leases = 1
+                self._contexts[key] = entry
+                creating = True
+                break
+
+        if evicted is not None:
+            await self._close_entry(evicted)
+
+        if creating:
+            try:
+                entry.context = await self._factory(proxy)
+                self.created += 1
+            except BaseException:
+                async with self._cond:
+                    if self._contexts.get(key) is entry:
+                        del self._contexts[key]
+                    entry.leases -= 1
+                    self._cond.notify_all()
+                raise
+            finally:
+                entry.ready.set()
+            return entry
+
+        await entry.ready.wait()
+        if entry.context is None:
+            await self._unlease(entry)
+            raise RuntimeError(f"Browser context creation failed (proxy={proxy or 'direct'})")
+        return entry
+
+    async def _unlease(self, entry: PooledContext):
+        async with self._cond:
+            entry.leases -= 1
+            if entry.leases <= 0:
+                self._cond.notify_all()
+
+    def _pop_idle(self) -> Optional[PooledContext]:
+        """弹出最久未使用且无在途请求的上下文（调用方持有锁）"""
+        for key, entry in self._contexts.items():
+            if entry.leases == 0:
+                del self._contexts[key]
+                self.evicted += 1
+                self.logger.debug(f"Evicting browser context (proxy={entry.proxy or 'direct'})")
+                return entry
+        return None
+
+    async def _close_entry(self, entry: PooledContext):
+        for page in entry.pages:
+            try:
+                await page.close()
+            except Exception as e:
+                self.logger.debug("Suppressed exception: %s", e)
+        entry.pages.clear()
+        entry.used_pages.clear()
+        if entry.context is not None:
+            try:
+                await entry.context.close()
+            except Exception as e:
+                self.logger.debug("Suppressed exception: %s", e)
+            entry.context = None
+
+    # ── 页面池（每个上下文独立） ──
+
+    async def _checkout(self, entry: PooledContext):
+        if entry.semaphore is None:
+            return await entry.context.new_page()
+
+        await entry.semaphore.acquire()
+        try:
+            for page in entry.pages:
+                if id(page) not in entry.used_pages:
+                    entry.used_pages.add(id(page))
+                    return page
+            page = await entry.context.new_page()
+            entry.pages.append(page)
+            entry.used_pages.add(id(page))
+            return page
+        except BaseException:
+            entry.semaphore.release()
+            raise
+
+    async def _checkin(self, entry: PooledContext, page):
+        if id(page) not in entry.used_pages:
+            try:
+                await page.close()
+            except Exception as e:
+                self.logger.debug("Suppressed exception: %s", e)
+            return
+
+        # 先导航到空白页再标记空闲，避免下一个请求拿到仍在导航中的页面
+        try:
+            await page.goto("about:blank", timeout=BROWSER_PAGE_GOTO_BLANK_TIMEOUT_MS)
+        except Exception as e:
+            self.logger.debug("Suppressed exception: %s", e)
+        entry.used_pages.discard(id(page))
+        entry.semaphore.release()
+
+
+class ContextPoolMixin:
+    """
+    按请求代理路由页面（PlaywrightDownloader / CloakBrowserDownloader 共用）
+
+    使用方需提供：
+    - self._context_pool: BrowserContextPool
+    - self._current_proxy: 默认上下文使用的代理
+    - self._get_page() / self._release_page(page): 默认上下文的页面池
+    - self._supports_context_pool(): 是否可以创建额外上下文
+    """
+
+    def _route_proxy(self, request):
+        """
+        确定请求使用的代理
+
+        代理来源优先级：
+        1. request.meta['proxy_downgraded']（代理降级为直连）
+        2. request.proxy（由 ProxyMiddleware 设置）
+        3. 未指定代理 → 默认上下文（兼容无 ProxyMiddleware 的场景）
+
+        与默认上下文代理相同时返回 DEFAULT_CONTEXT。
+        """
+        if request.meta.get('proxy_downgraded', False):
+            target = None
+        elif getattr(request, 'proxy', None):
+            target = request.proxy
+        else:
+            return DEFAULT_CONTEXT
+
+        if proxy_key(target) == proxy_key(self._current_proxy):
+            return DEFAULT_CONTEXT
+        if not self._supports_context_pool():
+            self.logger.warning(
+                f"Proxy {target or 'direct'} requested but this mode cannot create extra contexts. "
+                f"Using default context (proxy={self._current_proxy or 'direct'})"
+            )
+            return DEFAULT_CONTEXT
+        return target
+
+    async def _acquire_routed_page(self, request):
+        """按代理获取页面，返回 (上下文条目或 None, 页面)；None 表示默认上下文"""
+        target = self._route_proxy(request)
+        if target is DEFAULT_CONTEXT:
+            return None, await self._get_page()
+        return await self._context_pool.acquire(target)
+
+    async def _release_routed_page(self, entry: Optional[PooledContext], page):
+        """归还 _acquire_routed_page 取得的页面"""
+        if entry is None:
+            await self._release_page(page)
+        else:
+            await self._context_pool.release(entry, page)
@@ -3,7 +3,8 @@
 import httpx
 import asyncio
 import time
-from typing import Optional
+from collections import OrderedDict
+from typing import Callable, List, Optional
 
 from httpx import HTTPStatusError
 from httpx import AsyncClient, Timeout, Limits
@@ -16,6 +17,98 @@ from crawlo.http.exceptions import DownloadError
 from crawlo.constants import ABSOLUTE_TIMEOUT_MULTIPLIER_NORMAL, ABSOLUTE_TIMEOUT_MULTIPLIER_EXTENDED
 
 
+class _CachedClient:
+    """代理客户端缓存条目"""
+
+    __slots__ = ('client', 'last_used', 'in_use', 'evicted')
+
+    def __init__(self, client: AsyncClient):
+        self.client = client
+        self.last_used = time.monotonic()
+        self.in_use = 0
+        self.evicted = False
+
+
+class _ProxyClientCache:
+    """
+    按代理 URL 复用 AsyncClient 的 LRU 缓存
+
+    - 每个代理 URL 一个持久化客户端（独立连接池），超时按请求级覆盖，不再按超时档位拆分客户端
+    - 超过 max_size 时淘汰最久未使用的客户端；空闲超过 idle_timeout 的客户端在下次获取时关闭
+    - 被淘汰但仍有请求在用的客户端，待最后一个请求释放后再关闭
+    """
+
+    def __init__(self, factory: Callable[[str], AsyncClient], max_size: int = 32, idle_timeout: float = 60.0):
+        self._factory = factory
+        self.max_size = max(1, max_size)
+        self.idle_timeout = idle_timeout
+        self._entries: "OrderedDict[str, _CachedClient]" = OrderedDict()
+        self._retired: List[_CachedClient] = []
+        self.created = 0
+        self.reused = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, proxy: str) -> bool:
+        return proxy in self._entries
+
+    async def acquire(self, proxy: str) -> _CachedClient:
+        """获取代理对应的客户端（引用计数 +1），用完必须调用 release"""
+        await self._expire_idle()
+        entry = self._entries.get(proxy)
+        if entry is not None:
+            self._entries.move_to_end(proxy)
+            self.reused += 1
+        else:
+            entry = _CachedClient(self._factory(proxy))
+            self._entries[proxy] = entry
+            self.created += 1
+            while len(self._entries) > self.max_size:
+                _, oldest = self._entries.popitem(last=False)
+                await self._retire(oldest)
+        entry.in_use += 1
+        return entry
+
+    async def release(self, entry: _CachedClient) -> None:
+        entry.in_use -= 1
+        entry.last_used = time.monotonic()
+        # close() 可能已清空 _retired 并关闭了该客户端
+        if entry.evicted and entry.in_use <= 0 and entry in self._retired:
+            self._retired.remove(entry)
+            await entry.client.aclose()
+
+    async def _retire(self, entry: _CachedClient) -> None:
+        entry.evicted = True
+        if entry.in_use > 0:
+            self._retired.append(entry)
+        else:
+            await entry.client.aclose()
+
+    async def _expire_idle(self) -> None:
+        if self.idle_timeout <= 0:
+            return
+        deadline = time.monotonic() - self.idle_timeout
+        expired = [proxy for proxy, entry in self._entries.items()
+                   if entry.in_use == 0 and entry.last_used < deadline]
+        for proxy in expired:
+            # 前一次 await 期间 acquire / close 可能已取走或重新使用该客户端：
+            # 复查与摘除之间没有 await，不会再被并发修改
+            entry = self._entries.get(proxy)
+            if entry is None or entry.in_use or entry.last_used >= deadline:
+                continue
+            self._entries.pop(proxy, None)
+            await self._retire(entry)
+
+    async def close(self) -> None:
+        """关闭全部缓存客户端（含已淘汰但仍在使用的）"""
+        entries = list(self._entries.values()) + self._retired
+        self._entries.clear()
+        self._retired = []
+        for entry in entries:
+            await entry.client.aclose()
+
+
 class HttpXDownloader(DownloaderBase):
     """
     基于 httpx 的高性能异步下载器
@@ -23,6 +116,7 @@ class HttpXDownloader(DownloaderBase):
     - 支持连接池、HTTP/2、透明代理
     - 智能处理 Request 的 json_body 和 form_data
     - 支持代理失败后自动降级为直连
+    - 代理客户端按代理 URL 缓存复用（LRU + 空闲过期），超时按请求级覆盖
     """
 
     def __init__(self, crawler):
@@ -32,6 +126,7 @@ class HttpXDownloader(DownloaderBase):
         self._client_limits: Optional[Limits] = None
         self._client_verify: bool = True
         self._client_http2: bool = False
+        self._proxy_clients: Optional[_ProxyClientCache] = None
         self._timeout_total: int = 15  # 总超时配置，用于重试时动态计算
         self.max_download_size: int = 0
         self.logger = get_logger(self.__class__.__name__)
@@ -105,14 +200,32 @@ class HttpXDownloader(DownloaderBase):
             follow_redirects=True,  # 自动跟随重定向
         )
 
+        # 代理客户端缓存：同一代理 URL 复用连接池，避免每个代理请求重新握手
+        self._proxy_clients = _ProxyClientCache(
+            self._create_proxy_client,
+            max_size=safe_get_config(self.crawler.settings, "HTTPX_PROXY_CLIENT_CACHE_SIZE", 32, int),
+            idle_timeout=safe_get_config(self.crawler.settings, "HTTPX_PROXY_CLIENT_IDLE_TIMEOUT", 60, float),
+        )
+
         self.logger.debug("HttpXDownloader initialized.")
 
+    def _create_proxy_client(self, proxy: str) -> AsyncClient:
+        """创建代理客户端（复用主客户端的连接池配置，超时由请求级覆盖）"""
+        return AsyncClient(
+            timeout=self._client_timeout,
+            limits=self._client_limits,
+            verify=self._client_verify,
+            http2=self._client_http2,
+            follow_redirects=True,
+            proxy=proxy
+        )
+
     async def download(self, request) -> Response:
         """
         执行下载请求，支持代理失败自动降级为直连
         
         流程：
-        1. 如果有代理，创建临时客户端（严格超时）
+        1. 如果有代理，从缓存获取该代理的客户端（严格超时按请求级覆盖）
         2. 发送请求，网络异常时降级为直连
         3. 安全检查、读取响应、返回结果
         """
@@ -133,8 +246,9 @@ class HttpXDownloader(DownloaderBase):
             time.time()
 
         # 初始化客户端变量
+        request_timeout = self._client_timeout  # 请求级超时（默认主客户端超时）
         effective_client = self._client  # 默认使用主客户端（直连）
-        temp_client = None               # 临时客户端（代理模式）
+        proxy_entry = None               # 代理客户端缓存条目（代理模式）
 
         try:
             # 构造请求参数
@@ -197,10 +311,10 @@ class HttpXDownloader(DownloaderBase):
                                 f"No specific proxy for scheme '{request_scheme}', using '{httpx_proxy_config}'"
                             )
 
-                # 创建临时客户端（代理模式）
+                # 获取缓存的代理客户端（代理模式）
                 if httpx_proxy_config:
                     try:
-                        # 代理客户端使用更严格的超时（快速失败）
+                        # 代理请求使用更严格的超时（快速失败），作为请求级超时传入
                         # 基于 httpx 源码分析：Timeout(connect, read, write, pool)
                         # connect: 代理连接建立（TCP 握手 + SSL）
                         # read: 等待响应数据
@@ -211,7 +325,7 @@ class HttpXDownloader(DownloaderBase):
                         is_retry = request.meta.get("retry_times", 0) > 0
                         if is_retry:
                             # 重试请求：更严格的超时
-                            proxy_timeout = Timeout(
+                            request_timeout = Timeout(
                                 connect=3.0,   # 连接超时：3秒（快速失败）
                                 read=5.0,      # 读取超时：5秒（已经重试过）
                                 write=3.0,     # 写入超时：3秒
@@ -219,25 +333,18 @@ class HttpXDownloader(DownloaderBase):
                             )
                         else:
                             # 正常请求：正常超时
-                            proxy_timeout = Timeout(
+                            request_timeout = Timeout(
                                 connect=5.0,   # 连接超时：5秒（代理服务器响应慢）
                                 read=8.0,      # 读取超时：8秒（等待目标服务器响应）
                                 write=5.0,     # 写入超时：5秒（发送请求体）
                                 pool=1.0       # 连接池超时：1秒（获取可用连接）
                             )
                         
-                        temp_client = AsyncClient(
-                            timeout=proxy_timeout,
-                            limits=self._client_limits,      # 复用主客户端的连接池配置
-                            verify=self._client_verify,
-                            http2=self._client_http2,
-                            follow_redirects=True,
-                            proxy=httpx_proxy_config
-                        )
-                        effective_client = temp_client
+                        proxy_entry = await self._proxy_clients.acquire(str(httpx_proxy_config))
+                        effective_client = proxy_entry.client
                         self.logger.info(f"Using proxy: {httpx_proxy_config} for {request.url}")
                     except Exception as e:
-                        # 临时客户端创建失败，快速失败
+                        # 代理客户端创建失败，快速失败
                         # 重试和降级由 RetryMiddleware 处理
                         self.logger.error(
                             f"Failed to create proxy client {httpx_proxy_config} for {request.url}: {e}")
@@ -250,22 +357,13 @@ class HttpXDownloader(DownloaderBase):
                 # 基于 httpx 源码分析：已经重试过，应该更快失败
                 # 分配比例: connect=17%, read=33%, write=10%, pool=固定1s
                 # 默认 timeout_total=15: connect=2.6s, read=5.0s, write=1.5s, pool=1s → 10.1s
-                strict_timeout = Timeout(
+                # 严格超时作为请求级超时传给主客户端，复用主客户端连接池
+                request_timeout = Timeout(
                     connect=min(5.0, self._timeout_total * 0.17),   # 连接超时：17%（上限5秒）
                     read=self._timeout_total * 0.33,                # 读取超时：33%（已经重试过，更快失败）
                     write=min(3.0, self._timeout_total * 0.10),     # 写入超时：10%（上限3秒）
                     pool=1.0                                        # 连接池超时：固定1秒
                 )
-                
-                # 创建临时客户端（严格超时模式）
-                temp_client = AsyncClient(
-                    timeout=strict_timeout,
-                    limits=self._client_limits,      # 复用主客户端的连接池配置
-                    verify=self._client_verify,
-                    http2=self._client_http2,
-                    follow_redirects=True
-                )
-                effective_client = temp_client
                 self.logger.info(
                     f"Retry direct request (retry_times={retry_times}) with strict timeout "
                     f"(connect={min(5.0, self._timeout_total * 0.17):.1f}s, read={self._timeout_total * 0.33:.1f}s, write={min(3.0, self._timeout_total * 0.10):.1f}s): {request.url}"
@@ -289,12 +387,14 @@ class HttpXDownloader(DownloaderBase):
             # httpx 的 Timeout 在 httpcore 层应用，但代理连接可能在更底层阻塞
             # asyncio.wait_for 可能无法中断 httpcore 的底层 socket 操作
             # 因此使用 asyncio.create_task + task.cancel() 强制取消
-            kwargs["timeout"] = effective_client.timeout  # 显式传递超时配置
+            kwargs["timeout"] = request_timeout  # 请求级超时覆盖（不为超时档位新建客户端）
+            spool = self._new_body_spool(request)
             
             try:
-                # 创建请求任务
+                # 创建请求任务（流式模式只等待响应头，响应体随后分块读取）
                 request_task = asyncio.create_task(
-                    effective_client.request(**kwargs)
+                    self._send_streaming(effective_client, kwargs) if spool
+                    else effective_client.request(**kwargs)
                 )
                 
                 # 等待任务完成或超时
@@ -351,21 +451,25 @@ class HttpXDownloader(DownloaderBase):
                 raise
 
             # 安全检查：防止大响应体导致 OOM
+            max_size = spool.max_size if spool else self.max_download_size
             content_length = httpx_response.headers.get("Content-Length")
-            if content_length and int(content_length) > self.max_download_size:
+            if content_length and int(content_length) > max_size:
                 await httpx_response.aclose()
-                raise OverflowError(f"Response too large: {content_length} > {self.max_download_size}")
+                raise OverflowError(f"Response too large: {content_length} > {max_size}")
 
-            # 读取响应体
-            body = await httpx_response.aread()
+            if spool is not None:
+                response = await self._read_streaming(request, httpx_response, spool)
+            else:
+                # 读取响应体
+                body = await httpx_response.aread()
+                response = self.structure_response(request=request, response=httpx_response, body=body)
 
             # HTTP 级别下载结果（状态码 + 大小）
             self.logger.debug(
-                f"[HTTP] {request.url} {httpx_response.status_code} ({len(body)}B)"
+                f"[HTTP] {request.url} {httpx_response.status_code} ({response.body_size}B)"
             )
 
-            # 构造并返回 Response
-            return self.structure_response(request=request, response=httpx_response, body=body)
+            return response
 
         except HTTPStatusError as e:
             # HTTP 状态码错误（4xx/5xx）：返回 Response 由上层处理
@@ -382,18 +486,45 @@ class HttpXDownloader(DownloaderBase):
             raise  # 重新抛出异常
 
         finally:
-            # 清理：关闭临时客户端（如果存在）
-            if temp_client:
+            # 归还代理客户端（被淘汰且无人使用时在此关闭）
+            if proxy_entry is not None:
                 try:
-                    await temp_client.aclose()
+                    await self._proxy_clients.release(proxy_entry)
                 except Exception as e:
-                    self.logger.warning(f"Error closing temporary client: {e}")
+                    self.logger.warning(f"Error releasing proxy client: {e}")
             
             # 释放并发槽位
             if self._semaphore:
                 self._active_requests -= 1
                 self._semaphore.release()
 
+    @staticmethod
+    async def _send_streaming(client: httpx.AsyncClient, kwargs: dict) -> httpx.Response:
+        """以 stream=True 发送请求（与 client.request(**kwargs) 等价，但不读取响应体）"""
+        kwargs = dict(kwargs)
+        send_kwargs = {"stream": True, "follow_redirects": kwargs.pop("follow_redirects")}
+        if "auth" in kwargs:
+            send_kwargs["auth"] = kwargs.pop("auth")
+        return await client.send(client.build_request(**kwargs), **send_kwargs)
+
+    @staticmethod
+    async def _read_streaming(request, httpx_response: httpx.Response, spool) -> Response:
+        """分块读取响应体到 BodySpool（超过阈值落盘），读完后关闭响应"""
+        try:
+            async for chunk in httpx_response.aiter_bytes(64 * 1024):
+                await spool.write(chunk)
+            return await spool.to_response(
+                str(httpx_response.url),
+                headers=dict(httpx_response.headers),
+                status=httpx_response.status_code,
+                request=request,
+            )
+        except BaseException:
+            await spool.discard()
+            raise
+        finally:
+            await httpx_response.aclose()
+
     @staticmethod
     def structure_response(request, response: httpx.Response, body: bytes) -> Response:
         """构造框架标准的 Response 对象"""
@@ -406,7 +537,12 @@ class HttpXDownloader(DownloaderBase):
         )
 
     async def close(self) -> None:
-        """关闭下载器，释放主客户端资源"""
+        """关闭下载器，释放主客户端与缓存的代理客户端资源"""
+        if self._proxy_clients is not None:
+            try:
+                await self._proxy_clients.close()
+            except Exception as e:
+                self.logger.warning(f"Error during proxy clients close: {e}")
         if self._client:
             self.logger.debug("Closing HttpXDownloader client...")
             try:
@@ -25,12 +25,32 @@ Collaboration model:
 import importlib
 from typing import Optional, Dict, Type, List
 import re
-from urllib.parse import urlparse
+from urllib.parse import urlsplit
 
 from crawlo.downloader import DownloaderBase
 from crawlo.http.request import Request
 from crawlo.http.response import Response
 from crawlo.logging import get_logger
+from crawlo.utils.host_matcher import HostMatcher
+
+# 静态资源扩展名（直接走协议下载器）
+STATIC_EXTENSIONS = frozenset({'.js', '.css', '.jpg', '.jpeg', '.png', '.gif', '.ico', '.pdf', '.zip', '.doc', '.docx'})
+
+# 含反向引用的模式合并后组号会偏移，不参与合并
+_BACKREFERENCE = re.compile(r'\\[1-9]|\(\?P=')
+
+
+def _combine_patterns(patterns: List[re.Pattern]) -> Optional[re.Pattern]:
+    """把多个 URL 正则合并为一个交替正则（一次 search 代替逐条扫描）；无法安全合并时返回 None"""
+    if not patterns:
+        return None
+    if any(p.flags & ~re.UNICODE or _BACKREFERENCE.search(p.pattern) for p in patterns):
+        return None
+    try:
+        return re.compile('|'.join(f'(?:{p.pattern})' for p in patterns))
+    except re.error:
+        # 如模式中间含全局内联标志、重复的命名组
+        return None
 
 
 class HybridDownloader(DownloaderBase):
@@ -70,9 +90,18 @@ class HybridDownloader(DownloaderBase):
             re.compile(p) for p in crawler.settings.get_list("HYBRID_PROTOCOL_URL_PATTERNS", [])
         ]
 
+        self._dynamic_url_regex = _combine_patterns(self.dynamic_url_patterns)
+        self._protocol_url_regex = _combine_patterns(self.protocol_url_patterns)
+
         # Domain configuration
         self.dynamic_domains = set(crawler.settings.get_list("HYBRID_DYNAMIC_DOMAINS", []))
         self.protocol_domains = set(crawler.settings.get_list("HYBRID_PROTOCOL_DOMAINS", []))
+        # 主机名精确匹配（忽略端口与大小写，IDNA 归一化）；同时配置时动态优先
+        self._domain_matcher = HostMatcher(include_subdomains=False)
+        for domain in self.protocol_domains:
+            self._domain_matcher.add(domain, "protocol")
+        for domain in self.dynamic_domains:
+            self._domain_matcher.add(domain, "dynamic")
 
         # Enable smart detection logging
         self.verbose_logging = crawler.settings.get_bool("HYBRID_VERBOSE_LOGGING", False)
@@ -167,8 +196,6 @@ class HybridDownloader(DownloaderBase):
             "protocol" - 使用协议下载器
         """
         url = request.url
-        parsed_url = urlparse(url)
-        domain = parsed_url.netloc.lower()
 
         # 1. 检查请求标记（最高优先级，由 DynamicRenderMiddleware 或用户设置）
         if request.meta.get("use_dynamic_loader"):
@@ -183,37 +210,33 @@ class HybridDownloader(DownloaderBase):
             return "protocol"
 
         # 2. 检查URL模式配置（使用正则表达式匹配）
-        for pattern in self.dynamic_url_patterns:
-            if pattern.search(url):
-                detection_reason = f"url_pattern:dynamic:{pattern.pattern}"
-                if self.verbose_logging:
-                    self.logger.debug(f"[Hybrid] {url} -> dynamic (reason: {detection_reason})")
-                return "dynamic"
-
-        for pattern in self.protocol_url_patterns:
-            if pattern.search(url):
-                detection_reason = f"url_pattern:protocol:{pattern.pattern}"
-                if self.verbose_logging:
-                    self.logger.debug(f"[Hybrid] {url} -> protocol (reason: {detection_reason})")
-                return "protocol"
+        for downloader_type, combined, patterns in (
+            ("dynamic", self._dynamic_url_regex, self.dynamic_url_patterns),
+            ("protocol", self._protocol_url_regex, self.protocol_url_patterns),
+        ):
+            if combined is not None and not self.verbose_logging:
+                if combined.search(url):
+                    return downloader_type
+                continue
+            for pattern in patterns:
+                if pattern.search(url):
+                    detection_reason = f"url_pattern:{downloader_type}:{pattern.pattern}"
+                    if self.verbose_logging:
+                        self.logger.debug(f"[Hybrid] {url} -> {downloader_type} (reason: {detection_reason})")
+                    return downloader_type
 
         # 3. 检查域名配置
-        if domain in self.dynamic_domains:
-            detection_reason = f"domain_config:dynamic:{domain}"
+        downloader_type = self._domain_matcher.lookup_url(url)
+        if downloader_type is not None:
             if self.verbose_logging:
-                self.logger.debug(f"[Hybrid] {url} -> dynamic (reason: {detection_reason})")
-            return "dynamic"
-
-        if domain in self.protocol_domains:
-            detection_reason = f"domain_config:protocol:{domain}"
-            if self.verbose_logging:
-                self.logger.debug(f"[Hybrid] {url} -> protocol (reason: {detection_reason})")
-            return "protocol"
+                detection_reason = f"domain_config:{downloader_type}:{urlsplit(url).hostname}"
+                self.logger.debug(f"[Hybrid] {url} -> {downloader_type} (reason: {detection_reason})")
+            return downloader_type
 
         # 4. 检查文件扩展名（静态资源通常有特定扩展名）
-        path = parsed_url.path.lower()
-        static_extensions = {'.js', '.css', '.jpg', '.jpeg', '.png', '.gif', '.ico', '.pdf', '.zip', '.doc', '.docx'}
-        if any(path.endswith(ext) for ext in static_extensions):
+        path = urlsplit(url).path
+        dot = path.rfind('.')
+        if dot >= 0 and path[dot:].lower() in STATIC_EXTENSIONS:
             detection_reason = "file_extension:static"
             if self.verbose_logging:
                 self.logger.debug(f"[Hybrid] {url} -> protocol (reason: {detection_reason})")
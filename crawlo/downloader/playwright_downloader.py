@@ -29,6 +29,8 @@ from crawlo.downloader.stealth import StealthMixin
 from crawlo.downloader.playwright_context import ContextProxyMixin
 from crawlo.downloader.playwright_actions import PageActionsMixin
 from crawlo.downloader.playwright_pool import PagePoolMixin
+from crawlo.downloader.context_pool import BrowserContextPool, ContextPoolMixin
+from crawlo.downloader.resource_blocker import ResourceBlocker
 from crawlo.downloader.wait_strategies import SmartWaitMixin, WaitStrategy
 from crawlo.downloader.constants import (
     DEFAULT_ARGS, STEALTH_ARGS, HARMFUL_ARGS,
@@ -47,7 +49,7 @@ from crawlo.utils.misc import (
 
 class PlaywrightDownloader(
     DownloaderBase, SmartWaitMixin, StealthMixin,
-    ContextProxyMixin, PageActionsMixin, PagePoolMixin,
+    ContextProxyMixin, PageActionsMixin, PagePoolMixin, ContextPoolMixin,
 ):
     """
     基于 Playwright 的动态内容下载器
@@ -67,7 +69,7 @@ class PlaywrightDownloader(
         self.context: Optional[BrowserContext] = None
         self.logger = get_logger(self.__class__.__name__)
 
-        # 当前上下文使用的代理（用于检测代理变化，触发 Context 重建）
+        # 默认上下文使用的代理（请求代理与之不同时路由到上下文池）
         self._current_proxy = None
 
         s = crawler.settings
@@ -91,6 +93,7 @@ class PlaywrightDownloader(
         self.browser_type = s.get("PLAYWRIGHT_BROWSER_TYPE", "chromium").lower()
         self.single_browser_mode = s.get_bool("PLAYWRIGHT_SINGLE_BROWSER_MODE", True)
         self.max_pages_per_browser = get_browser_config_int(s, "PLAYWRIGHT", "MAX_PAGES", 10)
+        self.max_contexts = get_browser_config_int(s, "PLAYWRIGHT", "MAX_CONTEXTS", 8)
         self.block_ads = s.get_bool("PLAYWRIGHT_BLOCK_ADS", True)
         self.block_webrtc = s.get_bool("PLAYWRIGHT_BLOCK_WEBRTC", False)
         self.hide_canvas = s.get_bool("PLAYWRIGHT_HIDE_CANVAS", False)
@@ -107,6 +110,17 @@ class PlaywrightDownloader(
         self._page_semaphore_lock = asyncio.Lock()  # 信号量操作锁，防止竞态条件
         self._init_lock = asyncio.Lock()  # 浏览器初始化锁，防止并发重复初始化
 
+        # 资源屏蔽：规则预编译一次，路由按上下文安装
+        self._resource_blocker = ResourceBlocker.from_settings(s, "PLAYWRIGHT", logger=self.logger)
+
+        # 按代理的上下文池（每个上下文独立页面池；非单浏览器模式下页面用完即关）
+        self._context_pool = BrowserContextPool(
+            self._create_pooled_context,
+            max_contexts=self.max_contexts,
+            max_pages=self.max_pages_per_browser if self.single_browser_mode else None,
+            logger=self.logger,
+        )
+
     def open(self):
         super().open()
         self.logger.info("Opening PlaywrightDownloader")
@@ -124,17 +138,15 @@ class PlaywrightDownloader(
                         self.logger.error(f"Failed to initialize Playwright for {request.url}: {e}")
                         return None
 
-        # 检测代理变化：如果 request.proxy 与当前 Context 的代理不同，重建 Context
-        await self._check_proxy_change(request)
-
         start_time = None
         if self.crawler.settings.get_bool("DOWNLOAD_STATS", True):
             start_time = time.time()
 
+        entry = None
         page: Optional[Page] = None
         try:
-            # 获取页面（支持单浏览器多标签页模式）
-            page = await self._get_page()
+            # 按请求代理获取页面（默认上下文或上下文池中对应代理的上下文）
+            entry, page = await self._acquire_routed_page(request)
 
             # 设置超时
             page.set_default_timeout(self.default_timeout)
@@ -191,7 +203,7 @@ class PlaywrightDownloader(
             headers = dict(response.headers) if response else {}
 
             # 获取 Cookies
-            cookies = await self._get_cookies()
+            cookies = await self._get_cookies(entry.context if entry else None)
 
             # 构造响应对象
             crawlo_response = Response(
@@ -220,7 +232,8 @@ class PlaywrightDownloader(
         finally:
             # 归还页面到池中
             if page:
-                await self._release_page(page)
+                await self._resource_blocker.deactivate(page)
+                await self._release_routed_page(entry, page)
 
     async def _initialize_playwright(self):
         """初始化 Playwright（代理不再在 launch 级设置，移至 Context 级）"""
@@ -269,6 +282,7 @@ class PlaywrightDownloader(
 
             # 创建浏览器上下文（代理在 Context 级设置）
             self.context = await self._create_context(proxy_config)
+            self._current_proxy = proxy_config
 
             # 初始化页面池信号量
             if self.single_browser_mode:
@@ -283,11 +297,12 @@ class PlaywrightDownloader(
             self.logger.error(f"Failed to initialize Playwright: {e}")
             raise
 
-    async def _get_cookies(self) -> Dict[str, str]:
-        """获取 Cookies"""
+    async def _get_cookies(self, context=None) -> Dict[str, str]:
+        """获取 Cookies（context 为空时读取默认上下文）"""
+        context = context or self.context
         try:
-            if self.context:
-                playwright_cookies = await self.context.cookies()
+            if context:
+                playwright_cookies = await context.cookies()
                 return {cookie['name']: cookie['value'] for cookie in playwright_cookies}
             return {}
         except Exception as e:
@@ -309,6 +324,9 @@ class PlaywrightDownloader(
                 self._page_pool.clear()
                 self._used_pages.clear()
             
+            # 关闭上下文池中按代理创建的上下文
+            await self._context_pool.close()
+
             # 关闭上下文（会自动关闭所有临时标签页）
             if self.context:
                 try:
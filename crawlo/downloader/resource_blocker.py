@@ -0,0 +1,427 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+浏览器资源屏蔽器
+==============
+PlaywrightDownloader / CloakBrowserDownloader 共用的预编译屏蔽规则：
+
+- 资源类型位掩码：一次整数按位与代替集合查找
+- 域名后缀集合：按标签边界逐级查找（a.b.example.com → b.example.com → example.com），
+  每个子资源最多做 标签数 次集合查找，而不是对黑名单逐条做子串扫描
+- EasyList 风格规则（可选）：``||host^`` 并入域名集合，其余规则按资源类型分组
+  合并成一个正则；支持 ``@@`` 例外规则与资源类型选项（``$image,script`` / ``$~image``）
+
+路由在每个 BrowserContext 上安装一次（``context.route``），页面只在下载过程中
+登记自己使用的屏蔽器；未登记的页面直接放行。
+
+原生模式（BROWSER_BLOCK_NATIVE，仅 Chromium）：通过 CDP ``Network.setBlockedURLs``
+把可以用 URL 通配符表达的部分（域名、规则、按扩展名映射的资源类型）交给浏览器处理，
+这些请求不再经过 Python；无法表达的部分（如 xhr/fetch 类型、带类型选项的规则）
+仍走上下文路由。
+"""
+from __future__ import annotations
+
+import re
+import weakref
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from crawlo.core.errors import NotConfiguredError
+from crawlo.downloader.constants import AD_DOMAINS
+from crawlo.logging import get_logger
+from crawlo.utils.host_matcher import url_host
+from crawlo.utils.misc import get_browser_config, get_browser_config_bool
+
+# ==================== 资源类型位掩码 ====================
+
+RESOURCE_TYPE_BITS: Dict[str, int] = {
+    name: 1 << i for i, name in enumerate((
+        "document", "stylesheet", "image", "media", "font", "script",
+        "texttrack", "xhr", "fetch", "eventsource", "websocket", "manifest",
+        "other", "beacon", "ping", "object", "imageset", "csp_report",
+    ))
+}
+ALL_TYPES = (1 << len(RESOURCE_TYPE_BITS)) - 1
+
+# EasyList 资源类型选项 → Playwright resource_type
+_OPTION_TYPES = {
+    "document": ("document",),
+    "subdocument": ("document",),
+    "stylesheet": ("stylesheet",),
+    "image": ("image", "imageset"),
+    "media": ("media",),
+    "font": ("font",),
+    "script": ("script",),
+    "xmlhttprequest": ("xhr", "fetch"),
+    "websocket": ("websocket",),
+    "ping": ("ping", "beacon"),
+    "object": ("object",),
+    "other": ("other", "texttrack", "eventsource", "manifest", "csp_report"),
+}
+
+# 原生模式下按扩展名近似匹配的资源类型（未列出的类型仍走上下文路由）
+NATIVE_TYPE_EXTENSIONS = {
+    "image": ("png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico", "bmp"),
+    "font": ("woff", "woff2", "ttf", "otf", "eot"),
+    "media": ("mp4", "webm", "mp3", "ogg", "wav", "m4a", "m3u8"),
+    "stylesheet": ("css",),
+    "script": ("js", "mjs"),
+}
+
+_HOST_RULE = re.compile(r"^\|\|([a-z0-9.-]+)\^$")
+_SEPARATOR = r"(?:[^\w.%-]|$)"
+
+
+def type_mask(resource_types: Iterable[str]) -> int:
+    """资源类型集合 → 位掩码（未知类型忽略）"""
+    mask = 0
+    for name in resource_types or ():
+        mask |= RESOURCE_TYPE_BITS.get(name, 0)
+    return mask
+
+
+# ==================== 规则解析 ====================
+
+class RuleSet:
+    """解析后的 EasyList 风格规则（不可变，可合并）"""
+
+    __slots__ = ("domains", "block", "allow", "native", "skipped")
+
+    def __init__(self, domains=frozenset(), block=(), allow=(), native=(), skipped=0):
+        self.domains: FrozenSet[str] = frozenset(domains)
+        self.block: Tuple[Tuple[int, str], ...] = tuple(block)   # (类型掩码, 正则源码)
+        self.allow: Tuple[Tuple[int, str], ...] = tuple(allow)
+        # 可由浏览器原生处理的 URL 通配符；None 表示规则集无法完整用通配符表达
+        self.native: Optional[Tuple[str, ...]] = None if native is None else tuple(native)
+        self.skipped = skipped
+
+    def __add__(self, other: "RuleSet") -> "RuleSet":
+        native = None if self.native is None or other.native is None else self.native + other.native
+        return RuleSet(self.domains | other.domains, self.block + other.block, self.allow + other.allow,
+                       native, self.skipped + other.skipped)
+
+    def __bool__(self) -> bool:
+        return bool(self.domains or self.block)
+
+    def native_patterns(self) -> Optional[Tuple[str, ...]]:
+        """域名 + 规则对应的原生通配符；有例外规则时返回 None（通配符无法表达例外）"""
+        if self.allow or self.native is None:
+            return None
+        patterns = []
+        for host in sorted(self.domains):
+            patterns += [f"*://{host}/*", f"*://*.{host}/*"]
+        return tuple(patterns) + self.native
+
+
+def _rule_regex(pattern: str) -> str:
+    """EasyList 匹配模式 → 正则源码"""
+    prefix = suffix = ""
+    if pattern.startswith("||"):
+        prefix, pattern = r"^[a-z][a-z0-9+.-]*://(?:[^/?#]*\.)?", pattern[2:]
+    elif pattern.startswith("|"):
+        prefix, pattern = "^", pattern[1:]
+    if pattern.endswith("|"):
+        suffix, pattern = "$", pattern[:-1]
+    body = "".join(
+        ".*" if c == "*" else _SEPARATOR if c == "^" else re.escape(c)
+        for c in pattern
+    )
+    return prefix + body + suffix
+
+
+def _rule_native(pattern: str) -> Optional[Tuple[str, ...]]:
+    """EasyList 匹配模式 → CDP 通配符；含中间分隔符 ^ 的规则无法表达时返回 None"""
+    if pattern.endswith("^"):
+        pattern = pattern[:-1] + "*"
+    if "^" in pattern:
+        return None
+    if pattern.endswith("|"):
+        pattern = pattern[:-1]
+    elif not pattern.endswith("*"):
+        pattern += "*"
+    if pattern.startswith("||"):
+        rest = pattern[2:]
+        return f"*://{rest}", f"*://*.{rest}"
+    if pattern.startswith("|"):
+        return (pattern[1:],)
+    return (pattern if pattern.startswith("*") else "*" + pattern,)
+
+
+def _parse_options(text: str) -> Optional[int]:
+    """解析 $ 选项，返回资源类型掩码；含不支持的选项时返回 None"""
+    include = exclude = 0
+    for option in text.split(","):
+        option = option.strip().lower()
+        negated = option.startswith("~")
+        name = option[1:] if negated else option
+        if name == "match-case":
+            continue
+        if name not in _OPTION_TYPES:
+            return None
+        bits = type_mask(_OPTION_TYPES[name])
+        if negated:
+            exclude |= bits
+        else:
+            include |= bits
+    return (include or ALL_TYPES) & ~exclude
+
+
+def parse_rules(lines: Iterable[str]) -> RuleSet:
+    """
+    解析 EasyList 风格规则
+
+    支持：``||host^``、``||host/path``、``|https://...``、``*`` 通配、``^`` 分隔符、
+    ``@@`` 例外、资源类型选项。注释、元素隐藏规则跳过；正则规则与
+    ``domain=`` / ``third-party`` 等选项不支持，计入 skipped（不屏蔽）。
+    """
+    domains, block, allow, native = set(), [], [], []
+    native_ok = True
+    skipped = 0
+    for raw in lines:
+        line = raw.strip()
+        if not line or line.startswith(("!", "[")) or "##" in line or "#@#" in line or "#?#" in line:
+            continue
+        exception = line.startswith("@@")
+        if exception:
+            line = line[2:]
+        mask = ALL_TYPES
+        if "$" in line:
+            line, _, options = line.rpartition("$")
+            mask = _parse_options(options)
+            if mask is None:
+                skipped += 1
+                continue
+        line = line.lower()
+        if not line or (line.startswith("/") and line.endswith("/") and len(line) > 1):
+            skipped += 1
+            continue
+
+        host = _HOST_RULE.match(line)
+        if host and not exception and mask == ALL_TYPES:
+            domains.add(host.group(1))
+            continue
+
+        (allow if exception else block).append((mask, _rule_regex(line)))
+        if not exception:
+            patterns = _rule_native(line) if mask == ALL_TYPES else None
+            if patterns is None:
+                native_ok = False
+            else:
+                native.extend(patterns)
+    return RuleSet(domains, block, allow, native if native_ok else None, skipped)
+
+
+def _ad_rules() -> RuleSet:
+    # 内置广告黑名单：纯域名按域名后缀匹配，带路径的条目（如 facebook.com/tr）按前缀规则匹配
+    return parse_rules(f"||{d}" if "/" in d else f"||{d}^" for d in AD_DOMAINS)
+
+
+AD_RULES = _ad_rules()
+
+
+def load_block_rules(settings, prefix: str) -> RuleSet:
+    """
+    读取 {PREFIX|BROWSER}_BLOCK_RULES（规则列表或多行字符串）与 _BLOCK_RULES_FILE（EasyList 文件）
+    """
+    lines: List[str] = []
+    rules = get_browser_config(settings, prefix, "BLOCK_RULES", None)
+    if isinstance(rules, str):
+        lines.extend(rules.splitlines())
+    elif rules:
+        lines.extend(rules)
+
+    path = get_browser_config(settings, prefix, "BLOCK_RULES_FILE", None)
+    if path:
+        try:
+            with open(path, encoding="utf-8") as f:
+                lines.extend(f.read().splitlines())
+        except OSError as e:
+            raise NotConfiguredError(f"Cannot read block rules file {path}: {e}") from e
+    return parse_rules(lines)
+
+
+# ==================== 编译后的屏蔽器 ====================
+
+class CompiledBlocker:
+    """资源类型掩码 + 规则集，编译一次后按 (url, resource_type) 判定"""
+
+    __slots__ = ("mask", "rules", "_domains", "_block", "_allow", "_native")
+
+    def __init__(self, mask: int = 0, rules: RuleSet = RuleSet()):
+        self.mask = mask
+        self.rules = rules
+        self._domains = rules.domains
+        self._block = self._group(rules.block)
+        self._allow = self._group(rules.allow)
+        self._native = None
+
+    @staticmethod
+    def _group(rules) -> Tuple[Tuple[int, "re.Pattern"], ...]:
+        # 同一类型掩码的规则合并为一个正则，判定时每组只做一次 search
+        groups: Dict[int, List[str]] = {}
+        for mask, source in rules:
+            groups.setdefault(mask, []).append(source)
+        return tuple((mask, re.compile("|".join(sources), re.IGNORECASE)) for mask, sources in groups.items())
+
+    def __bool__(self) -> bool:
+        return bool(self.mask or self.rules)
+
+    def _match_domain(self, url: str) -> bool:
+        domains = self._domains
+        if not domains:
+            return False
+        host = url_host(url)
+        if host in domains:
+            return True
+        i = host.find(".")
+        while i >= 0:
+            if host[i + 1:] in domains:
+                return True
+            i = host.find(".", i + 1)
+        return False
+
+    def _match(self, groups, url: str, bit: int) -> bool:
+        for mask, regex in groups:
+            if mask & bit and regex.search(url):
+                return True
+        return False
+
+    def blocks(self, url: str, resource_type: str) -> bool:
+        """是否屏蔽该请求"""
+        bit = RESOURCE_TYPE_BITS.get(resource_type, 0)
+        if self.mask & bit:
+            return True
+        if not (self._match_domain(url) or self._match(self._block, url, bit)):
+            return False
+        return not (self._allow and self._match(self._allow, url, bit))
+
+    def native_split(self) -> Tuple[Tuple[str, ...], "CompiledBlocker"]:
+        """
+        拆分为 (浏览器原生通配符, 仍需 Python 路由判定的剩余部分)
+
+        资源类型按扩展名映射；规则集仅在能完整用通配符表达且无例外规则时整体交给浏览器。
+        """
+        if self._native is None:
+            self._native = self._native_split()
+        return self._native
+
+    def _native_split(self):
+        patterns: List[str] = []
+        residual_mask = self.mask
+        for name, extensions in NATIVE_TYPE_EXTENSIONS.items():
+            bit = RESOURCE_TYPE_BITS[name]
+            if self.mask & bit:
+                residual_mask &= ~bit
+                for ext in extensions:
+                    patterns += [f"*.{ext}", f"*.{ext}?*"]
+        # imageset 与 image 一并按扩展名处理
+        if self.mask & RESOURCE_TYPE_BITS["image"]:
+            residual_mask &= ~RESOURCE_TYPE_BITS["imageset"]
+
+        rule_patterns = self.rules.native_patterns() if self.rules else ()
+        if rule_patterns is None:
+            return tuple(patterns), CompiledBlocker(residual_mask, self.rules)
+        return tuple(patterns) + rule_patterns, CompiledBlocker(residual_mask)
+
+
+# ==================== 上下文级路由 ====================
+
+class ResourceBlocker:
+    """
+    按上下文安装一次路由、按页面登记屏蔽器
+
+    - compile(types, block_ads)：按配置组合缓存 CompiledBlocker（请求级覆盖也只编译一次）
+    - activate(page, blocker)：登记页面屏蔽器，首次遇到该页面所属上下文时安装路由
+    - deactivate(page)：页面归还前注销，之后该页面的请求直接放行
+    """
+
+    def __init__(self, rules: RuleSet = RuleSet(), native: bool = False, logger=None):
+        self.rules = rules
+        self.native = native
+        self.logger = logger or get_logger(self.__class__.__name__)
+        self._cache: Dict[tuple, CompiledBlocker] = {}
+        self._page_blockers = weakref.WeakKeyDictionary()
+        self._native_pages = weakref.WeakKeyDictionary()  # page -> (cdp_session, 已下发的通配符)
+        self._routed_contexts = weakref.WeakSet()
+        if rules.skipped:
+            self.logger.warning(f"{rules.skipped} block rules use unsupported syntax and were ignored")
+
+    @classmethod
+    def from_settings(cls, settings, prefix: str, logger=None) -> "ResourceBlocker":
+        return cls(
+            rules=load_block_rules(settings, prefix),
+            native=get_browser_config_bool(settings, prefix, "BLOCK_NATIVE", False),
+            logger=logger,
+        )
+
+    def compile(self, resource_types: Iterable[str], block_ads: bool = False) -> CompiledBlocker:
+        """编译（并缓存）资源类型 + 广告黑名单 + 自定义规则"""
+        key = (frozenset(resource_types or ()), bool(block_ads))
+        blocker = self._cache.get(key)
+        if blocker is None:
+            rules = AD_RULES + self.rules if block_ads else self.rules
+            blocker = self._cache[key] = CompiledBlocker(type_mask(key[0]), rules)
+        return blocker
+
+    async def activate(self, page, blocker: CompiledBlocker):
+        """为页面启用屏蔽器（空屏蔽器等同于 deactivate）"""
+        if not blocker:
+            await self.deactivate(page)
+            return
+        routed = blocker
+        if self.native:
+            patterns, residual = blocker.native_split()
+            if await self._set_native(page, patterns):
+                routed = residual
+        if routed:
+            await self._ensure_route(page.context)
+            self._page_blockers[page] = routed
+        else:
+            self._page_blockers.pop(page, None)
+
+    async def deactivate(self, page):
+        """注销页面屏蔽器"""
+        self._page_blockers.pop(page, None)
+        if page in self._native_pages:
+            await self._set_native(page, ())
+
+    async def _ensure_route(self, context):
+        if context in self._routed_contexts:
+            return
+        # 先登记再 await，避免同一上下文并发安装两次
+        self._routed_contexts.add(context)
+        try:
+            await context.route("**/*", self._route)
+        except BaseException:
+            self._routed_contexts.discard(context)
+            raise
+
+    async def _route(self, route):
+        request = route.request
+        blocker = None
+        try:
+            blocker = self._page_blockers.get(request.frame.page)
+        except Exception as e:
+            # Service Worker 发起的请求没有 frame
+            self.logger.debug("Suppressed exception: %s", e)
+        if blocker is not None and blocker.blocks(request.url, request.resource_type):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _set_native(self, page, patterns: Tuple[str, ...]) -> bool:
+        """通过 CDP 下发原生屏蔽列表；失败时关闭原生模式并返回 False"""
+        session, current = self._native_pages.get(page, (None, ()))
+        if patterns == current:
+            return True
+        try:
+            if session is None:
+                session = await page.context.new_cdp_session(page)
+                await session.send("Network.enable")
+            await session.send("Network.setBlockedURLs", {"urls": list(patterns)})
+        except Exception as e:
+            self.logger.warning(f"Browser-native request blocking unavailable ({e}), using context routes")
+            self.native = False
+            self._native_pages.pop(page, None)
+            return False
+        self._native_pages[page] = (session, patterns)
+        return True
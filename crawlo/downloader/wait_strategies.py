@@ -6,12 +6,9 @@ Playwright 智能等待策略 Mixin
 提取自 PlaywrightDownloader，包含：
 - WaitStrategy / ResourceType 枚举常量
 - 智能等待（网络空闲、DOM 就绪、SPA 检测）
-- 资源屏蔽（图片/CSS/字体/广告）
+- 资源屏蔽（图片/CSS/字体/广告，规则见 resource_blocker）
 - 自动滚动（懒加载内容）
 """
-from urllib.parse import urlparse
-
-from crawlo.downloader.constants import AD_DOMAINS
 from crawlo.constants import BROWSER_ELEMENT_WAIT_TIMEOUT_MS, BROWSER_NETWORK_IDLE_TIMEOUT_MS
 
 
@@ -174,38 +171,16 @@ class SmartWaitMixin:
     # ==================== 资源屏蔽 ====================
 
     async def _setup_resource_blocking(self, page, request):
-        """设置资源屏蔽"""
-        # 获取请求级别的资源屏蔽配置
+        """
+        设置资源屏蔽
+
+        路由由 self._resource_blocker 在页面所属上下文上安装一次，
+        这里只按请求级配置登记当前页面的（预编译、已缓存的）屏蔽器。
+        """
         block_resources = request.meta.get("playwright_block_resources", self.block_resources)
         block_ads = request.meta.get("playwright_block_ads", self.block_ads)
-
-        if not block_resources and not block_ads:
-            return
-
-        async def route_handler(route):
-            request_obj = route.request
-            resource_type = request_obj.resource_type
-            url = request_obj.url
-
-            # 检查是否为广告
-            if block_ads:
-                parsed_url = urlparse(url)
-                domain = parsed_url.netloc.lower()
-                # 检查域名是否在广告黑名单中
-                for ad_domain in AD_DOMAINS:
-                    if ad_domain in domain:
-                        await route.abort()
-                        return
-
-            # 检查资源类型是否需要屏蔽
-            if resource_type in block_resources:
-                await route.abort()
-                return
-
-            # 允许其他资源
-            await route.continue_()
-
-        await page.route("**/*", route_handler)
+        blocker = self._resource_blocker.compile(block_resources, block_ads)
+        await self._resource_blocker.activate(page, blocker)
 
     # ==================== 自动滚动 ====================
 
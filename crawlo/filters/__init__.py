@@ -8,6 +8,7 @@ Provides multiple request deduplication filter implementations.
 Filter Types:
 - MemoryFilter: Memory-based deduplication, suitable for standalone mode
 - AioRedisFilter: Redis-based distributed deduplication, suitable for distributed mode
+- RedisBloomFilter: Redis bitmap scalable Bloom filter, for very large distributed crawls
 - MemoryFileFilter: Memory + file persistence, suitable for restart recovery scenarios
 
 Core Interface:
@@ -167,12 +168,19 @@ try:
 except ImportError:
     AioRedisFilter = None
 
+try:
+    from .redis_bloom_filter import RedisBloomFilter
+    __all__.append('RedisBloomFilter')
+except ImportError:
+    RedisBloomFilter = None
+
 # Provide convenient filter mapping
 FILTER_MAP = {
     'memory': MemoryFilter,
     'memory_file': MemoryFileFilter,
     'redis': AioRedisFilter,
     'aioredis': AioRedisFilter,  # 别名
+    'redis_bloom': RedisBloomFilter,
 }
 
 # Filter out unavailable filters
@@ -1,5 +1,5 @@
 import asyncio
-from typing import Optional, Dict, Any, TYPE_CHECKING
+from typing import Optional, Dict, Any, List, Sequence, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from crawlo.crawler import Crawler
@@ -30,6 +30,7 @@ class AioRedisFilter(BaseFilter):
     - Distributed deduplication across multiple nodes
     - TTL auto-expiration and cleanup
     - Pipeline batch operations for performance
+    - Atomic check-and-add (single SADD round trip, see ``atomic``)
     - Fault tolerance and connection pool management
     - Redis cluster support
     """
@@ -41,7 +42,8 @@ class AioRedisFilter(BaseFilter):
             stats: Optional[Dict[str, Any]] = None,
             debug: bool = False,
             log_level: int = 20,  # logging.INFO
-            ttl: Optional[int] = None
+            ttl: Optional[int] = None,
+            atomic: bool = True
     ) -> None:
         """
         Initialize Redis filter
@@ -53,6 +55,8 @@ class AioRedisFilter(BaseFilter):
             debug: Enable debug mode
             log_level: Log level
             ttl: Fingerprint expiration time (seconds)
+            atomic: Use SADD return value as the duplicate check (one round trip,
+                atomic across workers) instead of SISMEMBER + SADD + EXPIRE
         """
         self.logger = get_logger(self.__class__.__name__)
         super().__init__(self.logger, stats, debug)
@@ -60,6 +64,7 @@ class AioRedisFilter(BaseFilter):
         self.redis_key: str = redis_key
         self.redis = client
         self.ttl: Optional[int] = ttl
+        self.atomic: bool = atomic
         
         # Save connection pool reference (for lazy initialization)
         self._redis_pool: Optional[RedisConnectionPool] = None
@@ -125,6 +130,9 @@ class AioRedisFilter(BaseFilter):
         # Get debug configuration
         debug = safe_get_config(settings, 'FILTER_DEBUG', False, bool)
         log_level = safe_get_config(settings, 'LOG_LEVEL_NUM', 20, int)  # 默认INFO级别
+
+        # 原子判重：SADD 返回值即判重结果（单次往返）
+        atomic = safe_get_config(settings, 'REDIS_FILTER_ATOMIC', True, bool)
         
         # Create filter instance
         instance = cls(
@@ -133,7 +141,8 @@ class AioRedisFilter(BaseFilter):
             stats=crawler.stats,
             ttl=ttl,
             debug=debug,
-            log_level=log_level
+            log_level=log_level,
+            atomic=atomic
         )
 
         # 去重指纹可配置纳入的 header / meta（默认空 = 不参与，见 BaseFilter._get_fingerprint）
@@ -221,6 +230,43 @@ class AioRedisFilter(BaseFilter):
         else:
             return operation_func(cluster_mode=False, *args, **kwargs)
 
+    def _effective_key(self) -> str:
+        """
+        Get the fingerprint set key (cluster mode appends the ``{filter}`` hash tag)
+        
+        Returns:
+            str: Redis key actually used for SADD / SISMEMBER
+        """
+        if self._is_cluster_mode():
+            return f"{self.redis_key}{{filter}}"
+        return self.redis_key
+
+    async def _check_and_add_async(self, redis_client, fp: str) -> bool:
+        """
+        Atomic check-and-add in a single round trip
+        
+        SADD 返回 1 表示新指纹、0 表示已存在，判重与写入由 Redis 单条命令完成，
+        多 Worker 并发时不存在 SISMEMBER → SADD 之间的竞争窗口。
+        配置了 TTL 时 EXPIRE 与 SADD 放在同一个 pipeline 中发出。
+        
+        Args:
+            redis_client: Redis client instance
+            fp: Request fingerprint string
+            
+        Returns:
+            True if duplicate, False if newly added
+        """
+        key = self._effective_key()
+        if self.ttl and self.ttl > 0:
+            pipe = redis_client.pipeline()
+            pipe.sadd(key, fp)
+            pipe.expire(key, self.ttl)
+            added, _ = await pipe.execute()
+            self._pipeline_operations += 1
+        else:
+            added = await redis_client.sadd(key, fp)
+        return added != 1
+
     def requested(self, request: 'Request') -> bool:
         """
         Check if request already exists (synchronous method)
@@ -261,6 +307,12 @@ class AioRedisFilter(BaseFilter):
             fp = str(self._get_fingerprint(request))
             self._redis_operations += 1
 
+            if self.atomic:
+                is_duplicate = await self._check_and_add_async(redis_client, fp)
+                if is_duplicate and self.debug:
+                    self.logger.debug(f"Found duplicate request: {fp}")
+                return is_duplicate
+
             # 定义检查指纹是否存在的操作
             def _check_fingerprint_operation(cluster_mode=False):
                 if cluster_mode:
@@ -292,6 +344,58 @@ class AioRedisFilter(BaseFilter):
             )
             return False  # 宁可重复，不可丢失
 
+    async def requested_many(self, requests: Sequence['Request']) -> List[bool]:
+        """
+        Batch check-and-add for many requests in one pipelined round trip
+        
+        每个指纹一条 SADD，整批最多再附加一条 EXPIRE，一次 ``execute()`` 完成。
+        同一批内重复的指纹由第二条 SADD 返回 0 自然判为重复。
+        非原子模式下退化为逐个 ``requested_async``。
+        
+        Args:
+            requests: Request objects
+            
+        Returns:
+            List[bool]: Duplicate flag per request, in input order
+        """
+        if not requests:
+            return []
+        if not self.atomic:
+            return [await self.requested_async(request) for request in requests]
+
+        try:
+            redis_client = await self._get_redis_client()
+            
+            # If Redis unavailable, return False to avoid losing requests
+            if redis_client is None:
+                return [False] * len(requests)
+
+            fps = [str(self._get_fingerprint(request)) for request in requests]
+            key = self._effective_key()
+            pipe = redis_client.pipeline()
+            for fp in fps:
+                pipe.sadd(key, fp)
+            if self.ttl and self.ttl > 0:
+                pipe.expire(key, self.ttl)
+            results = await pipe.execute()
+
+            self._redis_operations += len(fps)
+            self._pipeline_operations += 1
+
+            duplicates = [added != 1 for added in results[:len(fps)]]
+            if self.debug:
+                self.logger.debug(
+                    f"Batch dedup: {len(fps)} checked, {sum(duplicates)} duplicates"
+                )
+            return duplicates
+
+        except Exception:
+            self.logger.warning(
+                f"Redis unavailable, allowing {len(requests)} requests without dedup. "
+                f"Duplicates possible but no data will be lost."
+            )
+            return [False] * len(requests)  # 宁可重复，不可丢失
+
     def add_fingerprint(self, fp: str) -> None:
         """
         Add new fingerprint to Redis set (synchronous method)
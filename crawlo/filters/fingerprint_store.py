@@ -0,0 +1,178 @@
+#!/usr/bin/python
+# -*- coding:UTF-8 -*-
+"""
+紧凑指纹存储
+================
+MemoryFilter 默认用 ``set[str]`` 保存 32 位十六进制指纹，每条约 100+ 字节。
+CompactFingerprintStore 只保存 8 字节摘要，放在 ``array('Q')`` 开放寻址表中，
+每条约 11~23 字节（随装载率变化），1000 万指纹约 270 MB 以内。
+
+淘汰策略（分代，确定性）：
+- 两代表：current / previous，每代容量 = max_capacity // 2
+- current 写满 → previous 整代丢弃、current 变为 previous、新建空 current
+- 命中 previous 的指纹提升到 current（近似 LRU：最近出现过的 URL 不会被淘汰）
+
+与 ``set`` 兼容的接口：``in`` / ``add`` / ``update`` / ``len`` / ``clear`` / 迭代，
+迭代产出 16 位十六进制摘要字符串（可再次 ``update`` 回来，用于 checkpoint）。
+"""
+import hashlib
+from array import array
+from typing import Iterable, Iterator, Optional
+
+# 开放寻址表的最大装载率（线性探测在 0.7 以下探测长度仍很短）
+MAX_LOAD = 0.7
+
+
+def fingerprint_digest(fp: str) -> int:
+    """
+    Map a fingerprint string to a non-zero 64-bit digest
+
+    十六进制指纹（默认 32 位，或本存储导出的 16 位）直接取前 64 bit；
+    其它格式用 blake2b 计算 8 字节摘要。0 保留为空槽标记。
+    """
+    if len(fp) in (16, 32):
+        try:
+            return int(fp[:16], 16) or 1
+        except ValueError:
+            pass
+    digest = hashlib.blake2b(fp.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') or 1
+
+
+class _DigestTable:
+    """线性探测的 64 位摘要哈希表（0 = 空槽）"""
+
+    __slots__ = ('slots', 'mask', 'size')
+
+    def __init__(self, capacity: int):
+        n = 8
+        while n * MAX_LOAD < capacity:
+            n <<= 1
+        self.slots = array('Q', bytes(8 * n))
+        self.mask = n - 1
+        self.size = 0
+
+    def __contains__(self, key: int) -> bool:
+        slots, mask = self.slots, self.mask
+        i = key & mask
+        while True:
+            value = slots[i]
+            if value == key:
+                return True
+            if value == 0:
+                return False
+            i = (i + 1) & mask
+
+    def add(self, key: int) -> bool:
+        """Insert key, return True if newly added"""
+        slots, mask = self.slots, self.mask
+        i = key & mask
+        while True:
+            value = slots[i]
+            if value == key:
+                return False
+            if value == 0:
+                slots[i] = key
+                self.size += 1
+                return True
+            i = (i + 1) & mask
+
+    def __iter__(self) -> Iterator[int]:
+        return (value for value in self.slots if value)
+
+    @property
+    def nbytes(self) -> int:
+        return self.slots.itemsize * len(self.slots)
+
+
+class CompactFingerprintStore:
+    """
+    8 字节摘要 + 分代淘汰的紧凑指纹集合
+
+    Example:
+        store = CompactFingerprintStore(max_capacity=20_000_000)
+        store.check_and_add(fp)   # False = 新指纹（已写入），True = 重复
+    """
+
+    def __init__(self, max_capacity: int):
+        self.max_capacity = max(2, max_capacity)
+        self._generation_capacity = self.max_capacity // 2
+        self._current = _DigestTable(self._generation_capacity)
+        self._previous: Optional[_DigestTable] = None
+        self._promoted = 0       # current 中同时存在于 previous 的条目数
+        self.evicted = 0         # 因换代被丢弃的指纹总数
+        self.generations = 0     # 已发生的换代次数
+
+    def _rotate(self) -> None:
+        """current 写满：丢弃 previous，current 降为 previous"""
+        if self._previous is not None:
+            self.evicted += self._previous.size - self._promoted
+        self._previous = self._current
+        self._current = _DigestTable(self._generation_capacity)
+        self._promoted = 0
+        self.generations += 1
+
+    def check_and_add(self, fp: str) -> bool:
+        """
+        Check a fingerprint and add it when new
+
+        Returns:
+            True if duplicate, False if newly added
+        """
+        key = fingerprint_digest(fp)
+        current = self._current
+        if key in current:
+            return True
+        previous = self._previous
+        duplicate = previous is not None and key in previous
+        if self._current.size >= self._generation_capacity:
+            self._rotate()
+            if duplicate:
+                # 刚降代的是旧 current，key 不在其中，previous 已被整代丢弃
+                self.evicted -= 1
+                self._promoted = 0
+            current = self._current
+        current.add(key)
+        if duplicate and self._previous is previous:
+            self._promoted += 1
+        return duplicate
+
+    def __contains__(self, fp: str) -> bool:
+        key = fingerprint_digest(fp)
+        return key in self._current or (self._previous is not None and key in self._previous)
+
+    def add(self, fp: str) -> None:
+        self.check_and_add(fp)
+
+    def update(self, fingerprints: Iterable[str]) -> None:
+        for fp in fingerprints:
+            self.check_and_add(fp)
+
+    def clear(self) -> None:
+        self._current = _DigestTable(self._generation_capacity)
+        self._previous = None
+        self._promoted = 0
+
+    def __len__(self) -> int:
+        previous = self._previous.size if self._previous is not None else 0
+        return self._current.size + previous - self._promoted
+
+    def __iter__(self) -> Iterator[str]:
+        current = self._current
+        for key in current:
+            yield f"{key:016x}"
+        if self._previous is not None:
+            for key in self._previous:
+                if key not in current:
+                    yield f"{key:016x}"
+
+    @property
+    def nbytes(self) -> int:
+        """Actual bytes held by the digest tables"""
+        total = self._current.nbytes
+        if self._previous is not None:
+            total += self._previous.nbytes
+        return total
+
+
+__all__ = ['CompactFingerprintStore', 'fingerprint_digest']
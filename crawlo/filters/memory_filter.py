@@ -11,11 +11,13 @@ Supported Filters:
 """
 import os
 import random
+import sys
 import warnings
 from weakref import WeakSet
-from typing import Set, TextIO, Optional, Dict, Any
+from typing import Set, TextIO, Optional, Dict, Any, Union, Callable
 
 from crawlo.filters import BaseFilter
+from crawlo.filters.fingerprint_store import CompactFingerprintStore
 from crawlo.logging import get_logger
 from crawlo.utils.misc import safe_get_config
 from crawlo.utils.concurrency import AsyncRLock
@@ -28,6 +30,7 @@ class MemoryFilter(BaseFilter):
     Features:
     - High Performance: O(1) lookup with Python set()
     - Memory Optimized: Supports weak reference temporary storage
+    - Compact Mode: 8-byte digests + generational eviction (MEMORY_FILTER_COMPACT)
     - Statistics: Provides detailed performance stats
     - Thread Safe: Supports multi-threaded concurrent access
     
@@ -37,13 +40,15 @@ class MemoryFilter(BaseFilter):
     - High performance requirements
     """
 
+    _fingerprint_listener: Optional[Callable[[str], None]] = None  # 新指纹回调（增量检查点）
+
     def __init__(self, crawler):
         """
         Initialize memory filter
 
         :param crawler: Crawler instance for configuration
         """
-        self.fingerprints: Set[str] = set()  # 主指纹存储
+        self.fingerprints: Union[Set[str], CompactFingerprintStore] = set()  # 主指纹存储
         self._temp_weak_refs = WeakSet()     # 弱引用临时存储
         self._lock = AsyncRLock()            # 异步安全锁（替代 threading.RLock）
 
@@ -68,6 +73,10 @@ class MemoryFilter(BaseFilter):
         self._max_capacity = max_capacity
         self._cleanup_threshold = cleanup_threshold
 
+        # 紧凑模式：8 字节摘要开放寻址表 + 分代淘汰（替代 set + 随机清理）
+        if safe_get_config(crawler.settings, 'MEMORY_FILTER_COMPACT', False, bool):
+            self.fingerprints = CompactFingerprintStore(max_capacity)
+
         # 去重指纹可配置纳入的 header / meta（默认空 = 不参与，见 BaseFilter._get_fingerprint）
         self._dupe_include_headers = safe_get_config(
             crawler.settings, 'DUPEFILTER_INCLUDE_HEADERS', [], list
@@ -93,12 +102,7 @@ class MemoryFilter(BaseFilter):
             raise TypeError(f"Fingerprint must be string type, got {type(fp)}")
 
         # Simple sync implementation
-        if fp not in self.fingerprints:
-            # Check capacity limit
-            if len(self.fingerprints) >= self._max_capacity:
-                self._cleanup_old_fingerprints()
-            
-            self.fingerprints.add(fp)
+        if not self._check_and_add(fp):
             self._unique_count += 1
             
             if self.debug:
@@ -115,16 +119,42 @@ class MemoryFilter(BaseFilter):
             raise TypeError(f"Fingerprint must be string type, got {type(fp)}")
 
         async with self._lock:
-            if fp not in self.fingerprints:
-                # 检查容量限制
-                if len(self.fingerprints) >= self._max_capacity:
-                    self._cleanup_old_fingerprints()
-                
-                self.fingerprints.add(fp)
+            if not self._check_and_add(fp):
                 self._unique_count += 1
                 
                 if self.debug:
                     self.logger.debug(f"Added fingerprint: {fp[:20]}...")
+
+    def _check_and_add(self, fp: str) -> bool:
+        """
+        Check fingerprint and add it when new (caller holds the lock if needed)
+
+        :param fp: Request fingerprint string
+        :return: Whether duplicate
+        """
+        if isinstance(self.fingerprints, CompactFingerprintStore):
+            # 紧凑存储内部按代淘汰，无需容量检查
+            duplicate = self.fingerprints.check_and_add(fp)
+        elif fp in self.fingerprints:
+            return True
+        else:
+            # 检查容量限制
+            if len(self.fingerprints) >= self._max_capacity:
+                self._cleanup_old_fingerprints()
+            self.fingerprints.add(fp)
+            duplicate = False
+
+        if not duplicate and self._fingerprint_listener is not None:
+            self._fingerprint_listener(fp)
+        return duplicate
+
+    def set_fingerprint_listener(self, listener: Optional[Callable[[str], None]]) -> None:
+        """
+        Register a callback invoked with every newly added fingerprint (None to remove)
+
+        增量检查点用它记录新指纹，避免保存时复制整个指纹集合。
+        """
+        self._fingerprint_listener = listener
     
     def _cleanup_old_fingerprints(self) -> None:
         """Clean old fingerprints to free memory"""
@@ -152,11 +182,11 @@ class MemoryFilter(BaseFilter):
         )
         # 同步实现
         fp = self._get_fingerprint(request)
-        if fp in self.fingerprints:
+        if self._check_and_add(fp):
             self._dupe_count += 1
             return True
 
-        self.add_fingerprint(fp)
+        self._unique_count += 1
         return False
 
     async def requested_async(self, request) -> bool:
@@ -168,15 +198,10 @@ class MemoryFilter(BaseFilter):
         """
         async with self._lock:
             fp = self._get_fingerprint(request)
-            if fp in self.fingerprints:
+            if self._check_and_add(fp):
                 self._dupe_count += 1
                 return True
 
-            # 检查容量限制
-            if len(self.fingerprints) >= self._max_capacity:
-                self._cleanup_old_fingerprints()
-            
-            self.fingerprints.add(fp)
             self._unique_count += 1
             return False
 
@@ -203,8 +228,11 @@ class MemoryFilter(BaseFilter):
     @property
     def stats_summary(self) -> Dict[str, Any]:
         """Get filter statistics"""
+        compact = isinstance(self.fingerprints, CompactFingerprintStore)
         return {
             'filter_type': 'MemoryFilter',
+            'store': 'compact' if compact else 'set',
+            'evicted': self.fingerprints.evicted if compact else None,
             'capacity': len(self.fingerprints),
             'max_capacity': self._max_capacity,
             'duplicates': self._dupe_count,
@@ -216,12 +244,15 @@ class MemoryFilter(BaseFilter):
         }
 
     def _estimate_memory(self) -> str:
-        """Estimate memory usage (approximate)"""
-        if not self.fingerprints:
+        """Memory held by the fingerprint store (digest tables, or set + str objects)"""
+        if isinstance(self.fingerprints, CompactFingerprintStore):
+            total = self.fingerprints.nbytes
+        elif not self.fingerprints:
             return "0 MB"
-        
-        avg_item_size = sum(len(x) for x in self.fingerprints) / len(self.fingerprints)
-        total = len(self.fingerprints) * (avg_item_size + 50)  # 50字节额外开销
+        else:
+            # 哈希表本体 + 每个 str 对象（指纹等长，取一个样本即可，避免 O(n) 遍历）
+            sample = next(iter(self.fingerprints))
+            total = sys.getsizeof(self.fingerprints) + len(self.fingerprints) * sys.getsizeof(sample)
         
         if total < 1024:
             return f"{total:.1f} B"
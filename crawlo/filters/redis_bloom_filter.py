@@ -0,0 +1,541 @@
+#!/usr/bin/python
+# -*- coding:UTF-8 -*-
+"""
+Redis 位图可扩展布隆过滤器（Scalable Bloom Filter）
+
+AioRedisFilter 把每个 32 位十六进制指纹存进同一个 SET，5 亿 URL 级别需要数十 GB
+Redis 内存。本过滤器改用 Redis 原生位图（SETBIT / GETBIT）：
+
+- 位位置在客户端计算（双重哈希），不依赖 RedisBloom 等模块
+- 多层可扩展：当前层写满后自动追加容量更大、误判率更低的新层，总误判率有上界
+- 判重+写入由一段 Lua 脚本整批完成（单次往返、多 Worker 原子；EVALSHA 执行，不重复发送脚本）
+- 只读探测（contains_async / probe_many）走 pipeline 批量 GETBIT
+- 支持把已有指纹 SET 迁移进布隆过滤器（migrate_from_set）
+
+启用方式::
+
+    FILTER_CLASS = 'crawlo.filters.RedisBloomFilter'
+    BLOOM_FILTER_CAPACITY = 100_000_000
+    BLOOM_FILTER_ERROR_RATE = 0.001
+"""
+import hashlib
+import math
+from typing import Optional, Dict, Any, List, Sequence, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from crawlo.crawler import Crawler
+    from crawlo.http.request import Request
+
+from crawlo.filters.aioredis_filter import AioRedisFilter
+from crawlo.utils.misc import safe_get_config
+from crawlo.utils.redis.scripts import run_script
+
+# Redis 位图单个 key 的最大位数（512MB）
+MAX_BITS_PER_KEY = 2 ** 32
+
+
+# Lua 脚本：整批判重 + 写入
+#   KEYS[1]         = meta hash（layers / count）
+#   KEYS[2..L+1]    = 各层位图
+#   ARGV[1]         = 客户端已知层数 L
+#   ARGV[2]         = 当前层容量
+#   ARGV[3]         = TTL（秒，0 = 不过期）
+#   ARGV[4..L+3]    = 各层哈希函数个数 k
+#   ARGV[L+4..]     = 每个指纹在各层的位位置（按层顺序平铺）
+# 返回 {layers, count, flag_1, ..., flag_m}；flag=1 表示重复。
+# 当前层写满时立即扩容并停止处理（m < n），客户端用新层参数提交剩余指纹；
+# 服务端层数多于 L 时返回 {-1, layers}，客户端刷新层参数后重试。
+_CHECK_AND_ADD_LUA = """
+local meta = redis.call('HMGET', KEYS[1], 'layers', 'count')
+local layers = tonumber(meta[1] or '1')
+local L = tonumber(ARGV[1])
+if layers > L then
+    return {-1, layers}
+end
+local count = tonumber(meta[2] or '0')
+local capacity = tonumber(ARGV[2])
+local ttl = tonumber(ARGV[3])
+local ks = {}
+local stride = 0
+for i = 1, L do
+    ks[i] = tonumber(ARGV[3 + i])
+    stride = stride + ks[i]
+end
+local base = 3 + L
+local n = (#ARGV - base) / stride
+local result = {0, 0}
+local scaled = false
+for item = 0, n - 1 do
+    local offset = base + item * stride
+    local duplicate = false
+    for layer = 1, L - 1 do
+        local all_set = true
+        for j = 1, ks[layer] do
+            if redis.call('GETBIT', KEYS[layer + 1], ARGV[offset + j]) == 0 then
+                all_set = false
+                break
+            end
+        end
+        if all_set then
+            duplicate = true
+            break
+        end
+        offset = offset + ks[layer]
+    end
+    if not duplicate then
+        duplicate = true
+        for j = 1, ks[L] do
+            if redis.call('SETBIT', KEYS[L + 1], ARGV[offset + j], 1) == 0 then
+                duplicate = false
+            end
+        end
+        if not duplicate then
+            count = count + 1
+        end
+    end
+    result[#result + 1] = duplicate and 1 or 0
+    if count >= capacity then
+        scaled = true
+        break
+    end
+end
+if scaled then
+    layers = L + 1
+    count = 0
+end
+redis.call('HSET', KEYS[1], 'layers', layers, 'count', count)
+if ttl > 0 then
+    for i = 1, #KEYS do
+        redis.call('EXPIRE', KEYS[i], ttl)
+    end
+end
+result[1] = layers
+result[2] = count
+return result
+"""
+
+
+class RedisBloomFilter(AioRedisFilter):
+    """
+    Request deduplication based on a scalable Bloom filter stored in Redis bitmaps
+
+    与 AioRedisFilter 共用连接管理、键命名与集群 hash tag，
+    只把存储结构从 SET 换成多层位图：
+
+    - 第 i 层容量 = capacity × growth^i，误判率 = error_rate × (1 - tightening) × tightening^i，
+      各层误判率之和收敛于 error_rate
+    - 单层位数受 Redis 位图上限（2^32 位）约束，超出时该层容量被截断，由后续层承接
+    """
+
+    def __init__(
+            self,
+            redis_key: str,
+            client: Optional[Any] = None,
+            stats: Optional[Dict[str, Any]] = None,
+            debug: bool = False,
+            log_level: int = 20,  # logging.INFO
+            ttl: Optional[int] = None,
+            atomic: bool = True,
+            capacity: int = 1000000,
+            error_rate: float = 0.001,
+            growth: int = 2,
+            tightening: float = 0.5
+    ) -> None:
+        """
+        Initialize Redis Bloom filter
+
+        Args:
+            redis_key: Base Redis key (bitmaps use ``<key>:bloom:<layer>``)
+            client: Redis client instance (can be None for lazy init)
+            stats: Statistics storage
+            debug: Enable debug mode
+            log_level: Log level
+            ttl: Expiration time for bitmaps and meta (seconds)
+            atomic: Accepted for AioRedisFilter compatibility (check-and-add is always atomic here)
+            capacity: Expected number of fingerprints in the first layer
+            error_rate: Target overall false-positive rate
+            growth: Capacity multiplier for each new layer
+            tightening: Error-rate ratio between consecutive layers (0 < r < 1)
+        """
+        super().__init__(redis_key, client, stats, debug, log_level, ttl, atomic)
+        self.capacity: int = capacity
+        self.error_rate: float = error_rate
+        self.growth: int = growth
+        self.tightening: float = tightening
+        # 层参数缓存：[(capacity, error_rate, bits, hashes), ...]
+        self._layer_params: List[Tuple[int, float, int, int]] = []
+        self._configure(capacity, error_rate, growth, tightening)
+
+        # 最近一次 Lua 返回的服务端状态
+        self._layers: int = 1
+        self._active_count: int = 0
+
+    @classmethod
+    def create_instance(cls, crawler: 'Crawler') -> 'RedisBloomFilter':
+        """
+        Create filter instance from crawler configuration
+
+        Reuses AioRedisFilter key naming / connection pool setup, then applies
+        ``BLOOM_FILTER_*`` settings.
+        """
+        instance = super().create_instance(crawler)
+        settings = crawler.settings
+        instance._configure(
+            safe_get_config(settings, 'BLOOM_FILTER_CAPACITY', 1000000, int),
+            safe_get_config(settings, 'BLOOM_FILTER_ERROR_RATE', 0.001, float),
+            safe_get_config(settings, 'BLOOM_FILTER_GROWTH', 2, int),
+            safe_get_config(settings, 'BLOOM_FILTER_TIGHTENING_RATIO', 0.5, float),
+        )
+        return instance
+
+    def _configure(self, capacity: int, error_rate: float, growth: int, tightening: float) -> None:
+        """Validate and apply the layer sizing parameters (shared by __init__ and create_instance)"""
+        if capacity <= 0:
+            raise ValueError(f"Bloom filter capacity must be positive, got {capacity}")
+        if not 0 < error_rate < 1:
+            raise ValueError(f"Bloom filter error rate must be in (0, 1), got {error_rate}")
+        if not 0 < tightening < 1:
+            raise ValueError(f"Bloom filter tightening ratio must be in (0, 1), got {tightening}")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.growth = max(1, growth)
+        self.tightening = tightening
+        self._layer_params = []
+
+    # ------------------------------------------------------------------
+    # 层参数与位位置
+    # ------------------------------------------------------------------
+    def _get_layer_params(self, layer: int) -> Tuple[int, float, int, int]:
+        """
+        Get (capacity, error_rate, bits, hashes) for a layer
+
+        标准公式：m = -n·ln(p) / (ln2)^2，k = m/n·ln2；m 超过单 key 上限时按上限反推容量。
+        """
+        while len(self._layer_params) <= layer:
+            i = len(self._layer_params)
+            error = self.error_rate * (1 - self.tightening) * (self.tightening ** i)
+            capacity = self.capacity * (self.growth ** i)
+            bits_per_item = -math.log(error) / (math.log(2) ** 2)
+            capacity = max(1, min(capacity, int(MAX_BITS_PER_KEY / bits_per_item)))
+            bits = min(MAX_BITS_PER_KEY, max(8, int(math.ceil(capacity * bits_per_item))))
+            hashes = max(1, int(round(bits / capacity * math.log(2))))
+            self._layer_params.append((capacity, error, bits, hashes))
+        return self._layer_params[layer]
+
+    @staticmethod
+    def _hash_pair(fp: str, layer: int) -> Tuple[int, int]:
+        """
+        Two independent 64-bit hashes of a fingerprint for one layer
+
+        以层号作 blake2b salt，各层位位置相互独立；不依赖指纹本身的分布（自定义指纹同样适用）。
+        """
+        digest = hashlib.blake2b(
+            fp.encode('utf-8'), digest_size=16, salt=layer.to_bytes(8, 'big')
+        ).digest()
+        return int.from_bytes(digest[:8], 'big'), int.from_bytes(digest[8:], 'big') | 1
+
+    def _positions(self, fp: str, layer: int) -> List[int]:
+        """Bit positions of a fingerprint in one layer (Kirsch–Mitzenmacher double hashing)"""
+        _, _, bits, hashes = self._get_layer_params(layer)
+        h1, h2 = self._hash_pair(fp, layer)
+        return [(h1 + i * h2) % bits for i in range(hashes)]
+
+    def _bloom_key(self, layer: int) -> str:
+        return f"{self._effective_key()}:bloom:{layer}"
+
+    def _meta_key(self) -> str:
+        return f"{self._effective_key()}:bloom:meta"
+
+    # ------------------------------------------------------------------
+    # 判重 + 写入
+    # ------------------------------------------------------------------
+    async def _check_and_add_many(self, redis_client, fps: Sequence[str]) -> List[bool]:
+        """
+        Run the check-and-add script for a batch of fingerprints
+
+        当前层写满时脚本提前返回，剩余指纹按新层参数继续提交，保证单层不超容。
+
+        Returns:
+            List[bool]: Duplicate flag per fingerprint
+        """
+        flags: List[bool] = []
+        remaining = list(fps)
+        stale_retries = 0
+        while remaining:
+            layers = self._layers
+            ks = [self._get_layer_params(layer)[3] for layer in range(layers)]
+            positions = []
+            for fp in remaining:
+                for layer in range(layers):
+                    positions.extend(self._positions(fp, layer))
+            keys = [self._meta_key()] + [self._bloom_key(layer) for layer in range(layers)]
+            result = await run_script(
+                redis_client, _CHECK_AND_ADD_LUA, len(keys), *keys,
+                layers, self._get_layer_params(layers - 1)[0], self.ttl or 0,
+                *ks, *positions,
+            )
+            if int(result[0]) == -1:
+                # 其它 Worker 已扩容，刷新层数后重试
+                stale_retries += 1
+                if stale_retries > 3:
+                    raise RuntimeError("Bloom filter layer count kept changing during check-and-add")
+                self._layers = int(result[1])
+                continue
+
+            done = [int(flag) == 1 for flag in result[2:]]
+            self._redis_operations += len(done)
+            if int(result[0]) != self._layers and self.debug:
+                self.logger.debug(f"Bloom filter scaled to {int(result[0])} layers")
+            self._layers = int(result[0])
+            self._active_count = int(result[1])
+            flags.extend(done)
+            remaining = remaining[len(done):]
+        return flags
+
+    async def requested_async(self, request: 'Request') -> bool:
+        """
+        Async check if request already exists (adds it when new)
+
+        Args:
+            request: Request object
+
+        Returns:
+            True if duplicate (or false positive), False if new request
+        """
+        try:
+            redis_client = await self._get_redis_client()
+
+            # If Redis unavailable, return False to avoid losing requests
+            if redis_client is None:
+                return False
+
+            fp = str(self._get_fingerprint(request))
+            is_duplicate = (await self._check_and_add_many(redis_client, [fp]))[0]
+            if is_duplicate and self.debug:
+                self.logger.debug(f"Found duplicate request: {fp}")
+            return is_duplicate
+
+        except Exception:
+            self.logger.warning(
+                f"Redis unavailable, allowing request without dedup: {getattr(request, 'url', 'Unknown URL')}. "
+                f"Duplicates possible but no data will be lost."
+            )
+            return False  # 宁可重复，不可丢失
+
+    async def requested_many(self, requests: Sequence['Request']) -> List[bool]:
+        """
+        Batch check-and-add in a single script round trip
+
+        Args:
+            requests: Request objects
+
+        Returns:
+            List[bool]: Duplicate flag per request, in input order
+        """
+        if not requests:
+            return []
+        try:
+            redis_client = await self._get_redis_client()
+
+            # If Redis unavailable, return False to avoid losing requests
+            if redis_client is None:
+                return [False] * len(requests)
+
+            fps = [str(self._get_fingerprint(request)) for request in requests]
+            self._pipeline_operations += 1
+            return await self._check_and_add_many(redis_client, fps)
+
+        except Exception:
+            self.logger.warning(
+                f"Redis unavailable, allowing {len(requests)} requests without dedup. "
+                f"Duplicates possible but no data will be lost."
+            )
+            return [False] * len(requests)  # 宁可重复，不可丢失
+
+    async def _add_fingerprint_async(self, fp: str) -> bool:
+        """
+        Async add fingerprint to the Bloom filter
+
+        Returns:
+            bool: Whether newly added (False = already present / false positive)
+        """
+        try:
+            redis_client = await self._get_redis_client()
+            if redis_client is None:
+                return False
+            return not (await self._check_and_add_many(redis_client, [str(fp)]))[0]
+        except Exception as e:
+            self.logger.error(f"Failed to add fingerprint: {str(fp)[:20]}... - {e}")
+            return False
+
+    # ------------------------------------------------------------------
+    # 只读探测
+    # ------------------------------------------------------------------
+    async def probe_many(self, fps: Sequence[str]) -> List[bool]:
+        """
+        Pipelined read-only membership probe (GETBIT on every layer)
+
+        Args:
+            fps: Fingerprint strings
+
+        Returns:
+            List[bool]: Whether each fingerprint is (probably) present
+        """
+        if not fps:
+            return []
+        redis_client = await self._get_redis_client()
+        if redis_client is None:
+            return [False] * len(fps)
+
+        await self._refresh_layers(redis_client)
+        layers = self._layers
+        pipe = redis_client.pipeline()
+        for fp in fps:
+            for layer in range(layers):
+                key = self._bloom_key(layer)
+                for pos in self._positions(str(fp), layer):
+                    pipe.getbit(key, pos)
+        bits = await pipe.execute()
+        self._pipeline_operations += 1
+
+        present = []
+        offset = 0
+        for _ in fps:
+            found = False
+            for layer in range(layers):
+                hashes = self._get_layer_params(layer)[3]
+                if all(bits[offset:offset + hashes]):
+                    found = True
+                offset += hashes
+            present.append(found)
+        return present
+
+    async def contains_async(self, fp: str) -> bool:
+        """
+        Async check if fingerprint is (probably) in the Bloom filter
+
+        Args:
+            fp: Request fingerprint string
+
+        Returns:
+            bool: Whether exists
+        """
+        try:
+            return (await self.probe_many([str(fp)]))[0]
+        except Exception:
+            self.logger.warning(
+                f"Redis unavailable, skipping dedup check for fingerprint: {str(fp)[:20]}... "
+                f"Duplicates possible but no data will be lost."
+            )
+            return False  # 宁可重复，不可丢失
+
+    async def _refresh_layers(self, redis_client) -> None:
+        """Reload layer count / active layer count from the meta hash"""
+        meta = await redis_client.hgetall(self._meta_key())
+        if meta:
+            meta = {
+                (k.decode() if isinstance(k, bytes) else k): int(v)
+                for k, v in meta.items()
+            }
+            self._layers = max(1, meta.get('layers', 1))
+            self._active_count = meta.get('count', 0)
+
+    # ------------------------------------------------------------------
+    # 迁移
+    # ------------------------------------------------------------------
+    async def migrate_from_set(
+            self,
+            source_key: Optional[str] = None,
+            batch_size: int = 1000,
+            delete_source: bool = False
+    ) -> int:
+        """
+        Migrate fingerprints from an existing AioRedisFilter SET into the Bloom filter
+
+        SSCAN 分批读取（不阻塞 Redis），每批一次脚本往返写入位图。
+
+        Args:
+            source_key: Fingerprint SET key (default: the key AioRedisFilter would use)
+            batch_size: SSCAN COUNT hint / script batch size
+            delete_source: Delete the SET after a successful migration
+
+        Returns:
+            int: Number of fingerprints migrated
+        """
+        redis_client = await self._get_redis_client()
+        if redis_client is None:
+            raise RuntimeError("Redis客户端未初始化")
+
+        source_key = source_key or self._effective_key()
+        await self._refresh_layers(redis_client)
+        migrated = 0
+        cursor = 0
+        while True:
+            cursor, members = await redis_client.sscan(source_key, cursor, count=batch_size)
+            fps = [m.decode() if isinstance(m, bytes) else str(m) for m in members]
+            for start in range(0, len(fps), batch_size):
+                chunk = fps[start:start + batch_size]
+                await self._check_and_add_many(redis_client, chunk)
+                migrated += len(chunk)
+            if int(cursor) == 0:
+                break
+
+        if delete_source:
+            await redis_client.delete(source_key)
+        self.logger.info(
+            f"Migrated {migrated} fingerprints from {source_key} into Bloom filter "
+            f"({self._layers} layers)"
+        )
+        return migrated
+
+    # ------------------------------------------------------------------
+    # 统计
+    # ------------------------------------------------------------------
+    def get_bloom_stats(self) -> Dict[str, Any]:
+        """
+        Estimated Bloom filter occupancy (based on the last server response)
+
+        - 各层填充率：1 - e^(-k·n/m)
+        - 总误判率：1 - Π(1 - fill_i^k_i)
+        """
+        layers = []
+        miss_all = 1.0
+        total_items = 0
+        total_bits = 0
+        for layer in range(self._layers):
+            capacity, error, bits, hashes = self._get_layer_params(layer)
+            items = self._active_count if layer == self._layers - 1 else capacity
+            fill = 1 - math.exp(-hashes * items / bits)
+            miss_all *= 1 - fill ** hashes
+            total_items += items
+            total_bits += bits
+            layers.append({
+                'layer': layer,
+                'capacity': capacity,
+                'items': items,
+                'bits': bits,
+                'hashes': hashes,
+                'fill_ratio': round(fill, 6),
+            })
+        return {
+            'layers': layers,
+            'estimated_items': total_items,
+            'memory_bytes': total_bits // 8,
+            'fill_ratio': round(layers[-1]['fill_ratio'], 6) if layers else 0.0,
+            'estimated_false_positive_rate': 1 - miss_all,
+        }
+
+    def get_stats(self) -> dict:
+        """Get filter statistics including Bloom occupancy estimates"""
+        stats = super().get_stats()
+        bloom = self.get_bloom_stats()
+        stats.update({
+            'bloom_layers': len(bloom['layers']),
+            'bloom_estimated_items': bloom['estimated_items'],
+            'bloom_fill_ratio': bloom['fill_ratio'],
+            'bloom_false_positive_rate': f"{bloom['estimated_false_positive_rate'] * 100:.4f}%",
+        })
+        return stats
+
+
+__all__ = ['RedisBloomFilter']
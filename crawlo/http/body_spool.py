@@ -0,0 +1,101 @@
+#!/usr/bin/python
+# -*- coding:UTF-8 -*-
+"""
+响应体落盘缓冲
+==============
+流式下载时按块接收响应体：不超过阈值时留在内存，超过后整体写入临时文件，
+由 ``Response.from_file`` 构造以文件为载体的响应（``body_path`` / ``iter_bytes``），
+避免附件类大响应在高并发下整体驻留内存。
+
+配置：
+    DOWNLOAD_STREAM_THRESHOLD = 0        # >0 时所有响应流式读取，超过该字节数落盘
+    DOWNLOAD_STREAM_MAXSIZE = None       # 流式响应大小上限，None 时沿用 DOWNLOAD_MAXSIZE
+    DOWNLOAD_STREAM_DIR = None           # 临时文件目录（默认系统临时目录）
+"""
+import contextlib
+import os
+import tempfile
+from typing import List, Optional
+
+import aiofiles
+
+from crawlo.http.response import Response
+
+# 仅 request.meta['stream'] = True 而未配置 DOWNLOAD_STREAM_THRESHOLD 时的落盘阈值
+DEFAULT_SPILL_THRESHOLD = 1024 * 1024
+
+
+class BodySpool:
+    """
+    响应体缓冲：内存 → 临时文件
+
+    用法::
+
+        spool = BodySpool(threshold, max_size)
+        try:
+            async for chunk in stream:
+                await spool.write(chunk)
+            response = await spool.to_response(url, headers=..., status=..., request=...)
+        except BaseException:
+            await spool.discard()
+            raise
+    """
+
+    def __init__(self, threshold: int, max_size: int = 0, directory: Optional[str] = None):
+        """
+        Args:
+            threshold: 超过该字节数时落盘
+            max_size: 响应体上限（0 不限制），超过时抛 OverflowError
+            directory: 临时文件目录
+        """
+        self.threshold = threshold
+        self.max_size = max_size
+        self.directory = directory
+        self.size = 0
+        self.path: Optional[str] = None
+        self._chunks: List[bytes] = []
+        self._file = None
+
+    async def write(self, chunk: bytes) -> None:
+        """追加一块响应体"""
+        if not chunk:
+            return
+        self.size += len(chunk)
+        if self.max_size and self.size > self.max_size:
+            raise OverflowError(f"Response too large: {self.size} > {self.max_size}")
+        if self._file is not None:
+            await self._file.write(chunk)
+            return
+        self._chunks.append(chunk)
+        if self.size > self.threshold:
+            await self._spill()
+
+    async def _spill(self) -> None:
+        fd, self.path = tempfile.mkstemp(prefix='crawlo-body-', dir=self.directory)
+        os.close(fd)
+        self._file = await aiofiles.open(self.path, 'wb')
+        await self._file.write(b''.join(self._chunks))
+        self._chunks = []
+
+    async def to_response(self, url: str, **kwargs) -> Response:
+        """结束写入并构造 Response（落盘时由响应持有临时文件，回收时删除）"""
+        if self._file is None:
+            return Response(url, body=b''.join(self._chunks), **kwargs)
+        await self._file.close()
+        self._file = None
+        path, self.path = self.path, None
+        return Response.from_file(url, path, size=self.size, owned=True, **kwargs)
+
+    async def discard(self) -> None:
+        """放弃已接收内容（下载失败时调用），删除临时文件"""
+        self._chunks = []
+        if self._file is not None:
+            await self._file.close()
+            self._file = None
+        if self.path:
+            with contextlib.suppress(OSError):
+                os.unlink(self.path)
+            self.path = None
+
+
+__all__ = ['BodySpool', 'DEFAULT_SPILL_THRESHOLD']
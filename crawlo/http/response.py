@@ -9,13 +9,17 @@ HTTP Response 封装模块
 - JSON 解析和缓存
 - 正则表达式支持
 - Cookie 处理
+- 以文件为载体的大响应体（流式下载落盘，body_path / iter_bytes）
 """
 import atexit
+import contextlib
+import os
 import re
 import threading
+import weakref
 from concurrent.futures import ThreadPoolExecutor, TimeoutError as _FuturesTimeoutError
 from typing import Dict, Any, List, Optional, Union, Pattern, Match
-from urllib.parse import urljoin as _urljoin
+from urllib.parse import urljoin as _urljoin, urlsplit
 from parsel import Selector, SelectorList
 
 # 尝试使用 ujson 提升性能，失败时降级到标准库 json
@@ -110,7 +114,11 @@ class Response(ResponseAdaptiveMixin):
                 f"(limit: {self.MAX_BODY_SIZE} bytes)"
             )
         
-        self.body: bytes = body
+        # 以文件为载体时 _body 为 None，首次访问 body 才读入内存（见 from_file）
+        self._body: Optional[bytes] = body
+        self.body_path: Optional[str] = None
+        self._body_size: int = len(body)
+        self._body_finalizer: Optional[weakref.finalize] = None
         self.method: str = method.upper()
         self.request: Optional['Request'] = request
         self.status: int = status
@@ -118,8 +126,10 @@ class Response(ResponseAdaptiveMixin):
         # 请求标记（从 Request.flags 传递，供回调函数检查）
         self.flags: list = getattr(request, 'flags', []) if request else []
 
-        # 编码处理
-        self.encoding: str = self._determine_encoding()
+        # 编码在首次访问 encoding / text / 选择器时才检测（只读 status / body / 被中间件丢弃的响应不付出检测开销）
+        self._encoding: Optional[str] = None
+        # 持有按主机缓存的检测器（由下载器设置，None 时不使用主机缓存）
+        self.encoding_detector: Optional[EncodingDetector] = None
 
         # 缓存属性
         self._text_cache: Optional[str] = None
@@ -179,8 +189,126 @@ class Response(ResponseAdaptiveMixin):
             **kwargs
         )
 
+    @classmethod
+    def from_file(cls, url: str, path: str, *, size: Optional[int] = None,
+                  owned: bool = False, **kwargs) -> 'Response':
+        """
+        Create a Response whose body lives in a file (streamed downloads).
+
+        The body is not loaded until ``response.body`` / ``text`` / selectors
+        are accessed; ``iter_bytes()`` and ``body_path`` read it without a full
+        in-memory copy.
+
+        Args:
+            url: Response URL
+            path: Body file path
+            size: Body size in bytes (defaults to the file size)
+            owned: Delete the file when the response is closed or garbage collected
+            **kwargs: Additional response parameters (status, headers, request, etc.)
+
+        Returns:
+            Response: Response object
+        """
+        response = cls(url=url, **kwargs)
+        response._body = None
+        response.body_path = path
+        response._body_size = os.path.getsize(path) if size is None else size
+        if owned:
+            response._body_finalizer = weakref.finalize(response, _unlink_quietly, path)
+        return response
+
+    # ==================== 响应体访问 ====================
+
+    @property
+    def body(self) -> bytes:
+        """
+        响应体字节；以文件为载体的响应首次访问时读入内存（受 MAX_BODY_SIZE 限制）。
+        
+        Returns:
+            bytes: 响应体
+        """
+        if self._body is None:
+            if self._body_size > self.MAX_BODY_SIZE:
+                raise ValueError(
+                    f"Response body too large: {self._body_size} bytes "
+                    f"(limit: {self.MAX_BODY_SIZE} bytes)"
+                )
+            with open(self.body_path, 'rb') as f:
+                self._body = f.read()
+        return self._body
+
+    @body.setter
+    def body(self, value: bytes) -> None:
+        self._body = value
+        self._body_size = len(value)
+        self.body_path = None
+
+    @property
+    def body_size(self) -> int:
+        """
+        响应体字节数（不读取文件）
+        
+        Returns:
+            int: 字节数
+        """
+        return self._body_size
+
+    def iter_bytes(self, chunk_size: int = 64 * 1024):
+        """
+        分块迭代响应体；以文件为载体时逐块读文件，不整体载入内存。
+        
+        Args:
+            chunk_size: 块大小（字节）
+            
+        Yields:
+            bytes: 响应体分块
+        """
+        if self._body is not None:
+            view = memoryview(self._body)
+            for start in range(0, len(view), chunk_size):
+                yield bytes(view[start:start + chunk_size])
+            return
+        with open(self.body_path, 'rb') as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+
+    def close(self) -> None:
+        """
+        释放以文件为载体的响应体：删除自有临时文件（from_file(owned=True)）。
+        未关闭的临时文件在响应对象回收时删除。
+        """
+        if self._body_finalizer is not None:
+            self._body_finalizer()
+
+    def _body_head(self, limit: int = 64 * 1024) -> bytes:
+        """响应体前 limit 字节（编码探测用，不载入整个文件）"""
+        if self._body is not None:
+            return self._body
+        with open(self.body_path, 'rb') as f:
+            return f.read(limit)
+
     # ==================== 编码检测相关方法 ====================
     
+    @property
+    def encoding(self) -> str:
+        """
+        响应编码（首次访问时检测并缓存）
+        
+        Returns:
+            str: 编码名称
+        """
+        if self._encoding is None:
+            self._encoding = self._determine_encoding()
+        return self._encoding
+
+    @encoding.setter
+    def encoding(self, value: str) -> None:
+        self._encoding = value
+        self._text_cache = None
+
     def _determine_encoding(self) -> str:
         """
         智能检测响应编码
@@ -190,22 +318,24 @@ class Response(ResponseAdaptiveMixin):
         2. BOM 字节顺序标记
         3. HTTP Content-Type 头部
         4. HTML meta 标签声明
-        5. 内容自动检测（基于字符频率分析）
+        5. 内容自动检测（基于字符频率分析；设置了 encoding_detector 时同一主机复用上次探测结果，解码验证通过即跳过）
         6. 默认编码 (utf-8)
         
         Returns:
             str: 检测到的编码
         """
         # 获取 Request 中声明的编码
-        declared_encoding = None
         if self.request and getattr(self.request, 'encoding', None):
-            declared_encoding = self.request.encoding
-        
-        # 使用 EncodingDetector 进行检测
-        return EncodingDetector.detect(
-            body=self.body,
+            return self.request.encoding
+        
+        # 2-4 为不解码响应体的快速路径，仅 5 需要内容探测
+        body = self._body_head()
+        if self.encoding_detector is None:
+            return EncodingDetector.detect_declared(body, self.headers) or EncodingDetector.detect(body, self.headers)
+        return self.encoding_detector.detect_for_host(
+            body=body,
             headers=self.headers,
-            declared_encoding=declared_encoding,
+            host=_hostname(self.url),
         )
 
     @property
@@ -714,3 +844,15 @@ class Response(ResponseAdaptiveMixin):
 
     def __str__(self) -> str:
         return f"<{self.status} {self.url}>"
+
+
+def _hostname(url: str) -> Optional[str]:
+    try:
+        return urlsplit(url).hostname
+    except ValueError:
+        return None
+
+
+def _unlink_quietly(path: str) -> None:
+    with contextlib.suppress(OSError):
+        os.unlink(path)
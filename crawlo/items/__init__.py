@@ -8,6 +8,7 @@ crawlo.items 包
 from .item import Item
 from .fields import Field
 from .base import ItemMeta
+from .compiled import CompiledItem, CompiledItemMeta
 
 from crawlo.items.exceptions import ItemInitError, ItemAttributeError  # noqa: F401
 
@@ -15,6 +16,8 @@ __all__ = [
     'Item',
     'Field',
     'ItemMeta',
+    'CompiledItem',
+    'CompiledItemMeta',
     'ItemInitError',
     'ItemAttributeError'
 ]
@@ -0,0 +1,249 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+Compiled Item Definition
+========================
+Opt-in schema-compiled items: 继承 ``CompiledItem`` 的类在定义时由元类按声明的字段生成
+``__slots__`` 和专用的 ``__init__`` / ``to_dict`` / ``to_tuple``，实例不再持有 ``__dict__`` /
+``_values`` / ``_dynamic_fields``，字段值按声明顺序存放在槽位中。
+
+    class ProductItem(CompiledItem):
+        coerce = True                      # 可选：按 field_type 转换类型（'12' -> 12）
+        title = Field(nullable=False)
+        price = Field(field_type=float)
+        stock = Field(field_type=int, default=0)
+
+    item = ProductItem(title='pen', price='1.5')
+    item.to_tuple()                        # ('pen', 1.5, 0)，顺序同 ProductItem.FIELD_NAMES
+    cursor.executemany(sql, [i.to_tuple() for i in items])
+
+与 ``Item`` 的差异：
+    - 字段固定，不支持动态字段（未声明的键抛出 KeyError）
+    - 校验规则与 ``Field.validate`` 相同，错误信息不附加 Item 的详细报告
+    - 仍是 MutableMapping，且 ``isinstance(item, Item)`` 为 True（ABC 虚拟子类）
+"""
+from copy import deepcopy
+from pprint import pformat
+from typing import Any, Dict, Iterator, Tuple
+from collections.abc import MutableMapping
+
+from .base import ItemMeta
+from .fields import Field
+from .item import Item
+from crawlo.items.exceptions import ItemInitError, ItemAttributeError
+
+_TRUE_STRINGS = frozenset(('1', 'true', 'yes', 'y', 'on'))
+_FALSE_STRINGS = frozenset(('0', 'false', 'no', 'n', 'off'))
+
+
+class _Unset:
+    """Marker stored in slots of fields that have not been set"""
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return '<unset>'
+
+    def __reduce__(self) -> str:
+        # pickle / deepcopy 后仍是同一个对象
+        return '_UNSET'
+
+
+_UNSET = _Unset()
+
+
+def _slot_name(field_name: str) -> str:
+    return f'_f_{field_name}'
+
+
+def _coerce(value: Any, field_type: Any, field_name: str) -> Any:
+    """Convert value to field_type (first type if a tuple is given)"""
+    target = field_type[0] if isinstance(field_type, tuple) else field_type
+    if target is bool and isinstance(value, str):
+        lowered = value.strip().lower()
+        if lowered in _TRUE_STRINGS:
+            return True
+        if lowered in _FALSE_STRINGS:
+            return False
+        raise TypeError(f"Field '{field_name}' cannot coerce {value!r} to {target}")
+    try:
+        return target(value)
+    except (TypeError, ValueError) as e:
+        raise TypeError(f"Field '{field_name}' cannot coerce {value!r} to {target}: {e}") from e
+
+
+def _make_validator(field_name: str, field: Field, coerce: bool):
+    validate = field.validate
+    field_type = field.field_type
+    if not (coerce and field_type):
+        return lambda value: validate(value, field_name)
+
+    def validator(value):
+        if value is not None and not isinstance(value, field_type) and not (
+                isinstance(value, str) and not value.strip()):
+            value = _coerce(value, field_type, field_name)
+        return validate(value, field_name)
+    return validator
+
+
+def _is_plain(field: Field) -> bool:
+    """Field without any rule: values are stored as-is"""
+    return (type(field) is Field and field.default is None and field.nullable
+            and field.field_type is None and not field.max_length)
+
+
+def _compile(cls, attrs: Dict[str, Any]) -> None:
+    """Generate slot accessors and the positional fast paths for cls"""
+    names = tuple(cls.FIELDS)
+    slots = tuple(_slot_name(name) for name in names)
+    validators = {}
+    namespace: Dict[str, Any] = {
+        '_crawlo_unset_': _UNSET,
+        '_crawlo_positional_': _reject_positional,
+        '_crawlo_unknown_': _reject_unknown,
+    }
+
+    params, body = [], []
+    for i, (name, slot) in enumerate(zip(names, slots)):
+        field = cls.FIELDS[name]
+        params.append(f'{name}=_crawlo_unset_')
+        if _is_plain(field):
+            body.append(f'_crawlo_self_.{slot} = {name}')
+            continue
+        validators[name] = namespace[f'_crawlo_v{i}_'] = _make_validator(name, field, cls.coerce)
+        missing = name
+        if field.default is not None:
+            namespace[f'_crawlo_d{i}_'] = field.default
+            missing = f'_crawlo_d{i}_'
+        body.append(f'_crawlo_self_.{slot} = {missing} if {name} is _crawlo_unset_ else _crawlo_v{i}_({name})')
+
+    source = [
+        f"def __init__(_crawlo_self_, *_crawlo_args_, {''.join(p + ', ' for p in params)}**_crawlo_extra_):",
+        "    if _crawlo_args_: _crawlo_positional_(_crawlo_self_, _crawlo_args_)",
+        "    if _crawlo_extra_: _crawlo_unknown_(_crawlo_self_, _crawlo_extra_)",
+    ]
+    source += [f'    {line}' for line in body]
+
+    source.append("def to_dict(_crawlo_self_):")
+    source.append("    d = {}")
+    for name, slot in zip(names, slots):
+        source.append(f"    v = _crawlo_self_.{slot}")
+        source.append(f"    if v is not _crawlo_unset_: d[{name!r}] = v")
+    source.append("    return d")
+
+    source.append("def to_tuple(_crawlo_self_):")
+    for i, slot in enumerate(slots):
+        source.append(f"    v{i} = _crawlo_self_.{slot}")
+    values = ''.join(f'None if v{i} is _crawlo_unset_ else v{i}, ' for i in range(len(slots)))
+    source.append(f"    return ({values})")
+
+    source.append("def _raw_values(_crawlo_self_):")
+    source.append(f"    return ({''.join(f'_crawlo_self_.{slot}, ' for slot in slots)})")
+
+    exec('\n'.join(source), namespace)  # nosec B102 - 源码只由已校验的字段标识符拼接
+
+    cls.FIELD_NAMES = names
+    cls._SLOTS = dict(zip(names, slots))
+    cls._VALIDATORS = validators
+    for method in ('__init__', 'to_dict', 'to_tuple', '_raw_values'):
+        if method in attrs:
+            continue  # 用户在类体中自定义的方法优先
+        function = namespace[method]
+        function.__qualname__ = f'{cls.__qualname__}.{method}'
+        function.__module__ = cls.__module__
+        setattr(cls, method, function)
+
+
+def _reject_positional(item, args):
+    raise ItemInitError(
+        f"{item.__class__.__name__} does not support positional arguments: {args}, "
+        f"please use keyword arguments for initialization."
+    )
+
+
+def _reject_unknown(item, extra):
+    raise KeyError(f"{item.__class__.__name__} does not contain field: {next(iter(extra))}")
+
+
+class CompiledItemMeta(ItemMeta):
+    """
+    Metaclass for compiled Item classes
+
+    Adds one slot per newly declared field (inherited fields reuse the parent's slots)
+    and generates the positional ``__init__`` / ``to_dict`` / ``to_tuple``.
+    """
+
+    def __new__(mcs, name: str, bases: tuple, attrs: Dict[str, Any]):
+        inherited = set()
+        for base in bases:
+            inherited.update(getattr(base, 'FIELDS', {}))
+        declared = [key for key, value in attrs.items() if isinstance(value, Field) and key not in inherited]
+
+        attrs = dict(attrs)
+        attrs['__slots__'] = tuple(attrs.get('__slots__', ())) + tuple(_slot_name(key) for key in declared)
+        cls = super().__new__(mcs, name, bases, attrs)
+        _compile(cls, attrs)
+        return cls
+
+
+class CompiledItem(MutableMapping, metaclass=CompiledItemMeta):
+    """
+    Slots-based Item with a fixed schema
+
+    字段按声明顺序存放在 ``__slots__`` 中；``coerce = True`` 时赋值前按 ``field_type`` 转换类型。
+    """
+    FIELDS: Dict[str, Any] = {}
+    FIELD_NAMES: Tuple[str, ...] = ()
+    allow_dynamic: bool = False
+    coerce: bool = False
+
+    def __getitem__(self, key: str) -> Any:
+        slot = self._SLOTS.get(key)
+        value = _UNSET if slot is None else getattr(self, slot)
+        if value is _UNSET:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        slot = self._SLOTS.get(key)
+        if slot is None:
+            raise KeyError(f"{self.__class__.__name__} does not contain field: {key}")
+        validator = self._VALIDATORS.get(key)
+        setattr(self, slot, validator(value) if validator else value)
+
+    def __delitem__(self, key: str) -> None:
+        slot = self._SLOTS.get(key)
+        if slot is None or getattr(self, slot) is _UNSET:
+            raise KeyError(key)
+        setattr(self, slot, _UNSET)
+
+    def __contains__(self, key: object) -> bool:
+        slot = self._SLOTS.get(key)
+        return slot is not None and getattr(self, slot) is not _UNSET
+
+    def __iter__(self) -> Iterator[str]:
+        return (name for name, value in zip(self.FIELD_NAMES, self._raw_values()) if value is not _UNSET)
+
+    def __len__(self) -> int:
+        return sum(value is not _UNSET for value in self._raw_values())
+
+    def __getattr__(self, item: str) -> Any:
+        if item in self.FIELDS:
+            raise ItemAttributeError(f"Use item[{item!r}] to access field values")
+        raise AttributeError(
+            f"{self.__class__.__name__} does not support field: {item}. "
+            f"Please declare the field in `{self.__class__.__name__}` first, "
+            f"then use item[{item!r}] to access it."
+        )
+
+    def __repr__(self) -> str:
+        return pformat(self.to_dict())
+
+    __str__ = __repr__
+
+    def copy(self) -> "CompiledItem":
+        """Deep copy the current Item"""
+        return deepcopy(self)
+
+
+# isinstance(item, Item) / issubclass(ProductItem, Item) 对编译后的类同样成立
+Item.register(CompiledItem)
@@ -154,8 +154,12 @@ class DownloadDelayMiddleware(BaseMiddleware):
         Returns:
             None: Continue processing
         """
+        # DomainSlotDispatcher 已在派发前按主机执行延迟，此处不再 sleep（否则双重延迟且占用全局并发）
+        if '_domain_slot' in request.meta:
+            return None
+
         domain = urlparse(request.url).netloc
-        
+
         wait_time = self._calculate_wait_time(domain)
         
         if wait_time > 0:
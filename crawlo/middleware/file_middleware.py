@@ -5,10 +5,13 @@
 ==============
 
 提供自动下载请求中附件的功能，支持多种文件类型和灵活配置。
+附件请求建议同时设置 ``meta['stream'] = True``：大文件由下载器分块落盘，本中间件直接复制临时文件。
 """
 
+import asyncio
 import os
 import re
+import shutil
 import aiofiles
 from urllib.parse import urlparse
 from typing import Optional, Dict, Any, List
@@ -17,6 +20,7 @@ import mimetypes
 from crawlo.middleware import BaseMiddleware
 from crawlo.logging import get_logger
 from crawlo.utils.misc import safe_get_path
+from crawlo.utils.request.response_helper import get_header_text
 
 
 class FileMiddleware(BaseMiddleware):
@@ -103,8 +107,8 @@ class FileMiddleware(BaseMiddleware):
             allowed_exts = allowed_extensions or self.allowed_extensions
             max_size = max_file_size or self.max_file_size
             
-            # 验证文件大小
-            content_length = len(response.body)
+            # 验证文件大小（body_size 不读取落盘的响应体）
+            content_length = response.body_size
             if content_length > max_size:
                 self.logger.warning(f"文件过大，超过限制 ({content_length} > {max_size}): {request.url}")
                 return None
@@ -120,7 +124,7 @@ class FileMiddleware(BaseMiddleware):
             
             # 验证内容类型（可选）
             if self.verify_content_type:
-                content_type = response.headers.get('Content-Type', b'').decode('utf-8').lower()
+                content_type = get_header_text(response.headers, 'Content-Type').lower()
                 if content_type and not self._is_allowed_content_type(content_type, ext):
                     self.logger.warning(f"内容类型与扩展名不匹配: {content_type} vs {ext} (来自 {request.url})")
                     return None
@@ -136,9 +140,12 @@ class FileMiddleware(BaseMiddleware):
             if self.create_dirs:
                 os.makedirs(os.path.dirname(filepath), exist_ok=True)
             
-            # 异步保存文件
-            async with aiofiles.open(filepath, 'wb') as f:
-                await f.write(response.body)
+            # 异步保存文件：流式下载落盘的响应体直接复制文件，不载入内存
+            if response.body_path:
+                await asyncio.to_thread(shutil.copyfile, response.body_path, filepath)
+            else:
+                async with aiofiles.open(filepath, 'wb') as f:
+                    await f.write(response.body)
             
             self.logger.info(f"附件下载成功: {actual_filename} ({content_length} bytes)")
             
@@ -147,7 +154,7 @@ class FileMiddleware(BaseMiddleware):
                 'filepath': filepath,
                 'size': content_length,
                 'url': request.url,
-                'content_type': response.headers.get('Content-Type', b'').decode('utf-8'),
+                'content_type': get_header_text(response.headers, 'Content-Type'),
                 'success': True
             }
         except Exception as e:
@@ -171,7 +178,7 @@ class FileMiddleware(BaseMiddleware):
             return custom_filename
         
         # 使用 Content-Disposition header 中的文件名
-        content_disposition = response.headers.get('Content-Disposition', b'').decode('utf-8')
+        content_disposition = get_header_text(response.headers, 'Content-Disposition')
         if 'filename=' in content_disposition:
             # re 已在顶部导入
             match = re.search(r'filename[^;=\n]*=(([\'\"]).*?\2|[^;\n]*)', content_disposition)
@@ -190,7 +197,7 @@ class FileMiddleware(BaseMiddleware):
         url_hash = hashlib.md5(request.url.encode()).hexdigest()[:8]  # nosec B324
         
         # 尝试从 Content-Type 推测扩展名
-        content_type = response.headers.get('Content-Type', b'').decode('utf-8')
+        content_type = get_header_text(response.headers, 'Content-Type')
         if content_type:
             ext = mimetypes.guess_extension(content_type.split(';')[0])
             if ext:
@@ -4,11 +4,11 @@
 OffsiteMiddleware
 Filters out requests that are outside the allowed domains
 """
-import re
 from urllib.parse import urlparse
 
 from crawlo.logging import get_logger
 from crawlo.http.exceptions import IgnoreRequestError
+from crawlo.utils.host_matcher import HostMatcher, url_netloc
 
 
 class OffsiteMiddleware:
@@ -49,7 +49,7 @@ class OffsiteMiddleware:
             allowed_domains=allowed_domains
         )
         
-        # Compile domain regex patterns for better performance
+        # Compile allowed domains into a host matcher
         o._compile_domains()
         
         # Use middleware's own logger instead of crawler.logger
@@ -58,36 +58,21 @@ class OffsiteMiddleware:
 
     def _compile_domains(self):
         """
-        Compile domain regex patterns for efficient matching
+        Compile allowed domains into a reversed-label trie (matches domain and subdomains)
+
+        Lookup cost depends on the number of labels in the hostname, not on the
+        number of allowed domains; decisions are cached per netloc.
         """
-        self._domain_regexes = []
-        for domain in self.allowed_domains:
-            # Escape special characters in domain
-            escaped_domain = re.escape(domain)
-            # Create regex pattern matching domain and subdomains
-            regex = re.compile(r'(^|.*\.)' + escaped_domain + '$', re.IGNORECASE)
-            self._domain_regexes.append(regex)
+        self._host_matcher = HostMatcher(self.allowed_domains)
 
     def _is_offsite_request(self, request):
         """
         Check if request is offsite (outside allowed domains)
         """
-        try:
-            parsed_url = urlparse(request.url)
-            hostname = parsed_url.hostname
-            
-            if not hostname:
-                return True  # Invalid URL
-                
-            # Check if hostname matches any allowed domain
-            for regex in self._domain_regexes:
-                if regex.match(hostname):
-                    return False  # Matches allowed domain
-                    
-            return True  # No match found
-        except Exception:
-            # URL parsing failed, treat as offsite
-            return True
+        netloc = url_netloc(request.url)
+        if not netloc:
+            return True  # Invalid URL
+        return not self._host_matcher.match(netloc)
 
     async def process_request(self, request, spider):
         """
@@ -9,6 +9,7 @@ Pipeline 模块
     generic_sql.py          — SQL 通用基类
     generic_doc.py          — 文档型通用基类
     manager.py              — PipelineManager
+    sink.py                 — 终端管道并发扇出（PIPELINE_SINKS）
     dedup/                  — 去重管道
     sql/                    — SQL 存储管道
     doc/                    — 文档型存储管道
@@ -37,11 +37,17 @@ Pipeline体系说明：
         async def process_item(self, item, spider):
             # 处理逻辑
             return item
+
+        # 可选：批量钩子（PROCESSOR_BATCH_MODE 下由 PipelineManager.process_items 整批调用，
+        # 返回保留的 item 列表；未实现时逐条调用 process_item）
+        async def process_items(self, items, spider):
+            return items
 """
 
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import inspect
 import time
 from abc import ABC, abstractmethod
@@ -182,7 +188,7 @@ class ResourceManagedPipeline(BasePipeline):
     - 自动资源清理
     - LIFO清理顺序
     - 异常容错
-    - 批量数据刷新
+    - 批量数据刷新（可选后台写入任务：按条数 / 时间刷新，双缓冲 + 有界反压）
     - 安全属性：破环阶段 self.crawler / self.settings / self.stats 自动切到
       Stub 对象，不再抛 AttributeError（保证 close_spider / flush 收尾不崩）。
     """
@@ -213,6 +219,17 @@ class ResourceManagedPipeline(BasePipeline):
         self.batch_size = self.settings.get_int('PIPELINE_BATCH_SIZE', 100)
         self.use_batch = self.settings.get_bool('PIPELINE_USE_BATCH', False)
 
+        # 后台批量写入（batch_flush_interval > 0 启用，见 _append_to_batch）
+        self.batch_flush_interval = self.settings.get_float('PIPELINE_BATCH_FLUSH_INTERVAL', 0.0)
+        self.max_buffer_size = max(
+            self.batch_size, self.settings.get_int('PIPELINE_MAX_BUFFER_SIZE', 1000)
+        )
+        self._batch_writer: Optional[asyncio.Task] = None
+        self._batch_wakeup: Optional[asyncio.Event] = None
+        self._batch_drained: Optional[asyncio.Event] = None
+        self._batch_stopping = False
+        self._batch_oldest = 0.0
+
         # 防重复清理标志（_on_spider_closed 和 PipelineManager.close 都会触发清理）
         self._cleaned_up = False
 
@@ -351,12 +368,121 @@ class ResourceManagedPipeline(BasePipeline):
             # 可选：失败后放回缓冲区或丢弃
             # self.batch_buffer.extend(items_to_save)
     
+    # ---- 后台批量写入 ----
+
+    @property
+    def _batch_stats_prefix(self) -> str:
+        return (getattr(self, '_PREFIX', None) or self.__class__.__name__).lower()
+
+    async def _append_to_batch(self, data: Any, spider: Spider) -> None:
+        """
+        追加一条数据到批量缓冲区，由后台写入任务刷新
+
+        写入任务把当前缓冲区整体交换出去再写（``_flush_batch`` 内交换），
+        写入期间生产者继续向新缓冲区追加；缓冲区达到 ``max_buffer_size`` 时
+        在此等待写入完成，从而把反压传递给 Processor。
+        """
+        self._start_batch_writer(spider)
+        limit = max(self.max_buffer_size, self.batch_size)
+        if len(self.batch_buffer) >= limit:
+            await self._wait_batch_space(spider, limit)
+        if not self.batch_buffer:
+            self._batch_oldest = time.monotonic()
+            self._batch_wakeup.set()
+        self.batch_buffer.append(data)
+        if len(self.batch_buffer) >= self.batch_size:
+            self._batch_wakeup.set()
+
+    def _start_batch_writer(self, spider: Spider) -> None:
+        if self._batch_writer is not None and not self._batch_writer.done():
+            return
+        self._batch_wakeup = asyncio.Event()
+        self._batch_drained = asyncio.Event()
+        if self.batch_buffer:
+            self._batch_wakeup.set()
+        self._batch_writer = asyncio.create_task(
+            self._batch_writer_loop(spider), name=f"{self.__class__.__name__}.batch_writer"
+        )
+
+    async def _wait_batch_space(self, spider: Spider, limit: int) -> None:
+        prefix = self._batch_stats_prefix
+        started = time.monotonic()
+        self.stats.inc_value(f'{prefix}/backpressure_waits')
+        while len(self.batch_buffer) >= limit:
+            if self._batch_writer is None or self._batch_writer.done():
+                # 写入任务已退出（关闭流程中）：退回同步刷新
+                await self._flush_batch(spider)
+                break
+            self._batch_drained.clear()
+            self._batch_wakeup.set()
+            await self._batch_drained.wait()
+        self.stats.inc_value(f'{prefix}/backpressure_time', time.monotonic() - started)
+
+    async def _batch_writer_loop(self, spider: Spider) -> None:
+        """攒满 batch_size 或最早一条已等待 batch_flush_interval 秒时写出一批"""
+        while True:
+            await self._batch_wakeup.wait()
+            self._batch_wakeup.clear()
+            deadline = self._batch_oldest + self.batch_flush_interval
+            while (self.batch_buffer and len(self.batch_buffer) < self.batch_size
+                   and not self._batch_stopping):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._batch_wakeup.wait(), remaining)
+                self._batch_wakeup.clear()
+            if self.batch_buffer:
+                await self._write_batch(spider)
+            self._batch_drained.set()
+            if self._batch_stopping and not self.batch_buffer:
+                return
+            if self.batch_buffer:
+                self._batch_wakeup.set()
+
+    async def _write_batch(self, spider: Spider) -> None:
+        """调用 _flush_batch 写出当前缓冲区并记录刷新指标（写入失败不终止写入任务）"""
+        prefix = self._batch_stats_prefix
+        stats = self.stats
+        depth = len(self.batch_buffer)
+        age = time.monotonic() - self._batch_oldest
+        started = time.monotonic()
+        try:
+            await self._flush_batch(spider)
+        except Exception as e:
+            stats.inc_value(f'{prefix}/flush_errors')
+            self.logger.error(f"后台批量写入失败 ({depth} 条): {e}")
+        elapsed = time.monotonic() - started
+
+        stats.inc_value(f'{prefix}/flush_count')
+        stats.set_value(f'{prefix}/flush_latency', round(elapsed, 4))
+        stats.set_value(f'{prefix}/flush_queue_depth', depth)
+        for key, value in (('flush_latency_max', round(elapsed, 4)),
+                           ('flush_batch_age_max', round(age, 4)),
+                           ('flush_queue_depth_max', depth)):
+            if value > (stats.get_value(f'{prefix}/{key}') or 0):
+                stats.set_value(f'{prefix}/{key}', value)
+
+    async def _stop_batch_writer(self) -> None:
+        """停止后台写入任务：先写完缓冲区剩余数据（关闭流程调用）"""
+        writer, self._batch_writer = self._batch_writer, None
+        if writer is None or writer.done():
+            return
+        self._batch_stopping = True
+        self._batch_wakeup.set()
+        try:
+            await writer
+        finally:
+            self._batch_stopping = False
+
     async def _on_spider_closed(self, **kwargs):
         """spider_closed 事件处理 - 刷新批量数据"""
         if self._cleaned_up:
             return
         self._cleaned_up = True
         try:
+            await self._stop_batch_writer()
+
             # 1. 刷新批量数据
             if self.use_batch and self.batch_buffer:
                 spider = self.crawler.spider
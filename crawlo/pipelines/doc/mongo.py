@@ -176,21 +176,16 @@ class MongoPipeline(GenericDocumentPipeline):
     # ═══════════════════════════════════════════════
 
     async def _flush_batch(self, spider):
-        """刷新批量缓冲区（带双重锁）"""
+        """刷新批量缓冲区（带双重锁）
+
+        缓冲区由父类在 _lock 内交换取出；此处只串行化并发 flush，
+        不能先行清空 batch_buffer，否则父类取到空批次，数据被丢弃。
+        """
         if not self.batch_buffer:
             return
 
         async with self._flush_lock:
-            if not self.batch_buffer:
-                return
-
-            batch = self.batch_buffer[:]
-            self.batch_buffer.clear()
-
-        if not batch:
-            return
-
-        await super()._flush_batch(spider)
+            await super()._flush_batch(spider)
 
     # ═══════════════════════════════════════════════
     # 清理
@@ -198,6 +193,7 @@ class MongoPipeline(GenericDocumentPipeline):
 
     async def _cleanup_resources(self):
         """清理资源"""
+        await self._stop_batch_writer()
         if self.use_batch and self.batch_buffer:
             spider = getattr(self.crawler, 'spider', None)
             spider_name = getattr(spider, 'name', 'unknown') if spider else 'unknown'
@@ -121,6 +121,9 @@ class GenericSQLPipeline(ResourceManagedPipeline):
         self.batch_size = max(1, self.settings.get_int(f'{prefix}_BATCH_SIZE', 100))
         self.max_buffer_size = max(self.batch_size, self.settings.get_int(f'{prefix}_MAX_BUFFER_SIZE', 1000))
         self.use_batch = self.settings.get_bool(f'{prefix}_USE_BATCH', False)
+        self.batch_flush_interval = self.settings.get_float(
+            f'{prefix}_BATCH_FLUSH_INTERVAL', self.batch_flush_interval
+        )
 
         # 重试配置
         self.max_retries = self.settings.get_int(f'{prefix}_EXECUTE_MAX_RETRIES', 3)
@@ -180,6 +183,16 @@ class GenericSQLPipeline(ResourceManagedPipeline):
             return await self._add_to_batch(item, spider)
         return await self._insert_single(item)
 
+    async def process_items(self, items: List[Item], spider) -> List[Item]:
+        """整批处理（Processor 批量模式）：批量写入时一次追加整批行，攒满后刷新"""
+        await self._ensure_initialized()
+        if not self.use_batch:
+            for item in items:
+                await self._insert_single(item)
+            return items
+        await self._extend_batch([dict(item) for item in items], spider)
+        return items
+
     async def _ensure_initialized(self):
         """确保已初始化（DCL 模式）"""
         if self._initialized and self.pool:
@@ -237,6 +250,10 @@ class GenericSQLPipeline(ResourceManagedPipeline):
         此处先调用 _ensure_initialized 让子类（如 MySQLPipeline）检查 pool 活性并
         在必要时重建，避免 "Cannot acquire connection after closing pool"。
         """
+        if self._batch_writer is not None:
+            # 后台写入任务退出前会写完缓冲区
+            await self._ensure_initialized()
+            await self._stop_batch_writer()
         if self.use_batch and self.batch_buffer:
             spider = getattr(self.crawler, 'spider', None)
             spider_name = getattr(spider, 'name', 'unknown') if spider else 'unknown'
@@ -306,16 +323,23 @@ class GenericSQLPipeline(ResourceManagedPipeline):
     # ═══════════════════════════════════════════════
 
     async def _add_to_batch(self, item: Item, spider) -> Item:
-        """添加到批量缓冲区"""
+        """添加到批量缓冲区（配置了 *_BATCH_FLUSH_INTERVAL 时交给后台写入任务）"""
+        await self._extend_batch([dict(item)], spider)
+        return item
+
+    async def _extend_batch(self, rows: List[Dict], spider):
+        if self.batch_flush_interval > 0:
+            for row in rows:
+                await self._append_to_batch(row, spider)
+            return
         async with self._lock:
             if len(self.batch_buffer) >= self.max_buffer_size:
                 self.logger.debug("Buffer full, triggering flush")
                 await self._flush_batch(spider)
-            self.batch_buffer.append(dict(item))
+            self.batch_buffer.extend(rows)
             should_flush = len(self.batch_buffer) >= self.batch_size
         if should_flush:
             await self._flush_batch(spider)
-        return item
 
     async def _flush_batch(self, spider):
         """刷新批量缓冲区"""
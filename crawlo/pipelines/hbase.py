@@ -70,6 +70,9 @@ class HBasePipeline(ResourceManagedPipeline):
         # 批量配置
         self.use_batch = self.settings.get_bool('HBASE_USE_BATCH', True)
         self.batch_size = max(1, self.settings.get_int('HBASE_BATCH_SIZE', 100))
+        self.batch_flush_interval = self.settings.get_float(
+            'HBASE_BATCH_FLUSH_INTERVAL', self.batch_flush_interval
+        )
 
     # ═══════════════════════════════════════════════
     # 生命周期
@@ -147,6 +150,7 @@ class HBasePipeline(ResourceManagedPipeline):
 
     async def _cleanup_resources(self):
         """清理资源"""
+        await self._stop_batch_writer()
         if self.use_batch and self.batch_buffer:
             spider = getattr(self.crawler, 'spider', None)
             spider_name = getattr(spider, 'name', 'unknown') if spider else 'unknown'
@@ -207,7 +211,10 @@ class HBasePipeline(ResourceManagedPipeline):
     # ═══════════════════════════════════════════════
 
     async def _add_to_batch(self, item: Item, spider) -> Item:
-        """添加到批量缓冲区"""
+        """添加到批量缓冲区（配置了 HBASE_BATCH_FLUSH_INTERVAL 时交给后台写入任务）"""
+        if self.batch_flush_interval > 0:
+            await self._append_to_batch(item, spider)
+            return item
         async with self._lock:
             self.batch_buffer.append(item)
             should_flush = len(self.batch_buffer) >= self.batch_size
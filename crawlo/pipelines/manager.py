@@ -18,7 +18,16 @@ Pipeline 管理器
         'crawlo.pipelines.MemoryDedupPipeline',
         'crawlo.pipelines.ConsolePipeline',
     ]
+
+终端管道并发扇出（可选）：
+    # 列在 PIPELINE_SINKS 中的管道从串行调用链中移出，转换 / 过滤管道执行完后
+    # 再投递到各自的有界队列并发写出（见 crawlo.pipelines.sink）
+    PIPELINE_SINKS = {
+        'myproject.pipelines.MySQLPipeline': 4,         # worker 数量
+        'crawlo.pipelines.JsonLinesPipeline': 1,
+    }
 """
+import asyncio
 from typing import List, Dict, Union
 from asyncio import create_task
 
@@ -28,6 +37,7 @@ from crawlo.utils.misc import load_object
 from crawlo.project import common_call
 from crawlo.core.errors import PipelineInitError, InvalidOutputError
 from crawlo.items.exceptions import ItemDiscard
+from crawlo.pipelines.sink import PipelineSink
 
 
 def get_builtin_dedup_pipeline_classes():
@@ -134,13 +144,16 @@ class PipelineManager:
     def __init__(self, crawler):
         self.crawler = crawler
         self.pipelines: List = []
+        self.pipeline_paths: List[str] = []
         self.methods: List = []
+        self.sinks: List[PipelineSink] = []
         self._closed = False  # PipelineManager.close 幂等标记：防重入时 crawler 属性提前被断
 
         self.logger = get_logger(self.__class__.__name__)
         # 支持字典和列表两种格式
         self.pipelines_settings = self.crawler.settings.get('PIPELINES', {})
         self.dedup_pipeline = self.crawler.settings.get('DEFAULT_DEDUP_PIPELINE')
+        self.sinks_settings = self.crawler.settings.get('PIPELINE_SINKS', [])
 
         # 添加调试信息
         self.logger.debug(f"PIPELINES from settings: {self.pipelines_settings}")
@@ -161,6 +174,8 @@ class PipelineManager:
         
         await self._add_pipelines(pipelines)
         self._add_methods()
+        for sink in self.sinks:
+            sink.start()
 
     @classmethod
     async def from_crawler(cls, *args, **kwargs):
@@ -185,6 +200,7 @@ class PipelineManager:
                 else:
                     instance = result
                 self.pipelines.append(instance)
+                self.pipeline_paths.append(pipeline_path)
             except Exception as e:
                 self.logger.error(f"Failed to load pipeline {pipeline_path}: {e}")
                 raise
@@ -204,10 +220,45 @@ class PipelineManager:
                 self.logger.info(f"enabled pipelines:\n{formatted_output}")
 
     def _add_methods(self):
-        for pipeline in self.pipelines:
-            if hasattr(pipeline, 'process_item'):
+        sink_workers = self._sink_workers()
+        for i, pipeline in enumerate(self.pipelines):
+            if not hasattr(pipeline, 'process_item'):
+                continue
+            path = self.pipeline_paths[i] if i < len(self.pipeline_paths) else None
+            if path in sink_workers:
+                self.sinks.append(PipelineSink(
+                    pipeline, self.crawler,
+                    queue_size=int(self.crawler.settings.get('PIPELINE_SINK_QUEUE_SIZE', 1000)),
+                    workers=sink_workers[path],
+                ))
+            else:
                 self.methods.append(pipeline.process_item)
 
+        missing = set(sink_workers) - set(self.pipeline_paths)
+        if missing:
+            self.logger.warning(f"PIPELINE_SINKS not found in PIPELINES, ignored: {sorted(missing)}")
+        if self.sinks:
+            self.logger.info(
+                "pipeline sinks: " + ", ".join(f"{sink.name} (workers={sink.workers})" for sink in self.sinks)
+            )
+
+    def _sink_workers(self) -> Dict[str, int]:
+        """PIPELINE_SINKS → {管道路径: worker 数量}（列表格式使用 PIPELINE_SINK_WORKERS）"""
+        config = self.sinks_settings
+        if not config:
+            return {}
+        if isinstance(config, dict):
+            return {path: int(workers) for path, workers in config.items()}
+        if isinstance(config, str):
+            config = [config]
+        workers = int(self.crawler.settings.get('PIPELINE_SINK_WORKERS', 1))
+        return {path: workers for path in config}
+
+    @property
+    def sink_pending(self) -> int:
+        """各 sink 队列中尚未处理完的 item 总数"""
+        return sum(sink.pending for sink in self.sinks)
+
     async def process_item(self, item):
         try:
             for method in self.methods:
@@ -224,8 +275,78 @@ class PipelineManager:
             # 异常已经被处理和通知，这里只需要重新抛出
             raise
         else:
+            for sink in self.sinks:
+                await sink.put(item)
             create_task(self.crawler.subscriber.notify(CrawlerEvent.ITEM_SUCCESSFUL, item, self.crawler.spider))
 
+    async def process_items(self, items: List) -> int:
+        """
+        批量处理 Item（Processor 批量模式调用）
+
+        管道实现了 ``process_items(items, spider)`` 时整批调用：返回保留的 item 列表
+        （保留的 item 须原样返回），未返回的视为丢弃；整批抛出异常时该批全部计为出错。
+        其余管道逐条调用 process_item，单条出错 / 丢弃只影响该条。
+
+        Returns:
+            int: 出错（不含丢弃）的 item 数
+        """
+        crawler = self.crawler
+        spider = crawler.spider
+        notify = crawler.subscriber.notify
+        errors = 0
+        discarded = []
+        for method in self.methods:
+            if not items:
+                break
+            process_items = getattr(getattr(method, '__self__', None), 'process_items', None)
+            if process_items is not None:
+                try:
+                    kept = await process_items(items, spider)
+                except ItemDiscard as exc:
+                    discarded.extend((item, exc) for item in items)
+                    items = []
+                    break
+                except Exception as e:
+                    self.logger.error(f"Error processing {len(items)} items in {process_items.__qualname__}: {e}")
+                    errors += len(items)
+                    items = []
+                    break
+                if len(kept) != len(items):
+                    kept_ids = {id(item) for item in kept}
+                    exc = ItemDiscard(f"Discarded by {process_items.__qualname__}")
+                    discarded.extend((item, exc) for item in items if id(item) not in kept_ids)
+                items = kept
+                continue
+
+            passed = []
+            for item in items:
+                try:
+                    result = await common_call(method, item, spider)
+                    if result is None:
+                        raise InvalidOutputError(f"{method.__qualname__} return None is not supported.")
+                    passed.append(result)
+                except ItemDiscard as exc:
+                    discarded.append((item, exc))
+                except Exception as e:
+                    errors += 1
+                    self.logger.error(f"Error processing {item}: {e}")
+            items = passed
+
+        for item in items:
+            for sink in self.sinks:
+                await sink.put(item)
+        if items or discarded:
+            # 一批只创建一个通知任务
+            create_task(self._notify_batch(notify, spider, items, discarded))
+        return errors
+
+    async def _notify_batch(self, notify, spider, items, discarded):
+        for item, exc in discarded:
+            self.logger.debug(f"Item discarded by pipeline: {exc}")
+            await notify(CrawlerEvent.ITEM_DISCARD, item, exc, spider)
+        for item in items:
+            await notify(CrawlerEvent.ITEM_SUCCESSFUL, item, spider)
+
     async def close(self):
         """关闭所有 pipeline，清理资源（防重复清理 + 防重入 + 破环）。
 
@@ -240,6 +361,12 @@ class PipelineManager:
             return
         self._closed = True
 
+        # 0. 先等各 sink 队列写完，再关闭管道
+        if self.sinks:
+            timeout = self.crawler.settings.get('PIPELINE_SINK_DRAIN_TIMEOUT', 60.0)
+            await asyncio.gather(*(sink.close(timeout) for sink in self.sinks), return_exceptions=True)
+            self.sinks.clear()
+
         for pipeline in self.pipelines:
             try:
                 # 防重复清理（_on_spider_closed 可能已触发过）
@@ -292,6 +419,7 @@ class PipelineManager:
                 except Exception as e:
                     self.logger.debug("Suppressed exception: %s", e)
         self.pipelines.clear()
+        self.pipeline_paths.clear()
         self.crawler = None  # type: ignore[assignment]
         # logger 最后清（如果此时还有后续 log 调用，不要报错）
         self.logger = None  # type: ignore[assignment]
\ No newline at end of file
@@ -0,0 +1,153 @@
+#!/usr/bin/python
+# -*- coding:UTF-8 -*-
+"""
+终端管道（Sink）并发扇出
+======================
+PIPELINE_SINKS 中的管道不再参与 PipelineManager 的串行调用链：
+前置的转换 / 过滤管道照常按顺序执行，通过的 item 再投递到每个 sink 的有界队列，
+由各自的 worker 并发写出。
+
+- 反压按 sink 隔离：某个 sink 的队列满时 put 等待，只有它拖慢上游
+- 错误按 sink 隔离：sink 抛出的异常只记录日志和统计，不影响其他 sink
+- sink 的返回值不再使用；多个 sink 收到的是同一个 item 对象，不应修改它
+- workers > 1 时同一 sink 内不保证写入顺序，且要求该管道的 process_item 可并发调用
+
+统计（前缀 ``pipeline_sink/<管道类名>``）：
+    items / errors / discarded / put_blocked        累计计数（items 含出错 / 丢弃的条目）
+    queue_depth / queue_depth_max                   当前 / 最大队列深度
+    latency / latency_max / latency_p99             单条处理耗时（秒）
+    throughput                                      处理速率（条/秒，按首条开始到最近完成计）
+"""
+import asyncio
+import time
+from typing import List, Optional
+
+from crawlo.items.exceptions import ItemDiscard
+from crawlo.logging import get_logger
+from crawlo.project import common_call
+from crawlo.utils.ring_buffer import RingBuffer
+
+_SUMMARY_EVERY = 100  # 每处理多少条刷新一次 p99 / throughput
+
+
+class PipelineSink:
+    """
+    单个终端管道：有界队列 + worker 池
+
+    Args:
+        pipeline: 管道实例（需有 process_item）
+        crawler: Crawler 实例（取 spider / stats）
+        queue_size: 队列上限，满时 put 等待（反压）
+        workers: worker 数量
+    """
+
+    def __init__(self, pipeline, crawler, queue_size: int = 1000, workers: int = 1):
+        self.pipeline = pipeline
+        self.crawler = crawler
+        self.name = pipeline.__class__.__name__
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max(queue_size, 1))
+        self.workers = max(workers, 1)
+        self.logger = get_logger(self.__class__.__name__)
+
+        self._method = pipeline.process_item
+        self._prefix = f'pipeline_sink/{self.name}'
+        self._tasks: List[asyncio.Task] = []
+        self._latency = RingBuffer(1000)
+        self._started_at: Optional[float] = None
+        self._finished_at = 0.0
+        self._pending = 0
+        self.processed = 0
+        self.errors = 0
+        self.discarded = 0
+
+    @property
+    def pending(self) -> int:
+        """已投递但尚未处理完的 item 数（含正在处理的）"""
+        return self._pending
+
+    @property
+    def throughput(self) -> float:
+        if self._started_at is None or self._finished_at <= self._started_at:
+            return 0.0
+        return self.processed / (self._finished_at - self._started_at)
+
+    def start(self):
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f'pipeline-sink-{self.name}-{i}')
+            for i in range(self.workers)
+        ]
+
+    async def put(self, item):
+        """投递 item；队列满时等待（反压只作用于当前 sink）"""
+        queue = self.queue
+        stats = self.crawler.stats
+        if queue.full():
+            stats.inc_value(f'{self._prefix}/put_blocked')
+        await queue.put(item)
+        self._pending += 1
+        depth = queue.qsize()
+        stats.set_value(f'{self._prefix}/queue_depth', depth)
+        if depth > (stats.get_value(f'{self._prefix}/queue_depth_max') or 0):
+            stats.set_value(f'{self._prefix}/queue_depth_max', depth)
+
+    async def close(self, timeout: Optional[float] = None):
+        """等待队列处理完（最多 timeout 秒）后停止 worker"""
+        if self._tasks:
+            try:
+                await asyncio.wait_for(self.queue.join(), timeout=timeout)
+            except asyncio.TimeoutError:
+                self.logger.warning(f"Sink {self.name} drain timeout, {self.pending} items dropped")
+            for task in self._tasks:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            self._tasks = []
+        if self.crawler is not None:
+            self._write_summary()
+        self.crawler = None
+
+    async def _worker(self):
+        queue = self.queue
+        while True:
+            item = await queue.get()
+            started = time.monotonic()
+            if self._started_at is None:
+                self._started_at = started
+            try:
+                await common_call(self._method, item, self.crawler.spider)
+            except ItemDiscard as exc:
+                self.discarded += 1
+                self.crawler.stats.inc_value(f'{self._prefix}/discarded')
+                self.logger.debug(f"Item discarded by sink {self.name}: {exc}")
+            except Exception as e:
+                self.errors += 1
+                self.crawler.stats.inc_value(f'{self._prefix}/errors')
+                self.logger.error(f"Sink {self.name} failed to process item: {e}")
+            finally:
+                self._record(started)
+                self._pending -= 1
+                queue.task_done()
+
+    def _record(self, started: float):
+        now = time.monotonic()
+        elapsed = now - started
+        self._finished_at = now
+        self._latency.append(elapsed)
+        self.processed += 1
+
+        stats = self.crawler.stats
+        prefix = self._prefix
+        stats.inc_value(f'{prefix}/items')
+        stats.set_value(f'{prefix}/queue_depth', self.queue.qsize())
+        stats.set_value(f'{prefix}/latency', round(elapsed, 4))
+        if elapsed > (stats.get_value(f'{prefix}/latency_max') or 0):
+            stats.set_value(f'{prefix}/latency_max', round(elapsed, 4))
+        if self.processed % _SUMMARY_EVERY == 0:
+            self._write_summary()
+
+    def _write_summary(self):
+        stats = self.crawler.stats
+        if len(self._latency):
+            stats.set_value(f'{self._prefix}/latency_p99', round(self._latency.percentile(99), 4))
+        stats.set_value(f'{self._prefix}/throughput', round(self.throughput, 2))
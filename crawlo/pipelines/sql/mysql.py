@@ -25,6 +25,14 @@ class MySQLPipeline(GenericSQLPipeline):
 
     _PREFIX = 'MYSQL'
 
+    # ── 配置 ──
+
+    def _init_config(self):
+        """扩展配置 — MySQL 特有：单条多行 VALUES 语句的行数上限"""
+        super()._init_config()
+        # 大批量拆成多条语句，避免超过 max_allowed_packet
+        self.rows_per_statement = max(1, self.settings.get_int('MYSQL_ROWS_PER_STATEMENT', 1000))
+
     # ═══════════════════════════════════════════════
     # 连接池
     # ═══════════════════════════════════════════════
@@ -123,18 +131,22 @@ class MySQLPipeline(GenericSQLPipeline):
         )
 
     async def _do_batch_insert(self, batch: List[Dict]) -> int:
-        """批量事务插入"""
+        """批量事务插入（多行 VALUES，每 MYSQL_ROWS_PER_STATEMENT 行一条语句）"""
+        total = 0
         async with self._helper.transaction() as cursor:
-            sql, params = self._helper._sql_builder.make_batch(
-                self.table_name, batch,
-                auto_update=self.auto_update,
-                update_columns=self.update_columns,
-                insert_ignore=self.insert_ignore
-            )
-            if sql is None:
-                return 0
-            await cursor.execute(sql, params)
-            return cursor.rowcount
+            for i in range(0, len(batch), self.rows_per_statement):
+                result = self._helper._sql_builder.make_batch(
+                    self.table_name, batch[i:i + self.rows_per_statement],
+                    auto_update=self.auto_update,
+                    update_columns=self.update_columns,
+                    insert_ignore=self.insert_ignore
+                )
+                if result is None:
+                    continue
+                sql, params = result
+                await cursor.execute(sql, params)
+                total += cursor.rowcount
+        return total
 
     async def _do_batch_insert_no_tx(self, batch: List[Dict]) -> int:
         """批量无事务插入"""
@@ -144,5 +156,5 @@ class MySQLPipeline(GenericSQLPipeline):
             auto_update=self.auto_update,
             update_columns=self.update_columns,
             insert_ignore=self.insert_ignore,
-            batch_size=len(batch)
+            batch_size=self.rows_per_statement
         )
@@ -9,6 +9,7 @@ PostgreSQL Pipeline — 异步 PostgreSQL 数据管道
 - ON CONFLICT (conflict_cols) DO UPDATE
 - 必须配置 PG_CONFLICT_COLUMNS（与 MySQL 的自动唯一键检测不同）
 - 占位符风格 $1, $2（使用 PostgreSQLDialect 管理）
+- 批量写入按列集合分组：executemany 预编译语句，或 COPY 临时表 + 集合式 INSERT（PG_BULK_MODE）
 
 依赖：asyncpg>=0.29.0
 
@@ -60,6 +61,14 @@ class PostgreSQLPipeline(GenericSQLPipeline):
                 "Or set PG_INSERT_IGNORE=True to use ON CONFLICT DO NOTHING."
             )
 
+        # 批量写入方式：executemany（预编译语句）| copy（COPY 临时表 + 集合式 INSERT）
+        self.bulk_mode = str(self.settings.get('PG_BULK_MODE') or 'executemany').lower()
+        if self.bulk_mode not in ('executemany', 'copy'):
+            raise PipelineInitError(
+                f"Invalid PG_BULK_MODE: {self.bulk_mode!r} (expected 'executemany' or 'copy')"
+            )
+        self._sql_cache: Dict[tuple, str] = {}
+
     # ═══════════════════════════════════════════════
     # 连接池
     # ═══════════════════════════════════════════════
@@ -117,74 +126,104 @@ class PostgreSQLPipeline(GenericSQLPipeline):
     # 单条 / 批量插入（使用 PostgreSQLDialect 构建 SQL）
     # ═══════════════════════════════════════════════
 
+    def _insert_sql(self, cols: tuple) -> str:
+        """按列集合构建 INSERT ... ON CONFLICT 语句并缓存（同列集合的行共用一条预编译语句）"""
+        sql = self._sql_cache.get(cols)
+        if sql is None:
+            data = dict.fromkeys(cols)
+            if self.insert_ignore:
+                sql, _ = PostgreSQLDialect.build_insert_ignore(self.table_name, data)
+            else:
+                sql, _ = PostgreSQLDialect.build_upsert(
+                    table=self.table_name,
+                    data=data,
+                    conflict_cols=self.conflict_cols,
+                    update_cols=self.update_columns,
+                )
+            self._sql_cache[cols] = sql
+        return sql
+
+    @staticmethod
+    def _group_rows(batch: List[Dict]) -> Dict[tuple, List[tuple]]:
+        """按列集合（含顺序）分组，值转为与列对齐的元组"""
+        groups: Dict[tuple, List[tuple]] = {}
+        for data in batch:
+            groups.setdefault(tuple(data), []).append(tuple(data.values()))
+        return groups
+
+    def _dedupe_conflicts(self, cols: tuple, rows: List[tuple]) -> List[tuple]:
+        """
+        按冲突列去重，保留最后一行。
+
+        集合式 ON CONFLICT DO UPDATE 不允许同一语句两次更新同一行，
+        逐行执行时后写覆盖先写，这里保持同样的结果。
+        """
+        if self.insert_ignore or not set(self.conflict_cols) <= set(cols):
+            return rows
+        key_idx = [cols.index(c) for c in self.conflict_cols]
+        latest = {tuple(row[i] for i in key_idx): row for row in rows}
+        return list(latest.values())
+
+    async def _copy_upsert(self, conn, cols: tuple, rows: List[tuple], seq: int):
+        """COPY 到临时表后一条 INSERT ... SELECT ... ON CONFLICT 写入（须在事务内调用）"""
+        tmp = f'_crawlo_bulk_{seq}'
+        col_list = PostgreSQLDialect.build_cols_str(list(cols))
+        # 只复制列类型，不带 NOT NULL 等约束；提交时自动删除
+        await conn.execute(
+            f'CREATE TEMP TABLE {PostgreSQLDialect.quote(tmp)} ON COMMIT DROP AS '
+            f'SELECT {col_list} FROM {PostgreSQLDialect.quote(self.table_name)} WITH NO DATA'
+        )
+        await conn.copy_records_to_table(
+            tmp, records=self._dedupe_conflicts(cols, rows), columns=list(cols)
+        )
+        await conn.execute(PostgreSQLDialect.build_upsert_select(
+            self.table_name, list(cols), PostgreSQLDialect.quote(tmp),
+            conflict_cols=self.conflict_cols,
+            update_cols=self.update_columns,
+            ignore=self.insert_ignore,
+        ))
+
     async def _do_insert(self, data: Dict) -> int:
         """单条插入"""
-        if self.insert_ignore:
-            sql, params = PostgreSQLDialect.build_insert_ignore(
-                self.table_name, data
-            )
-        else:
-            sql, params = PostgreSQLDialect.build_upsert(
-                table=self.table_name,
-                data=data,
-                conflict_cols=self.conflict_cols,
-                update_cols=self.update_columns,
-            )
+        sql = self._insert_sql(tuple(data))
 
         async with self.pool.acquire() as conn:
-            await conn.execute(sql, *params)
+            await conn.execute(sql, *data.values())
             # asyncpg 的 execute 返回 "INSERT 0 1" 格式字符串
             return 1
 
     async def _do_batch_insert(self, batch: List[Dict]) -> int:
-        """批量事务插入"""
+        """
+        批量事务插入
+
+        每个列集合一次往返：PG_BULK_MODE='executemany' 时预编译一次语句后
+        executemany；'copy' 时 COPY 到临时表再集合式写入。
+        """
         if not batch:
             return 0
 
-        list(batch[0].keys())
-        total = 0
-
         async with self.pool.acquire() as conn:
             async with conn.transaction():
-                for data in batch:
-                    if self.insert_ignore:
-                        sql, params = PostgreSQLDialect.build_insert_ignore(
-                            self.table_name, data
-                        )
+                for seq, (cols, rows) in enumerate(self._group_rows(batch).items()):
+                    if self.bulk_mode == 'copy':
+                        await self._copy_upsert(conn, cols, rows, seq)
                     else:
-                        sql, params = PostgreSQLDialect.build_upsert(
-                            table=self.table_name,
-                            data=data,
-                            conflict_cols=self.conflict_cols,
-                            update_cols=self.update_columns,
-                        )
-                    await conn.execute(sql, *params)
-                    total += 1
+                        await conn.executemany(self._insert_sql(cols), rows)
 
-        return total
+        return len(batch)
 
     async def _do_batch_insert_no_tx(self, batch: List[Dict]) -> int:
-        """批量无事务插入"""
+        """
+        批量无事务插入
+
+        COPY 需要事务内的临时表，这里始终使用 executemany
+        （asyncpg 的 executemany 对单个列集合是原子的）。
+        """
         if not batch:
             return 0
 
-        list(batch[0].keys())
-        total = 0
-
         async with self.pool.acquire() as conn:
-            for data in batch:
-                if self.insert_ignore:
-                    sql, params = PostgreSQLDialect.build_insert_ignore(
-                        self.table_name, data
-                    )
-                else:
-                    sql, params = PostgreSQLDialect.build_upsert(
-                        table=self.table_name,
-                        data=data,
-                        conflict_cols=self.conflict_cols,
-                        update_cols=self.update_columns,
-                    )
-                await conn.execute(sql, *params)
-                total += 1
-
-        return total
+            for cols, rows in self._group_rows(batch).items():
+                await conn.executemany(self._insert_sql(cols), rows)
+
+        return len(batch)
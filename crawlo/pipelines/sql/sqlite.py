@@ -129,18 +129,18 @@ class SQLitePipeline(GenericSQLPipeline):
         else:
             sql = SQLiteDialect.build_insert(self.table_name, cols)
 
-        total = 0
+        params_list = [
+            tuple(row.get(col, '') for col in cols)
+            for row in batch
+        ]
         try:
             await self.pool.execute('BEGIN')
-            for row in batch:
-                params = tuple(row.get(col, '') for col in cols)
-                cursor = await self.pool.execute(sql, params)
-                total += cursor.rowcount
+            cursor = await self.pool.executemany(sql, params_list)
             await self.pool.commit()
         except Exception:
             await self.pool.rollback()
             raise
-        return total
+        return cursor.rowcount
 
     async def _do_batch_insert_no_tx(self, batch: List[Dict]) -> int:
         """批量插入（无事务）"""
@@ -5,24 +5,49 @@
 
 基于 SQLite 的磁盘持久化队列，
 支持大规模数据存储、断电恢复和批量操作。
+
+吞吐设计：
+- 所有 SQLite 读写都在专用的单线程 writer 上执行（一个连接），不阻塞事件循环；
+  单线程执行器按提交顺序串行执行，天然保证写入 / 读取的先后关系
+- 入队组提交：put 只追加到内存缓冲，攒满 ``batch_size`` 条或距首条超过 ``commit_interval``
+  秒时一次事务 executemany 写入；出队确认（processed = 1）随下一次组提交一起写入
+- 出队预取：本地缓冲为空时一次读取 ``prefetch_size`` 条（至少为 get_batch 请求的条数），
+  后续 get 直接从内存返回
+- 队列长度由内存计数器维护，size() 不再执行 COUNT(*)
+
+崩溃语义：尚未提交的入队（至多 ``commit_interval`` 秒 / ``batch_size`` 条）会丢失；
+已出队但尚未确认的条目在重启后重新投递（至少一次）。``commit_interval=0`` 时每次 put
+等待自身事务提交后返回。组提交失败时本批入队与确认放回缓冲并稍后重试，已返回 True 的 put
+不会因一次失败而丢弃；同步提交失败时只撤回调用方自己的条目并返回 False。
+
+预取缓冲中的条目已排好序，其后入队的更高优先级条目要等缓冲取完才会被取出
+（优先级反转不超过 ``prefetch_size`` 条）。
 """
 import asyncio
 import os
 import json
 import time
 import logging
+import warnings
 import pickle  # nosec B403
 import sqlite3
 import tempfile
-from typing import Optional, Any, Dict, List
-from contextlib import contextmanager
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Optional, Any, Deque, Dict, List, Tuple
 from dataclasses import dataclass
 
+from crawlo.http.request import Request
 from crawlo.queue.interfaces import IQueue, BackpressureableQueueMixin
 from crawlo.queue.queue_types import QueueType
+from crawlo.utils.request.request_codec import RequestCodec, get_request_codec
 
 logger = logging.getLogger(__name__)
 
+# 组提交失败后的最短重试间隔（秒）
+_FLUSH_RETRY_INTERVAL = 1.0
+
 
 @dataclass
 class QueueItem:
@@ -44,7 +69,7 @@ class DiskQueueConfig:
         max_size: int = 0,
         db_name: str = "queue.db",
         table_name: str = "queue_items",
-        max_connections: int = 5,
+        max_connections: Optional[int] = None,
         WAL_mode: bool = True,
         cache_size: int = 10000,
         synchronous: str = "NORMAL",
@@ -53,6 +78,8 @@ class DiskQueueConfig:
         ttl: float = 0,  # 0 表示永不过期
         serialization: str = "pickle",
         compress: bool = False,
+        commit_interval: float = 0.05,
+        prefetch_size: int = 0,
     ):
         """
         初始化磁盘队列配置
@@ -63,16 +90,25 @@ class DiskQueueConfig:
             max_size: 最大队列大小，0 表示无限制
             db_name: 数据库文件名
             table_name: 表名
-            max_connections: 最大连接数
+            max_connections: 已废弃（所有读写共用 writer 线程上的单个连接），传入时发出 DeprecationWarning
             WAL_mode: 是否启用 WAL 模式
             cache_size: 缓存大小
             synchronous: 同步模式 (OFF, NORMAL, FULL)
-            batch_size: 批量操作大小
+            batch_size: 批量操作大小（组提交攒满该条数立即写入）
             cleanup_interval: 清理间隔（秒）
             ttl: 生存时间（秒），0 表示永不过期
-            serialization: 序列化方式 ("pickle", "json")
+            serialization: 序列化方式 ("pickle", "json", "codec")
             compress: 是否压缩数据
+            commit_interval: 组提交最长等待时间（秒），0 表示每次 put 同步提交
+            prefetch_size: 出队预取条数，0 表示与 batch_size 相同
         """
+        if max_connections is not None:
+            warnings.warn(
+                "DiskQueueConfig(max_connections=...) is deprecated and ignored: "
+                "all SQLite I/O uses a single writer connection",
+                DeprecationWarning,
+                stacklevel=2
+            )
         if path is None:
             path = os.path.join(tempfile.gettempdir(), "crawlo_disk_queue")
         
@@ -81,7 +117,6 @@ class DiskQueueConfig:
         self.max_size = max_size
         self.db_name = db_name
         self.table_name = table_name
-        self.max_connections = max_connections
         self.WAL_mode = WAL_mode
         self.cache_size = cache_size
         self.synchronous = synchronous
@@ -90,6 +125,8 @@ class DiskQueueConfig:
         self.ttl = ttl
         self.serialization = serialization
         self.compress = compress
+        self.commit_interval = commit_interval
+        self.prefetch_size = prefetch_size or batch_size
     
     def get_db_path(self) -> str:
         """获取数据库文件路径"""
@@ -108,6 +145,7 @@ class DiskQueue(BackpressureableQueueMixin, IQueue):
     - 支持批量操作
     - 支持 TTL 自动清理
     - 支持数据压缩
+    - 组提交 + 出队预取，SQLite I/O 在专用线程执行（见模块说明）
     
     使用示例：
         config = DiskQueueConfig(path="/tmp/queue", max_size=10000)
@@ -134,6 +172,22 @@ class DiskQueue(BackpressureableQueueMixin, IQueue):
         self._cleanup_task: Optional[asyncio.Task] = None
         self._closed = False
         
+        # 单线程 writer：唯一的 SQLite 连接只在该线程上使用
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"disk-queue-{config.name}")
+        self._conn: Optional[sqlite3.Connection] = None
+        
+        # 组提交缓冲：待写入的 (priority, data, created_at) 与待确认的行 id
+        self._pending_puts: List[Tuple[int, bytes, float]] = []
+        self._pending_acks: List[int] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        
+        # 出队预取缓冲：(id, data)，已按优先级排好序
+        self._prefetched: Deque[Tuple[int, bytes]] = deque()
+        self._not_empty = asyncio.Event()
+        self._size = 0
+        # 已提交的行数（含已处理），由组提交 / 清理 / 清空维护
+        self._total_items = 0
+        
         # 统计信息
         self._total_puts = 0
         self._total_gets = 0
@@ -156,6 +210,8 @@ class DiskQueue(BackpressureableQueueMixin, IQueue):
         
         # 创建表
         await self._create_table()
+        self._size = await self._run(self._count_pending)
+        self._total_items = await self._run(self._count_total)
         
         # 启动清理任务
         if self._config.ttl > 0:
@@ -165,37 +221,47 @@ class DiskQueue(BackpressureableQueueMixin, IQueue):
         logger.info(f"DiskQueue '{self._name}' opened at {self._db_path}")
     
     async def _init_connection_pool(self) -> None:
-        """初始化连接池"""
-        # 创建主连接用于写入
-        conn = self._create_connection()
-        conn.execute("PRAGMA journal_mode=WAL" if self._config.WAL_mode else "")
+        """在 writer 线程上创建主连接（之后所有读写共用）"""
+        self._conn = await self._run(self._open_writer_connection)
+        self._connection_pool.append(self._conn)
+    
+    def _open_writer_connection(self) -> sqlite3.Connection:
+        conn = self._create_connection(check_same_thread=False)
+        if self._config.WAL_mode:
+            conn.execute("PRAGMA journal_mode=WAL")
         conn.execute(f"PRAGMA cache_size=-{self._config.cache_size}")
         conn.execute(f"PRAGMA synchronous={self._config.synchronous}")
-        self._connection_pool.append(conn)
+        return conn
     
-    def _create_connection(self) -> sqlite3.Connection:
+    def _create_connection(self, check_same_thread: bool = True) -> sqlite3.Connection:
         """创建新的数据库连接"""
         conn = sqlite3.connect(
             self._db_path,
             timeout=30.0,
             isolation_level="DEFERRED",
+            check_same_thread=check_same_thread,
         )
         conn.row_factory = sqlite3.Row
         return conn
     
-    @contextmanager
-    def _get_connection(self):
-        """获取数据库连接（上下文管理器）"""
-        conn = self._create_connection()
-        conn.row_factory = sqlite3.Row
-        try:
-            yield conn
-        finally:
-            conn.close()
+    def _writer_conn(self) -> sqlite3.Connection:
+        """writer 线程使用的连接；队列未打开或已关闭时抛出 RuntimeError"""
+        conn = self._conn
+        if conn is None:
+            raise RuntimeError(f"DiskQueue '{self._name}' is not open")
+        return conn
+    
+    async def _run(self, func, *args):
+        """在 writer 线程上执行同步 SQLite 操作"""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, partial(func, *args))
     
     async def _create_table(self) -> None:
         """创建队列表"""
-        with self._get_connection() as conn:
+        await self._run(self._create_table_sync)
+    
+    def _create_table_sync(self) -> None:
+        conn = self._conn
+        if conn is not None:
             cursor = conn.cursor()
             cursor.execute(f"""
                 CREATE TABLE IF NOT EXISTS {self._config.table_name} (
@@ -208,10 +274,11 @@ class DiskQueue(BackpressureableQueueMixin, IQueue):
                 )
             """)
             
-            # 创建索引
+            # 出队索引：只覆盖未处理行，顺序与出队 ORDER BY 一致（rowid 隐含在末尾）
             cursor.execute(f"""
-                CREATE INDEX IF NOT EXISTS idx_priority_created
-                ON {self._config.table_name} (priority DESC, created_at ASC)
+                CREATE INDEX IF NOT EXISTS idx_pending_order
+                ON {self._config.table_name} (priority ASC, created_at ASC)
+                WHERE processed = 0
             """)
             
             cursor.execute(f"""
@@ -222,8 +289,10 @@ class DiskQueue(BackpressureableQueueMixin, IQueue):
             conn.commit()
     
     def _serialize(self, item: Any) -> bytes:
-        """序列化数据"""
+        """序列化数据（codec 模式下 Request 使用共享二进制编解码器，其他对象仍走 pickle）"""
         try:
+            if self._config.serialization == "codec" and isinstance(item, Request):
+                return get_request_codec().encode(item)
             if self._config.serialization == "json":
                 data = json.dumps(item)
                 return data.encode('utf-8')
@@ -234,8 +303,10 @@ class DiskQueue(BackpressureableQueueMixin, IQueue):
             raise
     
     def _deserialize(self, data: bytes) -> Any:
-        """反序列化数据"""
+        """反序列化数据（codec 载荷按前缀识别，与旧格式可混存）"""
         try:
+            if RequestCodec.is_encoded(data):
+                return get_request_codec().decode(data)
             if self._config.serialization == "json":
                 return json.loads(data.decode('utf-8'))
             else:
@@ -248,6 +319,8 @@ class DiskQueue(BackpressureableQueueMixin, IQueue):
         """
         入队操作
         
+        写入组提交缓冲后返回；缓冲攒满 batch_size 条时等待本批提交（写入背压）。
+        
         Args:
             item: 要入队的元素
             priority: 优先级，数值越小优先级越高（与框架统一）
@@ -261,14 +334,12 @@ class DiskQueue(BackpressureableQueueMixin, IQueue):
             return False
         
         # 检查队列大小限制
-        if self._max_size > 0:
-            current_size = await self.size()
-            if current_size >= self._max_size:
-                logger.warning(
-                    f"Queue '{self._name}' is full ({current_size}/{self._max_size})"
-                )
-                self._stats.record_reject()
-                return False
+        if self._max_size > 0 and self._size >= self._max_size:
+            logger.warning(
+                f"Queue '{self._name}' is full ({self._size}/{self._max_size})"
+            )
+            self._stats.record_reject()
+            return False
         
         # 应用背压控制
         if self._backpressure_enabled:
@@ -280,35 +351,31 @@ class DiskQueue(BackpressureableQueueMixin, IQueue):
         
         try:
             serialized = self._serialize(item)
-            created_at = time.time()
-            
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    f"""
-                    INSERT INTO {self._config.table_name}
-                    (priority, data, created_at, processed)
-                    VALUES (?, ?, ?, 0)
-                    """,
-                    (priority, serialized, created_at)
-                )
-                conn.commit()
-            
-            self._total_puts += 1
-            self._stats.record_enqueue()
-            self._stats.update_max_size(await self.size())
-            
-            return True
-            
         except Exception as e:
             logger.error(f"Error putting item to queue '{self._name}': {e}")
             self._total_errors += 1
             self._stats.record_reject()
             return False
+        
+        entry = (priority, serialized, time.time())
+        self._pending_puts.append(entry)
+        self._size += 1
+        self._total_puts += 1
+        self._stats.record_enqueue()
+        self._stats.update_max_size(self._size)
+        self._not_empty.set()
+        
+        if self._config.commit_interval <= 0 or len(self._pending_puts) >= self._config.batch_size:
+            if await self._flush():
+                return True
+            self._withdraw_puts([entry])
+            return False
+        self._schedule_flush()
+        return True
     
     async def put_batch(self, items: List[Any], default_priority: int = 0) -> int:
         """
-        批量入队
+        批量入队（连同缓冲中的待提交条目一次事务写入）
         
         Args:
             items: 要入队的元素列表
@@ -317,43 +384,57 @@ class DiskQueue(BackpressureableQueueMixin, IQueue):
         Returns:
             int: 成功入队的数量
         """
-        if not items:
+        if not items or self._closed:
             return 0
         
-        success_count = 0
-        created_at = time.time()
+        # 检查队列大小限制：超出容量的部分拒绝入队
+        if self._max_size > 0:
+            capacity = max(0, self._max_size - self._size)
+            if capacity < len(items):
+                logger.warning(
+                    f"Queue '{self._name}' is full ({self._size}/{self._max_size}), "
+                    f"rejecting {len(items) - capacity} of {len(items)} items"
+                )
+                for _ in range(len(items) - capacity):
+                    self._stats.record_reject()
+                items = items[:capacity]
+                if not items:
+                    return 0
         
+        # 应用背压控制
+        if self._backpressure_enabled:
+            should_backpressure = await self.should_apply_backpressure()
+            if should_backpressure:
+                delay = await self.calculate_backpressure_delay()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+        
+        created_at = time.time()
         try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                
-                data_batch = [
-                    (default_priority, self._serialize(item), created_at)
-                    for item in items
-                ]
-                
-                cursor.executemany(
-                    f"""
-                    INSERT INTO {self._config.table_name}
-                    (priority, data, created_at, processed)
-                    VALUES (?, ?, ?, 0)
-                    """,
-                    data_batch
-                )
-                conn.commit()
-            
-            success_count = len(items)
-            self._total_puts += success_count
-            
-            for _ in range(success_count):
-                self._stats.record_enqueue()
-            
-            return success_count
-            
+            data_batch = [
+                (default_priority, self._serialize(item), created_at)
+                for item in items
+            ]
         except Exception as e:
             logger.error(f"Error in batch put to queue '{self._name}': {e}")
             self._total_errors += 1
             return 0
+        
+        self._pending_puts.extend(data_batch)
+        self._size += len(data_batch)
+        if not await self._flush():
+            self._withdraw_puts(data_batch)
+            return 0
+        
+        success_count = len(items)
+        self._total_puts += success_count
+        
+        for _ in range(success_count):
+            self._stats.record_enqueue()
+        self._stats.update_max_size(self._size)
+        self._not_empty.set()
+        
+        return success_count
     
     async def get(self, timeout: Optional[float] = None) -> Optional[Any]:
         """
@@ -365,63 +446,40 @@ class DiskQueue(BackpressureableQueueMixin, IQueue):
         Returns:
             出队的元素，如果超时返回 None
         """
-        if self._closed and await self.empty():
+        if self._closed:
             return None
         
         timeout_value = timeout if timeout is not None else 0
         deadline = time.time() + timeout_value if timeout_value > 0 else None
         
         while True:
-            if deadline and time.time() >= deadline:
-                return None
+            if self._prefetched:
+                return self._take()
             
+            # 先清除唤醒标记再查库：查库期间到达的 put 会重新置位，不会漏唤醒
+            self._not_empty.clear()
             try:
-                with self._get_connection() as conn:
-                    cursor = conn.cursor()
-                    
-                    # 获取最高优先级的未处理项（数值越小越优先）
-                    cursor.execute(
-                        f"""
-                        SELECT id, priority, data, created_at
-                        FROM {self._config.table_name}
-                        WHERE processed = 0
-                        ORDER BY priority ASC, created_at ASC
-                        LIMIT 1
-                        """
-                    )
-                    row = cursor.fetchone()
-                    
-                    if row is None:
-                        if timeout_value == 0:
-                            return None
-                        await asyncio.sleep(0.1)
-                        continue
-                    
-                    # 标记为已处理
-                    cursor.execute(
-                        f"""
-                        UPDATE {self._config.table_name}
-                        SET processed = 1
-                        WHERE id = ?
-                        """,
-                        (row['id'],)
-                    )
-                    conn.commit()
-                
-                item = self._deserialize(row['data'])
-                self._total_gets += 1
-                self._stats.record_dequeue()
-                return item
-                
+                if await self._refill(self._config.prefetch_size):
+                    continue
             except Exception as e:
                 logger.error(f"Error getting item from queue '{self._name}': {e}")
                 self._total_errors += 1
                 return None
+            
+            remaining = deadline - time.time() if deadline else 0
+            if remaining <= 0:
+                return None
+            try:
+                await asyncio.wait_for(self._not_empty.wait(), remaining)
+            except asyncio.TimeoutError:
+                return None
     
     async def get_batch(self, batch_size: int, timeout: Optional[float] = 1.0) -> List[Any]:
         """
         批量出队
         
+        本地缓冲不足时一次预取 max(缺口, prefetch_size) 条；队列为空时最多等待 timeout 秒取第一条。
+        
         Args:
             batch_size: 最大批量大小
             timeout: 获取超时时间
@@ -429,42 +487,152 @@ class DiskQueue(BackpressureableQueueMixin, IQueue):
         Returns:
             List: 出队的元素列表
         """
-        items = []
-        deadline = time.time() + timeout if timeout else None
+        items: List[Any] = []
+        if self._closed:
+            return items
         
-        for _ in range(batch_size):
-            if deadline and time.time() >= deadline:
-                break
-            
-            item = await self.get(timeout=0.1)
-            if item is None:
-                break
-            items.append(item)
+        try:
+            while len(items) < batch_size:
+                if not self._prefetched:
+                    wanted = max(batch_size - len(items), self._config.prefetch_size)
+                    if not await self._refill(wanted):
+                        break
+                item = self._take()
+                if item is not None:
+                    items.append(item)
+        except Exception as e:
+            logger.error(f"Error in batch get from queue '{self._name}': {e}")
+            self._total_errors += 1
         
+        if not items and timeout:
+            item = await self.get(timeout=timeout)
+            if item is not None:
+                items.append(item)
         return items
     
-    async def size(self) -> int:
+    def _take(self) -> Optional[Any]:
+        """从预取缓冲取出一条，出队确认随下一次组提交写入"""
+        row_id, data = self._prefetched.popleft()
+        self._pending_acks.append(row_id)
+        self._size = max(0, self._size - 1)
+        self._total_gets += 1
+        self._stats.record_dequeue()
+        self._schedule_flush()
+        return self._deserialize(data)
+    
+    async def _refill(self, limit: int) -> int:
         """
-        获取队列大小
+        提交缓冲后从数据库预取至多 limit 条未处理条目，返回预取条数。
         
-        Returns:
-            int: 当前队列中的未处理元素数量
+        加锁避免并发的出队协程预取到同一批行。提交失败时不预取（返回 0）：
+        未写入的出队确认对应的行仍为未处理状态，此时读取会重复投递。
         """
+        async with self._lock:
+            if self._prefetched:
+                return len(self._prefetched)
+            if not await self._flush():
+                return 0
+            rows = await self._run(self._fetch_pending, max(1, limit))
+            self._prefetched.extend(rows)
+            return len(rows)
+    
+    # ---- writer 线程上执行的同步操作 ----
+    
+    def _fetch_pending(self, limit: int) -> List[Tuple[int, bytes]]:
+        # 获取最高优先级的未处理项（数值越小越优先）
+        cursor = self._writer_conn().execute(
+            f"""
+            SELECT id, data
+            FROM {self._config.table_name}
+            WHERE processed = 0
+            ORDER BY priority ASC, created_at ASC, id ASC
+            LIMIT ?
+            """,  # nosec B608
+            (limit,)
+        )
+        return [(row[0], row[1]) for row in cursor.fetchall()]
+    
+    def _write_batch(self, puts: List[Tuple[int, bytes, float]], acks: List[int]) -> None:
+        conn = self._writer_conn()
         try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
+            if puts:
+                conn.executemany(
                     f"""
-                    SELECT COUNT(*) as count
-                    FROM {self._config.table_name}
-                    WHERE processed = 0
-                    """
+                    INSERT INTO {self._config.table_name}
+                    (priority, data, created_at, processed)
+                    VALUES (?, ?, ?, 0)
+                    """,  # nosec B608
+                    puts
+                )
+            if acks:
+                # 标记为已处理
+                conn.executemany(
+                    f"UPDATE {self._config.table_name} SET processed = 1 WHERE id = ?",  # nosec B608
+                    [(row_id,) for row_id in acks]
                 )
-                row = cursor.fetchone()
-                return row['count'] if row else 0
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    
+    def _count_pending(self) -> int:
+        row = self._writer_conn().execute(
+            f"SELECT COUNT(*) FROM {self._config.table_name} WHERE processed = 0"  # nosec B608
+        ).fetchone()
+        return row[0] if row else 0
+    
+    def _count_total(self) -> int:
+        row = self._writer_conn().execute(f"SELECT COUNT(*) FROM {self._config.table_name}").fetchone()  # nosec B608
+        return row[0] if row else 0
+    
+    # ---- 组提交 ----
+    
+    def _schedule_flush(self) -> None:
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+    
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self._config.commit_interval)
+        while not await self._flush() and not self._closed:
+            await asyncio.sleep(max(self._config.commit_interval, _FLUSH_RETRY_INTERVAL))
+    
+    async def _flush(self) -> bool:
+        """
+        一次事务写入缓冲中的入队与出队确认。
+        
+        失败时本批入队与出队确认按原顺序放回缓冲（计入错误），并安排稍后重试。
+        """
+        if not self._pending_puts and not self._pending_acks:
+            return True
+        puts, self._pending_puts = self._pending_puts, []
+        acks, self._pending_acks = self._pending_acks, []
+        try:
+            await self._run(self._write_batch, puts, acks)
+            self._total_items += len(puts)
+            return True
         except Exception as e:
-            logger.error(f"Error getting queue size: {e}")
-            return 0
+            logger.error(f"Error committing {len(puts)} puts to queue '{self._name}': {e}")
+            self._total_errors += 1
+            self._pending_puts[:0] = puts
+            self._pending_acks[:0] = acks
+            if not self._closed:
+                self._schedule_flush()
+            return False
+    
+    def _withdraw_puts(self, entries: List[Tuple[int, bytes, float]]) -> None:
+        """同步提交失败时从缓冲撤回调用方自己的入队（其余条目留待重试）"""
+        withdrawn = {id(entry) for entry in entries}
+        self._pending_puts = [entry for entry in self._pending_puts if id(entry) not in withdrawn]
+        self._size = max(0, self._size - len(entries))
+    
+    async def size(self) -> int:
+        """
+        获取队列大小
+        
+        Returns:
+            int: 当前队列中的未处理元素数量（内存计数器，含尚未提交的入队）
+        """
+        return self._size
     
     async def total_size(self) -> int:
         """
@@ -474,13 +642,8 @@ class DiskQueue(BackpressureableQueueMixin, IQueue):
             int: 总元素数量
         """
         try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    f"SELECT COUNT(*) as count FROM {self._config.table_name}"  # nosec B608
-                )
-                row = cursor.fetchone()
-                return row['count'] if row else 0
+            await self._flush()
+            return await self._run(self._count_total)
         except Exception:
             return 0
     
@@ -496,7 +659,11 @@ class DiskQueue(BackpressureableQueueMixin, IQueue):
     async def close(self) -> None:
         """
         关闭队列
+        
+        提交缓冲中的入队与出队确认；预取但未取出的条目仍为未处理状态，下次打开时可见。
         """
+        if self._closed:
+            return
         self._closed = True
         
         # 停止清理任务
@@ -507,12 +674,21 @@ class DiskQueue(BackpressureableQueueMixin, IQueue):
             except asyncio.CancelledError:
                 pass
         
+        if self._flush_task and not self._flush_task.done():
+            self._flush_task.cancel()
+        if self._conn is not None:
+            await self._flush()
+        self._prefetched.clear()
+        
         # 关闭连接
         for conn in self._connection_pool:
             try:
-                conn.close()
+                await self._run(conn.close)
             except Exception as e:
                 logger.debug("Suppressed exception: %s", e)
+        self._connection_pool.clear()
+        self._conn = None
+        self._executor.shutdown(wait=False)
         
         self._stats.mark_end()
         
@@ -523,16 +699,24 @@ class DiskQueue(BackpressureableQueueMixin, IQueue):
         )
     
     async def clear(self) -> None:
-        """清空队列"""
+        """清空队列（包括尚未提交的缓冲与预取缓冲）"""
+        self._pending_puts.clear()
+        self._pending_acks.clear()
+        self._prefetched.clear()
+        self._size = 0
+        self._total_items = 0
         try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(f"DELETE FROM {self._config.table_name}")  # nosec B608
-                conn.commit()
+            await self._run(self._clear_sync)
             logger.debug(f"DiskQueue '{self._name}' cleared")
         except Exception as e:
             logger.error(f"Error clearing queue: {e}")
     
+    def _clear_sync(self) -> None:
+        conn = self._writer_conn()
+        conn.execute(f"DELETE FROM {self._config.table_name}")  # nosec B608
+        conn.commit()
+    
+    
     async def _cleanup_loop(self) -> None:
         """定期清理过期数据"""
         while not self._closed:
@@ -558,50 +742,42 @@ class DiskQueue(BackpressureableQueueMixin, IQueue):
         
         try:
             deadline = time.time() - self._config.ttl
-            
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    f"""
-                    DELETE FROM {self._config.table_name}
-                    WHERE created_at < ? AND processed = 1
-                    """,
-                    (deadline,)
-                )
-                deleted = cursor.rowcount
-                conn.commit()
+            deleted = await self._run(self._delete_expired, deadline)
+            self._total_items = max(0, self._total_items - deleted)
             
             if deleted > 0:
                 logger.debug(f"Cleaned up {deleted} expired items from queue '{self._name}'")
             
-            # 执行 VACUUM 回收空间
-            if deleted > 1000:
-                with self._get_connection() as conn:
-                    conn.execute("VACUUM")
-            
             return deleted
             
         except Exception as e:
             logger.error(f"Error cleaning up expired items: {e}")
             return 0
     
+    def _delete_expired(self, deadline: float) -> int:
+        conn = self._writer_conn()
+        cursor = conn.execute(
+            f"""
+            DELETE FROM {self._config.table_name}
+            WHERE created_at < ? AND processed = 1
+            """,  # nosec B608
+            (deadline,)
+        )
+        deleted = cursor.rowcount
+        conn.commit()
+        
+        # 执行 VACUUM 回收空间
+        if deleted > 1000:
+            conn.execute("VACUUM")
+        return deleted
+    
     def get_extended_stats(self) -> Dict[str, Any]:
         """
-        获取扩展统计信息
+        获取扩展统计信息（total_items 为组提交维护的已提交行数，不访问数据库）
         
         Returns:
             Dict: 扩展统计信息
         """
-        try:
-            total_items = 0
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(f"SELECT COUNT(*) as count FROM {self._config.table_name}")  # nosec B608
-                row = cursor.fetchone()
-                total_items = row['count'] if row else 0
-        except Exception:
-            total_items = -1
-        
         return {
             'queue_type': QueueType.DISK.value,
             'name': self._name,
@@ -610,11 +786,16 @@ class DiskQueue(BackpressureableQueueMixin, IQueue):
             'total_puts': self._total_puts,
             'total_gets': self._total_gets,
             'total_errors': self._total_errors,
-            'total_items': total_items,
+            'total_items': self._total_items,
+            'pending_size': self._size,
+            'uncommitted_puts': len(self._pending_puts),
+            'prefetched': len(self._prefetched),
             'config': {
                 'ttl': self._config.ttl,
                 'serialization': self._config.serialization,
                 'compress': self._config.compress,
+                'commit_interval': self._config.commit_interval,
+                'prefetch_size': self._config.prefetch_size,
             },
             'base_stats': self._stats.to_dict(),
         }
@@ -626,6 +807,7 @@ class DiskQueue(BackpressureableQueueMixin, IQueue):
                 conn.close()
             except Exception as e:
                 logger.debug("Suppressed exception: %s", e)
+        self._executor.shutdown(wait=False)
 
 
 __all__ = [
@@ -11,7 +11,7 @@
 import asyncio
 import time
 import logging
-from typing import Optional, Any, Dict, List
+from typing import Optional, Any, Dict, List, Tuple
 
 from crawlo.queue.queue_types import QueueType
 from crawlo.queue.interfaces import IQueue, BackpressureableQueueMixin
@@ -664,6 +664,9 @@ class DomainAwareQueue(MemoryQueue):
 class SpiderPriorityQueue(asyncio.PriorityQueue):
     """带超时功能的异步优先级队列（MemoryQueue 的轻量级替代）"""
 
+    # asyncio.PriorityQueue 内部的堆（_init 中创建），元素为 (priority, item)
+    _queue: List[Tuple[int, Any]]
+
     def __init__(self, maxsize: int = 0) -> None:
         """初始化队列，maxsize为0表示无大小限制"""
         super().__init__(maxsize)
@@ -698,6 +701,46 @@ class SpiderPriorityQueue(asyncio.PriorityQueue):
         except asyncio.TimeoutError:
             return None
 
+    async def get_batch(self, batch_size: int, timeout: float = 0.0) -> List[Any]:
+        """
+        批量出队（一次唤醒取出多个元素）
+
+        与逐个 ``get()`` 不同，队列非空时用 ``get_nowait`` 直接排空，
+        不为每个元素创建超时定时器；队列为空且 ``timeout > 0`` 时
+        只等待第一个元素。
+
+        Args:
+            batch_size: 最大批量大小
+            timeout: 队列为空时等待第一个元素的超时（秒），0 表示不等待
+
+        Returns:
+            List: 出队的元素列表（可能为空）
+        """
+        items: List[Any] = []
+        if batch_size <= 0:
+            return items
+        if self.empty() and timeout > 0:
+            first = await self.get(timeout=timeout)
+            if first is None:
+                return items
+            items.append(first)
+        while len(items) < batch_size:
+            try:
+                _, item = self.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            items.append(item)
+        return items
+
+    def snapshot(self) -> List[Any]:
+        """
+        不出队地返回当前全部元素（堆内顺序，非严格优先级序）
+        
+        Returns:
+            List: 元素列表的浅拷贝
+        """
+        return [item for _, item in self._queue]
+
     async def size(self) -> int:
         """
         异步获取队列大小（与 MemoryQueue API 保持一致）
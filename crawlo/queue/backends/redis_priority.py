@@ -21,6 +21,7 @@ except ImportError:
 from crawlo import Request
 from crawlo.logging import get_logger
 from crawlo.utils.errors import ErrorHandler, ErrorContext
+from crawlo.utils.request.request_codec import RequestCodec, get_request_codec
 from crawlo.utils.request.request_serializer import RequestSerializer
 from crawlo.utils.redis import get_redis_pool, RedisConnectionPool, RedisKeyManager
 
@@ -131,6 +132,7 @@ class RedisPriorityQueue:
         self._lock: asyncio.Lock = asyncio.Lock()
         self.request_serializer: RequestSerializer = RequestSerializer(serialization_format=serialization_format)
         self.serialization_format: str = serialization_format  # 新增：存储序列化格式
+        self._request_codec: RequestCodec = get_request_codec()
         self._serialization_validated: bool = False  # 序列化验证标志
 
     async def connect(self, max_retries: int = 3, delay: int = 1) -> None:
@@ -203,6 +205,20 @@ class RedisPriorityQueue:
             self._redis = None
             await self.connect()
     
+    def _serialize_request(self, request: 'Request') -> bytes:
+        """
+        按配置的格式序列化请求
+
+        - codec：共享的二进制编解码器（字段 id + 省略默认值，体积约为 pickle dict 的 40%）
+        - msgpack / pickle：Request.to_dict() 后整体序列化
+        """
+        if self.serialization_format == 'codec':
+            return self._request_codec.encode(request)
+        request_data = self.request_serializer.prepare_for_serialization(request)
+        if self.serialization_format == 'msgpack' and MSGPACK_AVAILABLE:
+            return msgpack.packb(request_data, default=str)
+        return pickle.dumps(request_data)
+
     def _validate_serialization_format(self) -> None:
         """
         验证序列化格式是否正常工作（仅在连接时调用一次）
@@ -218,7 +234,10 @@ class RedisPriorityQueue:
             request_data = self.request_serializer.prepare_for_serialization(test_request)
             
             # 测试序列化格式
-            if self.serialization_format == 'msgpack' and MSGPACK_AVAILABLE:
+            if self.serialization_format == 'codec':
+                restored = self._request_codec.decode(self._serialize_request(test_request))
+                assert restored.url == test_request.url, "codec 往返结果不一致"  # nosec B101
+            elif self.serialization_format == 'msgpack' and MSGPACK_AVAILABLE:
                 serialized = msgpack.packb(request_data, default=str)
                 deserialized = msgpack.unpackb(serialized, raw=False)
                 assert isinstance(deserialized, dict), "msgpack 反序列化结果不是 dict"  # nosec B101
@@ -288,14 +307,8 @@ class RedisPriorityQueue:
             score = priority
             key = self._get_request_key(request)
 
-            # 🔥 使用 Request.to_dict() 序列化
-            request_data = self.request_serializer.prepare_for_serialization(request)
-
             # 根据配置的序列化格式进行序列化（移除冗余验证，已在连接时验证）
-            if self.serialization_format == 'msgpack' and MSGPACK_AVAILABLE:
-                serialized = msgpack.packb(request_data, default=str)
-            else:
-                serialized = pickle.dumps(request_data)
+            serialized = self._serialize_request(request)
 
             # 处理集群模式下的操作
             try:
@@ -396,12 +409,7 @@ class RedisPriorityQueue:
                         pipe = self._redis.pipeline()
                         for request, priority in batch:
                             key = self._get_request_key(request)
-                            request_data = self.request_serializer.prepare_for_serialization(request)
-
-                            if self.serialization_format == 'msgpack' and MSGPACK_AVAILABLE:
-                                serialized = msgpack.packb(request_data, default=str)
-                            else:
-                                serialized = pickle.dumps(request_data)
+                            serialized = self._serialize_request(request)
 
                             pipe.zadd(queue_name_with_tag, {key: priority})
                             pipe.hset(data_key_with_tag, key, serialized)
@@ -411,12 +419,7 @@ class RedisPriorityQueue:
                         pipe = self._redis.pipeline()
                         for request, priority in batch:
                             key = self._get_request_key(request)
-                            request_data = self.request_serializer.prepare_for_serialization(request)
-
-                            if self.serialization_format == 'msgpack' and MSGPACK_AVAILABLE:
-                                serialized = msgpack.packb(request_data, default=str)
-                            else:
-                                serialized = pickle.dumps(request_data)
+                            serialized = self._serialize_request(request)
 
                             pipe.zadd(self.queue_name, {key: priority})
                             pipe.hset(self.key_manager.get_requests_data_key(), key, serialized)
@@ -556,6 +559,8 @@ class RedisPriorityQueue:
             return None
         
         try:
+            if RequestCodec.is_encoded(serialized):
+                return self._request_codec.decode(serialized)
             if self.serialization_format == 'msgpack' and MSGPACK_AVAILABLE:
                 data = msgpack.unpackb(serialized, raw=False)
             else:
@@ -16,15 +16,39 @@
 
 Redis 版本要求：基础功能 5.0+，XAUTOCLAIM 需要 6.2+。
 低版本自动降级为 XPENDING + XCLAIM 手动 fallback。
+
+预取消费（``set_prefetch(n)`` / STREAM_PREFETCH）：
+- 后台任务先读高优、再用剩余额度读普通 Stream，合计最多预取 n 条到本地缓冲
+- 出队直接取本地缓冲（高优优先），缓冲降到一半时后台补充，不再逐条往返 Redis
+- 关闭时未交付的缓冲消息以 XCLAIM IDLE 标记为可回收，其他 Worker 立即接管
+
+批量入队与 ACK 合并：
+- ``put_batch`` 用 pipeline 批量 XADD，每条按 priority 路由到高优 / 普通 Stream
+- ``set_ack_batch(n, interval_ms)`` / STREAM_ACK_BATCH_SIZE 开启后，ack 与 RETRY 类 nack
+  先进入本地缓冲，攒满 n 条或距首条超过 interval_ms 时按 Stream 各用一次 Lua 调用提交
+
+崩溃安全（ACK 合并）：
+- 缓冲中的 ACK / 重试只存在于进程内存；消息在 Redis 中仍是本 Consumer 的 pending
+- 进程在提交前退出时，这些消息不会丢失：超过 consumer_idle_timeout 后由其他 Worker
+  的 claim_stale_pending / 启动回收重新投递（投递计数 +1）
+- 代价是重复处理：最多重复一个合并窗口（≤ n 条或 interval_ms 内）已处理完的请求，
+  语义仍为 at-least-once；需要幂等的下游应按请求指纹去重
+- 重试消息若尚未提交，则不会增加 retry_count，而是以回收路径重新投递
+- close() 与集群优雅关闭会先提交缓冲，正常退出不产生重复
 """
+import asyncio
+import contextlib
 import json
 import pickle  # nosec B403
 import time
 import uuid
-from typing import Optional, Any, Dict, List, Tuple
+from collections import deque
+from typing import Optional, Any, Deque, Dict, List, Tuple
 
 from crawlo.logging import get_logger
 from crawlo.queue.task_tracker import TaskResult
+from crawlo.utils.request.request_codec import RequestCodec, get_request_codec
+from crawlo.utils.request.request_serializer import RequestSerializer
 from crawlo.utils.redis.stream_utils import (
     detect_redis_version,
     supports_xautoclaim,
@@ -33,6 +57,44 @@ from crawlo.utils.redis.stream_utils import (
     claim_pending_manual,
     get_pending_count,
 )
+from crawlo.utils.redis.scripts import run_script
+
+
+# 合并提交 ACK 与重试（flush_acks）：每个 Stream 一次 EVALSHA
+_FLUSH_ACKS_LUA = (
+    "local n_ack = tonumber(ARGV[5]) "
+    "local acked = 0 "
+    "for i = 6, 5 + n_ack do "
+    "  if redis.call('XACK', KEYS[1], ARGV[1], ARGV[i]) > 0 then "
+    "    redis.call('XDEL', KEYS[1], ARGV[i]) "
+    "    acked = acked + 1 "
+    "  end "
+    "end "
+    "local escalate = {} "
+    "for i = 6 + n_ack, #ARGV, 2 do "
+    "  local msgs = redis.call('XRANGE', KEYS[1], ARGV[i], ARGV[i], 'COUNT', 1) "
+    "  if #msgs > 0 then "
+    "    local flat = msgs[1][2] "
+    "    local fields = {} "
+    "    for j = 1, #flat, 2 do fields[flat[j]] = flat[j + 1] end "
+    "    local retry_count = 1 "
+    "    if fields['retry_count'] then retry_count = tonumber(fields['retry_count']) + 1 end "
+    "    if retry_count >= tonumber(ARGV[3]) then "
+    "      escalate[#escalate + 1] = ARGV[i] "
+    "    else "
+    "      redis.call('XACK', KEYS[1], ARGV[1], ARGV[i]) "
+    "      redis.call('XDEL', KEYS[1], ARGV[i]) "
+    "      fields['retry_count'] = tostring(retry_count) "
+    "      fields['last_error'] = ARGV[i + 1] "
+    "      fields['reenqueued_at'] = ARGV[2] "
+    "      local nf = {} "
+    "      for k, v in pairs(fields) do nf[#nf + 1] = k; nf[#nf + 1] = v end "
+    "      redis.call('XADD', KEYS[1], 'MAXLEN', '~', tonumber(ARGV[4]), '*', unpack(nf)) "
+    "    end "
+    "  end "
+    "end "
+    "return {acked, escalate}"
+)
 
 
 class RedisStreamQueue:
@@ -60,6 +122,12 @@ class RedisStreamQueue:
     # 类级别：已输出过版本日志的流名称集合（避免多个实例重复日志）
     _version_logged: set = set()
 
+    # 预取缓冲大小（0 = 关闭，逐条 XREADGROUP）；由 set_prefetch 开启
+    _prefetch_size: int = 0
+
+    # ACK 合并条数（1 = 关闭，逐条 Lua 提交）；由 set_ack_batch 开启
+    _ack_batch_size: int = 1
+
     def __init__(
         self,
         redis_url: str,
@@ -90,7 +158,7 @@ class RedisStreamQueue:
             consumer_idle_timeout: Consumer 空闲超时（ms），超时后任务可被回收
             delivery_count_limit: 最大投递次数，超过则进死信
             block_timeout: XREADGROUP 阻塞超时（ms）
-            serialization_format: 序列化格式（pickle | json | msgpack）
+            serialization_format: 序列化格式（pickle | json | codec）
             sentinel_urls: Sentinel 地址列表（空 = 直连模式）
             sentinel_service: Sentinel 监控的 Master 名称
             cluster_enabled: 是否使用 Redis Cluster（优先于直连）
@@ -105,6 +173,11 @@ class RedisStreamQueue:
         self._block_timeout = block_timeout
         self._serialization_format = serialization_format
         self._stream_compact = stream_compact
+        self._request_serializer = RequestSerializer(serialization_format=serialization_format)
+        # codec 格式：精简模式下 priority / headers / cookies 由消息字段与中间件补全，不写入
+        self._request_codec = get_request_codec(
+            exclude=('priority', 'headers', 'cookies') if stream_compact else ()
+        )
         self._sentinel_urls = sentinel_urls or []
         self._sentinel_service = sentinel_service
         self._cluster_enabled = cluster_enabled or self.redis_url.startswith(
@@ -140,6 +213,22 @@ class RedisStreamQueue:
         # message_id → stream_key 映射（支持双 Stream 的 ACK/NACK）
         self._message_stream: dict = {}
 
+        # 预取缓冲：按 Stream 分开存放，出队时高优优先
+        self._prefetch_size = 0
+        self._prefetch_high: Deque[Tuple[Any, list]] = deque()
+        self._prefetch_low: Deque[Tuple[Any, list]] = deque()
+        self._prefetch_task: Optional[asyncio.Task] = None
+        self._prefetch_wakeup = asyncio.Event()
+        self._prefetch_ready = asyncio.Event()
+        self._prefetch_reads = 0
+
+        # ACK / 重试合并缓冲：stream → [(message_id, error)]，error 为 None 表示 ACK
+        self._ack_batch_size = 1
+        self._ack_flush_interval = 0.05
+        self._ack_buffer: Dict[str, List[Tuple[str, Optional[str]]]] = {}
+        self._ack_buffered = 0
+        self._ack_flush_task: Optional[asyncio.Task] = None
+
         self.logger = get_logger(self.__class__.__name__)
 
     # ---- 公开属性（供 FailoverManager 等外部组件使用） ----
@@ -322,7 +411,16 @@ class RedisStreamQueue:
                 self.logger.warning(f"Failed to ensure consumer group on {stream}")
 
     async def close(self):
-        """关闭连接"""
+        """关闭连接（先提交合并缓冲中的 ACK，预取模式下再交还未交付的缓冲消息）"""
+        task, self._ack_flush_task = self._ack_flush_task, None
+        if task is not None and not task.done():
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        if self._ack_buffered and self._redis:
+            await self.flush_acks()
+        if self._prefetch_size and self._redis:
+            await self.release_prefetched()
         if self._redis:
             await self._redis.aclose()
             self._redis = None
@@ -522,6 +620,51 @@ class RedisStreamQueue:
             self.logger.error(f"XADD failed: {e}")
             return False
 
+    async def put_batch(self, requests: List[Tuple[Any, int]], batch_size: int = 500) -> int:
+        """
+        批量 XADD 入队（pipeline，每批一次网络往返）。
+
+        每条请求按 priority 路由到高优 / 普通 Stream，消息字段与 put 一致。
+        某批执行失败时停止，返回已成功入队的条数（即输入列表的前缀长度），
+        调用方可对其余请求逐条 put。
+
+        Args:
+            requests: (request, priority) 元组列表
+            batch_size: 每个 pipeline 最多包含的 XADD 条数
+
+        Returns:
+            int: 成功入队的请求数量
+        """
+        if not requests:
+            return 0
+        self._ensure_connected()
+
+        added = 0
+        for start in range(0, len(requests), batch_size):
+            batch = requests[start:start + batch_size]
+            try:
+                # Cluster 客户端的 pipeline 不支持 transaction 参数（按 slot 自动分组）
+                pipe = self._redis.pipeline() if self._is_cluster else self._redis.pipeline(transaction=False)
+                enqueued_at = str(time.time())
+                for request, priority in batch:
+                    target_stream = self._high_stream if (self._priority_enabled and priority < 0) else self._stream
+                    pipe.xadd(
+                        target_stream,
+                        {
+                            "data": self._serialize_request(request),
+                            "priority": str(priority),
+                            "enqueued_at": enqueued_at,
+                            "retry_count": "0",
+                        },
+                        maxlen=self._max_length, approximate=True,
+                    )
+                await pipe.execute()
+            except Exception as e:
+                self.logger.error(f"Batch XADD failed after {added}/{len(requests)} requests: {e}")
+                break
+            added += len(batch)
+        return added
+
     async def get(self, consumer_name: Optional[str] = None, timeout: float = 0.01) -> Optional[Any]:
         """
         非阻塞出队（兼容 IQueue.get API）。
@@ -533,7 +676,7 @@ class RedisStreamQueue:
         block = int(timeout * 1000) if timeout and timeout > 0 else None
 
         try:
-            msgs = await self._read(consumer, count=1, block=block)
+            msgs = await self._read_one(consumer, block)
             if not msgs:
                 return None
 
@@ -553,7 +696,7 @@ class RedisStreamQueue:
         block = int(timeout * 1000)
 
         try:
-            msgs = await self._read(consumer, count=1, block=block)
+            msgs = await self._read_one(consumer, block)
             if not msgs:
                 return None
 
@@ -576,7 +719,7 @@ class RedisStreamQueue:
         block = int(timeout * 1000)
 
         try:
-            msgs = await self._read(consumer, count=1, block=block)
+            msgs = await self._read_one(consumer, block)
             if not msgs:
                 return None
 
@@ -586,6 +729,165 @@ class RedisStreamQueue:
             self.logger.debug(f"get_with_receipt failed: {e}")
             return None
 
+    # -------------------------------
+    # 预取消费
+    # -------------------------------
+
+    def set_prefetch(self, size: int) -> None:
+        """
+        开启 / 关闭预取消费。
+
+        Args:
+            size: 本地缓冲上限（建议取引擎并发数）；<= 0 关闭，回到逐条 XREADGROUP
+
+        缓冲中的消息已投递给本 Consumer（处于 pending），
+        因此上限不宜过大：崩溃时这些消息要等 consumer_idle_timeout 后才能被回收。
+        """
+        self._prefetch_size = max(0, int(size))
+
+    @property
+    def prefetched(self) -> int:
+        """本地缓冲中尚未交付的消息数"""
+        return len(self._prefetch_high) + len(self._prefetch_low)
+
+    @property
+    def prefetch_reads(self) -> int:
+        """预取任务累计发出的 XREADGROUP 次数"""
+        return self._prefetch_reads
+
+    async def _read_one(self, consumer: str, block: Optional[int]):
+        """读取一条消息：本 Consumer 开启预取时取本地缓冲，否则直接 XREADGROUP"""
+        if self._prefetch_size and consumer == self._consumer_name:
+            msg = await self._next_prefetched(block / 1000.0 if block else 0.0)
+            return [msg] if msg else None
+        return await self._read(consumer, count=1, block=block)
+
+    async def _next_prefetched(self, timeout: float) -> Optional[Tuple[Any, list]]:
+        """从预取缓冲取一条（高优优先），缓冲为空时最多等待 timeout 秒"""
+        task = self._start_prefetch()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            buffer = self._prefetch_high or self._prefetch_low
+            if buffer:
+                msg = buffer.popleft()
+                if self.prefetched <= self._prefetch_size // 2:
+                    self._prefetch_wakeup.set()
+                return msg
+            remaining = deadline - loop.time()
+            if remaining <= 0 or task.done():
+                return None
+            self._prefetch_ready.clear()
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._prefetch_ready.wait(), remaining)
+
+    def _start_prefetch(self) -> asyncio.Task:
+        task = self._prefetch_task
+        if task is not None and not task.done():
+            return task
+        # 每次启动新建事件：队列对象可能跨事件循环复用（Event 绑定首次使用的循环）
+        self._prefetch_wakeup = asyncio.Event()
+        self._prefetch_ready = asyncio.Event()
+        task = self._prefetch_task = asyncio.create_task(
+            self._prefetch_loop(), name=f"stream-prefetch-{self._consumer_name}"
+        )
+        return task
+
+    async def _prefetch_loop(self) -> None:
+        """后台补充：缓冲降到一半以下时读取 (size - 已缓冲) 条"""
+        # release_prefetched 先摘下任务引用再取消：客户端在读取中途吞掉取消时也能退出
+        task = asyncio.current_task()
+        while self._prefetch_task is task:
+            free = self._prefetch_size - self.prefetched
+            if free <= 0 or self.prefetched > self._prefetch_size // 2:
+                self._prefetch_wakeup.clear()
+                await self._prefetch_wakeup.wait()
+                continue
+            try:
+                msgs = await self._read_many(free)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.debug(f"Stream prefetch failed: {e}")
+                await asyncio.sleep(0.5)
+                continue
+            for stream, entries in msgs or ():
+                stream_key = stream.decode("utf-8") if isinstance(stream, bytes) else stream
+                target = self._prefetch_high if (
+                    stream_key == self._high_stream and self._high_stream != self._stream
+                ) else self._prefetch_low
+                target.extend((stream, [entry]) for entry in entries)
+            if not msgs:
+                # 阻塞读取超时或非阻塞读取为空：稍候再读，避免空转
+                await asyncio.sleep(0.05)
+            elif self.prefetched:
+                self._prefetch_ready.set()
+
+    async def _read_many(self, count: int):
+        """
+        预取读取：双 Stream 时先非阻塞读高优，再读普通 Stream，合计不超过 count 条。
+
+        XREADGROUP 的 COUNT 按 Stream 分别生效，一条命令读两个 Stream 最多会投递 2×count 条，
+        超出缓冲上限的消息会在 pending 中滞留直至被其他 Consumer 回收，因此第二次读取
+        只读剩余额度；高优有消息时普通 Stream 不阻塞。
+        """
+        self._prefetch_reads += 1
+        block = self._block_timeout or None
+        if not self._priority_enabled or self._high_stream == self._stream:
+            return await stream_read(
+                self._redis, self._group_name, self._consumer_name,
+                self._stream, count=count, block=block,
+                cluster_mode=self._is_cluster,
+            )
+        high = await stream_read(
+            self._redis, self._group_name, self._consumer_name,
+            self._high_stream, count=count, cluster_mode=self._is_cluster,
+        ) or []
+        remaining = count - sum(len(entries) for _, entries in high)
+        if remaining <= 0:
+            return high
+        low = await stream_read(
+            self._redis, self._group_name, self._consumer_name,
+            self._stream, count=remaining, block=None if high else block,
+            cluster_mode=self._is_cluster,
+        ) or []
+        return high + low
+
+    async def release_prefetched(self) -> int:
+        """
+        停止预取并交还缓冲中尚未交付的消息，返回交还条数。
+
+        消息仍属于本 Consumer 的 pending，这里用 XCLAIM ... IDLE <consumer_idle_timeout> JUSTID
+        把空闲时间标记到回收阈值：其他 Worker 的 claim_stale_pending / 启动回收立即可接管，
+        且不增加投递计数。停止时正在进行的那次 XREADGROUP 若已投递消息，按常规超时回收。
+        """
+        task, self._prefetch_task = self._prefetch_task, None
+        if task is not None and not task.done():
+            task.cancel()
+            self._prefetch_wakeup.set()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+        by_stream: Dict[Any, List[Any]] = {}
+        for buffer in (self._prefetch_high, self._prefetch_low):
+            while buffer:
+                stream, entries = buffer.popleft()
+                by_stream.setdefault(stream, []).append(entries[0][0])
+
+        released = 0
+        for stream, message_ids in by_stream.items():
+            try:
+                await self._redis.xclaim(
+                    stream, self._group_name, self._consumer_name, 0, message_ids,
+                    idle=self._consumer_idle_timeout, justid=True,
+                )
+                released += len(message_ids)
+            except Exception as e:
+                self.logger.warning(f"Release {len(message_ids)} prefetched messages failed: {e}")
+        if released:
+            self.logger.info(f"Released {released} prefetched messages for reclaim")
+        return released
+
     # -------------------------------
     # ACK / NACK
     # -------------------------------
@@ -593,9 +895,14 @@ class RedisStreamQueue:
     async def ack(self, message_id: str) -> bool:
         """
         原子性地 XACK + XDEL，消除两条命令之间的崩溃窗口。
+
+        开启 ACK 合并（set_ack_batch）时只写入本地缓冲并返回 True，由 flush_acks 批量提交。
         """
         self._ensure_connected()
         stream = self._get_message_stream(message_id)
+        if self._ack_batch_size > 1:
+            await self._buffer_ack(stream, message_id, None)
+            return True
         lua = (
             "local acked = redis.call('XACK', KEYS[1], ARGV[1], ARGV[2]) "
             "if acked > 0 then redis.call('XDEL', KEYS[1], ARGV[2]) end "
@@ -631,9 +938,92 @@ class RedisStreamQueue:
         if result == TaskResult.DEAD_LETTER:
             return await self._escalate_to_dead_letter(message_id, error)
 
-        # RETRY: 重新入队
+        # RETRY: 重新入队（开启 ACK 合并时进入缓冲，随下一次 flush_acks 提交）
+        if self._ack_batch_size > 1:
+            stream = self._get_message_stream(message_id)
+            await self._buffer_ack(stream, message_id, error or "unknown")
+            return True
         return await self._retry_message(message_id, error)
 
+    # -------------------------------
+    # ACK 合并
+    # -------------------------------
+
+    def set_ack_batch(self, size: int, interval_ms: int = 50) -> None:
+        """
+        开启 / 关闭 ACK 合并。
+
+        Args:
+            size: 缓冲条数上限，攒满立即提交（<= 1 关闭，恢复逐条提交）
+            interval_ms: 缓冲中首条消息最多等待的毫秒数，超时由后台任务提交
+        """
+        self._ack_batch_size = max(1, int(size))
+        self._ack_flush_interval = max(1, int(interval_ms)) / 1000.0
+
+    @property
+    def pending_acks(self) -> int:
+        """合并缓冲中尚未提交的 ACK / 重试条数"""
+        return self._ack_buffered
+
+    async def _buffer_ack(self, stream: str, message_id: str, error: Optional[str]) -> None:
+        """写入合并缓冲；攒满立即提交，否则确保有定时提交任务"""
+        self._ack_buffer.setdefault(stream, []).append((message_id, error))
+        self._ack_buffered += 1
+        if self._ack_buffered >= self._ack_batch_size:
+            await self.flush_acks()
+        elif self._ack_flush_task is None or self._ack_flush_task.done():
+            self._ack_flush_task = asyncio.create_task(self._flush_acks_later())
+
+    async def _flush_acks_later(self) -> None:
+        await asyncio.sleep(self._ack_flush_interval)
+        await self.flush_acks()
+
+    async def flush_acks(self) -> int:
+        """
+        提交合并缓冲中的 ACK 与重试，返回提交成功的消息条数。
+
+        每个 Stream 一次 Lua 调用：ACK 部分逐条 XACK（成功才 XDEL），重试部分与 _retry_message
+        逻辑一致（XACK + XDEL + 带 retry_count 重新 XADD）；超过投递上限的消息由脚本返回，
+        再逐条转入死信。某个 Stream 提交失败时其消息保持 pending，按回收路径重新投递。
+        """
+        if not self._ack_buffered:
+            return 0
+        buffer, self._ack_buffer = self._ack_buffer, {}
+        self._ack_buffered = 0
+
+        pending = list(buffer.items())
+        committed = 0
+        for index, (stream, entries) in enumerate(pending):
+            acks = [message_id for message_id, error in entries if error is None]
+            retries = [value for entry in entries if entry[1] is not None for value in entry]
+            try:
+                result = await run_script(
+                    self._redis, _FLUSH_ACKS_LUA, 1, stream,
+                    self._group_name, str(time.time()),
+                    str(self._delivery_count_limit), str(self._max_length),
+                    str(len(acks)), *acks, *retries,
+                )
+            except asyncio.CancelledError:
+                # 被取消时把尚未确认提交的部分放回缓冲（XACK / 重试脚本可安全重放）
+                for stream_key, rest in pending[index:]:
+                    self._ack_buffer.setdefault(stream_key, []).extend(rest)
+                    self._ack_buffered += len(rest)
+                raise
+            except Exception as e:
+                self.logger.error(
+                    f"Batch ACK failed for {len(entries)} messages on {stream} "
+                    f"(left pending for reclaim): {e}"
+                )
+                continue
+
+            committed += len(entries)
+            errors = dict(entries)
+            for raw_id in (result[1] if result and len(result) > 1 else None) or []:
+                message_id = raw_id.decode() if isinstance(raw_id, bytes) else str(raw_id)
+                self._message_stream[message_id] = stream
+                await self._escalate_to_dead_letter(message_id, errors.get(message_id))
+        return committed
+
     # -------------------------------
     # 故障恢复
     # -------------------------------
@@ -667,6 +1057,88 @@ class RedisStreamQueue:
         else:
             return await self._claim_manual(idle_ms, count, target_stream)
 
+    async def claim_pending_entries(
+        self,
+        min_idle_ms: Optional[int] = None,
+        count: int = 100,
+        stream: Optional[str] = None,
+    ) -> List[Tuple[Any, Optional[Dict[Any, Any]]]]:
+        """
+        回收超时未 ACK 的消息，返回 claim 得到的原始字段（不反序列化请求）。
+
+        供批量回收使用：字段可直接交给 ``requeue_claimed`` 重新入队，无需 XRANGE 回读。
+
+        Returns:
+            [(message_id, fields), ...]；fields 为空表示消息体已被删除，仅剩 PEL 条目
+        """
+        self._ensure_connected()
+        idle_ms = min_idle_ms if min_idle_ms is not None else self._consumer_idle_timeout
+        target_stream = stream or self._stream
+
+        if self._has_xautoclaim:
+            return await self._xautoclaim_entries(idle_ms, count, target_stream)
+        return await self._xclaim_entries(idle_ms, count, target_stream)
+
+    async def requeue_claimed(
+        self,
+        stream: str,
+        entries: List[Tuple[Any, Optional[Dict[Any, Any]]]],
+        extra_fields: Optional[Dict[str, str]] = None,
+        dead_reason: str = "max retries exceeded",
+    ) -> Tuple[int, int]:
+        """
+        批量处理一页已 claim 的消息：重新入队或转入死信，整页一次往返。
+
+        每条消息 XACK + XDEL；retry_count 未达投递上限的带 retry_count + 1 重新 XADD 到原 Stream，
+        达到上限的连同原字段写入死信 Stream。字段直接复用 claim 的返回值。
+        非 Cluster 模式下整页以 MULTI/EXEC 原子提交，失败时整页保持 pending，由下一轮回收重试；
+        Cluster 模式按 slot 分组提交（死信 Stream 可能位于其他节点）。
+
+        Args:
+            stream: 消息所在 Stream key
+            entries: ``claim_pending_entries`` 的返回值
+            extra_fields: 重新入队时附加的字段（如 failover_from）
+            dead_reason: 转入死信时写入的原因
+
+        Returns:
+            (重新入队条数, 转入死信条数)
+        """
+        if not entries:
+            return 0, 0
+        self._ensure_connected()
+
+        now = str(time.time()).encode()
+        extra = {k.encode(): str(v).encode() for k, v in (extra_fields or {}).items()}
+        requeued = dead = 0
+        pipe = self._redis.pipeline() if self._is_cluster else self._redis.pipeline(transaction=True)
+        for msg_id, fields in entries:
+            pipe.xack(stream, self._group_name, msg_id)
+            if not fields:
+                continue  # 消息体已被删除，只清理 PEL
+            pipe.xdel(stream, msg_id)
+            new_fields = {
+                (k if isinstance(k, bytes) else str(k).encode()): (v if isinstance(v, bytes) else str(v).encode())
+                for k, v in fields.items()
+            }
+            retry_count = int(new_fields.get(b"retry_count", b"0"))
+            if retry_count >= self._delivery_count_limit:
+                new_fields[b"original_message_id"] = msg_id if isinstance(msg_id, bytes) else str(msg_id).encode()
+                new_fields[b"dead_at"] = now
+                new_fields[b"dead_reason"] = dead_reason.encode()
+                pipe.xadd(self._failed_stream, new_fields, maxlen=self._max_length // 10, approximate=True)
+                dead += 1
+            else:
+                new_fields[b"retry_count"] = str(retry_count + 1).encode()
+                new_fields[b"reenqueued_at"] = now
+                new_fields.update(extra)
+                pipe.xadd(stream, new_fields, maxlen=self._max_length, approximate=True)
+                requeued += 1
+        await pipe.execute()
+
+        if dead:
+            self.logger.warning(f"{dead} claimed messages from {stream} escalated to dead letter ({dead_reason})")
+        return requeued, dead
+
     async def claim_stale_pending(self, min_idle_sec: int, count: int = 100) -> int:
         """
         主动扫描并回收所有 Stream 的 stale pending 消息（分布式 idle 期间调用）。
@@ -837,13 +1309,13 @@ class RedisStreamQueue:
     def _serialize_request(self, request) -> bytes:
         """序列化 Request 对象"""
         try:
-            from crawlo.utils.request.request_serializer import RequestSerializer
-            serializer = RequestSerializer(serialization_format=self._serialization_format)
+            if self._serialization_format == "codec":
+                return self._request_codec.encode(request)
 
             if self._stream_compact:
                 data = self._compact_request_dict(request)
             else:
-                data = serializer.prepare_for_serialization(request)
+                data = self._request_serializer.prepare_for_serialization(request)
 
             if self._serialization_format == "json":
                 return json.dumps(data, ensure_ascii=False).encode("utf-8")
@@ -866,9 +1338,7 @@ class RedisStreamQueue:
 
         反序列化时由 Request.from_dict() 自动补全缺失字段的默认值。
         """
-        from crawlo.utils.request.request_serializer import RequestSerializer
-        serializer = RequestSerializer(serialization_format=self._serialization_format)
-        full = serializer.prepare_for_serialization(request)
+        full = self._request_serializer.prepare_for_serialization(request)
 
         # 与 Request.from_dict() 中的默认值保持一致
         # 注意：encoding 不在此表中！其默认值 None 表示"自动检测"，
@@ -909,9 +1379,16 @@ class RedisStreamQueue:
         return compact
 
     def _deserialize_request(self, raw: bytes):
-        """反序列化 Request"""
+        """
+        反序列化 Request
+
+        先按 0xC1 魔数识别 codec 数据；无魔数时按配置格式解码，
+        codec 模式下只回退 JSON（切换前的旧数据），不对无法识别的数据调用 pickle。
+        """
         try:
-            if self._serialization_format == "json":
+            if RequestCodec.is_encoded(raw):
+                return self._request_codec.decode(raw)
+            if self._serialization_format in ("json", "codec"):
                 data = json.loads(raw.decode("utf-8"))
             else:
                 data = pickle.loads(raw)  # nosec B301
@@ -1117,6 +1594,24 @@ class RedisStreamQueue:
         self, min_idle_ms: int, count: int, stream: str
     ) -> List[Tuple[str, Any, int]]:
         """使用 XAUTOCLAIM 回收消息（Redis 6.2+）"""
+        return [
+            (msg_id, self._deserialize_claimed(fields), self._claimed_retry_count(fields))
+            for msg_id, fields in await self._xautoclaim_entries(min_idle_ms, count, stream)
+        ]
+
+    async def _claim_manual(
+        self, min_idle_ms: int, count: int, stream: str
+    ) -> List[Tuple[str, Any, int]]:
+        """手动 XPENDING + XCLAIM（Redis 5.0-6.1 fallback）"""
+        return [
+            (msg_id, self._deserialize_claimed(fields), self._claimed_retry_count(fields))
+            for msg_id, fields in await self._xclaim_entries(min_idle_ms, count, stream)
+        ]
+
+    async def _xautoclaim_entries(
+        self, min_idle_ms: int, count: int, stream: str
+    ) -> List[Tuple[Any, Optional[Dict[Any, Any]]]]:
+        """XAUTOCLAIM 回收，返回 [(message_id, fields), ...]"""
         claimed = []
         try:
             result = await self._redis.xautoclaim(
@@ -1127,34 +1622,35 @@ class RedisStreamQueue:
             if result:
                 # XAUTOCLAIM returns (cursor, messages, [deleted_ids])
                 _, messages, _ = result
-                for msg in messages:
-                    msg_id, fields = msg
-                    raw_data = fields.get(b"data")
-                    request = self._deserialize_request(raw_data) if raw_data else None
-                    retry_count = int(fields.get(b"retry_count", b"0"))
-                    claimed.append((msg_id, request, retry_count))
+                claimed = [(msg_id, fields) for msg_id, fields in messages]
         except Exception as e:
             self.logger.warning(f"XAUTOCLAIM failed on {stream}: {e}")
         return claimed
 
-    async def _claim_manual(
+    async def _xclaim_entries(
         self, min_idle_ms: int, count: int, stream: str
-    ) -> List[Tuple[str, Any, int]]:
-        """手动 XPENDING + XCLAIM（Redis 5.0-6.1 fallback）"""
-        claimed = []
+    ) -> List[Tuple[Any, Optional[Dict[Any, Any]]]]:
+        """XPENDING + XCLAIM 回收，返回 [(message_id, fields), ...]"""
         try:
-            msgs = await claim_pending_manual(
+            return list(await claim_pending_manual(
                 self._redis, stream, self._group_name,
                 self._consumer_name, min_idle_ms=min_idle_ms, batch_size=count,
-            )
-            for msg_id, fields in msgs:
-                raw_data = fields.get(b"data", fields.get("data"))
-                request = self._deserialize_request(raw_data) if raw_data else None
-                retry_count = int(fields.get(b"retry_count", fields.get("retry_count", b"0")))
-                claimed.append((msg_id, request, retry_count))
+            ))
         except Exception as e:
             self.logger.warning(f"Manual claim failed on {stream}: {e}")
-        return claimed
+            return []
+
+    def _deserialize_claimed(self, fields: Optional[Dict[Any, Any]]) -> Any:
+        """从 claim 返回的字段中反序列化 Request（消息体已删除时返回 None）"""
+        raw_data = fields.get(b"data", fields.get("data")) if fields else None
+        return self._deserialize_request(raw_data) if raw_data else None
+
+    @staticmethod
+    def _claimed_retry_count(fields: Optional[Dict[Any, Any]]) -> int:
+        """claim 返回字段中的 retry_count"""
+        if not fields:
+            return 0
+        return int(fields.get(b"retry_count", fields.get("retry_count", b"0")))
 
 
 __all__ = [
@@ -14,7 +14,7 @@ import asyncio
 import inspect
 import time
 import traceback
-from typing import Optional, TYPE_CHECKING, Dict, Callable, Any
+from typing import Optional, TYPE_CHECKING, Dict, Callable, Any, List, Tuple
 
 if TYPE_CHECKING:
     from crawlo import Request
@@ -286,32 +286,7 @@ class QueueManager(QueueStatusMixin, QueueBackpressureMixin):
                 current_queue_size = await self.size()
 
             # ===== 软限制：队列超过阈值时延迟入队（流量整形，非阻塞）=====
-            if hasattr(self, '_backpressure_controller') and self._backpressure_controller.enabled:
-                # 使用新的背压策略系统检查是否需要应用背压
-                if await self._backpressure_controller.should_apply(self):
-                    # 计算背压延迟
-                    delay = await self._backpressure_controller.calculate_delay(self)
-
-                    if delay > 0:
-                        # 记录背压激活日志（仅在状态变更时）
-                        if not self._backpressure_controller.active:
-                            metrics = await self._backpressure_controller.get_metrics(self)
-                            self.logger.info(
-                                f"Backpressure activated: queue={metrics.queue_size}/{metrics.max_queue_size} "
-                                f"(utilization: {metrics.utilization:.0%}, delay: {delay:.2f}s, "
-                                f"level: {metrics.level.value})"
-                            )
-
-                        # 应用背压延迟
-                        self.logger.debug(
-                            f"Backpressure delay: {delay:.2f}s "
-                            f"(queue={current_queue_size}/{max_size})"
-                        )
-                        await asyncio.sleep(delay)
-
-                        # 喂入实际延迟供自适应策略学习
-                        if hasattr(self._backpressure_controller.strategy, 'record_delay'):
-                            self._backpressure_controller.strategy.record_delay(delay)
+            await self._apply_soft_backpressure(current_queue_size, max_size)
 
             # 背压控制（仅对内存队列）
             if self._queue_semaphore:
@@ -359,6 +334,73 @@ class QueueManager(QueueStatusMixin, QueueBackpressureMixin):
                     pass
             return False
 
+    async def _apply_soft_backpressure(self, current_queue_size: int, max_size: int) -> None:
+        """软限制：队列超过阈值时延迟入队（流量整形，非阻塞）"""
+        if hasattr(self, '_backpressure_controller') and self._backpressure_controller.enabled:
+            # 使用新的背压策略系统检查是否需要应用背压
+            if await self._backpressure_controller.should_apply(self):
+                # 计算背压延迟
+                delay = await self._backpressure_controller.calculate_delay(self)
+
+                if delay > 0:
+                    # 记录背压激活日志（仅在状态变更时）
+                    if not self._backpressure_controller.active:
+                        metrics = await self._backpressure_controller.get_metrics(self)
+                        self.logger.info(
+                            f"Backpressure activated: queue={metrics.queue_size}/{metrics.max_queue_size} "
+                            f"(utilization: {metrics.utilization:.0%}, delay: {delay:.2f}s, "
+                            f"level: {metrics.level.value})"
+                        )
+
+                    # 应用背压延迟
+                    self.logger.debug(
+                        f"Backpressure delay: {delay:.2f}s "
+                        f"(queue={current_queue_size}/{max_size})"
+                    )
+                    await asyncio.sleep(delay)
+
+                    # 喂入实际延迟供自适应策略学习
+                    if hasattr(self._backpressure_controller.strategy, 'record_delay'):
+                        self._backpressure_controller.strategy.record_delay(delay)
+
+    async def put_batch(self, items: List[Tuple["Request", int]]) -> int:
+        """批量入队（Stream 队列：pipeline XADD，一次往返写入整批）
+
+        只写入当前剩余容量内的前缀，整批只应用一次软背压。返回成功入队的条数
+        （即 ``items`` 的前缀长度），其余由调用方逐条 ``put``（含阻塞等待与超时策略）。
+        非 Stream 队列不支持批量写入，返回 0。
+
+        Args:
+            items: (request, priority) 元组列表
+
+        Returns:
+            成功入队的请求数量
+        """
+        if not items or not isinstance(self._queue, RedisStreamQueue):
+            return 0
+
+        try:
+            max_size = self.config.max_queue_size
+            current_queue_size = await self.size()
+            room = max_size - current_queue_size
+            if room <= 0:
+                return 0
+            items = items[:room]
+
+            await self._apply_soft_backpressure(current_queue_size, max_size)
+            for request, _ in items:
+                self._priority_calculator.update_stats(request)
+            return await self._queue.put_batch(items)
+        except Exception as e:
+            self.logger.error(f"Failed to enqueue batch of {len(items)} requests: {e}")
+            return 0
+
+    async def flush_acks(self) -> int:
+        """立即提交 Stream 队列合并缓冲中的 ACK / 重试（其他队列为空操作）"""
+        if isinstance(self._queue, RedisStreamQueue):
+            return await self._queue.flush_acks()
+        return 0
+
     async def _wait_for_space(self, max_size: int, timeout: Optional[float]) -> bool:
         """等待队列腾出空间。
 
@@ -466,6 +508,60 @@ class QueueManager(QueueStatusMixin, QueueBackpressureMixin):
         # 内存队列 fallback（get 内部已处理 notify）
         return await self.get()
 
+    async def get_batch(self, batch_size: int) -> List["Request"]:
+        """批量出队（非阻塞）：一次调用取出至多 ``batch_size`` 个请求。
+
+        内存队列直接排空底层 PriorityQueue（``get_nowait``），
+        不为每个请求单独创建 0.01s 超时定时器，且只通知一次等待入队的 put；
+        其他队列类型逐个 ``get()``，遇到空结果即停止。
+
+        Args:
+            batch_size: 本次最多取出的请求数
+
+        Returns:
+            请求列表（队列为空时返回空列表）
+        """
+        if not self._queue:
+            raise RuntimeError("队列未初始化")
+        if batch_size <= 0:
+            return []
+
+        if self._queue_type != QueueType.MEMORY or not hasattr(self._queue, 'get_batch'):
+            requests = []
+            for _ in range(batch_size):
+                request = await self.get()
+                if request is None:
+                    break
+                requests.append(request)
+            return requests
+
+        try:
+            results = await self._queue.get_batch(batch_size, timeout=0)
+        except Exception as e:
+            self.logger.error(f"Failed to dequeue request batch: {e}")
+            return []
+
+        if not results:
+            return []
+
+        # 与 get() 对称：每取出一个元素释放一次信号量
+        if self._queue_semaphore:
+            for _ in results:
+                try:
+                    self._queue_semaphore.release()
+                except ValueError:
+                    break
+        await self._notify_space_available()
+
+        requests = []
+        for result in results:
+            request_obj = result[1] if isinstance(result, tuple) and len(result) == 2 else result
+            if hasattr(request_obj, 'url'):
+                requests.append(request_obj)
+            else:
+                self.logger.warning("Dequeued non-Request object from memory queue, discarding")
+        return requests
+
     async def size(self) -> int:
         """Get queue size"""
         if not self._queue:
@@ -492,6 +588,21 @@ class QueueManager(QueueStatusMixin, QueueBackpressureMixin):
         except Exception as e:
             self.logger.warning(f"Failed to get queue size: {e}")
             return 0
+
+    async def snapshot_requests(self) -> Optional[List["Request"]]:
+        """不出队地读取队列中的全部请求（检查点用）
+
+        Returns:
+            请求列表（按队列内部顺序，非严格优先级序）；队列不支持快照时返回 None
+        """
+        if self._queue_type != QueueType.MEMORY or not hasattr(self._queue, 'snapshot'):
+            return None
+        requests = []
+        for result in self._queue.snapshot():
+            request_obj = result[1] if isinstance(result, tuple) and len(result) == 2 else result
+            if hasattr(request_obj, 'url'):
+                requests.append(request_obj)
+        return requests
     
     @property
     def max_size(self) -> int:
@@ -793,6 +904,22 @@ class QueueManager(QueueStatusMixin, QueueBackpressureMixin):
             )
             # Stream queue 需要立即 connect 以创建 Consumer Group
             await queue.connect()
+
+            # 预取消费：缓冲大小默认取引擎并发数
+            stream_settings = self.config.settings if hasattr(self.config, 'settings') else None
+            if safe_get_config(stream_settings, 'STREAM_PREFETCH', False, bool):
+                prefetch_size = safe_get_config(stream_settings, 'STREAM_PREFETCH_SIZE', 0, int)
+                if prefetch_size <= 0:
+                    prefetch_size = max(1, safe_get_config(stream_settings, 'CONCURRENCY', 8, int))
+                queue.set_prefetch(prefetch_size)
+
+            # ACK 合并：攒满 STREAM_ACK_BATCH_SIZE 条或超过 STREAM_ACK_FLUSH_INTERVAL 毫秒提交一次
+            ack_batch_size = safe_get_config(stream_settings, 'STREAM_ACK_BATCH_SIZE', 1, int)
+            if ack_batch_size > 1:
+                queue.set_ack_batch(
+                    ack_batch_size,
+                    safe_get_config(stream_settings, 'STREAM_ACK_FLUSH_INTERVAL', 50, int),
+                )
             return queue
 
         elif queue_type == QueueType.REDIS:
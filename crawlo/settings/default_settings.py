@@ -108,12 +108,25 @@ ENQUEUE_FULL_POLICY = 'drop_with_counter'              # 入队满策略
 ENQUEUE_BLOCK_TIMEOUT = None                            # 阻塞等待上限（秒），None=无限（仅 block 策略读取）
 ENQUEUE_DROP_TIMEOUT = 50.0                             # drop_with_counter/raise 策略的等待超时（秒，默认 50s 匹配旧行为 100×0.5s）
 ENQUEUE_BLOCK_STALL_ALERT_SECONDS = 120                 # block 模式下既无入队也无出队的停滞告警阈值（秒）
+ENQUEUE_BATCH_SIZE = 1                                  # 回调连续产出的 Request 攒批去重入队（>1 启用，配合 AioRedisFilter.requested_many）
 
 # 请求生成控制
 REQUEST_GENERATION_BATCH_SIZE = 10                      # 请求生成批处理大小
 REQUEST_GENERATION_INTERVAL = 0.01               # 请求生成间隔（秒）
 ENABLE_CONTROLLED_REQUEST_GENERATION = False            # 是否启用受控请求生成
 
+# 引擎派发器（None = 默认 RequestDispatcher，逐个出队 + 10ms 轮询流控）
+# 'crawlo.core.engine_dispatch.SlotDispatcher'：槽位式事件驱动派发 + 批量出队（高吞吐单机推荐）
+# 'crawlo.core.engine_dispatch.DomainSlotDispatcher'：在 SlotDispatcher 之上按主机分槽位（多站点推荐）
+ENGINE_DISPATCHER_CLASS = None
+
+# 按主机槽位（仅 DomainSlotDispatcher 读取）
+DOMAIN_SLOT_CONCURRENCY = 8                             # 每个主机最大并发（meta['download_slot'] 可自定义槽位）
+DOMAIN_SLOT_DELAY = None                                # 每个主机启动间隔（秒），None = 沿用 DOWNLOAD_DELAY / RANDOMNESS / DOWNLOAD_DELAY_OVERRIDES
+DOMAIN_SLOT_AUTOTHROTTLE = False                        # 按主机 AIMD 自动调整并发（慢响应/失败减半，一轮快速完成后 +1）
+DOMAIN_SLOT_TARGET_LATENCY = 2.0                        # AIMD 目标耗时（秒），超过视为拥塞
+DOMAIN_SLOT_MAX_DEFERRED = 10000                        # 暂缓派发请求上限，达到后暂停从调度器出队
+
 # ---------------------------------------------------------------------------#
 # 2.3 队列类型
 # ---------------------------------------------------------------------------#
@@ -124,7 +137,7 @@ QUEUE_TIMEOUT = 300                                     # 队列操作超时时
 # 安全修复：默认从 pickle 改为 json，避免 Redis 被入侵时反序列化 RCE
 # pickle 反序列化可执行任意代码，Redis 通常是共享资源，默认不安全
 # 如需 pickle（信任 Redis 环境 + 需要 pickle 才能序列化的对象），显式设置为 'pickle'
-QUEUE_SERIALIZATION_FORMAT = 'json'                     # 序列化格式：json（默认，安全）| pickle（不推荐）| msgpack（适用于 redis 队列）
+QUEUE_SERIALIZATION_FORMAT = 'json'                     # 序列化格式：json（默认，安全）| pickle（不推荐）| msgpack（适用于 redis 队列）| codec（0xC1 前缀的二进制请求编解码器，省内存与 CPU）
 
 # Stream 配置（仅 QUEUE_TYPE='redis_stream' 时生效）
 STREAM_MAX_LENGTH = 100000                              # Stream 最大长度（近似修剪）
@@ -132,8 +145,12 @@ STREAM_CONSUMER_IDLE_TIMEOUT = 90000                    # ms，任务超时未 A
 STREAM_DELIVERY_COUNT_LIMIT = 5                         # 最大投递次数（超过进死信，网络抖动时避免过早判定失败）
 STREAM_BLOCK_TIMEOUT = 5000                             # ms，XREADGROUP 阻塞超时
 STREAM_COMPACT = True                                   # 精简序列化（仅存储非空字段，节省内存）
-STREAM_SERIALIZATION_FORMAT = 'json'                    # Stream 序列化格式（默认 json，使 redis-cli 可读）
+STREAM_SERIALIZATION_FORMAT = 'json'                    # Stream 序列化格式（默认 json，使 redis-cli 可读；codec = 二进制请求编解码器，省内存与 CPU）
 STREAM_PRIORITY_ENABLED = True                           # 双 Stream 优先级支持（True: 独立高优 Stream, False: 单 Stream FIFO）
+STREAM_PREFETCH = False                                 # 预取消费：按空闲额度读双 Stream（高优优先）批量预取到本地缓冲，后台补充
+STREAM_PREFETCH_SIZE = 0                                # 预取缓冲上限（0 = 取 CONCURRENCY）；缓冲消息关闭时以 XCLAIM IDLE 交还
+STREAM_ACK_BATCH_SIZE = 1                               # ACK/重试合并提交条数（1 = 关闭逐条提交）；未提交的消息崩溃后按 idle 超时重新投递
+STREAM_ACK_FLUSH_INTERVAL = 50                          # ACK 合并最长等待（毫秒），超时即提交
 
 # Sentinel 高可用配置
 # 优先级：REDIS_SENTINEL_URLS 非空 → 走 Sentinel 模式，忽略 REDIS_HOST/REDIS_PORT
@@ -176,6 +193,8 @@ PROGRESS_REPORT_INTERVAL = 10                           # 进度上报间隔（
 DISTRIBUTED_RATE_LIMIT_ENABLED = False                  # 是否启用分布式限流
 DISTRIBUTED_RATE_LIMIT_DEFAULT_RATE = 0                 # 默认速率（0=不限，单位：req/s）
 DISTRIBUTED_RATE_LIMIT_CAPACITY = 10                    # 令牌桶容量（允许突发）
+DISTRIBUTED_RATE_LIMIT_LEASE_SIZE = 0                   # 租约模式：每次 Redis 往返预留的令牌数（<=1 关闭，逐请求申请）
+DISTRIBUTED_RATE_LIMIT_LEASE_TTL = 1.0                  # 租约有效期（秒），到期未用完的令牌归还
 
 # 动态配置
 DYNAMIC_CONFIG_ENABLED = False                          # 是否启用动态配置
@@ -194,8 +213,13 @@ VERIFY_SSL = True                                       # 是否验证 SSL 证
 CONNECTION_POOL_LIMIT = 100                             # 连接池大小限制
 CONNECTION_POOL_LIMIT_PER_HOST = 20                     # 每个主机的连接池大小限制
 DOWNLOAD_MAXSIZE = 10 * 1024 * 1024                     # 最大下载大小（字节）
+DOWNLOAD_STREAM_THRESHOLD = 0                           # >0 时响应体流式读取，超过该字节数落盘（request.meta['stream']=True 单独开启）
+DOWNLOAD_STREAM_MAXSIZE = None                          # 流式响应体大小上限（字节），None 时沿用 DOWNLOAD_MAXSIZE；落盘的大附件可单独调高
+DOWNLOAD_STREAM_DIR = None                              # 流式响应落盘目录（None 为系统临时目录）
 DOWNLOAD_STATS = True                                   # 是否启用下载统计
 DOWNLOAD_RETRY_TIMES = 3                                # 下载重试次数
+HTTPX_PROXY_CLIENT_CACHE_SIZE = 32                      # httpx 代理客户端缓存上限（按代理 URL，LRU 淘汰）
+HTTPX_PROXY_CLIENT_IDLE_TIMEOUT = 60                    # httpx 代理客户端空闲过期时间（秒）
 
 # ---------------------------------------------------------------------------#
 # 3.2 重试配置
@@ -250,8 +274,12 @@ BROWSER_LOAD_TIMEOUT = 10000                            # 页面加载超时（
 BROWSER_VIEWPORT_WIDTH = 1280                           # 视口宽度
 BROWSER_VIEWPORT_HEIGHT = 720                           # 视口高度
 BROWSER_MAX_PAGES = 10                                  # 单浏览器最大页面数
+BROWSER_MAX_CONTEXTS = 8                                # 按代理保留的浏览器上下文上限（LRU，默认上下文不计入）
 BROWSER_PROXY = None                              # 代理设置
 BROWSER_BLOCK_RESOURCES = ["image", "font", "media"]    # 屏蔽的资源类型
+BROWSER_BLOCK_RULES = []                                # EasyList 风格屏蔽规则（列表或多行字符串）
+BROWSER_BLOCK_RULES_FILE = None                         # EasyList 规则文件路径
+BROWSER_BLOCK_NATIVE = False                            # 由浏览器原生屏蔽（CDP，仅 Chromium），被屏蔽请求不经过 Python
 BROWSER_AUTO_SCROLL = False                             # 是否自动滚动加载更多内容
 BROWSER_SCROLL_DELAY = 500                              # 滚动延迟（毫秒）
 BROWSER_WAIT_STRATEGY = "auto"                          # 等待策略：auto | networkidle | domcontentloaded | element
@@ -354,6 +382,29 @@ PIPELINES = {
     'crawlo.pipelines.ConsolePipeline': 100,
 }
 
+# 批量写入后台任务（ResourceManagedPipeline 子类：SQL / Mongo / ES / HBase）
+# >0 时 process_item 只追加缓冲区，后台任务攒满 *_BATCH_SIZE 或最早一条等待超过该秒数即写出；
+# 写入期间继续追加（双缓冲），缓冲区达到 *_MAX_BUFFER_SIZE 时 process_item 等待（反压）。
+# 可按前缀单独配置：MYSQL_BATCH_FLUSH_INTERVAL / PG_* / SQLITE_* / CLICKHOUSE_* / MONGO_* ...
+PIPELINE_BATCH_FLUSH_INTERVAL = 0.0                     # 0 = 沿用攒满即在 process_item 内同步写入
+PIPELINE_MAX_BUFFER_SIZE = 1000                         # 后台写入时缓冲区上限（前缀配置 *_MAX_BUFFER_SIZE 优先）
+
+# 终端管道并发扇出（默认关闭）
+# 列在 PIPELINE_SINKS 中的管道（须同时在 PIPELINES 中）不再串行执行：其余管道按顺序执行完后，
+# item 投递到每个 sink 的有界队列，由各自的 worker 并发写出，反压与错误按 sink 隔离。
+# 列表格式使用 PIPELINE_SINK_WORKERS；字典格式 {路径: worker 数量} 可逐个配置。
+PIPELINE_SINKS = []
+PIPELINE_SINK_QUEUE_SIZE = 1000                         # 每个 sink 的队列上限，满时上游等待（反压）
+PIPELINE_SINK_WORKERS = 1                               # 每个 sink 的 worker 数（>1 时不保证写入顺序）
+PIPELINE_SINK_DRAIN_TIMEOUT = 60.0                      # 关闭时等待 sink 队列写完的最长秒数
+
+# Processor 批量模式（默认关闭，适合列表页产出大量 Item 的爬虫）
+# 开启后 Processor 每次唤醒用 get_nowait 取出至多 PROCESSOR_BATCH_SIZE 条，计数不加锁；
+# 连续的 Item 整批交给 PipelineManager.process_items（管道实现 process_items 时整批调用）。
+# 攒满一批即处理，不足一批的在回调让出事件循环后处理。
+PROCESSOR_BATCH_MODE = False
+PROCESSOR_BATCH_SIZE = 100                              # 每批最多条数
+
 
 # #############################################################################
 # 6. 数据存储配置
@@ -376,6 +427,7 @@ REDIS_PASSWORD = ''                                     # Redis 密码  # nosec
 REDIS_USER = ''                                         # Redis 用户名（Redis 6.0+ ACL）
 REDIS_DB = 0                                            # Redis 数据库编号
 REDIS_TTL = 0                                           # 指纹过期时间（0 = 永不过期）
+REDIS_FILTER_ATOMIC = True                              # 去重判重+写入+TTL 单次往返（SADD 返回值判重，False=旧 SISMEMBER/SADD/EXPIRE）
 REDIS_POOL_SHARED_MODE = False                          # 连接池共享模式（True=共享单例）
 DECODE_RESPONSES = True                                 # Redis 返回是否解码为字符串
 FILTER_DEBUG = True                                     # 是否开启去重调试日志
@@ -395,6 +447,7 @@ MYSQL_TABLE = None                                # 表名（默认 {spider_name
 MYSQL_BATCH_SIZE = 500                                  # 批量插入大小
 MYSQL_USE_BATCH = True                                  # 是否启用批量插入
 MYSQL_BATCH_TIMEOUT = 90                                # 批量操作超时时间（秒）
+MYSQL_ROWS_PER_STATEMENT = 1000                         # 单条多行 VALUES 语句的最大行数（受 max_allowed_packet 限制）
 
 # 冲突处理策略（三者互斥，按优先级生效）
 MYSQL_UPDATE_COLUMNS = ()                    # ON DUPLICATE KEY UPDATE
@@ -453,6 +506,7 @@ PG_AUTO_UPDATE = False                                  # 覆盖整行
 PG_EXECUTE_MAX_RETRIES = 3                              # 重试次数
 PG_EXECUTE_RETRY_DELAY = 0.5                     # 重试延迟
 PG_USE_TRANSACTION = True                               # 默认开启事务
+PG_BULK_MODE = 'executemany'                            # 批量写入方式：executemany（预编译语句）| copy（COPY 临时表 + INSERT ... ON CONFLICT）
 PG_POOL_MIN = 2                                         # 最小连接数
 PG_POOL_MAX = 10                                        # 最大连接数
 
@@ -545,8 +599,13 @@ DEFAULT_DEDUP_PIPELINE = 'crawlo.pipelines.MemoryDedupPipeline'
 FILTER_CLASS = 'crawlo.filters.MemoryFilter'
 DUPEFILTER_INCLUDE_HEADERS = []                        # 纳入请求去重指纹的 header 列表（默认空=不参与，与 Scrapy 一致）
 DUPEFILTER_INCLUDE_META = []                           # 纳入请求去重指纹的 meta key 列表（默认空=不参与）
+MEMORY_FILTER_MAX_CAPACITY = 1000000                    # MemoryFilter 最大指纹数
+MEMORY_FILTER_CLEANUP_THRESHOLD = 0.8                   # set 模式写满时保留比例（其余随机清理）
+MEMORY_FILTER_COMPACT = False                           # 紧凑模式：8 字节摘要 + 分代淘汰（1000 万指纹 < 300MB）
 BLOOM_FILTER_CAPACITY = 1000000                         # Bloom 过滤器容量
 BLOOM_FILTER_ERROR_RATE = 0.001                  # Bloom 过滤器错误率
+BLOOM_FILTER_GROWTH = 2                                 # RedisBloomFilter 每新增一层的容量倍数
+BLOOM_FILTER_TIGHTENING_RATIO = 0.5                     # RedisBloomFilter 相邻层误判率收紧比例（0~1）
 
 # MySQLDedupPipeline
 REDIS_DEDUP_CLEANUP = False                             # 关闭时是否清理 Redis 指纹
@@ -647,8 +706,11 @@ LOG_FILE_WORKER_ID = True
 LOG_FORMAT = '%(asctime)s - [%(name)s] - %(levelname)s: %(message)s'
 LOG_ENCODING = 'utf-8'
 STATS_DUMP = True                                       # 是否周期性输出统计信息
-STATS_BACKEND = 'memory'                                # 统计后端：memory（默认）| redis | file | prometheus
+STATS_BACKEND = 'memory'                                # 统计后端：memory（默认）| redis | redis_buffered | file | prometheus
 STATS_PREFIX = 'crawlo'                                 # 统计键前缀
+# ---- Redis 写回缓冲（STATS_BACKEND='redis_buffered' 时生效） ----
+STATS_REDIS_FLUSH_INTERVAL = 1000                       # 缓冲写入间隔（毫秒），即集群统计的最大陈旧度
+STATS_REDIS_MAX_PENDING = 1000                          # 待写 key 数达到该值时提前写入
 
 # ---- Prometheus 监控（STATS_BACKEND='prometheus' 时生效） ----
 PROMETHEUS_METRICS_PORT = 9100                          # 指标暴露端口，设为 0 则自动分配可用端口
@@ -821,6 +883,11 @@ ADAPTIVE_MAX_FINGERPRINT_ELEMENTS = 10                  # 每个选择器最多
 #   crawlo run myspider --clean-checkpoint # 清除检查点并从头开始
 
 CHECKPOINT_ENABLED = False                              # 是否启用检查点功能（默认关闭）
-CHECKPOINT_STORAGE = 'json'                             # 存储后端：json | sqlite
+CHECKPOINT_STORAGE = 'json'                             # 存储后端：json | sqlite | journal（增量日志，仅内存队列）
 CHECKPOINT_DIR = None                             # 存储目录（默认 .checkpoints/{project}/{spider}）
 CHECKPOINT_SAVE_ON_SIGNAL = False                       # Ctrl+C 时是否自动保存检查点（默认关闭，跟随 CHECKPOINT_ENABLED 显式开启）
+
+# 增量检查点（CHECKPOINT_STORAGE = 'journal'）：运行中记录入队 / 出队 / 新指纹事件，保存检查点时只写增量
+CHECKPOINT_JOURNAL_BATCH_SIZE = 1000                    # 缓冲事件数上限，攒满立即追加到日志
+CHECKPOINT_JOURNAL_FLUSH_INTERVAL = 1.0                 # 缓冲事件最长等待秒数（崩溃时至多丢失该时间窗内的事件）
+CHECKPOINT_JOURNAL_COMPACT_THRESHOLD = 100000           # 日志累计事件数超过该值时折叠进快照（0 = 仅保存检查点时折叠）
@@ -10,6 +10,7 @@ Crawlo 统计模块
 - StatsBackend: 统计后端抽象基类
 - MemoryStatsBackend: 内存存储后端（默认）
 - RedisStatsBackend: Redis 存储后端
+- BufferedRedisStatsBackend: Redis 写回缓冲后端（STATS_BACKEND = 'redis_buffered'）
 - FileStatsBackend: 文件存储后端
 - PrometheusStatsBackend: Prometheus 指标暴露后端（需 pip install crawlo[monitoring]）
 - StatsBackendFactory: 后端工厂
@@ -28,6 +29,7 @@ from crawlo.stats.backends import (
     StatsBackend,
     MemoryStatsBackend,
     RedisStatsBackend,
+    BufferedRedisStatsBackend,
     FileStatsBackend,
     StatsBackendFactory,
 )
@@ -37,6 +39,7 @@ __all__ = [
     'StatsBackend',
     'MemoryStatsBackend',
     'RedisStatsBackend',
+    'BufferedRedisStatsBackend',
     'FileStatsBackend',
     'StatsBackendFactory',
 ]
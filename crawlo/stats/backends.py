@@ -9,9 +9,11 @@
 - StatsBackend: 统计后端抽象基类
 - MemoryStatsBackend: 内存存储后端（默认）
 - RedisStatsBackend: Redis 存储后端
+- BufferedRedisStatsBackend: Redis 写回缓冲后端（进程内聚合，定时一次 pipeline 写入）
 - FileStatsBackend: 文件存储后端
 - StatsBackendFactory: 后端工厂
 """
+import asyncio
 import json
 from abc import ABC, abstractmethod
 from collections import defaultdict
@@ -73,6 +75,9 @@ class StatsBackend(ABC):
     def close(self) -> None:
         """关闭后端（可选实现）"""
 
+    async def wait_closed(self) -> None:
+        """等待 close() 开始的收尾工作完成（可选实现，默认无需等待）"""
+
 
 # ==================== 内存后端 ====================
 
@@ -181,6 +186,218 @@ class RedisStatsBackend(StatsBackend):
             self._logger.error(f"Redis delete error: {e}")
 
 
+# ==================== Redis 写回缓冲后端 ====================
+
+class BufferedRedisStatsBackend(StatsBackend):
+    """
+    Redis 写回缓冲后端（``STATS_BACKEND = 'redis_buffered'``）
+
+    inc_value / set_value 只更新进程内的计数与 gauge，不访问 Redis；增量与最新 gauge 值
+    攒到 ``flush_interval`` 毫秒（或累计 ``max_pending`` 个待写 key）后由事件循环中的刷新任务
+    一次 pipeline（HINCRBY / HINCRBYFLOAT / HSET）写入，同一 key 的多次增量合并为一条命令。
+
+    - 需要 asyncio 客户端（``redis.asyncio``），刷新不阻塞事件循环
+    - 读取（get_value / get_stats）返回本进程视图；集群汇总值直接读 Redis HASH
+    - 陈旧度上界为 ``flush_interval``；刷新失败时增量放回缓冲，下一轮重试
+    - close() 后不再记录；在事件循环中调用时于后台最终写入，``await wait_closed()`` 等待写入完成
+      并关闭由工厂创建、归本后端所有的客户端（StatsCollector.wait_closed 在爬虫关闭时调用）
+    - 客户端绑定在首次记录时的事件循环上；该循环已关闭时跳过最终写入并告警
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        key: str = "crawlo:stats",
+        expire: Optional[int] = None,
+        flush_interval: float = 1000,
+        max_pending: int = 1000,
+        owns_client: bool = False,
+    ):
+        self._redis = redis_client
+        self._owns_client = owns_client  # 为 True 时关闭后端时一并关闭客户端
+        self._key = key
+        self._expire = expire
+        self._flush_interval = max(0.0, flush_interval) / 1000
+        self._max_pending = max(1, int(max_pending))
+        self._logger = get_logger(self.__class__.__name__)
+
+        self._stats: Dict[str, Any] = {}           # 本进程视图
+        self._increments: Dict[str, Any] = {}      # 待写增量
+        self._gauges: Dict[str, Any] = {}          # 待写 gauge（最后一次写入为准）
+        self._clear_pending = False
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._full: Optional[asyncio.Event] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None  # 客户端所属的事件循环
+        self._closed = False
+        self._closing: Optional[asyncio.Future] = None
+        self.flush_count = 0
+
+    @property
+    def pending_keys(self) -> int:
+        """尚未写入 Redis 的 key 数"""
+        return len(self._increments) + len(self._gauges)
+
+    # ---- 记录（同步，只改内存）----
+
+    def inc_value(self, key: str, count: int = 1) -> None:
+        if self._closed:
+            return
+        self._stats[key] = self._stats.get(key, 0) + count
+        if key in self._gauges:
+            # 本周期内已被 set_value 覆盖：折叠为新的 gauge 值
+            self._gauges[key] = self._stats[key]
+        else:
+            self._increments[key] = self._increments.get(key, 0) + count
+        self._after_record()
+
+    def set_value(self, key: str, value: Any) -> None:
+        if self._closed:
+            return
+        self._stats[key] = value
+        self._increments.pop(key, None)
+        self._gauges[key] = value
+        self._after_record()
+
+    def get_value(self, key: str, default: Any = None) -> Any:
+        return self._stats.get(key, default)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(self._stats)
+
+    def clear(self) -> None:
+        if self._closed:
+            return
+        self._stats.clear()
+        self._increments.clear()
+        self._gauges.clear()
+        self._clear_pending = True
+        self._after_record()
+
+    def _after_record(self) -> None:
+        try:
+            self._loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # 尚无事件循环：留在缓冲中，下次记录或 close() 时写入
+        if self._flush_lock is None:
+            self._flush_lock, self._full = asyncio.Lock(), asyncio.Event()
+        if self.pending_keys >= self._max_pending:
+            self._full.set()
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        try:
+            await asyncio.wait_for(self._full.wait(), self._flush_interval)
+        except asyncio.TimeoutError:
+            pass
+        self._full.clear()
+        await self.flush()
+
+    # ---- 写入 ----
+
+    async def flush(self) -> int:
+        """把缓冲的增量与 gauge 一次 pipeline 写入 Redis，返回写入的 key 数"""
+        self._loop = asyncio.get_running_loop()
+        if self._flush_lock is None:
+            self._flush_lock, self._full = asyncio.Lock(), asyncio.Event()
+        async with self._flush_lock:
+            if not (self._increments or self._gauges or self._clear_pending):
+                return 0
+            increments, self._increments = self._increments, {}
+            gauges, self._gauges = self._gauges, {}
+            clear, self._clear_pending = self._clear_pending, False
+
+            pipe = self._redis.pipeline(transaction=False)
+            if clear:
+                pipe.delete(self._key)
+            for key, count in increments.items():
+                if isinstance(count, int):
+                    pipe.hincrby(self._key, key, count)
+                else:
+                    pipe.hincrbyfloat(self._key, key, count)
+            if gauges:
+                pipe.hset(self._key, mapping={k: self._encode(v) for k, v in gauges.items()})
+            if self._expire:
+                pipe.expire(self._key, self._expire)
+            try:
+                await pipe.execute()
+            except Exception as e:
+                self._logger.warning(f"Redis stats flush failed ({len(increments) + len(gauges)} keys), will retry: {e}")
+                self._restore(increments, gauges, clear)
+                return 0
+            self.flush_count += 1
+            return len(increments) + len(gauges)
+
+    def _restore(self, increments: Dict[str, Any], gauges: Dict[str, Any], clear: bool) -> None:
+        """刷新失败：把未写入的内容合并回缓冲（本周期内的新写入优先）"""
+        for key, count in increments.items():
+            if key in self._gauges:
+                continue
+            self._increments[key] = self._increments.get(key, 0) + count
+        for key, value in gauges.items():
+            if key in self._gauges:
+                continue
+            if key in self._increments:
+                # gauge 之后又有增量：以本地视图为准
+                self._increments.pop(key)
+                value = self._stats.get(key, value)
+            self._gauges[key] = value
+        self._clear_pending = self._clear_pending or clear
+
+    @staticmethod
+    def _encode(value: Any) -> Any:
+        if isinstance(value, (dict, list, bool)) or value is None:
+            return json.dumps(value)
+        if isinstance(value, (str, bytes, int, float)):
+            return value
+        return str(value)
+
+    def close(self) -> None:
+        """停止记录并写入剩余内容、释放自有客户端
+
+        在事件循环中调用时于后台执行（``await wait_closed()`` 等待完成）；在循环外调用时，
+        若客户端所属的循环仍可用则在其上同步执行，否则跳过最终写入并告警。
+        """
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            loop = self._loop
+            if loop is None or loop.is_closed() or loop.is_running():
+                if self.pending_keys or self._clear_pending:
+                    self._logger.warning(
+                        f"Event loop of the Redis stats client is gone, "
+                        f"skipping final flush of {self.pending_keys} keys"
+                    )
+                return
+            try:
+                loop.run_until_complete(self._flush_and_release())
+            except Exception as e:
+                self._logger.warning(f"Final Redis stats flush failed: {e}")
+            return
+        self._closing = asyncio.ensure_future(self._flush_and_release())
+
+    async def wait_closed(self) -> None:
+        """等待 close() 开始的最终写入与客户端关闭完成（可重复 await）"""
+        if self._closing is not None:
+            await asyncio.shield(self._closing)
+
+    async def _flush_and_release(self) -> None:
+        try:
+            # 唤醒等待中的定时刷新而不是取消它，避免丢弃已取出但尚未写入的批次
+            task = self._flush_task
+            if task is not None and not task.done():
+                self._full.set()
+                await asyncio.gather(task, return_exceptions=True)
+            await self.flush()
+        finally:
+            if self._owns_client:
+                await self._redis.aclose()
+
+
 # ==================== 文件后端 ====================
 
 class FileStatsBackend(StatsBackend):
@@ -249,6 +466,7 @@ class StatsBackendFactory:
     _backends = {
         'memory': MemoryStatsBackend,
         'redis': RedisStatsBackend,
+        'redis_buffered': BufferedRedisStatsBackend,
         'file': FileStatsBackend,
     }
     
@@ -301,6 +519,28 @@ class StatsBackendFactory:
                 get_logger(cls.__name__).warning("redis not installed, fallback to memory backend")
                 return MemoryStatsBackend()
         
+        elif backend_type == 'redis_buffered':
+            try:
+                import redis.asyncio as aioredis
+            except ImportError:
+                get_logger(cls.__name__).warning("redis not installed, fallback to memory backend")
+                return MemoryStatsBackend()
+            redis_url = settings.get('REDIS_URL')
+            client = aioredis.from_url(redis_url) if redis_url else aioredis.Redis(
+                host=settings.get('REDIS_HOST', 'localhost'),
+                port=settings.get_int('REDIS_PORT', 6379),
+                db=settings.get_int('REDIS_DB', 0),
+                password=settings.get('REDIS_PASSWORD')
+            )
+            return BufferedRedisStatsBackend(
+                client,
+                key=settings.get('STATS_REDIS_KEY', 'crawlo:stats'),
+                expire=settings.get_int('STATS_REDIS_EXPIRE', None),
+                flush_interval=settings.get_float('STATS_REDIS_FLUSH_INTERVAL', 1000),
+                max_pending=settings.get_int('STATS_REDIS_MAX_PENDING', 1000),
+                owns_client=True,
+            )
+
         elif backend_type == 'file':
             return FileStatsBackend(file_path=safe_get_path(settings, 'STATS_FILE', 'stats.json'))
 
@@ -177,6 +177,10 @@ class StatsCollector:
             self.logger.info(f'{spider_name} stats: \n{pformat(optimized_stats)}')
 
         self.backend.close()
+
+    async def wait_closed(self) -> None:
+        """等待后端最终写入完成（close() 之后调用；只有写回缓冲类后端需要等待）"""
+        await self.backend.wait_closed()
     
     def _calculate_rate_metrics(self, end_time: datetime) -> None:
         """
@@ -151,11 +151,44 @@ class PostgreSQLDialect(SQLDialect):
         'ON CONFLICT DO NOTHING'
     )
 
+    # 批量写入：COPY 到临时表后以集合方式写入目标表
+    upsert_select_template = (
+        'INSERT INTO {table} ({cols}) SELECT {cols} FROM {source} '
+        'ON CONFLICT ({conflict_cols}) DO UPDATE SET {updates}'
+    )
+    insert_ignore_select_template = (
+        'INSERT INTO {table} ({cols}) SELECT {cols} FROM {source} '
+        'ON CONFLICT DO NOTHING'
+    )
+
     @classmethod
     def build_placeholder(cls, col_index: int) -> str:
         """PostgreSQL 使用 $1, $2 风格占位符"""
         return f'${col_index + 1}'
 
+    @classmethod
+    def build_upsert_select(
+        cls,
+        table: str,
+        cols: List[str],
+        source: str,
+        conflict_cols: tuple = (),
+        update_cols: tuple = (),
+        ignore: bool = False,
+    ) -> str:
+        """构建 INSERT ... SELECT ... ON CONFLICT 语句（source 为已加引号的临时表名）"""
+        template = cls.insert_ignore_select_template if ignore else cls.upsert_select_template
+        return template.format(
+            table=cls.quote(table),
+            cols=cls.build_cols_str(cols),
+            source=source,
+            conflict_cols=cls.build_cols_str(list(conflict_cols)),
+            updates=', '.join(
+                f'{cls.quote(c)} = EXCLUDED.{cls.quote(c)}'
+                for c in update_cols
+            ),
+        )
+
 
 class SQLiteDialect(SQLDialect):
     """SQLite 方言"""
@@ -9,14 +9,16 @@
 - HTTP Content-Type 头部编码检测
 - HTML meta 标签编码检测
 - 内容自动检测
+- 快速路径（BOM / Content-Type / meta 声明，不解码响应体）与按主机缓存的内容探测结果
 
 设计原则：
-1. 纯函数设计，无状态，便于测试
+1. 纯函数设计，无状态，便于测试（按主机缓存除外：缓存属于检测器实例，见 detect_for_host）
 2. 支持 w3lib 和内置 fallback 两种实现
 3. 优先级明确，可配置
 """
 
 import re
+from collections import OrderedDict
 from typing import Optional, Dict, Any
 
 # 尝试导入 w3lib 编码检测函数
@@ -265,6 +267,115 @@ class EncodingDetector:
         # 3. 使用内置检测逻辑
         return cls._detect_fallback(body, headers)
 
+    @classmethod
+    def detect_declared(
+            cls,
+            body: bytes,
+            headers: Optional[Dict[str, Any]] = None,
+    ) -> Optional[str]:
+        """
+        快速路径：只看 BOM、HTTP Content-Type charset 与 HTML meta / XML 声明
+
+        不解码响应体（w3lib.html_to_unicode 会顺带整体解码一次，检测后即丢弃）；
+        三者皆无时返回 None，需进行内容探测。结果与 detect() 在这三步上一致。
+
+        Args:
+            body: 响应体字节内容
+            headers: HTTP 响应头
+
+        Returns:
+            Optional[str]: 声明的编码或 None
+        """
+        encoding, bom = read_bom(body)
+        if encoding and bom:
+            return encoding
+
+        encoding = cls._detect_from_headers(headers or {})
+        if not encoding:
+            encoding = html_body_declared_encoding(body)
+            if encoding:
+                encoding = resolve_encoding(encoding)
+        if W3LIB_AVAILABLE and encoding in ('utf-16', 'utf-32'):
+            encoding += '-be'
+        return encoding or None
+
+    # 内容探测结果按主机缓存的上限（LRU）
+    HOST_CACHE_SIZE = 1024
+    # 不缓存的内容探测结果（单字节编码，严格解码无法否决）
+    _SINGLE_BYTE_ENCODINGS = frozenset(WESTERN_ENCODINGS) | frozenset(
+        resolve_encoding(enc) or enc for enc in WESTERN_ENCODINGS)
+
+    def __init__(self) -> None:
+        # 按主机缓存的编码（每个检测器实例独立，由下载器按爬虫各持有一个）
+        self._host_encodings: 'OrderedDict[str, str]' = OrderedDict()
+
+    def detect_for_host(
+            self,
+            body: bytes,
+            headers: Optional[Dict[str, Any]] = None,
+            host: Optional[str] = None,
+    ) -> str:
+        """
+        检测编码，声明的 charset 与可信的内容探测结果按主机缓存在本实例中（LRU）
+
+        同一站点的后续页面若没有 BOM / charset / meta 声明，先做 ASCII/UTF-8 判定
+        （与 detect() 的探测顺序一致），否则用该主机缓存的编码严格解码验证，
+        通过即直接采用，跳过 chardet；验证失败再走完整检测并更新缓存。
+
+        单字节西欧编码（latin-1 / cp1252 / cp1251）几乎能解码任意字节，严格解码无法否决，
+        内容探测得到它们时不写入缓存，避免把一次兜底猜测固定到整个站点。
+
+        Args:
+            body: 响应体字节内容
+            headers: HTTP 响应头
+            host: 主机名（None 时不使用缓存）
+
+        Returns:
+            str: 检测到的编码
+        """
+        encoding = self.detect_declared(body, headers)
+        if encoding:
+            if host:
+                self._remember_host_encoding(host, encoding)
+            return encoding
+
+        cached = self._host_encodings.get(host) if host else None
+        if host and cached:
+            encoding = self._detect_ascii_utf8(body)
+            if encoding:
+                return encoding
+            try:
+                body.decode(cached)
+                self._host_encodings.move_to_end(host)
+                return cached
+            except (UnicodeError, LookupError):
+                # 该页面与站点缓存编码不符，重新探测
+                self._host_encodings.pop(host, None)
+
+        encoding = self.detect(body, headers)
+        if host and (resolve_encoding(encoding) or encoding) not in self._SINGLE_BYTE_ENCODINGS:
+            self._remember_host_encoding(host, encoding)
+        return encoding
+
+    def _remember_host_encoding(self, host: str, encoding: str) -> None:
+        host_encodings = self._host_encodings
+        host_encodings[host] = encoding
+        host_encodings.move_to_end(host)
+        if len(host_encodings) > self.HOST_CACHE_SIZE:
+            host_encodings.popitem(last=False)
+
+    @classmethod
+    def _detect_ascii_utf8(cls, body: bytes) -> Optional[str]:
+        """内容探测的第一步（ASCII / UTF-8），与 detect() 各实现的返回值保持一致"""
+        candidates = ('ascii', 'utf-8') if W3LIB_AVAILABLE else ('utf-8',)
+        for enc in candidates:
+            try:
+                body.decode(enc)
+                return resolve_encoding(enc)
+            except UnicodeError:
+                continue
+        return None
+
     @classmethod
     def _detect_with_w3lib(
             cls,
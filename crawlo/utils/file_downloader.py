@@ -12,6 +12,7 @@ import aiofiles
 import asyncio
 import os
 import re
+import shutil
 import hashlib
 import mimetypes
 from pathlib import Path
@@ -19,6 +20,7 @@ from urllib.parse import urlparse
 from typing import Optional, Dict, Any, List, Callable
 
 from crawlo.logging import get_logger
+from crawlo.utils.request.response_helper import get_header_text
 
 
 # Constants
@@ -164,41 +166,22 @@ class FileDownloader:
                         # Generate filename
                         actual_filename = await self._generate_filename(url, response, filename)
                         
-                        # Validate file extension
-                        _, ext = os.path.splitext(actual_filename.lower())
-                        if ext not in allowed_exts:
-                            return {
-                                'success': False,
-                                'error': f'Extension {ext} not allowed',
-                                'url': url
-                            }
-                        
-                        # Validate content type (optional)
-                        if self.verify_content_type:
-                            content_type = response.headers.get('Content-Type', '').lower()
-                            if content_type and not self._is_allowed_content_type(content_type, ext):
-                                return {
-                                    'success': False,
-                                    'error': f'Content type mismatch: {content_type} vs {ext}',
-                                    'url': url
-                                }
-                        
-                        # Generate full file path
-                        filepath = download_dir / actual_filename
+                        # Validate extension / content type
+                        error = self._validate_file(actual_filename, get_header_text(response.headers, 'Content-Type'), allowed_exts)
+                        if error:
+                            return {'success': False, 'error': error, 'url': url}
                         
-                        # Handle duplicate filenames
-                        if self.rename_duplicates:
-                            filepath = self._handle_duplicate_filename(filepath)
+                        filepath = self._prepare_filepath(download_dir, actual_filename)
                         
-                        # Create directory
-                        if self.create_dirs:
-                            filepath.parent.mkdir(parents=True, exist_ok=True)
-                        
-                        # Stream download with progress callback
+                        # Stream download with progress callback; abort as soon as the size limit is exceeded
+                        oversized = False
                         async with aiofiles.open(filepath, 'wb') as f:
-                            async for chunk in response.content.iter_chunked(8192):
-                                await f.write(chunk)
+                            async for chunk in response.content.iter_chunked(CHUNK_SIZE):
                                 downloaded_size += len(chunk)
+                                if max_size > 0 and downloaded_size > max_size:
+                                    oversized = True
+                                    break
+                                await f.write(chunk)
                                 # Invoke progress callback
                                 if self.progress_callback:
                                     try:
@@ -209,7 +192,7 @@ class FileDownloader:
                         actual_size = downloaded_size
                         
                         # Validate file size
-                        if max_size > 0 and actual_size > max_size:
+                        if oversized:
                             # Delete oversized file
                             if filepath.exists():
                                 filepath.unlink()
@@ -252,6 +235,93 @@ class FileDownloader:
             'url': url
         }
     
+    async def save_response(self,
+                            response,
+                            filename: Optional[str] = None,
+                            custom_dir: Optional[str] = None,
+                            allowed_extensions: Optional[List[str]] = None,
+                            max_file_size: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Save a crawlo ``Response`` that was already downloaded by the engine
+        
+        Streamed responses (``request.meta['stream'] = True``) are copied from
+        ``response.body_path`` without loading the body into memory; in-memory
+        bodies are written chunk by chunk via ``response.iter_bytes()``.
+        
+        Args:
+            response: crawlo Response
+            filename: Custom filename
+            custom_dir: Custom download directory
+            allowed_extensions: Custom allowed extensions list
+            max_file_size: Custom max file size
+            
+        Returns:
+            Dict: Download result dictionary (same keys as ``download``)
+        """
+        url = response.url
+        download_dir = Path(custom_dir) if custom_dir else self.download_dir
+        if allowed_extensions:
+            allowed_exts = list(set(self.allowed_extensions + allowed_extensions))
+        else:
+            allowed_exts = self.allowed_extensions
+        max_size = max_file_size or self.max_file_size
+        
+        size = response.body_size
+        if max_size > 0 and size > max_size:
+            return {'success': False, 'error': f'File too large ({size} > {max_size})', 'url': url}
+        
+        try:
+            actual_filename = await self._generate_filename(url, response, filename)
+            error = self._validate_file(actual_filename, get_header_text(response.headers, 'Content-Type'), allowed_exts)
+            if error:
+                return {'success': False, 'error': error, 'url': url}
+            
+            filepath = self._prepare_filepath(download_dir, actual_filename)
+            if response.body_path:
+                await asyncio.to_thread(shutil.copyfile, response.body_path, filepath)
+            else:
+                async with aiofiles.open(filepath, 'wb') as f:
+                    for chunk in response.iter_bytes(CHUNK_SIZE):
+                        await f.write(chunk)
+        except Exception as e:
+            self.logger.error(f"附件保存失败 {url}: {e}")
+            return {'success': False, 'error': str(e), 'url': url}
+        
+        self.logger.info(f"附件保存成功: {actual_filename}")
+        return {
+            'success': True,
+            'filepath': str(filepath),
+            'filename': actual_filename,
+            'size': size,
+            'url': url,
+            'content_type': get_header_text(response.headers, 'Content-Type'),
+            'attempts': 1
+        }
+    
+    def _validate_file(self, filename: str, content_type: str, allowed_exts: List[str]) -> Optional[str]:
+        """
+        Validate extension and (optionally) content type
+        
+        Returns:
+            Optional[str]: Error message, or None when the file is acceptable
+        """
+        _, ext = os.path.splitext(filename.lower())
+        if ext not in allowed_exts:
+            return f'Extension {ext} not allowed'
+        content_type = content_type.lower()
+        if self.verify_content_type and content_type and not self._is_allowed_content_type(content_type, ext):
+            return f'Content type mismatch: {content_type} vs {ext}'
+        return None
+    
+    def _prepare_filepath(self, download_dir: Path, filename: str) -> Path:
+        """Resolve the target path (duplicate renaming, directory creation)"""
+        filepath = download_dir / filename
+        if self.rename_duplicates:
+            filepath = self._handle_duplicate_filename(filepath)
+        if self.create_dirs:
+            filepath.parent.mkdir(parents=True, exist_ok=True)
+        return filepath
+    
     async def download_batch(self, urls: List[str], 
                            headers: Optional[Dict] = None,
                            concurrency: int = 5) -> List[Dict[str, Any]]:
@@ -289,13 +359,13 @@ class FileDownloader:
         
         return processed_results
     
-    async def _generate_filename(self, url: str, response: aiohttp.ClientResponse, custom_filename: Optional[str] = None) -> str:
+    async def _generate_filename(self, url: str, response, custom_filename: Optional[str] = None) -> str:
         """
         Generate filename
         
         Args:
             url: File URL
-            response: Response object
+            response: aiohttp or crawlo response object
             custom_filename: Custom filename
             
         Returns:
@@ -306,7 +376,7 @@ class FileDownloader:
             return self._sanitize_filename(custom_filename)
         
         # Try to get filename from Content-Disposition
-        content_disposition = response.headers.get('Content-Disposition', '')
+        content_disposition = get_header_text(response.headers, 'Content-Disposition')
         if 'filename=' in content_disposition:
             # re 已在顶部导入
             match = re.search(r'filename[^;=\n]*=(([\'\"]).*?\2|[^;\n]*)', content_disposition)
@@ -325,7 +395,7 @@ class FileDownloader:
         url_hash = hashlib.md5(url.encode()).hexdigest()[:8]  # nosec B324
         
         # Try to infer extension from Content-Type
-        content_type = response.headers.get('Content-Type', '')
+        content_type = get_header_text(response.headers, 'Content-Type')
         if content_type:
             ext = mimetypes.guess_extension(content_type.split(';')[0])
             if ext:
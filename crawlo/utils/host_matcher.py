@@ -0,0 +1,140 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+主机名匹配器
+==========
+OffsiteMiddleware / HybridDownloader 共用：
+
+- 规则按反转标签存入 Trie（example.com → com → example），一次查找只走 标签数 步，
+  与规则数量无关（原实现对每条规则做一次正则匹配）
+- 主机名归一化：小写、去掉认证信息 / 端口 / 末尾的点，非 ASCII 域名转为 IDNA（punycode），
+  规则与请求两侧使用同一归一化
+- 按原始主机名缓存判定结果，命中时跳过归一化与 Trie 查找
+"""
+from typing import Any, Dict, Iterable, Optional
+
+_END = object()  # Trie 节点上的规则终止标记
+_MISSING = object()
+
+
+def normalize_host(host: Optional[str]) -> str:
+    """主机名归一化（也接受 ``user@host:port`` 形式）"""
+    if not host:
+        return ''
+    host = host.strip()
+    at = host.rfind('@')
+    if at >= 0:
+        host = host[at + 1:]
+    if host.startswith('['):
+        # IPv6 字面量
+        return host[:host.find(']') + 1].lower()
+    colon = host.find(':')
+    if colon >= 0:
+        host = host[:colon]
+    host = host.rstrip('.').lower()
+    if not host.isascii():
+        try:
+            host = host.encode('idna').decode('ascii')
+        except UnicodeError:
+            return host  # 非法 IDNA 主机名按原样比较（不会匹配任何规则）
+    return host
+
+
+def url_netloc(url: str) -> str:
+    """从 URL 中切出 netloc（不使用 urlparse，无 scheme 时返回空字符串）"""
+    start = url.find('://')
+    if start < 0:
+        return ''
+    start += 3
+    end = len(url)
+    for sep in '/?#':
+        i = url.find(sep, start, end)
+        if i >= 0:
+            end = i
+    return url[start:end]
+
+
+def url_host(url: str) -> str:
+    """从 URL 中提取归一化主机名"""
+    return normalize_host(url_netloc(url))
+
+
+class HostMatcher:
+    """
+    主机名规则匹配器
+
+    Args:
+        domains: 规则域名；``example.com`` / ``.example.com`` / ``*.example.com`` 等价
+        include_subdomains: True 时规则同时匹配其子域名，False 时只匹配主机名本身
+        cache_size: 判定缓存上限（按原始主机名），超出后整体清空
+    """
+
+    def __init__(self, domains: Iterable[str] = (), include_subdomains: bool = True, cache_size: int = 65536):
+        self.include_subdomains = include_subdomains
+        self.cache_size = cache_size
+        self._root: Dict[Any, Any] = {}
+        self._exact: Dict[str, Any] = {}
+        self._cache: Dict[str, Any] = {}
+        self._size = 0
+        for domain in domains:
+            self.add(domain)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, host: str) -> bool:
+        return self.lookup(host) is not None
+
+    def add(self, domain: str, value: Any = True):
+        """添加规则；同一主机名同时命中多条规则时，最具体（标签最多）的规则生效"""
+        domain = domain.strip()
+        if domain.startswith('*.'):
+            domain = domain[2:]
+        domain = normalize_host(domain.lstrip('.'))
+        if not domain:
+            return
+        self._cache.clear()
+        if not self.include_subdomains:
+            self._size += domain not in self._exact
+            self._exact[domain] = value
+            return
+        node = self._root
+        for label in reversed(domain.split('.')):
+            node = node.setdefault(label, {})
+        self._size += _END not in node
+        node[_END] = value
+
+    def lookup(self, host: Optional[str]) -> Any:
+        """返回主机名命中的规则值，未命中返回 None"""
+        if not host:
+            return None
+        cache = self._cache
+        value = cache.get(host, _MISSING)
+        if value is not _MISSING:
+            return value
+        value = self._lookup(normalize_host(host))
+        if len(cache) >= self.cache_size:
+            cache.clear()
+        cache[host] = value
+        return value
+
+    def match(self, host: Optional[str]) -> bool:
+        return self.lookup(host) is not None
+
+    def lookup_url(self, url: str) -> Any:
+        """按 URL 的主机名查找（以原始 netloc 为缓存 key，命中时不再归一化）"""
+        return self.lookup(url_netloc(url))
+
+    def _lookup(self, host: str) -> Any:
+        if not host:
+            return None
+        if not self.include_subdomains:
+            return self._exact.get(host)
+        node = self._root
+        found = None
+        for label in reversed(host.split('.')):
+            node = node.get(label)
+            if node is None:
+                break
+            found = node.get(_END, found)
+        return found
@@ -0,0 +1,37 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+Redis Lua 脚本执行工具
+
+脚本按 SHA1 通过 EVALSHA 执行，只传 40 字节摘要；服务端未缓存（NOSCRIPT，
+例如首次执行或 SCRIPT FLUSH / 故障切换之后）时回退一次 EVAL，EVAL 同时把脚本载入服务端缓存。
+"""
+import hashlib
+from functools import lru_cache
+
+try:
+    from redis.exceptions import NoScriptError
+except ImportError:  # pragma: no cover - redis 为分布式模式依赖
+    NoScriptError = None
+
+
+@lru_cache(maxsize=64)
+def script_sha(script: str) -> str:
+    """脚本的 SHA1 摘要（与 SCRIPT LOAD 返回值一致）"""
+    return hashlib.sha1(script.encode()).hexdigest()  # nosec B324
+
+
+def is_noscript(error: Exception) -> bool:
+    if NoScriptError is not None and isinstance(error, NoScriptError):
+        return True
+    return str(error).startswith('NOSCRIPT')
+
+
+async def run_script(redis_client, script: str, numkeys: int, *keys_and_args):
+    """EVALSHA 执行脚本，服务端未缓存时回退 EVAL 一次"""
+    try:
+        return await redis_client.evalsha(script_sha(script), numkeys, *keys_and_args)
+    except Exception as e:
+        if not is_noscript(e):
+            raise
+        return await redis_client.eval(script, numkeys, *keys_and_args)
@@ -258,11 +258,11 @@ async def claim_pending_manual(
         if not pending_result:
             return claimed
 
-        # 筛选超时消息
+        # 筛选超时消息（redis-py 以 time_since_delivered 返回空闲毫秒数）
         timed_out_ids = [
             entry["message_id"]
             for entry in pending_result
-            if entry.get("idle", 0) >= min_idle_ms
+            if entry.get("time_since_delivered", entry.get("idle", 0)) >= min_idle_ms
         ]
 
         if not timed_out_ids:
@@ -277,8 +277,8 @@ async def claim_pending_manual(
 
         for msg in claimed_msgs:
             if msg:
-                msg_id = msg[0] if isinstance(msg, tuple) else msg
-                msg_data = msg[1] if isinstance(msg, tuple) and len(msg) > 1 else {}
+                msg_id = msg[0] if isinstance(msg, (tuple, list)) else msg
+                msg_data = msg[1] if isinstance(msg, (tuple, list)) and len(msg) > 1 else {}
                 claimed.append((msg_id, msg_data))
 
     except Exception:  # nosec B110
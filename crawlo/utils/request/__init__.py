@@ -8,6 +8,8 @@ from .request import (
 
 from .fingerprint import FingerprintGenerator
 
+from .request_codec import RequestCodec, get_request_codec
+
 from .response_helper import (
     parse_cookies,
     regex_search,
@@ -21,6 +23,8 @@ __all__ = [
     "request_to_dict",
     "request_from_dict",
     "FingerprintGenerator",
+    "RequestCodec",
+    "get_request_codec",
     "parse_cookies",
     "regex_search",
     "regex_findall",
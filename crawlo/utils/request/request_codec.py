@@ -0,0 +1,201 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+Request 二进制编解码器（Redis 优先级队列 / Redis Stream / 磁盘队列 / 检查点共用）
+
+线格式（version 1）::
+
+    0xC1 | header | msgpack({field_id: value, ...})
+
+- 0xC1 是 msgpack 规范中保留不用的字节，JSON（``{``）、pickle（``0x80``）与普通 msgpack
+  map 都不会以它开头：解码端据此识别编码格式，旧格式数据与新格式可以混存在同一个队列中
+- header 高 4 位为格式版本，低 4 位为压缩算法（0 = 无，1 = zlib，2 = zstd）
+- Request 字段用整数 id 代替字段名；None、空容器、与 ``Request.from_dict`` 默认值相同的字段不写入
+- body 保留原始 bytes（``to_dict`` 按 UTF-8 解码为 str，二进制 body 有损）；
+  由 json_body / form_data 生成的 body 不重复存储，解码时由 Request 重新生成
+- 编码结果超过 ``compress_threshold`` 字节时整体压缩（安装 zstandard 时用 zstd，否则 zlib）
+
+字段 id 只允许追加、不允许复用：解码时忽略未知 id，旧进程可以读取新版本写入的数据。
+"""
+import zlib
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Tuple
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    msgpack = None
+    MSGPACK_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+from crawlo.http.request import Request
+
+__all__ = ['RequestCodec', 'get_request_codec']
+
+_MAGIC = 0xC1
+_VERSION = 1
+_COMPRESS_NONE = 0
+_COMPRESS_ZLIB = 1
+_COMPRESS_ZSTD = 2
+
+# 字段 id（只追加，不复用）
+_FIELDS = (
+    'url', 'method', 'headers', 'body', 'form_data', 'json_body', 'params', 'cb_kwargs',
+    'cookies', 'meta', 'priority', 'dont_filter', 'timeout', 'proxy', 'allow_redirects',
+    'auth', 'verify', 'flags', 'encoding', 'use_dynamic_loader',
+)
+_FIELD_IDS = {name: index for index, name in enumerate(_FIELDS, 1)}
+
+# 与 Request.from_dict() 的默认值保持一致
+_DEFAULTS = {
+    'method': 'GET',
+    'priority': 0,
+    'dont_filter': False,
+    'allow_redirects': True,
+    'verify': True,
+    'use_dynamic_loader': False,
+}
+
+
+class RequestCodec:
+    """
+    版本化的 Request 二进制编解码器（msgpack + 字段 id，可选压缩）。
+
+    实例无状态、可跨队列共享，一般通过 ``get_request_codec()`` 获取。
+
+    Args:
+        compress_threshold: 编码结果超过该字节数时压缩（0 = 不压缩）
+        exclude: 不写入的字段（如 Stream 精简模式下由其他机制补全的 priority / headers / cookies）
+    """
+
+    def __init__(self, compress_threshold: int = 4096, exclude: Iterable[str] = ()):
+        self.compress_threshold = compress_threshold
+        self.exclude = frozenset(exclude)
+        self._zstd_compressor = zstandard.ZstdCompressor() if ZSTD_AVAILABLE else None
+        self._zstd_decompressor = zstandard.ZstdDecompressor() if ZSTD_AVAILABLE else None
+
+    @staticmethod
+    def is_encoded(data: Any) -> bool:
+        """判断一段字节是否为本编解码器的输出"""
+        return isinstance(data, (bytes, bytearray, memoryview)) and len(data) > 1 and data[0] == _MAGIC
+
+    # ---- Request ↔ bytes ----
+
+    def encode(self, request: Request) -> bytes:
+        """
+        编码 Request。
+
+        直接读取 Request 属性，不经过 ``to_dict()``（省去 meta / cb_kwargs 的 deepcopy）。
+
+        Raises:
+            TypeError: meta / cb_kwargs 等字段包含 msgpack 不支持的类型
+        """
+        derived_body = request._json_body is not None or request._form_data is not None
+        return self._pack(self._compact((
+            ('url', request._original_url),
+            ('method', request.method),
+            ('headers', request.headers),
+            ('body', None if derived_body else request.body),
+            ('form_data', request._form_data),
+            ('json_body', request._json_body),
+            ('params', request._params),
+            ('cb_kwargs', request.cb_kwargs),
+            ('cookies', request.cookies),
+            ('meta', request._meta),
+            ('priority', -request.priority),
+            ('dont_filter', request.dont_filter),
+            ('timeout', request.timeout),
+            ('proxy', request.proxy),
+            ('allow_redirects', request.allow_redirects),
+            ('auth', request.auth),
+            ('verify', request.verify),
+            ('flags', request.flags),
+            ('encoding', request.encoding),
+            ('use_dynamic_loader', request.use_dynamic_loader),
+        )))
+
+    def decode(self, data: bytes) -> Request:
+        """解码为 Request（缺失字段由 ``Request.from_dict`` 补默认值）"""
+        fields = self.decode_dict(data)
+        if isinstance(fields.get('auth'), list):
+            fields['auth'] = tuple(fields['auth'])
+        return Request.from_dict(fields)
+
+    # ---- dict ↔ bytes（检查点等已转换为 dict 的场景）----
+
+    def encode_dict(self, data: Dict[str, Any]) -> bytes:
+        """
+        无损编码请求 dict：Request 字段名替换为 id，值与其他键（如 ``_callback``）原样保留。
+
+        不省略默认值，``decode_dict`` 的结果与输入相等。
+        """
+        return self._pack({_FIELD_IDS.get(name, name): value for name, value in data.items()})
+
+    def decode_dict(self, data: bytes) -> Dict[str, Any]:
+        """解码为字段名 → 值的 dict（未知字段 id 忽略）"""
+        if not self.is_encoded(data):
+            raise ValueError("Not a RequestCodec payload")
+        header = data[1]
+        if header >> 4 > _VERSION:
+            raise ValueError(f"Unsupported RequestCodec version: {header >> 4}")
+        _require_msgpack()
+        payload = bytes(data[2:])
+        compression = header & 0x0F
+        if compression == _COMPRESS_ZLIB:
+            payload = zlib.decompress(payload)
+        elif compression == _COMPRESS_ZSTD:
+            if self._zstd_decompressor is None:
+                raise RuntimeError("Payload is zstd-compressed but zstandard is not installed")
+            payload = self._zstd_decompressor.decompress(payload)
+
+        fields = {}
+        for key, value in msgpack.unpackb(payload, raw=False, strict_map_key=False).items():
+            if isinstance(key, int):
+                if 0 < key <= len(_FIELDS):
+                    fields[_FIELDS[key - 1]] = value
+            else:
+                fields[key] = value
+        return fields
+
+    # ---- 内部 ----
+
+    def _compact(self, items: Iterable[Tuple[str, Any]]) -> Dict[Any, Any]:
+        compact: Dict[Any, Any] = {}
+        for name, value in items:
+            if value is None or name in self.exclude:
+                continue
+            if isinstance(value, (dict, list, tuple, str, bytes)) and not value:
+                continue
+            if name in _DEFAULTS and value == _DEFAULTS[name]:
+                continue
+            compact[_FIELD_IDS.get(name, name)] = value
+        return compact
+
+    def _pack(self, compact: Dict[Any, Any]) -> bytes:
+        _require_msgpack()
+        payload = msgpack.packb(compact, use_bin_type=True)
+        compression = _COMPRESS_NONE
+        if self.compress_threshold and len(payload) > self.compress_threshold:
+            if self._zstd_compressor is not None:
+                payload, compression = self._zstd_compressor.compress(payload), _COMPRESS_ZSTD
+            else:
+                payload, compression = zlib.compress(payload), _COMPRESS_ZLIB
+        return bytes((_MAGIC, (_VERSION << 4) | compression)) + payload
+
+
+def _require_msgpack() -> None:
+    if not MSGPACK_AVAILABLE:
+        raise RuntimeError("RequestCodec requires msgpack: pip install msgpack")
+
+
+@lru_cache(maxsize=None)
+def get_request_codec(compress_threshold: int = 4096, exclude: Tuple[str, ...] = ()) -> RequestCodec:
+    """按参数返回共享的 RequestCodec 实例"""
+    return RequestCodec(compress_threshold=compress_threshold, exclude=exclude)
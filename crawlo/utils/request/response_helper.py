@@ -10,6 +10,7 @@
 - regex_search: 在文本上执行正则表达式搜索
 - regex_findall: 在文本上执行正则表达式查找
 - get_header_value: 从响应头中获取值，处理大小写不敏感的情况
+- get_header_text: 以 str 读取响应头（大小写不敏感，bytes 值按 UTF-8 解码，缺失为空串）
 """
 
 import re
@@ -122,10 +123,28 @@ def get_header_value(headers: Dict[str, Any], header_name: str, default: Any = N
     return default
 
 
+def get_header_text(headers: Any, header_name: str) -> str:
+    """
+    以 str 读取响应头，兼容 aiohttp 的 CIMultiDict 与 crawlo 的 dict（值可能是 str 或 bytes）
+
+    :param headers: 响应头
+    :param header_name: 头部名称（大小写不敏感）
+    :return: 头部值，缺失时为空串
+    """
+    value = get_header_value(headers, header_name)
+    if value is None and headers:
+        lowered = header_name.lower()
+        value = next((v for k, v in headers.items() if str(k).lower() == lowered), None)
+    if value is None:
+        return ''
+    return value.decode('utf-8', 'replace') if isinstance(value, bytes) else str(value)
+
+
 __all__ = [
     "parse_cookies",
     "regex_search",
     "regex_findall",
     "regex_findone",
-    "get_header_value"
+    "get_header_value",
+    "get_header_text"
 ]
\ No newline at end of file
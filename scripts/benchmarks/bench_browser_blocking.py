@@ -0,0 +1,186 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+浏览器资源屏蔽页面加载基准（本地夹具页面）
+======================================
+
+本地 HTTP 服务生成夹具页面：每页 ``--subresources`` 个子资源（图片 / 字体 / 样式 / 脚本，
+约三分之一来自广告域名）。Chromium 以 ``--host-resolver-rules`` 把所有主机解析到本地服务，
+广告域名请求同样落在本地，不依赖外网。
+
+对比模式：
+    - none      : 不屏蔽
+    - legacy    : 原实现——每个页面 page.route，逐条子串扫描 AD_DOMAINS
+    - compiled  : ResourceBlocker 预编译屏蔽器 + 上下文级路由
+    - native    : ResourceBlocker 原生模式（CDP Network.setBlockedURLs），被屏蔽请求不经过 Python
+
+另外 ``--decide-only`` 只测量单次屏蔽判定耗时（无需浏览器）。
+
+用法：
+    python scripts/benchmarks/bench_browser_blocking.py --pages 20 --subresources 150
+    python scripts/benchmarks/bench_browser_blocking.py --decide-only
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlparse
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from crawlo.downloader.constants import AD_DOMAINS  # noqa: E402
+from crawlo.downloader.resource_blocker import ResourceBlocker  # noqa: E402
+
+BLOCK_RESOURCES = {'image', 'font', 'media'}
+AD_HOSTS = ['stats.g.doubleclick.net', 'pagead2.googlesyndication.com', 'www.google-analytics.com',
+            'www.googletagmanager.com', 'connect.facebook.net']
+# 1x1 透明 GIF
+GIF = (b'GIF89a\x01\x00\x01\x00\x80\x00\x00\x00\x00\x00\xff\xff\xff!\xf9\x04\x01\x00\x00\x00\x00,'
+       b'\x00\x00\x00\x00\x01\x00\x01\x00\x00\x02\x02D\x01\x00;')
+
+
+def _subresources(n):
+    """(url, resource_type) 夹具列表：约三分之一来自广告域名"""
+    items = []
+    for i in range(n):
+        host = AD_HOSTS[i % len(AD_HOSTS)] if i % 3 == 0 else 'cdn.fixture.test'
+        kind = ('image', 'script', 'stylesheet', 'font')[i % 4]
+        ext = {'image': 'gif', 'script': 'js', 'stylesheet': 'css', 'font': 'woff2'}[kind]
+        items.append((f'http://{host}/assets/{i}.{ext}', kind))
+    return items
+
+
+def _page_html(n):
+    tags = []
+    for url, kind in _subresources(n):
+        if kind == 'image':
+            tags.append(f'<img src="{url}">')
+        elif kind == 'script':
+            tags.append(f'<script src="{url}"></script>')
+        elif kind == 'stylesheet':
+            tags.append(f'<link rel="stylesheet" href="{url}">')
+        else:
+            tags.append(f'<link rel="preload" as="font" crossorigin href="{url}">')
+    return f'<html><head><title>fixture</title></head><body>{"".join(tags)}</body></html>'.encode()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    html = b''
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        body, ctype = b'', 'text/plain'
+        if path.startswith('/page'):
+            body, ctype = self.html, 'text/html'
+        elif path.endswith('.gif'):
+            body, ctype = GIF, 'image/gif'
+        elif path.endswith('.js'):
+            ctype = 'application/javascript'
+        elif path.endswith('.css'):
+            ctype = 'text/css'
+        self.send_response(200)
+        self.send_header('Content-Type', ctype)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _legacy_handler(block_resources):
+    """原实现的路由处理函数"""
+    async def route_handler(route):
+        request_obj = route.request
+        domain = urlparse(request_obj.url).netloc.lower()
+        for ad_domain in AD_DOMAINS:
+            if ad_domain in domain:
+                await route.abort()
+                return
+        if request_obj.resource_type in block_resources:
+            await route.abort()
+            return
+        await route.continue_()
+    return route_handler
+
+
+async def _run_mode(browser, mode, url, pages):
+    context = await browser.new_context()
+    page = await context.new_page()
+    blocker = ResourceBlocker(native=(mode == 'native'))
+    if mode == 'legacy':
+        await page.route('**/*', _legacy_handler(BLOCK_RESOURCES))
+    elif mode in ('compiled', 'native'):
+        await blocker.activate(page, blocker.compile(BLOCK_RESOURCES, True))
+
+    samples = []
+    for i in range(pages):
+        start = time.perf_counter()
+        await page.goto(f'{url}?i={i}', wait_until='load')
+        samples.append((time.perf_counter() - start) * 1000)
+    await context.close()
+    return samples
+
+
+async def bench_pages(args):
+    from playwright.async_api import async_playwright
+
+    _Handler.html = _page_html(args.subresources)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    port = server.server_address[1]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = 'http://www.fixture.test/page'
+
+    async with async_playwright() as pw:
+        browser = await pw.chromium.launch(args=[f'--host-resolver-rules=MAP * 127.0.0.1:{port}'])
+        try:
+            print(f"{args.subresources} subresources/page, {args.pages} loads per mode (first load discarded)")
+            print(f"{'mode':>10} {'median ms':>10} {'p90 ms':>10}")
+            for mode in args.modes:
+                samples = (await _run_mode(browser, mode, url, args.pages + 1))[1:]
+                p90 = sorted(samples)[int(len(samples) * 0.9) - 1]
+                print(f"{mode:>10} {statistics.median(samples):>10.1f} {p90:>10.1f}")
+        finally:
+            await browser.close()
+            server.shutdown()
+
+
+def bench_decide(args):
+    """单次屏蔽判定耗时：原实现的 urlparse + 子串扫描 vs 预编译屏蔽器"""
+    requests = _subresources(args.subresources) * 20
+    blocker = ResourceBlocker().compile(BLOCK_RESOURCES, True)
+
+    def legacy(url, resource_type):
+        domain = urlparse(url).netloc.lower()
+        for ad_domain in AD_DOMAINS:
+            if ad_domain in domain:
+                return True
+        return resource_type in BLOCK_RESOURCES
+
+    for label, decide in (('legacy', legacy), ('compiled', blocker.blocks)):
+        start = time.perf_counter()
+        blocked = sum(decide(url, kind) for url, kind in requests)
+        elapsed = time.perf_counter() - start
+        print(f"{label:>10} {len(requests)} decisions, {blocked} blocked, "
+              f"{elapsed / len(requests) * 1e6:.2f} us/decision")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=20, help='每种模式加载页面次数')
+    parser.add_argument('--subresources', type=int, default=150, help='每个夹具页面的子资源数')
+    parser.add_argument('--modes', nargs='+', default=['none', 'legacy', 'compiled', 'native'],
+                        choices=['none', 'legacy', 'compiled', 'native'])
+    parser.add_argument('--decide-only', action='store_true', help='只测量屏蔽判定耗时（无需浏览器）')
+    args = parser.parse_args()
+    if args.decide_only:
+        bench_decide(args)
+    else:
+        asyncio.run(bench_pages(args))
@@ -0,0 +1,122 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+检查点保存耗时微基准（全量 vs 增量日志）
+======================================
+
+内存队列中有 ``--frontier`` 条待处理请求、过滤器中有同样数量的指纹，两次保存之间新增
+``--delta`` 条入队与 ``--delta`` 条出队。分别测量一次保存检查点的耗时：
+    - sqlite(drain)    : 原实现，逐条出队序列化后再放回队列，全量写入
+    - sqlite(snapshot) : 不出队地读取队列快照，全量 executemany 写入
+    - journal          : CHECKPOINT_STORAGE='journal'，只刷新两次保存之间的增量并折叠
+
+用法：
+    python scripts/benchmarks/bench_checkpoint.py --frontier 100000 --delta 1000
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from crawlo.checkpoint.manager import CheckpointManager  # noqa: E402
+from crawlo.http.request import Request  # noqa: E402
+from crawlo.queue.queue_manager import QueueConfig, QueueManager  # noqa: E402
+from crawlo.queue.queue_types import QueueType  # noqa: E402
+
+
+class _DrainOnly:
+    """只暴露 size / get / put，使 CheckpointManager 走出队再放回的回退路径"""
+
+    def __init__(self, queue_manager):
+        self._queue_manager = queue_manager
+
+    async def size(self):
+        return await self._queue_manager.size()
+
+    async def get(self):
+        return await self._queue_manager.get()
+
+    async def put(self, request, priority=0):
+        return await self._queue_manager.put(request, priority=priority)
+
+
+class _Settings(dict):
+    def get(self, key, default=None):
+        return super().get(key, default)
+
+
+def _request(i):
+    return Request(f'https://shop.example.com/item/{i}?ref=list', meta={'depth': i % 4}, priority=i % 3)
+
+
+async def _scheduler(frontier):
+    queue_manager = QueueManager(QueueConfig(queue_type='memory', max_queue_size=frontier * 2))
+    await queue_manager.initialize()
+    for i in range(frontier):
+        await queue_manager.put(_request(i), priority=i % 3)
+    dupe_filter = SimpleNamespace(fingerprints={f'{i:032x}' for i in range(frontier)})
+    return SimpleNamespace(queue_manager=queue_manager, dupe_filter=dupe_filter, queue_type=QueueType.MEMORY,
+                           checkpoint_journal=None)
+
+
+async def _full_save(storage_dir, frontier, drain):
+    scheduler = await _scheduler(frontier)
+    if drain:
+        scheduler.queue_manager = _DrainOnly(scheduler.queue_manager)
+    manager = CheckpointManager('bench', _Settings(
+        CHECKPOINT_ENABLED=True, CHECKPOINT_STORAGE='sqlite', CHECKPOINT_DIR=storage_dir))
+    start = time.perf_counter()
+    await manager.save(scheduler)
+    return time.perf_counter() - start
+
+
+async def _journal_save(storage_dir, frontier, delta):
+    scheduler = await _scheduler(0)
+    manager = CheckpointManager('bench', _Settings(
+        CHECKPOINT_ENABLED=True, CHECKPOINT_STORAGE='journal', CHECKPOINT_DIR=storage_dir,
+        CHECKPOINT_JOURNAL_FLUSH_INTERVAL=3600.0, CHECKPOINT_JOURNAL_BATCH_SIZE=10 ** 9))
+    manager.attach(scheduler)
+    journal = scheduler.checkpoint_journal
+    live = [_request(i) for i in range(frontier)]
+    for i, request in enumerate(live):
+        journal.record_enqueue(request)
+        journal.record_fingerprint(f'{i:032x}')
+    await manager.save(scheduler)
+
+    for i in range(frontier, frontier + delta):
+        journal.record_dequeue(live.pop(0))
+        request = _request(i)
+        live.append(request)
+        journal.record_enqueue(request)
+        journal.record_fingerprint(f'{i:032x}')
+    start = time.perf_counter()
+    await manager.save(scheduler)
+    elapsed = time.perf_counter() - start
+    await manager.detach(scheduler)
+    return elapsed
+
+
+async def main(args):
+    rows = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        rows.append(('sqlite(drain)', await _full_save(f'{tmpdir}/drain', args.frontier, drain=True)))
+        rows.append(('sqlite(snapshot)', await _full_save(f'{tmpdir}/snapshot', args.frontier, drain=False)))
+        rows.append(('journal', await _journal_save(f'{tmpdir}/journal', args.frontier, args.delta)))
+
+    print(f"frontier = {args.frontier}, delta = {args.delta}")
+    for label, elapsed in rows:
+        print(f"{label:>17} {elapsed * 1000:>10.1f} ms")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--frontier', type=int, default=100000)
+    parser.add_argument('--delta', type=int, default=1000)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,101 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+DiskQueue 吞吐微基准（put / put_batch / get / get_batch）
+=======================================================
+
+在临时目录中创建 DiskQueue，依次测量：
+    - put        : 逐条入队
+    - get        : 逐条出队
+    - put_batch  : 按 ``--batch`` 条一批入队
+    - get_batch  : 按 ``--batch`` 条一批出队
+输出每秒条数，以及逐条入队期间事件循环的最长阻塞时间（衡量 sqlite I/O 是否占用事件循环）。
+
+用法：
+    python scripts/benchmarks/bench_disk_queue.py --items 50000 --batch 500
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from crawlo.http.request import Request  # noqa: E402
+from crawlo.queue.backends.disk import DiskQueue, DiskQueueConfig  # noqa: E402
+
+
+async def _loop_lag(stop: asyncio.Event, result: dict) -> None:
+    """每 1ms 唤醒一次，记录实际唤醒间隔的最大值"""
+    last = time.perf_counter()
+    while True:
+        await asyncio.sleep(0.001)
+        now = time.perf_counter()
+        result['max_lag_ms'] = max(result['max_lag_ms'], (now - last) * 1000 - 1)
+        last = now
+        if stop.is_set():
+            break
+
+
+async def _timed(label, count, coro_factory, rows):
+    start = time.perf_counter()
+    await coro_factory()
+    elapsed = time.perf_counter() - start
+    rows.append((label, count / elapsed))
+
+
+async def main(args):
+    items = [Request(f'https://shop.example.com/item/{i}', meta={'depth': i % 4}, priority=i % 3)
+             for i in range(args.items)]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        queue = DiskQueue(DiskQueueConfig(path=tmpdir, name='bench', serialization=args.serialization,
+                                          batch_size=args.batch))
+        await queue.open()
+        rows = []
+
+        async def put_each():
+            for item in items:
+                await queue.put(item, priority=item.priority)
+
+        async def get_each():
+            for _ in items:
+                await queue.get()
+
+        async def put_batch():
+            for offset in range(0, len(items), args.batch):
+                await queue.put_batch(items[offset:offset + args.batch])
+
+        async def get_batch():
+            remaining = len(items)
+            while remaining > 0:
+                remaining -= len(await queue.get_batch(args.batch, timeout=0))
+
+        stop, lag = asyncio.Event(), {'max_lag_ms': 0.0}
+        monitor = asyncio.create_task(_loop_lag(stop, lag))
+        await asyncio.sleep(0)
+        await _timed('put', args.items, put_each, rows)
+        stop.set()
+        await monitor
+
+        await _timed('get', args.items, get_each, rows)
+        await _timed('put_batch', args.items, put_batch, rows)
+        await _timed('get_batch', args.items, get_batch, rows)
+        await queue.close()
+
+    print(f"items = {args.items}, batch = {args.batch}, serialization = {args.serialization}")
+    for label, rate in rows:
+        print(f"{label:>10} {rate:>12.0f} items/s")
+    print(f"max event-loop lag during put: {lag['max_lag_ms']:.1f} ms")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--items', type=int, default=50000)
+    parser.add_argument('--batch', type=int, default=500)
+    parser.add_argument('--serialization', default='pickle', choices=('pickle', 'codec'))
+    asyncio.run(main(parser.parse_args()))
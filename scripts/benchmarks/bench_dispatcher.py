@@ -0,0 +1,158 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+Engine 派发器微基准（RequestDispatcher vs SlotDispatcher）
+=========================================================
+
+在内存队列上预置 N 个请求，用模拟下载（``asyncio.sleep(latency)``）走完
+Engine 主循环的「出队 → 流控 → TaskManager 派发」路径，对比：
+    - 吞吐（requests/sec）
+    - 事件循环延迟 P50/P99（5ms 周期探针，排期时间 vs 实际执行时间）
+    - 主循环迭代次数
+
+用法：
+    python scripts/benchmarks/bench_dispatcher.py --requests 20000 --concurrency 64 --latency 0.002
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from crawlo.core.engine import Engine  # noqa: E402
+from crawlo.core.engine_dispatch import RequestDispatcher, SlotDispatcher  # noqa: E402
+from crawlo.queue.config import QueueConfig  # noqa: E402
+from crawlo.queue.queue_manager import QueueManager  # noqa: E402
+from crawlo.queue.queue_types import QueueType  # noqa: E402
+
+
+class _BenchRequest:
+    __slots__ = ('url', 'priority', 'meta')
+
+    def __init__(self, i: int):
+        self.url = f"http://bench.local/{i}"
+        self.priority = 0
+        self.meta = {}
+
+    def __lt__(self, other):
+        return self.url < other.url
+
+
+class _BenchScheduler:
+    """只暴露主循环用到的 Scheduler 接口，直接转发给真实 QueueManager。"""
+
+    def __init__(self, queue_manager: QueueManager):
+        self.queue_manager = queue_manager
+        self.pending_enqueue_count = 0
+
+    async def next_request(self):
+        return await self.queue_manager.get()
+
+    async def next_requests(self, batch_size: int):
+        return await self.queue_manager.get_batch(batch_size)
+
+    async def async_idle(self) -> bool:
+        return await self.queue_manager.async_empty()
+
+
+def _make_crawler(concurrency: int):
+    settings = {'CONCURRENCY': concurrency, 'RUN_MODE': 'standalone'}
+    crawler = Mock()
+    crawler.settings = Mock()
+    crawler.settings.get = Mock(side_effect=lambda key, default=None: settings.get(key, default))
+    return crawler
+
+
+async def _lag_probe(samples: list, stop: asyncio.Event, interval: float = 0.005):
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, loop.time() - expected) * 1000)
+
+
+async def _run_once(dispatcher_cls, total: int, concurrency: int, latency: float) -> dict:
+    config = QueueConfig(
+        queue_type=QueueType.MEMORY, max_queue_size=total + 1,
+        settings={'BACKPRESSURE_ENABLED': False},
+    )
+    queue_manager = QueueManager(config)
+    await queue_manager.initialize()
+    for i in range(total):
+        await queue_manager.put(_BenchRequest(i))
+
+    engine = Engine(_make_crawler(concurrency), dispatcher_cls=dispatcher_cls)
+    engine.scheduler = _BenchScheduler(queue_manager)
+    engine.downloader = Mock(idle=Mock(return_value=True))
+    engine.processor = Mock(idle_async=AsyncMock(return_value=True))
+    engine.running = True
+
+    done = 0
+
+    async def _fetch():
+        nonlocal done
+        await asyncio.sleep(latency)
+        done += 1
+
+    async def _crawl(_request):
+        await engine.task_manager.create_task_nowait(_fetch())
+
+    engine._crawl = _crawl
+
+    lag_samples: list = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(_lag_probe(lag_samples, stop))
+    loops = 0
+    original_next_batch = engine._dispatcher.next_batch
+
+    async def _counting_next_batch(*args, **kwargs):
+        nonlocal loops
+        loops += 1
+        return await original_next_batch(*args, **kwargs)
+
+    engine._dispatcher.next_batch = _counting_next_batch
+
+    t0 = time.perf_counter()
+    await engine._run_main_loop()
+    if engine.task_manager.current_task:
+        await asyncio.gather(*engine.task_manager.current_task)
+    elapsed = time.perf_counter() - t0
+
+    stop.set()
+    await probe
+    lag_samples.sort()
+    p99_index = max(0, int(len(lag_samples) * 0.99) - 1)
+    return {
+        'dispatcher': dispatcher_cls.__name__,
+        'completed': done,
+        'elapsed_s': round(elapsed, 3),
+        'req_per_s': round(done / elapsed, 1) if elapsed else 0.0,
+        'loop_iterations': loops,
+        'lag_p50_ms': round(statistics.median(lag_samples), 3) if lag_samples else 0.0,
+        'lag_p99_ms': round(lag_samples[p99_index], 3) if lag_samples else 0.0,
+    }
+
+
+async def main(args) -> None:
+    for dispatcher_cls in (RequestDispatcher, SlotDispatcher):
+        result = await _run_once(dispatcher_cls, args.requests, args.concurrency, args.latency)
+        print(
+            f"{result['dispatcher']:<18} completed={result['completed']:<7} "
+            f"elapsed={result['elapsed_s']:>7}s  req/s={result['req_per_s']:>9}  "
+            f"loops={result['loop_iterations']:<6} "
+            f"lag p50={result['lag_p50_ms']}ms p99={result['lag_p99_ms']}ms"
+        )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=20000, help='预置请求数')
+    parser.add_argument('--concurrency', type=int, default=64, help='CONCURRENCY')
+    parser.add_argument('--latency', type=float, default=0.002, help='模拟下载耗时（秒）')
+    asyncio.run(main(parser.parse_args()))
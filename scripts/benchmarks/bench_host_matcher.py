@@ -0,0 +1,92 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+主机名匹配微基准（逐条正则 vs HostMatcher）
+========================================
+
+在规则数 ``--rules``（默认 10 / 1000 / 100000）下测量每次判定耗时：
+    - regex      : OffsiteMiddleware 原实现，每条允许域名一个 ``(^|.*\\.)domain$`` 正则，逐条 match
+    - trie       : HostMatcher 反转标签 Trie，关闭缓存（每次归一化 + 查找）
+    - trie+cache : HostMatcher 默认配置，按 netloc 缓存判定结果
+
+请求主机名一半命中（子域名）、一半未命中，取自 ``--hosts`` 个不同主机名循环使用。
+regex 在规则数很大时极慢，``--regex-limit`` 以上的规则数只跑 ``--regex-requests`` 次。
+
+用法：
+    python scripts/benchmarks/bench_host_matcher.py --rules 10 1000 100000
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from crawlo.utils.host_matcher import HostMatcher  # noqa: E402
+
+
+def _domains(n):
+    return [f'site{i}.example{i % 97}.com' for i in range(n)]
+
+
+def _urls(domains, n):
+    urls = []
+    for i in range(n):
+        if i % 2:
+            urls.append(f'https://www.{domains[i % len(domains)]}/item/{i}')
+        else:
+            urls.append(f'https://offsite{i}.other.net/item/{i}')
+    return urls
+
+
+def _regex_case(domains):
+    regexes = [re.compile(r'(^|.*\.)' + re.escape(d) + '$', re.IGNORECASE) for d in domains]
+
+    def allowed(url):
+        hostname = urlparse(url).hostname
+        return any(regex.match(hostname) for regex in regexes)
+    return allowed
+
+
+def _run(allowed, urls, requests):
+    hits = 0
+    start = time.perf_counter()
+    for i in range(requests):
+        hits += allowed(urls[i % len(urls)])
+    return (time.perf_counter() - start) / requests, hits
+
+
+def main(args):
+    print(f"{'rules':>8} {'matcher':>12} {'build ms':>10} {'us/request':>12} {'hits':>8}")
+    for n in args.rules:
+        domains = _domains(n)
+        urls = _urls(domains, args.hosts)
+
+        cases = []
+        start = time.perf_counter()
+        regex_allowed = _regex_case(domains)
+        cases.append(('regex', time.perf_counter() - start, regex_allowed,
+                      args.requests if n <= args.regex_limit else args.regex_requests))
+        for label, cache_size in (('trie', 0), ('trie+cache', 65536)):
+            start = time.perf_counter()
+            matcher = HostMatcher(domains, cache_size=cache_size)
+            cases.append((label, time.perf_counter() - start, lambda url, m=matcher: m.lookup_url(url) is not None,
+                          args.requests))
+
+        for label, build, allowed, requests in cases:
+            per_request, hits = _run(allowed, urls, requests)
+            print(f"{n:>8} {label:>12} {build * 1000:>10.1f} {per_request * 1e6:>12.2f} {hits:>8}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rules', type=int, nargs='+', default=[10, 1000, 100000])
+    parser.add_argument('--requests', type=int, default=100000)
+    parser.add_argument('--hosts', type=int, default=5000, help='不同请求主机名数量')
+    parser.add_argument('--regex-limit', type=int, default=1000)
+    parser.add_argument('--regex-requests', type=int, default=200)
+    main(parser.parse_args())
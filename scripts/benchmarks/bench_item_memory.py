@@ -0,0 +1,90 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+Item 内存与构造耗时基准（dict vs Item vs CompiledItem）
+=====================================================
+
+用同一个 ``--fields`` 个字段的 schema（一半字段带 field_type 校验）构造 ``--items`` 个对象：
+    - dict          : 普通字典
+    - Item          : 默认 Item（_values / _dynamic_fields 两个字典 + 实例 __dict__）
+    - CompiledItem  : 继承 CompiledItem 的编译类（__slots__ 按位置存储）
+    - CompiledItem+coerce : 同上，coerce=True，输入为字符串
+
+输出每个对象的内存（tracemalloc，含字段值之外的全部开销）、构造耗时，
+以及整批转成 executemany 参数（dict -> tuple / to_tuple）的耗时。
+
+用法：
+    python scripts/benchmarks/bench_item_memory.py --items 100000 --fields 8
+"""
+
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from crawlo.items import CompiledItem, Field, Item  # noqa: E402
+
+
+def _schema(n_fields, base, coerce=False):
+    attrs = {f'f{i}': Field(field_type=int) if i % 2 else Field() for i in range(n_fields)}
+    if base is CompiledItem:
+        attrs['coerce'] = coerce
+    return type(f'Bench{base.__name__}', (base,), attrs)
+
+
+def _measure(build, count):
+    """返回 (每个对象字节数, 每个对象构造微秒数, 对象列表)；计时不在 tracemalloc 下进行"""
+    gc.collect()
+    start = time.perf_counter()
+    objects = [build(i) for i in range(count)]
+    elapsed = time.perf_counter() - start
+    del objects
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [build(i) for i in range(count)]
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return used / count, elapsed / count * 1e6, objects
+
+
+def main(args):
+    names = [f'f{i}' for i in range(args.fields)]
+    values = [f'value {i}' if i % 2 == 0 else i for i in range(args.fields)]
+    text_values = [str(v) for v in values]
+    kwargs = dict(zip(names, values))
+    text_kwargs = dict(zip(names, text_values))
+    item_cls = _schema(args.fields, Item)
+    compiled_cls = _schema(args.fields, CompiledItem)
+    coerce_cls = _schema(args.fields, CompiledItem, coerce=True)
+
+    cases = [
+        ('dict', lambda i: dict(kwargs), lambda objs: [tuple(o[n] for n in names) for o in objs]),
+        ('Item', lambda i: item_cls(**kwargs), lambda objs: [tuple(o.get(n) for n in names) for o in objs]),
+        ('CompiledItem', lambda i: compiled_cls(**kwargs), lambda objs: [o.to_tuple() for o in objs]),
+        ('CompiledItem+coerce', lambda i: coerce_cls(**text_kwargs), lambda objs: [o.to_tuple() for o in objs]),
+    ]
+
+    print(f"{args.items} objects, {args.fields} fields")
+    print(f"{'kind':>20} {'bytes/obj':>10} {'init us':>9} {'to_tuple us':>12}")
+    for label, build, to_rows in cases:
+        size, init_us, objects = _measure(build, args.items)
+        start = time.perf_counter()
+        rows = to_rows(objects)
+        rows_us = (time.perf_counter() - start) / args.items * 1e6
+        assert len(rows) == args.items
+        print(f"{label:>20} {size:>10.0f} {init_us:>9.2f} {rows_us:>12.2f}")
+        del objects, rows
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--items', type=int, default=100000)
+    parser.add_argument('--fields', type=int, default=8)
+    main(parser.parse_args())
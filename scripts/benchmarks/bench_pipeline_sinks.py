@@ -0,0 +1,109 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+终端管道并发扇出基准（串行 vs PIPELINE_SINKS）
+=========================================
+
+一个转换管道 + 三个存储替身（每条 item 分别等待 ``--latency`` 毫秒，默认模拟 MySQL / Elasticsearch / JSONL），
+由 Processor 逐条处理 ``--items`` 条 item：
+    - serial  : 默认模式，每条 item 依次经过全部管道，单条延迟为各存储之和
+    - fanout  : 三个存储列入 PIPELINE_SINKS，各自队列 + ``--workers`` 个 worker 并发写出
+
+输出总耗时、吞吐，以及 fan-out 模式下各 sink 的统计（队列深度峰值 / p99 延迟 / 吞吐）。
+替身只模拟等待，不模拟写入开销。
+
+用法：
+    python scripts/benchmarks/bench_pipeline_sinks.py --items 2000 --latency 3 5 1 --workers 4
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from crawlo import Item  # noqa: E402
+from crawlo.core.processor import Processor  # noqa: E402
+from crawlo.settings.setting_manager import SettingManager  # noqa: E402
+from crawlo.stats.collector import StatsCollector  # noqa: E402
+
+SINK_NAMES = ('MySQLStandIn', 'ElasticsearchStandIn', 'JsonLinesStandIn')
+
+
+class TransformStandIn:
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls()
+
+    async def process_item(self, item, spider):
+        item['title'] = item['title'].strip()
+        return item
+
+
+def _sink_class(name, latency):
+    async def process_item(self, item, spider):
+        await asyncio.sleep(latency)
+        self.count += 1
+        return item
+    return type(name, (), {'count': 0, 'process_item': process_item,
+                           'from_crawler': classmethod(lambda cls, crawler: cls())})
+
+
+async def _run(mode, args):
+    module = sys.modules[__name__]
+    paths = [f'{__name__}.TransformStandIn']
+    for name, latency in zip(SINK_NAMES, args.latency):
+        setattr(module, name, _sink_class(name, latency / 1000))
+        paths.append(f'{__name__}.{name}')
+
+    settings = SettingManager({'DEFAULT_DEDUP_PIPELINE': None, 'PIPELINE_SINK_QUEUE_SIZE': args.queue_size,
+                               'PIPELINE_SINK_WORKERS': args.workers})
+    settings.set('PIPELINES', paths)  # 不与默认 PIPELINES 合并（去掉 ConsolePipeline）
+    if mode == 'fanout':
+        settings.set('PIPELINE_SINKS', paths[1:])
+    crawler = SimpleNamespace(settings=settings, spider=SimpleNamespace(name='bench'),
+                              subscriber=SimpleNamespace(notify=AsyncMock()), middleware_manager=None)
+    crawler.stats = StatsCollector(crawler)
+
+    processor = Processor(crawler)
+    await processor.open()
+    start = time.perf_counter()
+    for i in range(args.items):
+        item = Item()
+        item['title'] = f' item {i} '
+        await processor._handle_result(item)
+    while not await processor.idle_async():
+        await asyncio.sleep(0.001)
+    elapsed = time.perf_counter() - start
+    await processor.pipelines.close()
+
+    print(f"{mode:>7} {elapsed:>9.2f} {args.items / elapsed:>10.0f}")
+    return crawler.stats
+
+
+def main(args):
+    args.latency = (args.latency + [1.0] * 3)[:3]
+    print(f"{args.items} items, sink latency ms {args.latency}, workers={args.workers}")
+    print(f"{'mode':>7} {'total s':>9} {'items/s':>10}")
+    asyncio.run(_run('serial', args))
+    stats = asyncio.run(_run('fanout', args))
+    print(f"{'sink':>22} {'depth max':>10} {'p99 ms':>8} {'items/s':>10}")
+    for name in SINK_NAMES:
+        prefix = f'pipeline_sink/{name}'
+        print(f"{name:>22} {stats.get_value(f'{prefix}/queue_depth_max', 0):>10} "
+              f"{stats.get_value(f'{prefix}/latency_p99', 0) * 1000:>8.2f} "
+              f"{stats.get_value(f'{prefix}/throughput', 0):>10.0f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--items', type=int, default=2000)
+    parser.add_argument('--latency', type=float, nargs='+', default=[3.0, 5.0, 1.0], help='三个存储的单条延迟（毫秒）')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--queue-size', type=int, default=1000)
+    main(parser.parse_args())
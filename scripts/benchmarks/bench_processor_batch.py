@@ -0,0 +1,102 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+Processor 批量模式微基准（逐条 vs PROCESSOR_BATCH_MODE）
+=====================================================
+
+模拟列表页回调：每页连续产出 ``--per-page`` 个 Item，经 ``Processor.enqueue`` 交给管道链
+（一个逐条转换管道 + 一个实现了 ``process_items`` 的内存存储管道），共 ``--items`` 条：
+    - per-item : 默认模式，每条 Item 加锁更新计数、逐条调用 PipelineManager.process_item
+    - batch    : PROCESSOR_BATCH_MODE=True，按 ``--batch-sizes`` 整批交给 PipelineManager.process_items
+
+输出每条 Item 的平均处理耗时与吞吐（不含下载与解析）。
+
+用法：
+    python scripts/benchmarks/bench_processor_batch.py --items 200000 --batch-sizes 10 100 500
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from crawlo import Item  # noqa: E402
+from crawlo.core.processor import Processor  # noqa: E402
+from crawlo.pipelines.manager import PipelineManager  # noqa: E402
+from crawlo.settings.setting_manager import SettingManager  # noqa: E402
+
+
+async def _notify(*args, **kwargs):
+    return []
+
+
+class TransformStandIn:
+    async def process_item(self, item, spider):
+        item['title'] = item['title'].strip()
+        return item
+
+
+class StoreStandIn:
+    """内存存储：逐条 / 整批追加到缓冲区"""
+
+    def __init__(self):
+        self.rows = []
+
+    async def process_item(self, item, spider):
+        self.rows.append(dict(item))
+        return item
+
+    async def process_items(self, items, spider):
+        self.rows.extend(dict(item) for item in items)
+        return items
+
+
+async def _run(args, batch_size):
+    settings = SettingManager({'PROCESSOR_BATCH_MODE': batch_size > 0, 'PROCESSOR_BATCH_SIZE': max(batch_size, 1)})
+    crawler = SimpleNamespace(settings=settings, spider=SimpleNamespace(name='bench'),
+                              subscriber=SimpleNamespace(notify=_notify), middleware_manager=None)
+    store = StoreStandIn()
+    manager = PipelineManager(crawler)
+    manager.pipelines = [TransformStandIn(), store]
+    manager._add_methods()
+    processor = Processor(crawler)
+    processor.pipelines = manager
+
+    items = []
+    for i in range(args.items):
+        item = Item()
+        item['title'] = f' item {i} '
+        items.append(item)
+
+    start = time.perf_counter()
+    for page in range(0, args.items, args.per_page):
+        for item in items[page:page + args.per_page]:
+            await processor.enqueue(item)
+        await asyncio.sleep(0)  # 回调结束，让出事件循环
+    while not await processor.idle_async():
+        await asyncio.sleep(0)
+    elapsed = time.perf_counter() - start
+    assert len(store.rows) == args.items
+    return elapsed
+
+
+def main(args):
+    print(f"{args.items} items, {args.per_page} items/page")
+    print(f"{'mode':>14} {'us/item':>10} {'items/s':>12}")
+    for batch_size in [0] + args.batch_sizes:
+        elapsed = asyncio.run(_run(args, batch_size))
+        label = 'per-item' if batch_size == 0 else f'batch={batch_size}'
+        print(f"{label:>14} {elapsed / args.items * 1e6:>10.2f} {args.items / elapsed:>12.0f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--items', type=int, default=200000)
+    parser.add_argument('--per-page', type=int, default=50, help='每个列表页产出的 Item 数')
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[10, 100, 500])
+    main(parser.parse_args())
@@ -0,0 +1,97 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+分布式令牌桶微基准（逐请求 vs 租约模式）
+=========================================
+
+N 个 worker 各持有一个 DistributedRateLimiter，共享同一个 Redis（默认
+fakeredis 内存服务器，需安装 fakeredis + lupa；``--redis-url`` 可指向真实 Redis），
+在 ``--duration`` 秒内对同一域名循环 ``wait_and_acquire``，对比：
+    - Redis 脚本调用次数/秒（EVALSHA/EVAL）
+    - 实际获取速率与目标速率的偏差（扣除初始满桶的突发量）
+
+用法：
+    python scripts/benchmarks/bench_rate_limiter.py --workers 1 8 64 --rate 200 --lease 16
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from crawlo.cluster.rate_limiter import DistributedRateLimiter  # noqa: E402
+
+
+def _make_client_factory(redis_url):
+    if redis_url:
+        import redis.asyncio as aioredis
+        return lambda: aioredis.from_url(redis_url)
+    import fakeredis
+    server = fakeredis.FakeServer()
+    return lambda: fakeredis.FakeAsyncRedis(server=server)
+
+
+async def _run(workers: int, lease: int, args, run_id: str) -> dict:
+    make_client = _make_client_factory(args.redis_url)
+    prefix = f'bench:{run_id}'
+    limiters = []
+    for _ in range(workers):
+        limiter = DistributedRateLimiter(make_client(), prefix,
+                                         default_rate=args.rate, default_capacity=args.capacity)
+        if lease > 1:
+            limiter.set_lease(lease, args.lease_ttl)
+        limiters.append(limiter)
+
+    acquired = 0
+    deadline = time.monotonic() + args.duration
+
+    async def worker(limiter):
+        nonlocal acquired
+        while time.monotonic() < deadline:
+            if await limiter.wait_and_acquire('bench.local', timeout=deadline - time.monotonic()):
+                acquired += 1
+
+    start = time.monotonic()
+    await asyncio.gather(*(worker(limiter) for limiter in limiters))
+    elapsed = time.monotonic() - start
+    for limiter in limiters:
+        await limiter.release_leases()
+
+    calls = sum(limiter.script_calls for limiter in limiters)
+    achieved = max(0, acquired - args.capacity) / elapsed
+    return {
+        'workers': workers,
+        'mode': f'lease={lease}' if lease > 1 else 'per-request',
+        'ops_per_sec': calls / elapsed,
+        'achieved': achieved,
+        'error_pct': (achieved - args.rate) / args.rate * 100,
+    }
+
+
+async def main(args):
+    rows = []
+    for workers in args.workers:
+        for lease in (0, args.lease):
+            rows.append(await _run(workers, lease, args, f'{workers}-{lease}-{time.time_ns()}'))
+
+    print(f"target rate = {args.rate}/s, capacity = {args.capacity}, duration = {args.duration}s")
+    print(f"{'workers':>8} {'mode':>12} {'redis ops/s':>12} {'achieved/s':>11} {'error':>8}")
+    for row in rows:
+        print(f"{row['workers']:>8} {row['mode']:>12} {row['ops_per_sec']:>12.1f} "
+              f"{row['achieved']:>11.1f} {row['error_pct']:>+7.1f}%")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 8, 64])
+    parser.add_argument('--rate', type=float, default=200.0)
+    parser.add_argument('--capacity', type=int, default=20)
+    parser.add_argument('--lease', type=int, default=16)
+    parser.add_argument('--lease-ttl', type=float, default=1.0)
+    parser.add_argument('--duration', type=float, default=3.0)
+    parser.add_argument('--redis-url', default=None)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,106 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+队列请求序列化微基准（每条字节数 + 编码 / 解码耗时）
+=================================================
+
+对比队列后端现有的序列化方式与共享二进制编解码器 ``RequestCodec``：
+    - pickle(to_dict)     : RedisPriorityQueue 默认（HASH 中存整份 dict）
+    - msgpack(to_dict)    : RedisPriorityQueue 的 msgpack 格式
+    - json(compact)       : RedisStreamQueue 默认（精简 dict + JSON）
+    - codec               : RequestCodec，全部字段
+    - codec(stream)       : RequestCodec，Stream 精简模式（不写 priority / headers / cookies）
+
+语料为典型列表 / 详情页请求：带查询参数的 URL、少量 headers、meta 中的 depth 与业务字段，
+``--body-ratio`` 比例的请求带 POST 表单。
+
+用法：
+    python scripts/benchmarks/bench_request_codec.py --requests 20000
+"""
+
+import argparse
+import json
+import pickle  # nosec B403
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+import msgpack  # noqa: E402
+
+from crawlo.http.request import Request  # noqa: E402
+from crawlo.queue.backends.redis_stream import RedisStreamQueue  # noqa: E402
+from crawlo.utils.request.request_codec import get_request_codec  # noqa: E402
+
+
+def _corpus(count: int, body_ratio: float, seed: int = 7):
+    rng = random.Random(seed)
+    requests = []
+    for i in range(count):
+        kwargs = {
+            'headers': {'Referer': f'https://shop.example.com/list?page={i // 20}', 'Accept-Language': 'zh-CN'},
+            'meta': {'depth': rng.randint(1, 4), 'category': f'cat-{rng.randint(1, 300)}', 'retry_times': 0},
+            'cb_kwargs': {'item_id': i},
+            'priority': rng.choice((0, 0, 0, 10)),
+        }
+        if rng.random() < body_ratio:
+            requests.append(Request(f'https://shop.example.com/api/search', method='POST',
+                                    form_data={'q': f'keyword {i}', 'page': str(i % 50)}, **kwargs))
+        else:
+            requests.append(Request(f'https://shop.example.com/item/{i}?ref=list&sku={rng.randint(10**6, 10**7)}',
+                                    **kwargs))
+    return requests
+
+
+def _formats():
+    stream_queue = RedisStreamQueue('redis://localhost:6379', serialization_format='json')
+    codec = get_request_codec()
+    stream_codec = get_request_codec(exclude=('priority', 'headers', 'cookies'))
+    return [
+        ('pickle(to_dict)', lambda r: pickle.dumps(r.to_dict()),
+         lambda b: Request.from_dict(pickle.loads(b))),  # nosec B301
+        ('msgpack(to_dict)', lambda r: msgpack.packb(r.to_dict(), default=str),
+         lambda b: Request.from_dict(msgpack.unpackb(b, raw=False))),
+        ('json(compact)', stream_queue._serialize_request, stream_queue._deserialize_request),
+        ('codec', codec.encode, codec.decode),
+        ('codec(stream)', stream_codec.encode, stream_codec.decode),
+    ]
+
+
+def _measure(requests, encode, decode, repeat: int):
+    encoded = [encode(request) for request in requests]
+    best_encode = best_decode = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for request in requests:
+            encode(request)
+        best_encode = min(best_encode, time.perf_counter() - start)
+        start = time.perf_counter()
+        for data in encoded:
+            decode(data)
+        best_decode = min(best_decode, time.perf_counter() - start)
+    return {
+        'bytes': sum(map(len, encoded)) / len(encoded),
+        'encode_us': best_encode / len(requests) * 1e6,
+        'decode_us': best_decode / len(requests) * 1e6,
+    }
+
+
+def main(args):
+    requests = _corpus(args.requests, args.body_ratio)
+    print(f"requests = {args.requests}, body_ratio = {args.body_ratio}")
+    print(f"{'format':>17} {'bytes/req':>10} {'encode µs':>10} {'decode µs':>10}")
+    for name, encode, decode in _formats():
+        row = _measure(requests, encode, decode, args.repeat)
+        print(f"{name:>17} {row['bytes']:>10.1f} {row['encode_us']:>10.2f} {row['decode_us']:>10.2f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=20000)
+    parser.add_argument('--body-ratio', type=float, default=0.2)
+    parser.add_argument('--repeat', type=int, default=3)
+    main(parser.parse_args())
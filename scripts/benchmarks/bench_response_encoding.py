@@ -0,0 +1,92 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+Response 编码检测微基准（构造时整链检测 vs 懒加载 + 快速路径 + 按主机缓存）
+==========================================================================
+
+生成 GBK / UTF-8 混合的中文页面语料（部分带 Content-Type charset，部分只能靠内容探测），
+分布在若干主机上，对比：
+    - eager：构造时执行 EncodingDetector.detect 完整检测链（改动前的行为）
+    - lazy：当前 Response（首次访问 text 时检测；声明编码不解码响应体；探测结果按主机缓存）
+场景：
+    - text：回调读取 response.text
+    - status：回调只读 status / body（或被中间件丢弃）
+
+用法：
+    python scripts/benchmarks/bench_response_encoding.py --pages 2000 --hosts 20
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from crawlo.http.response import Response  # noqa: E402
+from crawlo.utils.encoding import EncodingDetector  # noqa: E402
+
+_PARAGRAPH = '北京时间今日，多家媒体报道了关于城市交通规划的最新进展，专家表示将持续推进公共交通建设。'
+
+
+def _corpus(pages: int, hosts: int, seed: int = 7):
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(pages):
+        site = rng.randrange(hosts)
+        host = f'site{site}.cn'
+        # 每个主机固定一种编码（真实站点通常全站统一）
+        encoding = 'gbk' if site % 2 else 'utf-8'
+        text = '<html><head><title>新闻</title></head><body>' + ''.join(
+            f'<p>{_PARAGRAPH}{n}</p>' for n in range(rng.randint(20, 120))
+        ) + '</body></html>'
+        headers = {'Content-Type': 'text/html'}
+        if rng.random() < 0.4:
+            headers['Content-Type'] = f'text/html; charset={encoding}'
+        corpus.append((f'http://{host}/news/{i}.html', text.encode(encoding), headers))
+    return corpus
+
+
+def _eager(corpus, read_text: bool) -> float:
+    start = time.perf_counter()
+    for url, body, headers in corpus:
+        response = Response(url, body=body, headers=headers)
+        encoding = EncodingDetector.detect(body, headers)
+        if read_text:
+            body.decode(encoding, errors='replace')
+        response.status
+    return time.perf_counter() - start
+
+
+def _lazy(corpus, read_text: bool) -> float:
+    detector = EncodingDetector()
+    start = time.perf_counter()
+    for url, body, headers in corpus:
+        response = Response(url, body=body, headers=headers)
+        response.encoding_detector = detector
+        if read_text:
+            response.text
+        response.status
+    return time.perf_counter() - start
+
+
+def main(args):
+    corpus = _corpus(args.pages, args.hosts)
+    size_mb = sum(len(body) for _, body, _ in corpus) / 1024 / 1024
+    print(f"{len(corpus)} pages, {args.hosts} hosts, {size_mb:.1f} MB")
+    print(f"{'scenario':>8} {'mode':>6} {'pages/s':>10} {'speedup':>8}")
+    for scenario, read_text in (('text', True), ('status', False)):
+        eager = min(_eager(corpus, read_text) for _ in range(args.repeat))
+        lazy = min(_lazy(corpus, read_text) for _ in range(args.repeat))
+        print(f"{scenario:>8} {'eager':>6} {len(corpus) / eager:>10.0f} {'':>8}")
+        print(f"{scenario:>8} {'lazy':>6} {len(corpus) / lazy:>10.0f} {eager / lazy:>7.1f}x")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=2000)
+    parser.add_argument('--hosts', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=3)
+    main(parser.parse_args())
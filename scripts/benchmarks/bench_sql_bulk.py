@@ -0,0 +1,170 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+SQL 管道批量写入吞吐微基准（逐行 vs 批量路径）
+============================================
+
+在批大小 ``--sizes``（默认 100 / 1000 / 10000）下测量每秒写入行数：
+    - sqlite      : 真实 aiosqlite 临时库，事务内逐行 execute vs executemany
+    - postgresql  : asyncpg 连接替身，每次调用等待 ``--rtt`` 毫秒模拟网络往返；
+                    逐行 build_upsert + execute vs PG_BULK_MODE='executemany' vs 'copy'
+    - mysql       : 游标替身，同样按调用计往返；逐行 INSERT vs 多行 VALUES（MYSQL_ROWS_PER_STATEMENT）
+替身只模拟往返延迟，不模拟服务端写入开销，结果反映的是客户端 SQL 构建与往返次数。
+
+用法：
+    python scripts/benchmarks/bench_sql_bulk.py --sizes 100 1000 10000 --rtt 0.2
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+import aiosqlite  # noqa: E402
+
+from crawlo.pipelines.sql.mysql import MySQLPipeline  # noqa: E402
+from crawlo.pipelines.sql.postgresql import PostgreSQLPipeline  # noqa: E402
+from crawlo.pipelines.sql.sqlite import SQLitePipeline  # noqa: E402
+from crawlo.settings.setting_manager import SettingManager  # noqa: E402
+from crawlo.utils.db.dialect import PostgreSQLDialect  # noqa: E402
+from crawlo.utils.db.sql_builder import SQLBuilder  # noqa: E402
+
+
+def _crawler(**settings):
+    return SimpleNamespace(settings=SettingManager(settings), spider=SimpleNamespace(name='bench', custom_settings={}),
+                           subscriber=Mock(), stats=Mock())
+
+
+def _rows(n):
+    return [{'url': f'https://shop.example.com/item/{i}', 'title': f'item {i}', 'price': i % 997} for i in range(n)]
+
+
+class _RemoteStandIn:
+    """每次调用等待一个往返延迟并计数"""
+
+    def __init__(self, rtt):
+        self.rtt = rtt
+        self.round_trips = 0
+
+    async def _round_trip(self):
+        self.round_trips += 1
+        # asyncio.sleep 的实际等待不少于 rtt（受事件循环调度精度影响）
+        await asyncio.sleep(self.rtt)
+
+    async def execute(self, sql, *args):
+        await self._round_trip()
+        return 'INSERT 0 1'
+
+    async def executemany(self, sql, rows):
+        await self._round_trip()
+
+    async def copy_records_to_table(self, table, *, records, columns):
+        await self._round_trip()
+
+    @asynccontextmanager
+    async def transaction(self):
+        await self._round_trip()
+        yield
+        await self._round_trip()
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self
+
+
+async def _pg_per_row(conn, batch):
+    """原实现：事务内逐行构建 SQL 并 execute"""
+    async with conn.transaction():
+        for data in batch:
+            sql, params = PostgreSQLDialect.build_upsert('bench_items', data, ('url',), ('title', 'price'))
+            await conn.execute(sql, *params)
+
+
+async def _pg_bulk(conn, batch, mode):
+    pipeline = PostgreSQLPipeline(_crawler(PG_CONFLICT_COLUMNS=('url',), PG_UPDATE_COLUMNS=('title', 'price'),
+                                           PG_BULK_MODE=mode))
+    pipeline.pool = conn
+    await pipeline._do_batch_insert(batch)
+
+
+async def _mysql(conn, batch, rows_per_statement):
+    pipeline = MySQLPipeline(_crawler(MYSQL_ROWS_PER_STATEMENT=rows_per_statement, MYSQL_INSERT_IGNORE=True))
+
+    class _Cursor:
+        rowcount = 0
+
+        async def execute(self, sql, params):
+            await conn._round_trip()
+
+    @asynccontextmanager
+    async def transaction():
+        async with conn.transaction():
+            yield _Cursor()
+
+    pipeline._helper = SimpleNamespace(transaction=transaction, _sql_builder=SQLBuilder)
+    await pipeline._do_batch_insert(batch)
+
+
+async def _sqlite(tmpdir, batch, bulk):
+    pipeline = SQLitePipeline(_crawler(SQLITE_INSERT_IGNORE=True, SQLITE_USE_TRANSACTION=True))
+    pipeline.pool = await aiosqlite.connect(f'{tmpdir}/bench_{len(batch)}_{bulk}.db')
+    await pipeline.pool.execute('CREATE TABLE bench_items (url TEXT PRIMARY KEY, title TEXT, price INTEGER)')
+    await pipeline.pool.commit()
+    start = time.perf_counter()
+    if bulk:
+        await pipeline._do_batch_insert(batch)
+    else:
+        # 原实现：事务内逐行 execute
+        sql = 'INSERT OR IGNORE INTO "bench_items" ("url", "title", "price") VALUES (?, ?, ?)'
+        await pipeline.pool.execute('BEGIN')
+        for row in batch:
+            await pipeline.pool.execute(sql, tuple(row.values()))
+        await pipeline.pool.commit()
+    elapsed = time.perf_counter() - start
+    await pipeline.pool.close()
+    return elapsed, None
+
+
+async def _remote(rtt, fn, *args):
+    conn = _RemoteStandIn(rtt)
+    start = time.perf_counter()
+    await fn(conn, *args)
+    return time.perf_counter() - start, conn.round_trips
+
+
+async def main(args):
+    rtt = args.rtt / 1000
+    print(f"rtt = {args.rtt} ms (postgresql / mysql stand-ins)")
+    print(f"{'backend':>28} {'rows':>7} {'round trips':>12} {'ms':>10} {'rows/s':>12}")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for n in args.sizes:
+            batch = _rows(n)
+            cases = [
+                ('sqlite per-row', _sqlite(tmpdir, batch, False)),
+                ('sqlite executemany', _sqlite(tmpdir, batch, True)),
+                ('postgresql per-row', _remote(rtt, _pg_per_row, batch)),
+                ('postgresql executemany', _remote(rtt, _pg_bulk, batch, 'executemany')),
+                ('postgresql copy', _remote(rtt, _pg_bulk, batch, 'copy')),
+                ('mysql per-row', _remote(rtt, _mysql, batch, 1)),
+                (f'mysql VALUES x{args.rows_per_statement}', _remote(rtt, _mysql, batch, args.rows_per_statement)),
+            ]
+            for label, case in cases:
+                elapsed, round_trips = await case
+                trips = '-' if round_trips is None else round_trips
+                print(f"{label:>28} {n:>7} {trips:>12} {elapsed * 1000:>10.1f} {n / elapsed:>12,.0f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--rtt', type=float, default=0.2, help='替身模拟的单次往返延迟（毫秒）')
+    parser.add_argument('--rows-per-statement', type=int, default=1000)
+    asyncio.run(main(parser.parse_args()))
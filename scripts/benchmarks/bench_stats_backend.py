@@ -0,0 +1,112 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+Redis 统计后端微基准（逐次 HINCRBY vs 写回缓冲）
+===============================================
+
+模拟 ``--responses`` 个响应，每个响应记录 3 个计数（与 MiddlewareManager._record_response
+相当），响应之间让出事件循环。共享同一个 Redis（默认 fakeredis，``--redis-url`` 可指向真实 Redis），
+对比：
+    - direct   : 每次 inc_value 一次 await HINCRBY
+    - buffered : BufferedRedisStatsBackend，进程内聚合，每 ``--interval`` 毫秒一次 pipeline
+输出 Redis 往返次数、总耗时与单次 inc_value 的平均耗时。
+
+用法：
+    python scripts/benchmarks/bench_stats_backend.py --responses 20000 --interval 200
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from crawlo.stats.backends import BufferedRedisStatsBackend  # noqa: E402
+
+_KEYS = ('response_received_count', 'response_status_code/200', 'response_total_bytes')
+
+
+def _client(redis_url):
+    if redis_url:
+        import redis.asyncio as aioredis
+        return aioredis.from_url(redis_url)
+    import fakeredis
+    return fakeredis.FakeAsyncRedis()
+
+
+def _count_round_trips(client):
+    calls = {'round_trips': 0}
+    original_execute_command, original_pipeline = client.execute_command, client.pipeline
+
+    async def execute_command(*args, **kwargs):
+        calls['round_trips'] += 1
+        return await original_execute_command(*args, **kwargs)
+
+    def pipeline(*args, **kwargs):
+        pipe = original_pipeline(*args, **kwargs)
+        execute = pipe.execute
+
+        async def counting_execute(*a, **kw):
+            calls['round_trips'] += 1
+            return await execute(*a, **kw)
+
+        pipe.execute = counting_execute
+        return pipe
+
+    client.execute_command, client.pipeline = execute_command, pipeline
+    return calls
+
+
+async def _direct(client, key, responses):
+    for _ in range(responses):
+        for stat in _KEYS:
+            await client.hincrby(key, stat, 1 if stat != 'response_total_bytes' else 2048)
+        await asyncio.sleep(0)
+
+
+async def _buffered(client, key, responses, interval):
+    backend = BufferedRedisStatsBackend(client, key=key, flush_interval=interval)
+    start = time.perf_counter()
+    for _ in range(responses):
+        for stat in _KEYS:
+            backend.inc_value(stat, 1 if stat != 'response_total_bytes' else 2048)
+        await asyncio.sleep(0)
+    record_time = time.perf_counter() - start
+    backend.close()
+    await backend.wait_closed()
+    return record_time
+
+
+async def main(args):
+    rows = []
+    for label in ('direct', 'buffered'):
+        client = _client(args.redis_url)
+        key = f'bench:stats:{label}'
+        await client.delete(key)
+        calls = _count_round_trips(client)
+        start = time.perf_counter()
+        if label == 'direct':
+            await _direct(client, key, args.responses)
+            record_time = time.perf_counter() - start
+        else:
+            record_time = await _buffered(client, key, args.responses, args.interval)
+        elapsed = time.perf_counter() - start
+        total = int(await client.hget(key, 'response_received_count') or 0)
+        rows.append((label, calls['round_trips'], elapsed, record_time / (args.responses * len(_KEYS)), total))
+        await client.delete(key)
+
+    print(f"responses = {args.responses}, increments = {args.responses * len(_KEYS)}, interval = {args.interval} ms")
+    print(f"{'backend':>10} {'round trips':>12} {'total ms':>10} {'us/inc':>8} {'received':>10}")
+    for label, round_trips, elapsed, per_inc, total in rows:
+        print(f"{label:>10} {round_trips:>12} {elapsed * 1000:>10.1f} {per_inc * 1e6:>8.2f} {total:>10}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--responses', type=int, default=20000)
+    parser.add_argument('--interval', type=float, default=200, help='缓冲写入间隔（毫秒）')
+    parser.add_argument('--redis-url', default=None, help='默认使用 fakeredis')
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,110 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+RedisStreamQueue 入队 / ACK 微基准（逐条 vs 批量）
+==================================================
+
+对比 ``--messages`` 条请求的：
+    - 入队：逐条 ``put``（每条一次 XADD 往返） vs ``put_batch``（pipeline）
+    - 确认：逐条 ``ack``（每条一次 Lua 往返） vs ``set_ack_batch`` 合并提交
+输出吞吐（条/秒）与 Redis 命令往返次数。
+
+默认使用 fakeredis（需 lupa 执行 Lua），无网络延迟，往返次数更能反映真实 Redis 上的差距；
+``--redis-url`` 指向真实 Redis 时可观察到 RTT 的影响。
+
+用法：
+    python scripts/benchmarks/bench_stream_batch.py --messages 5000 --ack-batch 100
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from crawlo.http.request import Request  # noqa: E402
+from crawlo.queue.backends.redis_stream import RedisStreamQueue  # noqa: E402
+
+
+def _make_client(redis_url):
+    if redis_url:
+        import redis.asyncio as aioredis
+        return aioredis.from_url(redis_url)
+    import fakeredis
+    return fakeredis.FakeAsyncRedis()
+
+
+def _count_calls(client, names):
+    counter = {'calls': 0}
+    for name in names:
+        original = getattr(client, name)
+
+        async def counting(*a, _original=original, **kw):
+            counter['calls'] += 1
+            return await _original(*a, **kw)
+
+        setattr(client, name, counting)
+    return counter
+
+
+async def _run(batched: bool, args, run_id: str) -> dict:
+    client = _make_client(args.redis_url)
+    queue = RedisStreamQueue(args.redis_url or 'redis://localhost:6379', project_name='bench',
+                             spider_name=run_id, consumer_name='bench-worker', block_timeout=200)
+    queue._redis = client
+    queue._connected = True
+    await queue._ensure_consumer_groups()
+    requests = [(Request(url=f'http://bench.local/{i}'), 0) for i in range(args.messages)]
+
+    start = time.monotonic()
+    if batched:
+        await queue.put_batch(requests, batch_size=args.put_batch)
+    else:
+        for request, priority in requests:
+            await queue.put(request, priority)
+    put_elapsed = time.monotonic() - start
+
+    receipts = []
+    while len(receipts) < args.messages:
+        result = await queue.get_with_receipt(timeout=0.05)
+        if result is not None:
+            receipts.append(result[1])
+
+    if batched:
+        queue.set_ack_batch(args.ack_batch, args.ack_interval)
+    evals = _count_calls(client, ['eval'])
+    start = time.monotonic()
+    for message_id in receipts:
+        await queue.ack(message_id)
+    await queue.flush_acks()
+    ack_elapsed = time.monotonic() - start
+
+    await client.delete(queue.stream, queue.high_stream)
+    return {
+        'mode': 'batched' if batched else 'per-message',
+        'put_per_sec': args.messages / put_elapsed,
+        'ack_per_sec': args.messages / ack_elapsed,
+        'ack_round_trips': evals['calls'],
+    }
+
+
+async def main(args):
+    rows = [await _run(batched, args, f'{batched}-{time.time_ns()}') for batched in (False, True)]
+    print(f"messages = {args.messages}, put_batch = {args.put_batch}, ack_batch = {args.ack_batch}")
+    print(f"{'mode':>12} {'put/s':>10} {'ack/s':>10} {'ACK evals':>10}")
+    for row in rows:
+        print(f"{row['mode']:>12} {row['put_per_sec']:>10.1f} {row['ack_per_sec']:>10.1f} "
+              f"{row['ack_round_trips']:>10}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--messages', type=int, default=5000)
+    parser.add_argument('--put-batch', type=int, default=500)
+    parser.add_argument('--ack-batch', type=int, default=100)
+    parser.add_argument('--ack-interval', type=int, default=50, help='ACK 合并最长等待（毫秒）')
+    parser.add_argument('--redis-url', default=None)
+    asyncio.run(main(parser.parse_args()))
@@ -8,10 +8,12 @@ P4-E4 故障注入演练
     redis-down       停止本地 Redis → 框架应优雅失败/重试，恢复后继续
     worker-crash     分布式模式杀掉一个 Worker 进程 → 任务被 XCLAIM 回收
     network-partition 阻断爬虫到 mock 站的连接 → 重试后恢复
+    failover-recovery 崩溃 Worker 持有 N 条 pending 消息 → 测量 FailoverManager 回收耗时（需 Redis）
     disk-full        不可用（跳过，需容器环境）——文档说明
 
 用法：
     python scripts/failure_inject.py --scenario redis-down --recover 10
+    python scripts/failure_inject.py --scenario failover-recovery --pending 1000,10000,50000
 """
 
 import argparse
@@ -78,11 +80,59 @@ async def network_partition(base_url: str, recover_after: float) -> dict:
     return {"scenario": "network-partition", "during_outage": result, "after_recovery": ok}
 
 
+async def failover_recovery(redis_url: str, pending_counts: list, page_size: int) -> dict:
+    """
+    对每个 N：dead-worker 读取 N 条消息后不 ACK（模拟崩溃），
+    再由 FailoverManager._claim_worker_tasks 回收，记录回收耗时与吞吐。
+    """
+    from crawlo.cluster.failover import FailoverManager
+    from crawlo.http.request import Request
+    from crawlo.queue.backends.redis_stream import RedisStreamQueue
+
+    results = []
+    for pending in pending_counts:
+        queue = RedisStreamQueue(
+            redis_url,
+            project_name="failure_inject",
+            spider_name=f"failover_{pending}",
+            consumer_name="rescuer",
+            max_length=pending * 2,
+            consumer_idle_timeout=1,
+        )
+        await queue.connect()
+        try:
+            await queue.put_batch([(Request(f"https://example.com/item/{i}"), 0) for i in range(pending)])
+            await queue._redis.xreadgroup(queue.group_name, "dead-worker", {queue.stream: ">"}, count=pending)
+            await asyncio.sleep(0.01)
+
+            manager = FailoverManager(None, queue, None, queue._redis)
+            manager.claim_page_size = page_size
+            t0 = time.monotonic()
+            recovered = await manager._claim_worker_tasks("dead-worker")
+            elapsed = time.monotonic() - t0
+            left = (await queue._redis.xpending(queue.stream, queue.group_name))["pending"]
+            results.append({
+                "pending": pending,
+                "recovered": recovered,
+                "left_pending": left,
+                "recovery_s": round(elapsed, 3),
+                "msgs_per_s": round(recovered / elapsed) if elapsed > 0 else None,
+            })
+        finally:
+            await queue._redis.delete(queue.stream, queue.high_stream, queue.failed_stream)
+            await queue.close()
+    return {"scenario": "failover-recovery", "page_size": page_size, "results": results}
+
+
 async def main():
     parser = argparse.ArgumentParser()
-    parser.add_argument("--scenario", required=True, choices=["redis-down", "worker-crash", "network-partition"])
+    parser.add_argument("--scenario", required=True,
+                        choices=["redis-down", "worker-crash", "network-partition", "failover-recovery"])
     parser.add_argument("--base-url", default="http://127.0.0.1:9200")
     parser.add_argument("--recover", type=float, default=5.0)
+    parser.add_argument("--redis-url", default="redis://127.0.0.1:6379/15")
+    parser.add_argument("--pending", default="1000,10000", help="failover-recovery：逗号分隔的 pending 消息数")
+    parser.add_argument("--page-size", type=int, default=500, help="failover-recovery：每页 claim 条数")
     parser.add_argument("--report", default="/tmp/failure_inject_report.json")  # nosec B108
     args = parser.parse_args()
 
@@ -90,8 +140,12 @@ async def main():
         print("worker-crash 需分布式环境：请按 docs/deployment/redis-ha.md 演练章节执行")
         return 0
 
-    fn = redis_down if args.scenario == "redis-down" else network_partition
-    report = await fn(args.base_url, args.recover)
+    if args.scenario == "failover-recovery":
+        pending_counts = [int(n) for n in args.pending.split(",") if n.strip()]
+        report = await failover_recovery(args.redis_url, pending_counts, args.page_size)
+    else:
+        fn = redis_down if args.scenario == "redis-down" else network_partition
+        report = await fn(args.base_url, args.recover)
     Path(args.report).write_text(json.dumps(report, indent=2), encoding="utf-8")
     print(json.dumps(report, indent=2))
     return 0
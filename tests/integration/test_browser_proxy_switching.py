@@ -5,16 +5,16 @@
 ============================
 
 测试覆盖：
-1. CloakBrowserDownloader: Context 级代理切换
-2. PlaywrightDownloader: Context 级代理切换
+1. CloakBrowserDownloader: 按代理路由到上下文池（BrowserContextPool）
+2. PlaywrightDownloader: 按代理路由到上下文池（BrowserContextPool）
 3. CamoufoxDownloader: 浏览器重启式代理切换
 
 测试场景：
-- 代理变化检测（request.proxy 与当前代理不同）
+- 代理与默认上下文不同时路由到池中对应上下文，不影响在途页面
 - 代理降级（proxy_downgraded 标记）
 - 无代理变化（request.proxy 为 None，无 downgrade 标记）
-- 持久化模式无法重建 Context（CloakBrowser）
-- Context/浏览器重建逻辑
+- 持久化模式无法创建额外 Context（CloakBrowser）
+- 浏览器重启逻辑（Camoufox）
 """
 
 import sys
@@ -23,6 +23,8 @@ import pytest
 import asyncio
 from unittest.mock import Mock, MagicMock, patch, AsyncMock, PropertyMock
 
+from crawlo.downloader.context_pool import DEFAULT_CONTEXT
+
 
 pytestmark = pytest.mark.browser  # noqa: E402  (heavy browser / live-network tests, skipped in CI)
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
@@ -45,6 +47,21 @@ def make_mock_request(url="https://example.com", proxy=None, proxy_downgraded=Fa
     return request
 
 
+def _mock_page():
+    """创建模拟 Page 对象"""
+    page = AsyncMock()
+    page.close = AsyncMock()
+    page.goto = AsyncMock()
+    return page
+
+
+def _mock_context():
+    """创建模拟 BrowserContext（new_page 每次返回新页面）"""
+    context = AsyncMock()
+    context.new_page = AsyncMock(side_effect=lambda: _mock_page())
+    return context
+
+
 def make_cloakbrowser_mock_crawler(**overrides):
     """创建 CloakBrowser 下载器的模拟 Crawler"""
     crawler = Mock()
@@ -140,120 +157,83 @@ class TestCloakBrowserProxySwitching:
         dl._current_proxy = None
         return dl
 
-    # ---- _check_proxy_change 测试 ----
-
-    @pytest.mark.asyncio
-    async def test_no_proxy_change_when_request_proxy_is_none(self, downloader):
-        """request.proxy 为 None 且无 proxy_downgraded 标记时，不触发代理切换"""
-        request = make_mock_request(proxy=None, proxy_downgraded=False)
-
-        # _rebuild_context 不应被调用
-        downloader._rebuild_context = AsyncMock()
-        await downloader._check_proxy_change(request)
-        downloader._rebuild_context.assert_not_called()
-
-    @pytest.mark.asyncio
-    async def test_proxy_change_detected_when_proxy_differs(self, downloader):
-        """request.proxy 与当前代理不同时，触发代理切换"""
-        downloader._current_proxy = "http://proxy-a:8080"
-        request = make_mock_request(proxy="http://proxy-b:8081")
+    # ---- 按代理路由测试 ----
 
-        downloader._rebuild_context = AsyncMock()
-        await downloader._check_proxy_change(request)
-        downloader._rebuild_context.assert_called_once_with("http://proxy-b:8081")
+    def test_no_proxy_uses_default_context(self, downloader):
+        """request.proxy 为 None 且无降级标记时使用默认上下文"""
+        request = make_mock_request(proxy=None)
+        assert downloader._route_proxy(request) is DEFAULT_CONTEXT
 
-    @pytest.mark.asyncio
-    async def test_proxy_change_not_triggered_when_same_proxy(self, downloader):
-        """request.proxy 与当前代理相同时，不触发切换"""
+    def test_same_proxy_uses_default_context(self, downloader):
+        """代理与默认上下文相同时使用默认上下文"""
         downloader._current_proxy = "http://proxy-a:8080"
         request = make_mock_request(proxy="http://proxy-a:8080")
+        assert downloader._route_proxy(request) is DEFAULT_CONTEXT
 
-        downloader._rebuild_context = AsyncMock()
-        await downloader._check_proxy_change(request)
-        downloader._rebuild_context.assert_not_called()
-
-    @pytest.mark.asyncio
-    async def test_proxy_downgraded_to_direct(self, downloader):
-        """proxy_downgraded 标记触发降级为直连"""
+    def test_different_proxy_routed_to_pool(self, downloader):
+        """代理与默认上下文不同时路由到上下文池"""
         downloader._current_proxy = "http://proxy-a:8080"
-        request = make_mock_request(proxy=None, proxy_downgraded=True)
+        request = make_mock_request(proxy="http://proxy-b:8081")
+        assert downloader._route_proxy(request) == "http://proxy-b:8081"
 
-        downloader._rebuild_context = AsyncMock()
-        await downloader._check_proxy_change(request)
-        downloader._rebuild_context.assert_called_once_with(None)
+    def test_proxy_downgraded_to_direct(self, downloader):
+        """代理降级时路由到直连上下文"""
+        downloader._current_proxy = "http://proxy-a:8080"
+        request = make_mock_request(proxy="http://proxy-a:8080", proxy_downgraded=True)
+        assert downloader._route_proxy(request) is None
 
-    @pytest.mark.asyncio
-    async def test_proxy_downgrade_no_op_when_already_direct(self, downloader):
-        """已为直连时，proxy_downgraded 不触发切换"""
+    def test_proxy_downgrade_uses_default_when_already_direct(self, downloader):
+        """默认上下文已是直连时，降级不产生新上下文"""
         downloader._current_proxy = None
-        request = make_mock_request(proxy=None, proxy_downgraded=True)
+        request = make_mock_request(proxy_downgraded=True)
+        assert downloader._route_proxy(request) is DEFAULT_CONTEXT
 
-        downloader._rebuild_context = AsyncMock()
-        await downloader._check_proxy_change(request)
-        downloader._rebuild_context.assert_not_called()
-
-    @pytest.mark.asyncio
-    async def test_persistent_context_warns_on_proxy_change(self, downloader):
-        """持久化模式下代理切换只打印警告，不重建 Context"""
+    def test_persistent_context_uses_default(self, downloader):
+        """持久化模式无法创建额外上下文，仍使用默认上下文"""
         downloader.persistent_context = True
-        downloader.user_data_dir = "/tmp/test_data"
+        downloader.user_data_dir = "/tmp/cloak"
+        downloader._browser = None
         downloader._current_proxy = "http://proxy-a:8080"
         request = make_mock_request(proxy="http://proxy-b:8081")
-
-        downloader._rebuild_context = AsyncMock()
-        await downloader._check_proxy_change(request)
-        downloader._rebuild_context.assert_not_called()
+        assert downloader._route_proxy(request) is DEFAULT_CONTEXT
 
     @pytest.mark.asyncio
-    async def test_no_browser_returns_early(self, downloader):
-        """browser 为 None 时直接返回"""
-        downloader._browser = None
-        request = make_mock_request(proxy="http://proxy-a:8080")
+    async def test_proxy_switch_keeps_in_flight_pages(self, downloader):
+        """切换代理不关闭默认上下文中正在使用的页面"""
+        default_page = _mock_page()
+        downloader._context.new_page = AsyncMock(return_value=default_page)
+        proxy_context = _mock_context()
+        downloader._browser.new_context = AsyncMock(return_value=proxy_context)
 
-        downloader._rebuild_context = AsyncMock()
-        await downloader._check_proxy_change(request)
-        downloader._rebuild_context.assert_not_called()
+        entry, page = await downloader._acquire_routed_page(make_mock_request())
+        assert entry is None and page is default_page
 
-    # ---- _rebuild_context 测试 ----
+        entry_b, page_b = await downloader._acquire_routed_page(make_mock_request(proxy="http://proxy-b:8081"))
+        assert entry_b.context is proxy_context and entry_b.proxy == "http://proxy-b:8081"
+        downloader._context.close.assert_not_called()
+        default_page.close.assert_not_called()
+        assert id(default_page) in downloader._used_pages
 
-    @pytest.mark.asyncio
-    async def test_rebuild_context_closes_old_and_creates_new(self, downloader):
-        """重建 Context：关闭旧 Context 和页面，创建新 Context"""
-        old_context = AsyncMock()
-        old_page1 = AsyncMock()
-        old_page2 = AsyncMock()
-        new_context = AsyncMock()
-
-        downloader._context = old_context
-        downloader._page_pool = [old_page1, old_page2]
-        downloader._used_pages = {id(old_page1)}
-        downloader._create_context = AsyncMock(return_value=new_context)
-
-        await downloader._rebuild_context("http://new-proxy:8080")
-
-        # 验证旧页面被关闭
-        old_page1.close.assert_called_once()
-        old_page2.close.assert_called_once()
-        # 验证旧 Context 被关闭
-        old_context.close.assert_called_once()
-        # 验证创建了新 Context
-        downloader._create_context.assert_called_once_with("http://new-proxy:8080")
-        # 验证新 Context 被设置
-        assert downloader._context == new_context
-        # 验证页面池被清空
-        assert downloader._page_pool == []
+        await downloader._release_routed_page(entry_b, page_b)
+        await downloader._release_routed_page(entry, page)
         assert downloader._used_pages == set()
 
-    @pytest.mark.asyncio
-    async def test_rebuild_context_with_none_proxy(self, downloader):
-        """重建 Context 为直连模式（proxy=None）"""
-        new_context = AsyncMock()
-        downloader._create_context = AsyncMock(return_value=new_context)
+        # 同一代理的后续请求复用上下文
+        entry_b2, _ = await downloader._acquire_routed_page(make_mock_request(proxy="http://proxy-b:8081"))
+        assert entry_b2 is entry_b
+        downloader._browser.new_context.assert_called_once()
 
-        await downloader._rebuild_context(None)
+    @pytest.mark.asyncio
+    async def test_close_closes_pooled_contexts(self, downloader):
+        """关闭下载器时关闭上下文池中的上下文"""
+        proxy_context = _mock_context()
+        downloader._browser.new_context = AsyncMock(return_value=proxy_context)
+        entry, page = await downloader._acquire_routed_page(make_mock_request(proxy="http://proxy-b:8081"))
+        await downloader._release_routed_page(entry, page)
 
-        downloader._create_context.assert_called_once_with(None)
-        assert downloader._context == new_context
+        await downloader.close()
+        proxy_context.close.assert_called_once()
+        assert len(downloader._context_pool) == 0
 
     # ---- _create_context 测试 ----
 
@@ -269,7 +249,6 @@ class TestCloakBrowserProxySwitching:
         call_kwargs = downloader._browser.new_context.call_args[1]
         assert call_kwargs["proxy"] == {"server": "http://proxy:8080"}
         assert result == mock_context
-        assert downloader._current_proxy == "http://proxy:8080"
 
     @pytest.mark.asyncio
     async def test_create_context_with_dict_proxy(self, downloader):
@@ -282,7 +261,6 @@ class TestCloakBrowserProxySwitching:
 
         call_kwargs = downloader._browser.new_context.call_args[1]
         assert call_kwargs["proxy"] == proxy_dict
-        assert downloader._current_proxy == proxy_dict
 
     @pytest.mark.asyncio
     async def test_create_context_without_proxy(self, downloader):
@@ -294,7 +272,6 @@ class TestCloakBrowserProxySwitching:
 
         call_kwargs = downloader._browser.new_context.call_args[1]
         assert "proxy" not in call_kwargs
-        assert downloader._current_proxy is None
 
 
 # ==============================================================================
@@ -321,83 +298,39 @@ class TestPlaywrightProxySwitching:
         dl._current_proxy = None
         return dl
 
-    # ---- _check_proxy_change 测试 ----
+    # ---- 按代理路由测试 ----
 
-    @pytest.mark.asyncio
-    async def test_no_proxy_change_when_request_proxy_is_none(self, downloader):
-        """request.proxy 为 None 且无 proxy_downgraded 标记时，不触发切换"""
-        request = make_mock_request(proxy=None, proxy_downgraded=False)
+    def test_no_proxy_uses_default_context(self, downloader):
+        """request.proxy 为 None 且无降级标记时使用默认上下文"""
+        request = make_mock_request(proxy=None)
+        assert downloader._route_proxy(request) is DEFAULT_CONTEXT
 
-        downloader._rebuild_context = AsyncMock()
-        await downloader._check_proxy_change(request)
-        downloader._rebuild_context.assert_not_called()
-
-    @pytest.mark.asyncio
-    async def test_proxy_change_detected_when_proxy_differs(self, downloader):
-        """request.proxy 与当前代理不同时，触发 Context 重建"""
-        downloader._current_proxy = "http://proxy-a:8080"
-        request = make_mock_request(proxy="http://proxy-b:8081")
-
-        downloader._rebuild_context = AsyncMock()
-        await downloader._check_proxy_change(request)
-        downloader._rebuild_context.assert_called_once_with("http://proxy-b:8081")
-
-    @pytest.mark.asyncio
-    async def test_proxy_change_not_triggered_when_same_proxy(self, downloader):
-        """request.proxy 与当前代理相同时，不触发切换"""
+    def test_same_proxy_uses_default_context(self, downloader):
+        """代理与默认上下文相同时使用默认上下文"""
         downloader._current_proxy = "http://proxy-a:8080"
         request = make_mock_request(proxy="http://proxy-a:8080")
+        assert downloader._route_proxy(request) is DEFAULT_CONTEXT
 
-        downloader._rebuild_context = AsyncMock()
-        await downloader._check_proxy_change(request)
-        downloader._rebuild_context.assert_not_called()
-
-    @pytest.mark.asyncio
-    async def test_proxy_downgraded_to_direct(self, downloader):
-        """proxy_downgraded 标记触发降级为直连"""
+    def test_proxy_downgraded_to_direct(self, downloader):
+        """代理降级时路由到直连上下文"""
         downloader._current_proxy = "http://proxy-a:8080"
-        request = make_mock_request(proxy=None, proxy_downgraded=True)
-
-        downloader._rebuild_context = AsyncMock()
-        await downloader._check_proxy_change(request)
-        downloader._rebuild_context.assert_called_once_with(None)
+        request = make_mock_request(proxy_downgraded=True)
+        assert downloader._route_proxy(request) is None
 
     @pytest.mark.asyncio
-    async def test_no_browser_returns_early(self, downloader):
-        """browser 为 None 时直接返回"""
-        downloader.browser = None
-        request = make_mock_request(proxy="http://proxy-a:8080")
-
-        downloader._rebuild_context = AsyncMock()
-        await downloader._check_proxy_change(request)
-        downloader._rebuild_context.assert_not_called()
+    async def test_different_proxy_gets_own_context(self, downloader):
+        """不同代理的请求各自使用池中的上下文，并应用全局设置"""
+        contexts = [_mock_context(), _mock_context()]
+        downloader.browser.new_context = AsyncMock(side_effect=contexts)
 
-    # ---- _rebuild_context 测试 ----
+        entry_b, page_b = await downloader._acquire_routed_page(make_mock_request(proxy="http://proxy-b:8081"))
+        entry_c, page_c = await downloader._acquire_routed_page(make_mock_request(proxy="http://proxy-c:8082"))
+        assert (entry_b.context, entry_c.context) == (contexts[0], contexts[1])
+        assert downloader.browser.new_context.call_args_list[0][1]["proxy"] == {"server": "http://proxy-b:8081"}
+        downloader.context.close.assert_not_called()
 
-    @pytest.mark.asyncio
-    async def test_rebuild_context_closes_old_and_creates_new(self, downloader):
-        """重建 Context：关闭旧 Context 和页面，创建新 Context"""
-        old_context = AsyncMock()
-        old_page1 = AsyncMock()
-        old_page2 = AsyncMock()
-        new_context = AsyncMock()
-
-        downloader.context = old_context
-        downloader._page_pool = [old_page1, old_page2]
-        downloader._used_pages = {id(old_page1)}
-        downloader._create_context = AsyncMock(return_value=new_context)
-        downloader._apply_global_settings = AsyncMock()
-
-        await downloader._rebuild_context("http://new-proxy:8080")
-
-        old_page1.close.assert_called_once()
-        old_page2.close.assert_called_once()
-        old_context.close.assert_called_once()
-        downloader._create_context.assert_called_once_with("http://new-proxy:8080")
-        assert downloader.context == new_context
-        assert downloader._page_pool == []
-        assert downloader._used_pages == set()
-        downloader._apply_global_settings.assert_called_once()
+        await downloader._release_routed_page(entry_b, page_b)
+        await downloader._release_routed_page(entry_c, page_c)
 
     # ---- _create_context 测试 ----
 
@@ -411,7 +344,6 @@ class TestPlaywrightProxySwitching:
 
         call_kwargs = downloader.browser.new_context.call_args[1]
         assert call_kwargs["proxy"] == {"server": "http://proxy:8080"}
-        assert downloader._current_proxy == "http://proxy:8080"
 
     @pytest.mark.asyncio
     async def test_create_context_with_dict_proxy(self, downloader):
@@ -435,7 +367,6 @@ class TestPlaywrightProxySwitching:
 
         call_kwargs = downloader.browser.new_context.call_args[1]
         assert "proxy" not in call_kwargs
-        assert downloader._current_proxy is None
 
 
 # ==============================================================================
@@ -600,136 +531,68 @@ class TestCamoufoxProxySwitching:
 class TestProxySwitchingConsistency:
     """三个浏览器下载器代理切换行为一致性测试"""
 
-    @pytest.mark.asyncio
-    async def test_all_downloaders_ignore_none_proxy_without_downgrade(self):
-        """所有下载器在 request.proxy=None 且无 downgrade 时都不触发切换"""
+    @staticmethod
+    def _downloaders(current_proxy):
         from crawlo.downloader.cloakbrowser_downloader import CloakBrowserDownloader
         from crawlo.downloader.playwright_downloader import PlaywrightDownloader
         from crawlo.downloader.camoufox_downloader import CamoufoxDownloader
 
-        request = make_mock_request(proxy=None, proxy_downgraded=False)
-
-        # CloakBrowser
         cb_dl = CloakBrowserDownloader(make_cloakbrowser_mock_crawler())
         cb_dl._browser = AsyncMock()
-        cb_dl._current_proxy = "http://existing:8080"
-        cb_dl._rebuild_context = AsyncMock()
-        await cb_dl._check_proxy_change(request)
-        cb_dl._rebuild_context.assert_not_called()
+        cb_dl._current_proxy = current_proxy
 
-        # Playwright
         pw_dl = PlaywrightDownloader(make_playwright_mock_crawler())
         pw_dl.browser = AsyncMock()
-        pw_dl._current_proxy = "http://existing:8080"
-        pw_dl._rebuild_context = AsyncMock()
-        await pw_dl._check_proxy_change(request)
-        pw_dl._rebuild_context.assert_not_called()
+        pw_dl._current_proxy = current_proxy
 
-        # Camoufox
         cf_dl = CamoufoxDownloader(make_camoufox_mock_crawler())
         cf_dl._browser = AsyncMock()
-        cf_dl._current_proxy = "http://existing:8080"
+        cf_dl._current_proxy = current_proxy
         cf_dl._restart_browser = AsyncMock()
+        return cb_dl, pw_dl, cf_dl
+
+    @pytest.mark.asyncio
+    async def test_all_downloaders_ignore_none_proxy_without_downgrade(self):
+        """所有下载器在 request.proxy=None 且无 downgrade 时都不切换"""
+        request = make_mock_request(proxy=None, proxy_downgraded=False)
+        cb_dl, pw_dl, cf_dl = self._downloaders("http://existing:8080")
+
+        assert cb_dl._route_proxy(request) is DEFAULT_CONTEXT
+        assert pw_dl._route_proxy(request) is DEFAULT_CONTEXT
         await cf_dl._check_proxy_change(request)
         cf_dl._restart_browser.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_all_downloaders_handle_proxy_downgrade(self):
         """所有下载器都能处理 proxy_downgraded 标记"""
-        from crawlo.downloader.cloakbrowser_downloader import CloakBrowserDownloader
-        from crawlo.downloader.playwright_downloader import PlaywrightDownloader
-        from crawlo.downloader.camoufox_downloader import CamoufoxDownloader
-
         request = make_mock_request(proxy=None, proxy_downgraded=True)
+        cb_dl, pw_dl, cf_dl = self._downloaders("http://existing:8080")
 
-        # CloakBrowser
-        cb_dl = CloakBrowserDownloader(make_cloakbrowser_mock_crawler())
-        cb_dl._browser = AsyncMock()
-        cb_dl._current_proxy = "http://existing:8080"
-        cb_dl._rebuild_context = AsyncMock()
-        await cb_dl._check_proxy_change(request)
-        cb_dl._rebuild_context.assert_called_once_with(None)
-
-        # Playwright
-        pw_dl = PlaywrightDownloader(make_playwright_mock_crawler())
-        pw_dl.browser = AsyncMock()
-        pw_dl._current_proxy = "http://existing:8080"
-        pw_dl._rebuild_context = AsyncMock()
-        await pw_dl._check_proxy_change(request)
-        pw_dl._rebuild_context.assert_called_once_with(None)
-
-        # Camoufox
-        cf_dl = CamoufoxDownloader(make_camoufox_mock_crawler())
-        cf_dl._browser = AsyncMock()
-        cf_dl._current_proxy = "http://existing:8080"
-        cf_dl._restart_browser = AsyncMock()
+        assert cb_dl._route_proxy(request) is None
+        assert pw_dl._route_proxy(request) is None
         await cf_dl._check_proxy_change(request)
         cf_dl._restart_browser.assert_called_once_with(None)
 
     @pytest.mark.asyncio
     async def test_all_downloaders_detect_proxy_change(self):
         """所有下载器都能检测代理变化"""
-        from crawlo.downloader.cloakbrowser_downloader import CloakBrowserDownloader
-        from crawlo.downloader.playwright_downloader import PlaywrightDownloader
-        from crawlo.downloader.camoufox_downloader import CamoufoxDownloader
-
         request = make_mock_request(proxy="http://new-proxy:9090")
+        cb_dl, pw_dl, cf_dl = self._downloaders("http://old-proxy:8080")
 
-        # CloakBrowser
-        cb_dl = CloakBrowserDownloader(make_cloakbrowser_mock_crawler())
-        cb_dl._browser = AsyncMock()
-        cb_dl._current_proxy = "http://old-proxy:8080"
-        cb_dl._rebuild_context = AsyncMock()
-        await cb_dl._check_proxy_change(request)
-        cb_dl._rebuild_context.assert_called_once_with("http://new-proxy:9090")
-
-        # Playwright
-        pw_dl = PlaywrightDownloader(make_playwright_mock_crawler())
-        pw_dl.browser = AsyncMock()
-        pw_dl._current_proxy = "http://old-proxy:8080"
-        pw_dl._rebuild_context = AsyncMock()
-        await pw_dl._check_proxy_change(request)
-        pw_dl._rebuild_context.assert_called_once_with("http://new-proxy:9090")
-
-        # Camoufox
-        cf_dl = CamoufoxDownloader(make_camoufox_mock_crawler())
-        cf_dl._browser = AsyncMock()
-        cf_dl._current_proxy = "http://old-proxy:8080"
-        cf_dl._restart_browser = AsyncMock()
+        assert cb_dl._route_proxy(request) == "http://new-proxy:9090"
+        assert pw_dl._route_proxy(request) == "http://new-proxy:9090"
         await cf_dl._check_proxy_change(request)
         cf_dl._restart_browser.assert_called_once_with("http://new-proxy:9090")
 
     @pytest.mark.asyncio
     async def test_all_downloaders_ignore_same_proxy(self):
-        """所有下载器在代理相同时都不触发切换"""
-        from crawlo.downloader.cloakbrowser_downloader import CloakBrowserDownloader
-        from crawlo.downloader.playwright_downloader import PlaywrightDownloader
-        from crawlo.downloader.camoufox_downloader import CamoufoxDownloader
-
+        """所有下载器在代理相同时都不切换"""
         same_proxy = "http://same-proxy:8080"
         request = make_mock_request(proxy=same_proxy)
+        cb_dl, pw_dl, cf_dl = self._downloaders(same_proxy)
 
-        # CloakBrowser
-        cb_dl = CloakBrowserDownloader(make_cloakbrowser_mock_crawler())
-        cb_dl._browser = AsyncMock()
-        cb_dl._current_proxy = same_proxy
-        cb_dl._rebuild_context = AsyncMock()
-        await cb_dl._check_proxy_change(request)
-        cb_dl._rebuild_context.assert_not_called()
-
-        # Playwright
-        pw_dl = PlaywrightDownloader(make_playwright_mock_crawler())
-        pw_dl.browser = AsyncMock()
-        pw_dl._current_proxy = same_proxy
-        pw_dl._rebuild_context = AsyncMock()
-        await pw_dl._check_proxy_change(request)
-        pw_dl._rebuild_context.assert_not_called()
-
-        # Camoufox
-        cf_dl = CamoufoxDownloader(make_camoufox_mock_crawler())
-        cf_dl._browser = AsyncMock()
-        cf_dl._current_proxy = same_proxy
-        cf_dl._restart_browser = AsyncMock()
+        assert cb_dl._route_proxy(request) is DEFAULT_CONTEXT
+        assert pw_dl._route_proxy(request) is DEFAULT_CONTEXT
         await cf_dl._check_proxy_change(request)
         cf_dl._restart_browser.assert_not_called()
 
@@ -552,7 +552,9 @@ async def test_block_resources_default():
     async def mock_route(pattern, handler):
         route_calls.append((pattern, handler))
 
-    mock_page.route = mock_route
+    # 路由安装在页面所属上下文上（每个上下文一次），页面只登记屏蔽器
+    mock_page.context.route = mock_route
+    await dl._setup_resource_blocking(mock_page, req)
     await dl._setup_resource_blocking(mock_page, req)
 
     assert len(route_calls) == 1
@@ -572,7 +574,7 @@ async def test_block_resources_meta():
     async def mock_route(pattern, handler):
         route_calls.append((pattern, handler))
 
-    mock_page.route = mock_route
+    mock_page.context.route = mock_route
     await dl._setup_resource_blocking(mock_page, req)
     assert len(route_calls) == 1
 
@@ -589,7 +591,7 @@ async def test_block_resources_empty():
     async def mock_route(pattern, handler):
         route_calls.append((pattern, handler))
 
-    mock_page.route = mock_route
+    mock_page.context.route = mock_route
     await dl._setup_resource_blocking(mock_page, req)
     assert len(route_calls) == 0
 
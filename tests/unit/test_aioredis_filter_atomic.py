@@ -0,0 +1,163 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+AioRedisFilter 原子判重 / 批量判重测试
+
+测试内容：
+1. atomic 模式只发一条 SADD（带 TTL 时 SADD+EXPIRE 同一 pipeline），以返回值判重
+2. requested_many 一次 pipeline 往返完成整批判重，批内重复也能识别
+3. Redis 异常时整批放行（宁可重复，不可丢失）
+4. Scheduler.enqueue_requests 使用 requested_many 并只入队非重复请求
+"""
+
+from unittest.mock import AsyncMock, Mock
+
+from crawlo.core.scheduling.task_scheduler import Scheduler
+from crawlo.filters.aioredis_filter import AioRedisFilter
+from crawlo.http.request import Request
+
+
+class _FakePipeline:
+    def __init__(self, client):
+        self._client = client
+        self._commands = []
+
+    def sadd(self, key, member):
+        self._commands.append(('sadd', key, member))
+
+    def expire(self, key, ttl):
+        self._commands.append(('expire', key, ttl))
+
+    async def execute(self):
+        self._client.round_trips += 1
+        results = []
+        for name, key, arg in self._commands:
+            results.append(self._client.apply(name, key, arg))
+        return results
+
+
+class _FakeRedis:
+    """记录往返次数的最小 Redis 替身（仅实现本测试用到的命令）"""
+
+    def __init__(self):
+        self.sets = {}
+        self.ttls = {}
+        self.round_trips = 0
+        self.sismember = AsyncMock()
+
+    def apply(self, name, key, arg):
+        if name == 'sadd':
+            members = self.sets.setdefault(key, set())
+            if arg in members:
+                return 0
+            members.add(arg)
+            return 1
+        self.ttls[key] = arg
+        return True
+
+    async def sadd(self, key, member):
+        self.round_trips += 1
+        return self.apply('sadd', key, member)
+
+    def pipeline(self):
+        return _FakePipeline(self)
+
+
+def _make_filter(client, ttl=None, atomic=True):
+    return AioRedisFilter(redis_key='test:filter', client=client, stats=Mock(), ttl=ttl, atomic=atomic)
+
+
+class TestAtomicRequested:
+
+    async def test_single_sadd_without_ttl(self):
+        client = _FakeRedis()
+        dupe_filter = _make_filter(client)
+        request = Request(url='http://example.com/a')
+
+        assert await dupe_filter.requested_async(request) is False
+        assert await dupe_filter.requested_async(request) is True
+        assert client.round_trips == 2
+        client.sismember.assert_not_called()
+
+    async def test_ttl_sent_in_same_pipeline(self):
+        client = _FakeRedis()
+        dupe_filter = _make_filter(client, ttl=60)
+
+        assert await dupe_filter.requested_async(Request(url='http://example.com/a')) is False
+        assert client.round_trips == 1
+        assert client.ttls == {'test:filter': 60}
+
+
+class TestRequestedMany:
+
+    async def test_one_round_trip_for_batch(self):
+        client = _FakeRedis()
+        dupe_filter = _make_filter(client, ttl=60)
+        await dupe_filter.requested_async(Request(url='http://example.com/seen'))
+        client.round_trips = 0
+
+        requests = [
+            Request(url='http://example.com/seen'),
+            Request(url='http://example.com/new'),
+            Request(url='http://example.com/new'),
+        ]
+        flags = await dupe_filter.requested_many(requests)
+
+        assert flags == [True, False, True]
+        assert client.round_trips == 1
+
+    async def test_redis_error_allows_whole_batch(self):
+        client = Mock()
+        client.pipeline = Mock(side_effect=ConnectionError('Redis connection lost'))
+        dupe_filter = _make_filter(client)
+
+        flags = await dupe_filter.requested_many([Request(url='http://example.com/a')] * 3)
+        assert flags == [False, False, False]
+
+
+class TestSchedulerEnqueueRequests:
+
+    async def test_batch_dedup_then_put(self):
+        dupe_filter = _make_filter(_FakeRedis())
+        scheduler = Scheduler(crawler=Mock(), dupe_filter=dupe_filter, stats=Mock(), priority=0)
+        scheduler._put_request = AsyncMock(return_value=True)
+
+        seen = Request(url='http://example.com/seen')
+        await dupe_filter.requested_async(seen)
+        forced = Request(url='http://example.com/seen', dont_filter=True)
+        fresh = Request(url='http://example.com/fresh')
+
+        results = await scheduler.enqueue_requests([seen, forced, fresh])
+
+        assert results == [False, True, True]
+        assert scheduler._duplicate_filtered_count == 1
+        assert [c.args[0] for c in scheduler._put_request.await_args_list] == [forced, fresh]
+
+
+class TestSpiderOutputBatching:
+
+    async def test_requests_flushed_in_batches_before_items(self):
+        from crawlo import Item
+        from crawlo.core.engine import Engine
+
+        crawler = Mock()
+        crawler.settings = Mock()
+        crawler.settings.get = Mock(
+            side_effect=lambda key, default=None: 2 if key == 'ENQUEUE_BATCH_SIZE' else default
+        )
+        engine = Engine(crawler)
+        engine.processor = Mock()
+        engine.processor.enqueue = AsyncMock()
+        engine.processor.enqueue_requests = AsyncMock()
+
+        r1, r2, r3 = (Request(url=f'http://example.com/{i}') for i in range(3))
+        item = Item()
+
+        async def outputs():
+            for output in (r1, r2, r3, item):
+                yield output
+
+        await engine._handle_spider_output(outputs())
+
+        assert [c.args[0] for c in engine.processor.enqueue_requests.await_args_list] == [[r1, r2], [r3]]
+        engine.processor.enqueue.assert_awaited_once_with(item)
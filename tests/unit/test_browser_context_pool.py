@@ -0,0 +1,154 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+BrowserContextPool 测试（按代理的浏览器上下文池）
+
+测试内容：
+1. 同一代理复用上下文与页面，不同代理各自创建上下文
+2. 达到 max_contexts 时淘汰最久未使用且空闲的上下文；全部在用时等待
+3. 同一代理并发首次请求只创建一次上下文；创建失败不留下占位
+4. 每个上下文独立的页面并发上限；max_pages=None 时页面用完即关
+"""
+
+import asyncio
+
+import pytest
+
+from crawlo.downloader.context_pool import BrowserContextPool, proxy_key
+
+
+class _Page:
+    def __init__(self):
+        self.closed = False
+
+    async def goto(self, url, timeout=None):
+        self.url = url
+
+    async def close(self):
+        self.closed = True
+
+
+class _Context:
+    def __init__(self, proxy):
+        self.proxy = proxy
+        self.closed = False
+        self.pages = []
+
+    async def new_page(self):
+        page = _Page()
+        self.pages.append(page)
+        return page
+
+    async def close(self):
+        self.closed = True
+
+
+class _Factory:
+    def __init__(self, delay=0.0, fail=()):
+        self.created = []
+        self.delay = delay
+        self.fail = list(fail)
+
+    async def __call__(self, proxy):
+        await asyncio.sleep(self.delay)
+        if proxy in self.fail:
+            raise ConnectionError(f'cannot reach {proxy}')
+        context = _Context(proxy)
+        self.created.append(context)
+        return context
+
+
+class TestRouting:
+
+    async def test_same_proxy_reuses_context_and_page(self):
+        factory = _Factory()
+        pool = BrowserContextPool(factory, max_contexts=4, max_pages=2)
+
+        entry, page = await pool.acquire('http://a:1')
+        await pool.release(entry, page)
+        entry2, page2 = await pool.acquire('http://a:1')
+        assert entry2 is entry and page2 is page and page.url == 'about:blank'
+        await pool.release(entry2, page2)
+
+        entry3, page3 = await pool.acquire({'server': 'http://b:2'})
+        await pool.release(entry3, page3)
+        assert [c.proxy for c in factory.created] == ['http://a:1', {'server': 'http://b:2'}]
+        assert len(pool) == 2 and {'server': 'http://b:2'} in pool
+
+    def test_proxy_key(self):
+        assert proxy_key(None) == proxy_key('') == ''
+        assert proxy_key({'server': 's', 'username': 'u'}) == proxy_key({'username': 'u', 'server': 's'})
+
+
+class TestEviction:
+
+    async def test_lru_idle_context_evicted(self):
+        factory = _Factory()
+        pool = BrowserContextPool(factory, max_contexts=2, max_pages=2)
+        for proxy in ('a', 'b', 'a', 'c'):
+            entry, page = await pool.acquire(proxy)
+            await pool.release(entry, page)
+
+        a, b, c = factory.created
+        assert b.closed and b.pages[0].closed
+        assert not a.closed and not c.closed
+        assert 'b' not in pool and pool.evicted == 1
+
+    async def test_busy_contexts_never_evicted(self):
+        pool = BrowserContextPool(_Factory(), max_contexts=1, max_pages=2)
+        entry_a, page_a = await pool.acquire('a')
+        context_a = entry_a.context
+
+        waiter = asyncio.ensure_future(pool.acquire('b'))
+        await asyncio.sleep(0.01)
+        assert not waiter.done() and not context_a.closed
+
+        await pool.release(entry_a, page_a)
+        entry_b, page_b = await asyncio.wait_for(waiter, 1)
+        assert entry_b.proxy == 'b' and context_a.closed
+        await pool.release(entry_b, page_b)
+        await pool.close()
+        assert entry_b.context is None
+
+
+class TestCreation:
+
+    async def test_concurrent_first_requests_create_once(self):
+        factory = _Factory(delay=0.01)
+        pool = BrowserContextPool(factory, max_contexts=4, max_pages=10)
+        results = await asyncio.gather(*(pool.acquire('a') for _ in range(5)))
+        assert len(factory.created) == 1
+        assert len({id(page) for _, page in results}) == 5
+        for entry, page in results:
+            await pool.release(entry, page)
+
+    async def test_failed_creation_leaves_no_entry(self):
+        pool = BrowserContextPool(_Factory(fail={'bad'}), max_contexts=1, max_pages=2)
+        with pytest.raises(ConnectionError):
+            await pool.acquire('bad')
+        assert len(pool) == 0
+        entry, page = await pool.acquire('good')
+        await pool.release(entry, page)
+
+
+class TestPages:
+
+    async def test_page_limit_per_context(self):
+        pool = BrowserContextPool(_Factory(), max_contexts=4, max_pages=1)
+        entry_a, page_a = await pool.acquire('a')
+        # 其他代理的上下文不受 a 的页面上限影响
+        entry_b, page_b = await asyncio.wait_for(pool.acquire('b'), 1)
+
+        waiter = asyncio.ensure_future(pool.acquire('a'))
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+        await pool.release(entry_a, page_a)
+        _, page = await asyncio.wait_for(waiter, 1)
+        assert page is page_a
+        await pool.release(entry_b, page_b)
+
+    async def test_unpooled_pages_closed_on_release(self):
+        pool = BrowserContextPool(_Factory(), max_contexts=4, max_pages=None)
+        entry, page = await pool.acquire('a')
+        await pool.release(entry, page)
+        assert page.closed and entry.pages == [] and entry.leases == 0
@@ -0,0 +1,233 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+增量检查点（CHECKPOINT_STORAGE = 'journal'）测试
+
+测试内容：
+1. CheckpointJournal：同一刷新周期内入队又出队抵消、攒满批量刷新、日志折叠
+2. 保存检查点只写增量，不读取 / 改动队列
+3. 流式恢复：沿用原 key，恢复后的出队能删除快照中的请求，不产生重复
+4. MemoryFilter 新指纹回调；QueueManager.snapshot_requests 不出队
+"""
+
+import asyncio
+import sqlite3
+
+from crawlo.checkpoint.journal import CheckpointJournal
+from crawlo.checkpoint.manager import CheckpointManager
+from crawlo.checkpoint.storage import JournalStorage
+from crawlo.core.checkpoint_coordinator import CheckpointCoordinator
+from crawlo.filters.memory_filter import MemoryFilter
+from crawlo.http.request import Request
+from crawlo.queue.queue_types import QueueType
+
+
+class _Settings:
+    def __init__(self, data):
+        self._data = data
+
+    def get(self, key, default=None):
+        return self._data.get(key, default)
+
+
+class _Crawler:
+    def __init__(self, data=None):
+        self.settings = _Settings(data or {})
+        self.stats = None
+
+
+class _Scheduler:
+    """最小调度器：与 Scheduler 相同的位置调用 checkpoint_journal"""
+
+    queue_type = QueueType.MEMORY
+
+    def __init__(self):
+        self.dupe_filter = MemoryFilter(_Crawler())
+        self.checkpoint_journal = None
+        self.queue = []
+
+    async def enqueue_request(self, request):
+        if not request.dont_filter and await self.dupe_filter.requested_async(request):
+            return False
+        self.queue.append(request)
+        if self.checkpoint_journal is not None:
+            self.checkpoint_journal.record_enqueue(request)
+        return True
+
+    def next_request(self):
+        request = self.queue.pop(0)
+        if self.checkpoint_journal is not None:
+            self.checkpoint_journal.record_dequeue(request)
+        return request
+
+
+def _settings(tmp_path, **extra):
+    return _Settings(dict({
+        'CHECKPOINT_ENABLED': True,
+        'CHECKPOINT_STORAGE': 'journal',
+        'CHECKPOINT_DIR': str(tmp_path),
+        'CHECKPOINT_JOURNAL_FLUSH_INTERVAL': 10.0,
+    }, **extra))
+
+
+def _journal(tmp_path, **kwargs):
+    storage = JournalStorage('demo', checkpoint_dir=str(tmp_path))
+    return CheckpointJournal(storage, lambda request: {'url': request.url, 'priority': request.priority}, **kwargs)
+
+
+def _count(storage, table):
+    with sqlite3.connect(storage.filepath) as conn:
+        return conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]  # nosec B608
+
+
+class TestCheckpointJournal:
+
+    async def test_enqueue_then_dequeue_cancels_out(self, tmp_path):
+        journal = _journal(tmp_path, flush_interval=10.0)
+        kept, consumed = Request('https://example.com/kept'), Request('https://example.com/consumed')
+        journal.record_enqueue(kept)
+        journal.record_enqueue(consumed)
+        journal.record_dequeue(consumed)
+
+        assert journal.pending_events == 1 and journal.live_requests == 1
+        assert await journal.flush() == 1
+        await journal.close()
+
+    async def test_flushes_when_batch_full(self, tmp_path):
+        journal = _journal(tmp_path, batch_size=3, flush_interval=10.0)
+        for i in range(3):
+            journal.record_enqueue(Request(f'https://example.com/{i}'))
+        await asyncio.wait_for(journal._flush_task, 5)
+
+        assert journal.pending_events == 0 and _count(journal.storage, 'journal') == 3
+        await journal.close()
+
+    async def test_compaction_folds_dequeues(self, tmp_path):
+        journal = _journal(tmp_path, compact_threshold=4)
+        requests = [Request(f'https://example.com/{i}') for i in range(3)]
+        for request in requests:
+            journal.record_enqueue(request)
+        await journal.flush()
+        journal.record_dequeue(requests[0])
+        journal.record_fingerprint('fp-0')
+        await journal.flush()
+
+        storage = journal.storage
+        assert _count(storage, 'journal') == 0
+        assert _count(storage, 'pending_requests') == 2 and _count(storage, 'fingerprints') == 1
+        await journal.close()
+
+    async def test_storage_reuses_connection_and_pages_reads(self, tmp_path):
+        journal = _journal(tmp_path)
+        for i, priority in enumerate([5, -1, 5, 0, -1]):
+            journal.record_enqueue(Request(f'https://example.com/{i}', priority=priority))
+            journal.record_fingerprint(f'fp-{i}')
+        await journal.flush()
+
+        storage = journal.storage
+        conn = storage._conn
+        requests = [(key, data['url']) for key, data in storage.iter_requests(batch_size=2)]
+        assert [key for key, _ in requests] == [1, 3, 4, 2, 5]
+        assert sorted(fp for batch in storage.iter_fingerprints(batch_size=2) for fp in batch) == \
+            [f'fp-{i}' for i in range(5)]
+        assert storage._conn is conn
+
+        await journal.close()
+        assert storage._conn is None
+
+
+class TestIncrementalCheckpoint:
+
+    async def test_save_writes_delta_without_touching_queue(self, tmp_path):
+        manager = CheckpointManager('demo', _settings(tmp_path))
+        scheduler = _Scheduler()
+        scheduler.queue_manager = None  # 增量保存不应访问队列
+        assert manager.attach(scheduler)
+
+        for i in range(5):
+            await scheduler.enqueue_request(Request(f'https://example.com/{i}'))
+        scheduler.next_request()
+        assert await manager.save(scheduler)
+        assert _count(manager.storage, 'journal') == 0
+        assert _count(manager.storage, 'pending_requests') == 4
+        assert _count(manager.storage, 'fingerprints') == 5
+
+        await scheduler.enqueue_request(Request('https://example.com/5'))
+        assert scheduler.checkpoint_journal.pending_events == 2  # 入队 + 新指纹
+        await manager.detach(scheduler)
+        assert scheduler.checkpoint_journal is None
+
+    async def test_resume_streams_and_tracks_original_keys(self, tmp_path):
+        settings = _settings(tmp_path)
+        first = CheckpointManager('demo', settings)
+        scheduler = _Scheduler()
+        first.attach(scheduler)
+        for i in range(4):
+            await scheduler.enqueue_request(Request(f'https://example.com/{i}', priority=i % 2))
+        scheduler.next_request()
+        await first.save(scheduler)
+        await first.detach(scheduler)
+
+        coordinator = CheckpointCoordinator(settings)
+        spider = type('Spider', (), {'name': 'demo'})()
+        resumed = _Scheduler()
+        assert coordinator.attach(spider, resumed, resume=True)
+        assert await coordinator.resume_from_checkpoint(spider, resumed)
+        assert sorted(r.url for r in resumed.queue) == [f'https://example.com/{i}' for i in (1, 2, 3)]
+        assert resumed.checkpoint_journal.pending_events == 0  # 恢复的请求不重复写入
+        assert 'https://example.com/0' not in [r.url for r in resumed.queue]
+
+        resumed.next_request()
+        await coordinator.save_checkpoint(resumed, spider, stats=None, save_on_signal=True)
+        storage = JournalStorage('demo', checkpoint_dir=str(tmp_path))
+        assert storage.load()['pending_count'] == 2
+        assert storage.load()['fingerprint_count'] == 4
+
+    async def test_fresh_run_clears_previous_journal(self, tmp_path):
+        settings = _settings(tmp_path)
+        manager = CheckpointManager('demo', settings)
+        scheduler = _Scheduler()
+        manager.attach(scheduler)
+        await scheduler.enqueue_request(Request('https://example.com/stale'))
+        await manager.detach(scheduler)
+
+        coordinator = CheckpointCoordinator(settings)
+        spider = type('Spider', (), {'name': 'demo'})()
+        assert coordinator.attach(spider, _Scheduler(), resume=False)
+        assert not coordinator._get_manager('demo').storage.exists()
+
+    def test_not_attached_for_other_queues_or_storages(self, tmp_path):
+        scheduler = _Scheduler()
+        scheduler.queue_type = QueueType.REDIS_STREAM
+        assert not CheckpointManager('demo', _settings(tmp_path)).attach(scheduler)
+        sqlite_manager = CheckpointManager('demo', _settings(tmp_path, CHECKPOINT_STORAGE='sqlite'))
+        assert not sqlite_manager.attach(_Scheduler())
+
+
+class TestHooks:
+
+    async def test_memory_filter_listener(self):
+        dupe_filter = MemoryFilter(_Crawler())
+        seen = []
+        dupe_filter.set_fingerprint_listener(seen.append)
+        request = Request('https://example.com/a')
+        await dupe_filter.requested_async(request)
+        await dupe_filter.requested_async(request)
+        assert len(seen) == 1
+        dupe_filter.set_fingerprint_listener(None)
+        await dupe_filter.requested_async(Request('https://example.com/b'))
+        assert len(seen) == 1
+
+    async def test_snapshot_requests_does_not_dequeue(self):
+        from crawlo.queue.queue_manager import QueueConfig, QueueManager
+
+        manager = QueueManager(QueueConfig(queue_type='memory'))
+        await manager.initialize()
+        requests = [Request(f'https://example.com/{i}') for i in range(3)]
+        for request in requests:
+            await manager.put(request)
+
+        snapshot = await manager.snapshot_requests()
+        assert sorted(r.url for r in snapshot) == sorted(r.url for r in requests)
+        assert await manager.size() == 3
+        await manager.close()
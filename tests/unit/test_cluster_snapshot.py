@@ -0,0 +1,151 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+集群控制面往返次数测试（需要 fakeredis + lupa）
+
+测试内容：
+1. 心跳 / 状态更新一次 pipeline，服务端合并字段，不覆盖其他节点写入的字段
+2. get_active_workers 与 Worker 数无关：清理 + 范围查询一次、HMGET 一次
+3. ProgressAggregator.report 一次事务提交，首次上报时间只写一次
+4. ClusterMonitor.status / read_snapshot 一次往返；脚本失败时回退客户端汇总
+"""
+
+import pytest
+
+from crawlo.cluster.monitor import ClusterMonitor
+from crawlo.cluster.progress import ProgressAggregator
+from crawlo.cluster.registry import WorkerRegistry
+from crawlo.queue.backends.redis_stream import RedisStreamQueue
+from crawlo.utils.redis.keys import RedisKeyManager
+
+
+@pytest.fixture
+def redis_client():
+    fakeredis = pytest.importorskip('fakeredis')
+    pytest.importorskip('lupa')
+    return fakeredis.FakeAsyncRedis()
+
+
+def _spy(redis_client):
+    """统计往返次数：客户端直接命令各算一次，pipeline 每次 execute 算一次"""
+    calls = {'round_trips': 0}
+    original_pipeline, original_execute_command = redis_client.pipeline, redis_client.execute_command
+
+    def pipeline(*args, **kwargs):
+        pipe = original_pipeline(*args, **kwargs)
+        execute = pipe.execute
+
+        async def counting_execute(*a, **kw):
+            calls['round_trips'] += 1
+            return await execute(*a, **kw)
+
+        pipe.execute = counting_execute
+        return pipe
+
+    async def execute_command(*args, **kwargs):
+        calls['round_trips'] += 1
+        return await original_execute_command(*args, **kwargs)
+
+    redis_client.pipeline, redis_client.execute_command = pipeline, execute_command
+    return calls
+
+
+async def _workers(redis_client, count):
+    registry = WorkerRegistry(redis_client, RedisKeyManager('test', 'snapshot'))
+    for i in range(count):
+        await registry.register({'id': f'w{i}', 'host': 'h', 'pid': i})
+    return registry
+
+
+class TestRegistry:
+
+    async def test_heartbeat_single_round_trip_merges_fields(self, redis_client):
+        registry = await _workers(redis_client, 1)
+        await registry.update_status('w0', WorkerRegistry.STATUS_SUSPECT, suspect_since=1.0)
+        calls = _spy(redis_client)
+
+        await registry.heartbeat('w0', extra={'tasks_completed': 42})
+        assert calls['round_trips'] == 1
+        info = await registry.get_worker_info('w0')
+        assert info['tasks_completed'] == 42 and info['status'] == 'suspect' and info['suspect_since'] == 1.0
+
+    async def test_heartbeat_unknown_worker_not_registered(self, redis_client):
+        registry = await _workers(redis_client, 0)
+        await registry.heartbeat('ghost')
+        assert await registry.get_worker_info('ghost') is None
+        assert await redis_client.zscore(registry.heartbeats_key, 'worker:ghost') is not None
+
+    async def test_heartbeat_reloads_script_after_flush(self, redis_client):
+        registry = await _workers(redis_client, 1)
+        await redis_client.script_flush()
+        await registry.update_status('w0', WorkerRegistry.STATUS_IDLE)
+        assert (await registry.get_worker_info('w0'))['status'] == 'idle'
+
+    async def test_active_workers_constant_round_trips(self, redis_client):
+        registry = await _workers(redis_client, 50)
+        await redis_client.zadd(registry.heartbeats_key, {'worker:w0': 0})  # 心跳超时
+        calls = _spy(redis_client)
+
+        active = await registry.get_active_workers()
+        assert calls['round_trips'] == 2
+        assert len(active) == 49 and 'w0' not in {w['id'] for w in active}
+
+
+class TestProgress:
+
+    async def test_report_single_transaction(self, redis_client):
+        progress = ProgressAggregator(redis_client, RedisKeyManager('test', 'snapshot'))
+        calls = _spy(redis_client)
+        await progress.report('w0', {'completed': 5, 'failed': 1, 'items': 3})
+        assert calls['round_trips'] == 1
+
+        first = await redis_client.get(progress._first_report_key)
+        await progress.report('w1', {'completed': 2})
+        assert await redis_client.get(progress._first_report_key) == first
+
+        stats = await progress.get_global_stats()
+        assert (stats['total_completed'], stats['total_failed'], stats['total_items']) == (7, 1, 3)
+        assert (await progress.get_worker_stats('w1'))['completed'] == 2
+
+
+class TestSnapshot:
+
+    async def _monitor(self, redis_client):
+        registry = await _workers(redis_client, 3)
+        await registry.update_status('w2', WorkerRegistry.STATUS_IDLE)
+        progress = ProgressAggregator(redis_client, RedisKeyManager('test', 'snapshot'))
+        await progress.report('w0', {'completed': 4})
+        queue = RedisStreamQueue('redis://localhost:6379', project_name='test', spider_name='snapshot')
+        queue._redis, queue._connected = redis_client, True
+        await queue._ensure_consumer_groups()
+        for i in range(3):
+            await redis_client.xadd(queue.stream, {'data': str(i)})
+        await redis_client.xadd(queue.failed_stream, {'data': 'dead'})
+        await redis_client.xreadgroup(queue.group_name, 'w0', {queue.stream: '>'}, count=2)
+        return ClusterMonitor(registry, progress, stream_queue=queue)
+
+    async def test_status_one_round_trip(self, redis_client):
+        monitor = await self._monitor(redis_client)
+        calls = _spy(redis_client)
+
+        status = await monitor.status()
+        assert calls['round_trips'] == 1
+        assert status['workers'] == {'active': 2, 'idle': 1, 'total': 3, 'registered': 3}
+        assert status['queue']['pending'] == 3 and status['queue']['processing'] == 2
+        assert status['queue']['streams']['main']['consumers'] == ['w0']
+        assert status['dead_letter'] == {'total': 1} and status['progress']['completed'] == 4
+
+    async def test_snapshot_keys_match_components(self, redis_client):
+        monitor = await self._monitor(redis_client)
+        assert ClusterMonitor.snapshot_keys('test:snapshot') == monitor._snapshot_keys()
+
+    async def test_falls_back_when_script_fails(self, redis_client, monkeypatch):
+        monitor = await self._monitor(redis_client)
+        monkeypatch.setattr('crawlo.cluster.monitor._WORKER_SUMMARY_LUA', "return redis.error_reply('CROSSSLOT')")
+
+        status = await monitor.status()
+        assert status['workers'] == {'active': 2, 'idle': 1, 'total': 3, 'registered': 3}
+
+    async def test_empty_without_components(self):
+        status = await ClusterMonitor(None, None).status()
+        assert status['workers']['total'] == 0 and status['queue']['pending'] == 0
@@ -0,0 +1,94 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+紧凑指纹存储（MEMORY_FILTER_COMPACT）测试
+
+测试内容：
+1. CompactFingerprintStore 判重、set 兼容接口、16 位摘要导出可回灌
+2. 分代淘汰确定性：最老一代整代丢弃，命中旧代的指纹被提升保留
+3. MemoryFilter 紧凑模式端到端判重与真实内存统计
+"""
+
+import hashlib
+
+from crawlo.filters.fingerprint_store import CompactFingerprintStore, fingerprint_digest
+from crawlo.filters.memory_filter import MemoryFilter
+from crawlo.http.request import Request
+
+
+def _fp(i):
+    return hashlib.md5(str(i).encode()).hexdigest()  # nosec B324
+
+
+class _Settings:
+    def __init__(self, data):
+        self._data = data
+
+    def get(self, key, default=None):
+        return self._data.get(key, default)
+
+
+class _Crawler:
+    def __init__(self, data=None):
+        self.settings = _Settings(data or {})
+        self.stats = None
+
+
+class TestCompactFingerprintStore:
+
+    def test_check_and_add(self):
+        store = CompactFingerprintStore(100)
+        assert store.check_and_add(_fp(1)) is False
+        assert store.check_and_add(_fp(1)) is True
+        assert _fp(1) in store and _fp(2) not in store
+        assert len(store) == 1
+
+    def test_digest_export_roundtrip(self):
+        store = CompactFingerprintStore(100)
+        store.update(_fp(i) for i in range(10))
+        restored = CompactFingerprintStore(100)
+        restored.update(set(store))
+        assert all(_fp(i) in restored for i in range(10))
+        assert fingerprint_digest('not-a-hex-fingerprint') == fingerprint_digest('not-a-hex-fingerprint')
+
+    def test_generational_eviction_is_deterministic(self):
+        store = CompactFingerprintStore(10)  # 每代 5 条
+        for i in range(5):
+            store.add(_fp(i))               # 第 1 代
+        for i in range(5, 10):
+            store.add(_fp(i))               # 换代：第 1 代降为 previous
+        store.add(_fp(0))                   # 命中 previous；current 已满 → 换代，第 1 代丢弃，0 被提升保留
+
+        assert _fp(0) in store
+        assert all(_fp(i) not in store for i in range(1, 5))
+        assert all(_fp(i) in store for i in range(5, 10))
+        assert store.evicted == 4
+        assert len(store) == 6
+
+    def test_memory_is_digest_tables_only(self):
+        store = CompactFingerprintStore(200_000)
+        store.update(_fp(i) for i in range(100_000))
+        # 8 字节/槽，装载率 ≤ 0.7
+        assert store.nbytes <= 100_000 / 0.35 * 8
+
+
+class TestMemoryFilterCompact:
+
+    async def test_dedup_in_compact_mode(self):
+        dupe_filter = MemoryFilter(_Crawler({'MEMORY_FILTER_COMPACT': True, 'MEMORY_FILTER_MAX_CAPACITY': 1000}))
+        request = Request(url='http://example.com/a')
+
+        assert isinstance(dupe_filter.fingerprints, CompactFingerprintStore)
+        assert await dupe_filter.requested_async(request) is False
+        assert await dupe_filter.requested_async(request) is True
+
+        stats = dupe_filter.stats_summary
+        assert stats['store'] == 'compact'
+        assert stats['uniques'] == 1 and stats['duplicates'] == 1
+        assert stats['memory_usage'].endswith('KB')
+
+    async def test_set_mode_unchanged_by_default(self):
+        dupe_filter = MemoryFilter(_Crawler())
+        await dupe_filter.requested_async(Request(url='http://example.com/a'))
+        assert isinstance(dupe_filter.fingerprints, set)
+        assert dupe_filter.stats_summary['store'] == 'set'
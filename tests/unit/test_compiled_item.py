@@ -0,0 +1,85 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+编译型 Item 测试（CompiledItem）
+
+测试内容：
+1. 字段按声明顺序存放在 __slots__ 中，实例没有 __dict__；to_dict / to_tuple 顺序同 FIELD_NAMES
+2. MutableMapping 语义、默认值与校验规则与 Item 一致，未声明字段抛出 KeyError
+3. coerce=True 时按 field_type 转换类型
+4. 子类继承字段与槽位；isinstance(item, Item)；copy / pickle
+"""
+import pickle
+
+import pytest
+
+from crawlo.items import CompiledItem, Field, Item
+from crawlo.items.exceptions import ItemAttributeError, ItemInitError
+
+
+class ProductItem(CompiledItem):
+    title = Field(nullable=False)
+    price = Field(field_type=float)
+    stock = Field(field_type=int, default=0)
+    url = Field()
+
+
+class TypedProductItem(ProductItem):
+    coerce = True
+    available = Field(field_type=bool)
+
+
+class TestCompiledItem:
+
+    def test_slots_and_positional_export(self):
+        item = ProductItem(url='https://example.com/p/1', title='pen')
+        assert not hasattr(item, '__dict__')
+        assert ProductItem.FIELD_NAMES == ('title', 'price', 'stock', 'url')
+        assert item.to_tuple() == ('pen', None, 0, 'https://example.com/p/1')
+        assert item.to_dict() == {'title': 'pen', 'stock': 0, 'url': 'https://example.com/p/1'}
+        assert list(item.to_dict()) == ['title', 'stock', 'url']
+
+    def test_mapping_semantics(self):
+        item = ProductItem(title='pen')
+        item['price'] = 1.5
+        assert 'price' in item and item['price'] == 1.5 and len(item) == 3
+        del item['price']
+        assert 'price' not in item and item.get('price') is None
+        with pytest.raises(KeyError):
+            item['price']
+        with pytest.raises(KeyError):
+            item['color'] = 'red'
+        with pytest.raises(KeyError):
+            ProductItem(color='red')
+        with pytest.raises(ItemInitError):
+            ProductItem('pen')
+        with pytest.raises(ItemAttributeError):
+            item.title
+        assert dict(item) == item.to_dict() and item == Item(title='pen', stock=0)
+
+    def test_validation_matches_field_rules(self):
+        with pytest.raises(ValueError):
+            ProductItem(title='')
+        with pytest.raises(TypeError):
+            ProductItem(title='pen', price='1.5')
+        assert ProductItem(title='pen', stock=None)['stock'] == 0
+
+    def test_coerce(self):
+        item = TypedProductItem(title='pen', price='1.5', stock=' 3 ', available='no')
+        assert item.to_tuple() == ('pen', 1.5, 3, None, False)
+        item['available'] = 'YES'
+        assert item['available'] is True
+        with pytest.raises(TypeError):
+            item['stock'] = 'three'
+
+    def test_inheritance_isinstance_and_copy(self):
+        assert TypedProductItem.__slots__ == ('_f_available',)
+        item = TypedProductItem(title='pen', url='u', available=True)
+        assert isinstance(item, Item) and issubclass(TypedProductItem, Item)
+
+        clone = item.copy()
+        clone['title'] = 'pencil'
+        assert item['title'] == 'pen' and 'price' not in clone
+        restored = pickle.loads(pickle.dumps(item))
+        assert restored == item and restored.to_tuple() == item.to_tuple()
+        assert 'price' not in restored
@@ -0,0 +1,230 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+DiskQueue 组提交 / 预取 / 计数器测试
+
+测试内容：
+1. size() 由内存计数器维护，max_size 按计数器拒绝（put_batch 超出容量的部分被拒绝）
+2. 组提交：攒满 batch_size 或超过 commit_interval 后一次事务写入，SQLite 操作在 writer 线程执行；
+   提交失败时已确认的入队留在缓冲重试，同步提交的调用方收到 False
+3. 出队：优先级顺序包含尚未提交的入队；get_batch 一次预取；空队列等待时被 put 唤醒
+4. 重启：已出队未确认的条目重新投递，close 提交确认
+"""
+
+import asyncio
+import sqlite3
+import threading
+
+import pytest
+
+from crawlo.queue.backends.disk import DiskQueue, DiskQueueConfig
+
+
+async def _open(tmp_path, **kwargs):
+    kwargs.setdefault('commit_interval', 10.0)
+    queue = DiskQueue(DiskQueueConfig(path=str(tmp_path), name='q', **kwargs))
+    await queue.open()
+    return queue
+
+
+def _rows(queue, processed=None):
+    sql = f"SELECT COUNT(*) FROM {queue._config.table_name}"
+    if processed is not None:
+        sql += f" WHERE processed = {int(processed)}"
+    with sqlite3.connect(queue._db_path) as conn:
+        return conn.execute(sql).fetchone()[0]
+
+
+class TestSizeAndGroupCommit:
+
+    async def test_counter_and_max_size(self, tmp_path):
+        queue = await _open(tmp_path, max_size=2)
+        try:
+            assert await queue.put('a') and await queue.put('b')
+            assert await queue.size() == 2 and _rows(queue) == 0
+            assert not await queue.put('c')
+            await queue.get()
+            assert await queue.size() == 1 and await queue.put('c')
+        finally:
+            await queue.close()
+
+    async def test_commit_on_batch_size(self, tmp_path):
+        queue = await _open(tmp_path, batch_size=3)
+        threads = []
+        original = queue._write_batch
+
+        def write_batch(puts, acks):
+            threads.append(threading.current_thread().name)
+            return original(puts, acks)
+
+        queue._write_batch = write_batch
+        try:
+            await queue.put('a')
+            await queue.put('b')
+            assert _rows(queue) == 0 and not threads
+            await queue.put('c')
+            assert _rows(queue) == 3
+            assert threads == [threads[0]] and threads[0].startswith('disk-queue-q')
+        finally:
+            await queue.close()
+
+    async def test_commit_on_interval(self, tmp_path):
+        queue = await _open(tmp_path, commit_interval=0.02)
+        try:
+            await queue.put('a')
+            assert _rows(queue) == 0
+            await asyncio.sleep(0.1)
+            assert _rows(queue) == 1
+        finally:
+            await queue.close()
+
+    async def test_zero_interval_commits_each_put(self, tmp_path):
+        queue = await _open(tmp_path, commit_interval=0)
+        try:
+            await queue.put('a')
+            assert _rows(queue) == 1
+        finally:
+            await queue.close()
+
+    async def test_failed_commit_keeps_acknowledged_puts(self, tmp_path):
+        queue = await _open(tmp_path, batch_size=2)
+        original = queue._write_batch
+
+        def failing_write_batch(puts, acks):
+            raise sqlite3.OperationalError('disk I/O error')
+
+        queue._write_batch = failing_write_batch
+        try:
+            assert await queue.put('a')
+            assert not await queue.put('b')
+            assert await queue.size() == 1 and _rows(queue) == 0
+
+            queue._write_batch = original
+            assert await queue.put_batch(['c']) == 1
+            assert _rows(queue) == 2
+            assert await queue.get_batch(5, timeout=0) == ['a', 'c']
+        finally:
+            await queue.close()
+
+    async def test_put_batch_respects_max_size(self, tmp_path):
+        queue = await _open(tmp_path, max_size=3)
+        try:
+            assert await queue.put('a')
+            assert await queue.put_batch(['b', 'c', 'd', 'e']) == 2
+            assert await queue.size() == 3 and _rows(queue) == 3
+            assert await queue.put_batch(['f']) == 0
+            assert queue._stats.rejected_count == 3
+        finally:
+            await queue.close()
+
+    async def test_failed_commit_skips_refill(self, tmp_path):
+        queue = await _open(tmp_path)
+        original = queue._write_batch
+        try:
+            await queue.put_batch(['a', 'b'])
+            assert await queue.get_batch(1, timeout=0) == ['a']
+            queue._prefetched.clear()
+
+            def failing_write_batch(puts, acks):
+                raise sqlite3.OperationalError('disk I/O error')
+
+            queue._write_batch = failing_write_batch
+            assert await queue.get_batch(5, timeout=0) == []
+
+            queue._write_batch = original
+            assert await queue.get_batch(5, timeout=0) == ['b']
+        finally:
+            await queue.close()
+
+    async def test_extended_stats_uses_counters(self, tmp_path):
+        queue = await _open(tmp_path)
+        try:
+            await queue.put_batch(['a', 'b'])
+            await queue.put('c')
+            stats = queue.get_extended_stats()
+            assert stats['total_items'] == 2 and stats['uncommitted_puts'] == 1
+        finally:
+            await queue.close()
+        assert queue.get_extended_stats()['total_items'] == 3
+
+    def test_max_connections_deprecated(self, tmp_path):
+        with pytest.warns(DeprecationWarning):
+            DiskQueueConfig(path=str(tmp_path), max_connections=5)
+
+    async def test_open_without_wal(self, tmp_path):
+        queue = await _open(tmp_path, WAL_mode=False, commit_interval=0)
+        try:
+            assert await queue.put('a') and await queue.get() == 'a'
+        finally:
+            await queue.close()
+
+
+class TestGet:
+
+    async def test_priority_order_includes_uncommitted_puts(self, tmp_path):
+        queue = await _open(tmp_path)
+        try:
+            await queue.put_batch(['low-1', 'low-2'], default_priority=10)
+            await queue.put('high', priority=1)
+            assert [await queue.get() for _ in range(3)] == ['high', 'low-1', 'low-2']
+            assert await queue.get() is None
+        finally:
+            await queue.close()
+
+    async def test_get_batch_prefetches_once(self, tmp_path):
+        queue = await _open(tmp_path, prefetch_size=8)
+        fetches = []
+        original = queue._fetch_pending
+        queue._fetch_pending = lambda limit: fetches.append(limit) or original(limit)
+        try:
+            await queue.put_batch([f'item-{i}' for i in range(10)])
+            assert await queue.get_batch(3, timeout=0) == ['item-0', 'item-1', 'item-2']
+            assert fetches == [8] and len(queue._prefetched) == 5
+            assert len(await queue.get_batch(20, timeout=0)) == 7
+            assert await queue.size() == 0
+        finally:
+            await queue.close()
+
+    async def test_waiting_get_woken_by_put(self, tmp_path):
+        queue = await _open(tmp_path)
+        try:
+            waiter = asyncio.create_task(queue.get(timeout=2))
+            await asyncio.sleep(0.05)
+            await queue.put('late')
+            assert await asyncio.wait_for(waiter, 1) == 'late'
+            assert await queue.get(timeout=0.05) is None
+        finally:
+            await queue.close()
+
+
+class TestRestart:
+
+    async def test_unacked_items_redelivered_after_crash(self, tmp_path):
+        queue = await _open(tmp_path)
+        await queue.put_batch(['a', 'b', 'c'])
+        assert await queue.get() == 'a'
+        # 进程在此处崩溃：出队确认尚未提交
+        queue._closed = True
+        queue._flush_task.cancel()
+
+        reopened = await _open(tmp_path)
+        try:
+            assert await reopened.size() == 3
+            assert await reopened.get_batch(3, timeout=0) == ['a', 'b', 'c']
+        finally:
+            await reopened.close()
+
+    async def test_close_commits_acks(self, tmp_path):
+        queue = await _open(tmp_path)
+        await queue.put_batch(['a', 'b', 'c'])
+        assert await queue.get() == 'a'
+        await queue.put('d')
+        await queue.close()
+        assert _rows(queue, processed=True) == 1
+
+        reopened = await _open(tmp_path)
+        try:
+            assert await reopened.size() == 3
+            assert await reopened.get_batch(5, timeout=0) == ['b', 'c', 'd']
+        finally:
+            await reopened.close()
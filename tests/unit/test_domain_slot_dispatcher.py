@@ -0,0 +1,150 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+DomainSlotDispatcher 按主机槽位派发测试
+
+测试内容：
+1. DomainSlots 每主机并发上限、FIFO 等待、启动间隔
+2. AIMD：慢响应同一窗口只减半一次，一轮快速完成后 +1
+3. 忙碌主机的请求暂缓且不创建任务，其它主机照常派发；释放后由 next_batch 取回
+4. 有暂缓请求时不退出；分布式令牌桶拒绝时按等待时间延后
+5. DownloadDelayMiddleware 对已准入请求不再 sleep
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, Mock
+
+from crawlo.core.engine import Engine
+from crawlo.core.engine_dispatch import DomainSlotDispatcher
+from crawlo.core.scheduling.domain_slots import DomainSlots
+from crawlo.http.request import Request
+from crawlo.middleware.download_delay import DownloadDelayMiddleware
+
+
+def _make_crawler(overrides=None):
+    overrides = overrides or {}
+    crawler = Mock()
+    crawler.settings = Mock()
+    crawler.settings.get = Mock(side_effect=lambda key, default=None: overrides.get(key, default))
+    return crawler
+
+
+def _req(host, path='/'):
+    return Request(url=f'http://{host}{path}')
+
+
+class TestDomainSlots:
+
+    def test_per_host_concurrency_and_fifo(self):
+        slots = DomainSlots(concurrency=2)
+        a1, a2, a3, a4 = (_req('a.com', f'/{i}') for i in range(4))
+        slot = slots.slot_for(a1)
+
+        assert slots.admit(slot, a1, now=0) and slots.admit(slot, a2, now=0)
+        assert not slots.admit(slot, a3, now=0)
+        assert not slots.admit(slot, a4, now=0)
+        assert slots.admit(slots.slot_for(_req('b.com')), _req('b.com'), now=0)
+        assert slots.pop_ready(10, now=0) == []
+
+        slots.release(slot, elapsed=0.1)
+        assert slots.pop_ready(10) == [a3]
+        assert slots.deferred_count == 1
+
+    def test_delay_between_starts(self):
+        slots = DomainSlots(concurrency=8, delay=1.0, delay_overrides={'*.fast.com': 0})
+        slot = slots.slot_for(_req('a.com'))
+        assert slots.admit(slot, _req('a.com', '/1'), now=100)
+        assert not slots.admit(slot, _req('a.com', '/2'), now=100.2)
+
+        assert slots.pop_ready(10, now=100.5) == []
+        assert slots.next_ready_in(now=100.5) == 0.5
+        assert len(slots.pop_ready(10, now=101.0)) == 1
+        assert slots.slot_for(_req('api.fast.com')).delay == 0
+
+    def test_aimd(self):
+        slots = DomainSlots(concurrency=8, autothrottle=True, target_latency=1.0)
+        slot = slots.slot_for(_req('a.com'))
+        for _ in range(3):
+            slots.start(slot)
+        for _ in range(3):
+            slots.release(slot, elapsed=5.0)
+        assert slot.concurrency == 4          # 同一窗口只减半一次
+
+        for _ in range(4):
+            slots.start(slot)
+            slots.release(slot, elapsed=0.1)
+        assert slot.concurrency == 5
+
+
+class TestDomainSlotDispatcher:
+
+    def _make_engine(self, **overrides):
+        settings = {'DOMAIN_SLOT_CONCURRENCY': 1, 'DOWNLOAD_DELAY': 0, **overrides}
+        engine = Engine(_make_crawler(settings), dispatcher_cls=DomainSlotDispatcher)
+        engine.scheduler = Mock()
+        return engine
+
+    async def test_busy_host_deferred_without_task(self):
+        engine = self._make_engine()
+        dispatcher = engine._dispatcher
+        started = []
+
+        async def fake_crawl(request):
+            started.append(request)
+
+        engine._crawl = fake_crawl
+        slow1, slow2, other = _req('slow.com', '/1'), _req('slow.com', '/2'), _req('other.com')
+
+        await dispatcher.dispatch_requests([slow1, slow2, other], max_inflight=10)
+        await asyncio.gather(*engine._background_tasks)
+
+        assert started == [slow1, other]
+        assert dispatcher.has_deferred()
+        assert slow1.meta['_domain_slot'] == 'slow.com'
+
+        engine.scheduler.next_requests = AsyncMock(return_value=[])
+        assert await dispatcher.next_batch(10, 10) == []
+
+        engine._request_done(slow1, 0.1, False)
+        batch = await dispatcher.next_batch(10, 10)
+        assert batch == [slow2]
+        await dispatcher.dispatch_requests(batch, max_inflight=10)
+        await asyncio.gather(*engine._background_tasks)
+        assert started == [slow1, other, slow2]
+        assert not dispatcher.has_deferred()
+
+    async def test_does_not_exit_with_deferred_requests(self):
+        engine = self._make_engine()
+        dispatcher = engine._dispatcher
+        engine._crawl = AsyncMock()
+        await dispatcher.dispatch_requests([_req('a.com', '/1'), _req('a.com', '/2')], max_inflight=10)
+
+        should_exit, _ = await dispatcher.should_exit()
+        assert should_exit is False
+        assert await dispatcher.exit_fast() is False
+
+    async def test_distributed_rate_limit_postpones(self):
+        engine = self._make_engine(DOMAIN_SLOT_CONCURRENCY=4)
+        dispatcher = engine._dispatcher
+        engine._crawl = AsyncMock()
+        limiter = Mock(enabled=True)
+        limiter.reserve = AsyncMock(side_effect=[0.0, 0.5])
+        engine._cluster_state.rate_limiter = limiter
+
+        await dispatcher.dispatch_requests([_req('a.com', '/1'), _req('a.com', '/2')], max_inflight=10)
+
+        assert engine._crawl.call_count == 1
+        assert dispatcher.slots.deferred_count == 1
+        assert 0 < dispatcher.slots.next_ready_in() <= 0.5
+
+
+class TestDownloadDelayMiddleware:
+
+    async def test_skips_requests_admitted_by_domain_slots(self):
+        middleware = DownloadDelayMiddleware(delay=10)
+        request = _req('a.com')
+        middleware._last_request_time['a.com'] = time.time()
+        request.meta['_domain_slot'] = 'a.com'
+
+        assert await asyncio.wait_for(middleware.process_request(request, None), timeout=0.5) is None
@@ -0,0 +1,128 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+FailoverManager 批量回收测试（需要 fakeredis + lupa）
+
+测试内容：
+1. 崩溃 Worker 的 pending 消息按页回收，每页一次 pipeline，不再 XRANGE 回读
+2. 重新入队的消息 retry_count + 1 并带 failover_from；达到投递上限的转入死信并保留原字段
+3. 消息体已删除的 PEL 条目只做 XACK；XAUTOCLAIM 与 XPENDING + XCLAIM 两条路径结果一致
+4. 提交失败时整页保持 pending
+"""
+
+import asyncio
+
+import pytest
+
+from crawlo.cluster.failover import FailoverManager
+from crawlo.http.request import Request
+from crawlo.queue.backends.redis_stream import RedisStreamQueue
+
+
+@pytest.fixture
+def redis_client():
+    fakeredis = pytest.importorskip('fakeredis')
+    pytest.importorskip('lupa')
+    return fakeredis.FakeAsyncRedis()
+
+
+async def _queue(redis_client, consumer, delivery_count_limit=3):
+    queue = RedisStreamQueue(
+        'redis://localhost:6379', project_name='test', spider_name='failover',
+        consumer_name=consumer, consumer_idle_timeout=1, delivery_count_limit=delivery_count_limit,
+    )
+    queue._redis = redis_client
+    queue._connected = True
+    await queue._ensure_consumer_groups()
+    return queue
+
+
+async def _crash_holding(redis_client, queue, count, retry_count=0):
+    """dead-worker 读取 count 条消息后崩溃（不 ACK）"""
+    for i in range(count):
+        await redis_client.xadd(queue.stream, {'data': f'payload-{i}', 'retry_count': str(retry_count)})
+    await redis_client.xreadgroup(queue.group_name, 'dead-worker', {queue.stream: '>'}, count=count)
+    await asyncio.sleep(0.01)
+
+
+def _manager(queue, redis_client, page_size):
+    manager = FailoverManager(None, queue, None, redis_client)
+    manager.claim_page_size = page_size
+    return manager
+
+
+def _spy(redis_client):
+    calls = {'execute': 0, 'xrange': 0}
+    original_pipeline, original_xrange = redis_client.pipeline, redis_client.xrange
+
+    def pipeline(*args, **kwargs):
+        pipe = original_pipeline(*args, **kwargs)
+        execute = pipe.execute
+
+        async def counting_execute(*a, **kw):
+            calls['execute'] += 1
+            return await execute(*a, **kw)
+
+        pipe.execute = counting_execute
+        return pipe
+
+    async def xrange(*args, **kwargs):
+        calls['xrange'] += 1
+        return await original_xrange(*args, **kwargs)
+
+    redis_client.pipeline, redis_client.xrange = pipeline, xrange
+    return calls
+
+
+class TestBatchRecovery:
+
+    @pytest.mark.parametrize('xautoclaim', [True, False])
+    async def test_recovers_all_pending_one_pipeline_per_page(self, redis_client, xautoclaim):
+        queue = await _queue(redis_client, 'rescuer')
+        queue._has_xautoclaim = xautoclaim
+        await _crash_holding(redis_client, queue, 25)
+        calls = _spy(redis_client)
+
+        assert await _manager(queue, redis_client, 10)._claim_worker_tasks('dead-worker') == 25
+        assert calls == {'execute': 3, 'xrange': 0}
+        assert (await redis_client.xpending(queue.stream, queue.group_name))['pending'] == 0
+
+        entries = await redis_client.xrange(queue.stream)
+        assert len(entries) == 25
+        fields = entries[0][1]
+        assert fields[b'retry_count'] == b'1' and fields[b'failover_from'] == b'dead-worker'
+        assert {f[b'data'] for _, f in entries} == {f'payload-{i}'.encode() for i in range(25)}
+
+    async def test_escalates_at_delivery_limit(self, redis_client):
+        queue = await _queue(redis_client, 'rescuer', delivery_count_limit=2)
+        await _crash_holding(redis_client, queue, 3, retry_count=2)
+
+        assert await _manager(queue, redis_client, 100)._claim_worker_tasks('dead-worker') == 3
+        assert await redis_client.xlen(queue.stream) == 0
+        dead = await redis_client.xrange(queue.failed_stream)
+        assert len(dead) == 3
+        assert dead[0][1][b'data'] == b'payload-0' and dead[0][1][b'retry_count'] == b'2'
+        assert b'crashed' in dead[0][1][b'dead_reason']
+
+    async def test_deleted_message_only_acked(self, redis_client):
+        queue = await _queue(redis_client, 'rescuer')
+        await _crash_holding(redis_client, queue, 2)
+        (first_id, _), _ = await redis_client.xrange(queue.stream)
+        await redis_client.xdel(queue.stream, first_id)
+        queue._has_xautoclaim = False
+
+        await _manager(queue, redis_client, 100)._claim_worker_tasks('dead-worker')
+        assert (await redis_client.xpending(queue.stream, queue.group_name))['pending'] == 0
+        assert await redis_client.xlen(queue.stream) == 1
+
+    async def test_failed_page_left_pending(self, redis_client):
+        queue = await _queue(redis_client, 'rescuer')
+        await _crash_holding(redis_client, queue, 5)
+
+        async def broken(*args, **kwargs):
+            raise ConnectionError('connection lost')
+
+        queue.requeue_claimed = broken
+        assert await _manager(queue, redis_client, 100)._claim_worker_tasks('dead-worker') == 0
+        assert (await redis_client.xpending(queue.stream, queue.group_name))['pending'] == 5
+        assert await redis_client.xlen(queue.stream) == 5
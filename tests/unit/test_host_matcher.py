@@ -0,0 +1,104 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+HostMatcher 测试（反转标签 Trie + 主机名归一化 + 判定缓存）
+
+测试内容：
+1. 子域名匹配按标签边界，最具体的规则生效；精确模式只匹配主机名本身
+2. 端口 / 认证信息 / 大小写 / 末尾点 / IDNA 归一化
+3. 判定缓存有上限，添加规则后失效
+4. OffsiteMiddleware 与 HybridDownloader 的域名判定
+"""
+
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from crawlo.utils.host_matcher import HostMatcher, normalize_host, url_host
+
+
+class TestHostMatcher:
+
+    def test_subdomains_on_label_boundary(self):
+        matcher = HostMatcher(['example.com', '*.shop.example.org', '.news.net'])
+        assert matcher.match('example.com') and matcher.match('a.b.example.com')
+        assert not matcher.match('badexample.com') and not matcher.match('com')
+        assert matcher.match('x.shop.example.org') and not matcher.match('example.org')
+        assert matcher.match('news.net') and len(matcher) == 3
+
+    def test_most_specific_rule_wins(self):
+        matcher = HostMatcher()
+        matcher.add('example.com', 'parent')
+        matcher.add('api.example.com', 'child')
+        assert matcher.lookup('v1.api.example.com') == 'child'
+        assert matcher.lookup('www.example.com') == 'parent'
+
+    def test_exact_mode(self):
+        matcher = HostMatcher(['www.example.com'], include_subdomains=False)
+        assert matcher.match('WWW.example.com:8080')
+        assert not matcher.match('a.www.example.com') and not matcher.match('example.com')
+
+    def test_normalization(self):
+        assert normalize_host('User:pw@WWW.Example.COM.:443') == 'www.example.com'
+        assert normalize_host('[::1]:8080') == '[::1]'
+        assert normalize_host('münchen.de') == 'xn--mnchen-3ya.de'
+        assert url_host('https://Bücher.example/x?y') == 'xn--bcher-kva.example'
+        assert url_host('not_a_valid_url') == ''
+        assert HostMatcher(['münchen.de']).match('www.xn--mnchen-3ya.de')
+        assert HostMatcher(['xn--mnchen-3ya.de']).lookup_url('http://www.münchen.de/')
+
+    def test_cache_bounded_and_invalidated(self):
+        matcher = HostMatcher(['a.com'], cache_size=2)
+        for host in ('a.com', 'b.com', 'c.com'):
+            matcher.match(host)
+        assert len(matcher._cache) <= 2
+        assert not matcher.match('b.com')
+        matcher.add('b.com')
+        assert matcher.match('b.com')
+
+
+class TestOffsite:
+
+    def _middleware(self, domains):
+        from crawlo.middleware.offsite import OffsiteMiddleware
+        middleware = OffsiteMiddleware(stats=Mock(), allowed_domains=domains)
+        middleware._compile_domains()
+        return middleware
+
+    def test_ports_case_and_invalid_urls(self):
+        middleware = self._middleware(['Example.com'])
+        assert not middleware._is_offsite_request(SimpleNamespace(url='https://WWW.example.com:8443/a'))
+        assert middleware._is_offsite_request(SimpleNamespace(url='https://example.com.evil.net/'))
+        assert middleware._is_offsite_request(SimpleNamespace(url='example.com/no-scheme'))
+
+
+class TestHybridRouting:
+
+    def _hybrid(self, **settings):
+        from crawlo.downloader.hybrid_downloader import HybridDownloader
+        crawler = Mock()
+        crawler.settings.get.return_value = 'aiohttp'
+        crawler.settings.get_list.side_effect = lambda key, default=None: settings.get(key, [])
+        crawler.settings.get_bool.return_value = False
+        return HybridDownloader(crawler)
+
+    def test_domains_exact_host_dynamic_first(self):
+        from crawlo.http.request import Request
+        hybrid = self._hybrid(HYBRID_DYNAMIC_DOMAINS=['spa.example.com'],
+                              HYBRID_PROTOCOL_DOMAINS=['spa.example.com', 'api.example.com'])
+        assert hybrid._determine_downloader_type(Request(url='https://SPA.example.com:8443/x')) == 'dynamic'
+        assert hybrid._determine_downloader_type(Request(url='https://api.example.com/x')) == 'protocol'
+        # 子域名不继承（与原实现一致）
+        assert hybrid._domain_matcher.lookup('v2.api.example.com') is None
+
+    def test_url_patterns_combined(self):
+        from crawlo.http.request import Request
+        hybrid = self._hybrid(HYBRID_DYNAMIC_URL_PATTERNS=[r'/spa/', r'render=(1|true)'],
+                              HYBRID_PROTOCOL_URL_PATTERNS=[r'(\w+)/\1', r'(?i)/API/'])
+        assert hybrid._dynamic_url_regex is not None
+        # 反向引用 / 内联全局标志不参与合并，逐条匹配
+        assert hybrid._protocol_url_regex is None
+        assert hybrid._determine_downloader_type(Request(url='https://a.com/x?render=true')) == 'dynamic'
+        assert hybrid._determine_downloader_type(Request(url='https://a.com/api/v1')) == 'protocol'
+        assert hybrid._determine_downloader_type(Request(url='https://a.com/ab/ab')) == 'protocol'
+        assert hybrid._determine_downloader_type(Request(url='https://a.com/IMG.PNG')) == 'protocol'
+        assert hybrid._determine_downloader_type(Request(url='https://a.com/page.html')) == 'protocol'
@@ -0,0 +1,136 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+HttpXDownloader 代理客户端缓存测试
+
+测试内容：
+1. 同一代理 URL 复用同一客户端，不同代理各自独立
+2. 超过缓存上限按 LRU 淘汰；使用中的客户端待释放后再关闭
+3. 空闲过期、close() 关闭全部缓存客户端；并发过期 / close 后释放不抛异常
+4. 代理/直连重试的严格超时作为请求级超时传入，不新建客户端
+"""
+
+import asyncio
+from unittest.mock import Mock, patch
+
+import httpx
+
+from crawlo.downloader.httpx_downloader import HttpXDownloader, _ProxyClientCache
+from crawlo.http.request import Request
+from crawlo.settings.setting_manager import SettingManager
+
+
+def _mock_client(seen_timeouts=None):
+    def handler(request):
+        if seen_timeouts is not None:
+            seen_timeouts.append(request.extensions.get('timeout'))
+        return httpx.Response(200, content=b'ok')
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def _downloader(**settings):
+    settings_manager = SettingManager()
+    for key, value in settings.items():
+        settings_manager.set(key, value)
+    crawler = Mock()
+    crawler.settings = settings_manager
+    downloader = HttpXDownloader(crawler)
+    with patch('crawlo.downloader.MiddlewareManager.create_instance'):
+        downloader.open()
+    return downloader
+
+
+class TestProxyClientCache:
+
+    async def test_reuses_client_per_proxy(self):
+        cache = _ProxyClientCache(lambda proxy: _mock_client())
+        first = await cache.acquire('http://p1:8080')
+        await cache.release(first)
+        second = await cache.acquire('http://p1:8080')
+        other = await cache.acquire('http://p2:8080')
+
+        assert second.client is first.client
+        assert other.client is not first.client
+        assert cache.created == 2 and cache.reused == 1
+        await cache.close()
+
+    async def test_lru_eviction_defers_close_until_released(self):
+        cache = _ProxyClientCache(lambda proxy: _mock_client(), max_size=2)
+        in_use = await cache.acquire('http://p1:8080')
+        await cache.release(await cache.acquire('http://p2:8080'))
+        await cache.release(await cache.acquire('http://p3:8080'))
+
+        assert 'http://p1:8080' not in cache and len(cache) == 2
+        assert not in_use.client.is_closed
+        await cache.release(in_use)
+        assert in_use.client.is_closed
+        await cache.close()
+
+    async def test_idle_expiry_and_close_all(self):
+        cache = _ProxyClientCache(lambda proxy: _mock_client(), idle_timeout=60)
+        idle = await cache.acquire('http://p1:8080')
+        await cache.release(idle)
+        idle.last_used -= 120
+        fresh = await cache.acquire('http://p2:8080')
+
+        assert idle.client.is_closed and 'http://p1:8080' not in cache
+        await cache.close()
+        assert fresh.client.is_closed and len(cache) == 0
+
+    async def test_concurrent_expiry_and_release_after_close(self):
+        cache = _ProxyClientCache(lambda proxy: _mock_client(), max_size=1, idle_timeout=60)
+        in_use = await cache.acquire('http://p1:8080')
+        await cache.acquire('http://p2:8080')  # p1 被淘汰但仍在使用
+        await cache.close()
+        await cache.release(in_use)  # close() 已清空 _retired，不再抛出 ValueError
+
+        cache = _ProxyClientCache(lambda proxy: _mock_client(), idle_timeout=60)
+        for proxy in ('http://p1:8080', 'http://p2:8080'):
+            entry = await cache.acquire(proxy)
+            await cache.release(entry)
+            entry.last_used -= 120
+        await asyncio.gather(cache.acquire('http://p3:8080'), cache.acquire('http://p4:8080'))
+        assert len(cache) == 2 and 'http://p1:8080' not in cache
+        await cache.close()
+
+
+class TestHttpXDownloaderProxyClients:
+
+    async def test_proxied_requests_share_client_with_request_timeout(self):
+        downloader = _downloader(HTTPX_PROXY_CLIENT_CACHE_SIZE=4)
+        timeouts = []
+        created = []
+
+        def factory(proxy):
+            created.append(proxy)
+            return _mock_client(timeouts)
+
+        downloader._proxy_clients._factory = factory
+        for i in range(3):
+            request = Request(url=f'http://example.com/{i}', proxy='http://p1:8080')
+            response = await downloader.download(request)
+            assert response.status == 200
+
+        retry = Request(url='http://example.com/r', proxy='http://p1:8080', meta={'retry_times': 1})
+        await downloader.download(retry)
+
+        assert created == ['http://p1:8080']
+        assert timeouts[0]['connect'] == 5.0
+        assert timeouts[-1]['connect'] == 3.0
+
+        await downloader.close()
+        assert len(downloader._proxy_clients) == 0
+
+    async def test_direct_retry_uses_main_client(self):
+        downloader = _downloader()
+        timeouts = []
+        await downloader._client.aclose()
+        downloader._client = _mock_client(timeouts)
+        downloader._proxy_clients._factory = Mock(side_effect=AssertionError('no proxy client expected'))
+
+        request = Request(url='http://example.com/a', meta={'retry_times': 1})
+        response = await downloader.download(request)
+
+        assert response.status == 200
+        assert timeouts[0]['read'] == downloader._timeout_total * 0.33
+        await downloader.close()
@@ -76,8 +76,8 @@ class TestOffsiteMiddleware(unittest.TestCase):
             self.assertIn('ee.ofweek.com', middleware.allowed_domains)
             self.assertIn('www.baidu.com', middleware.allowed_domains)
             
-            # 检查是否创建了正确的正则表达式
-            self.assertEqual(len(middleware._domain_regexes), 2)
+            # 检查是否编译了全部域名
+            self.assertEqual(len(middleware._host_matcher), 2)
 
     def test_allowed_requests_with_multiple_domains(self):
         """测试多个域名下允许的请求"""
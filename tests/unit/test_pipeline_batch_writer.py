@@ -0,0 +1,177 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+Pipeline 后台批量写入测试
+
+测试内容：
+1. *_BATCH_FLUSH_INTERVAL 未配置时保持 process_item 内同步刷新
+2. 攒满 batch_size 或超过刷新间隔时由后台任务写出，写入期间继续接收数据（双缓冲）
+3. 缓冲区达到 *_MAX_BUFFER_SIZE 时 process_item 等待（反压），并记录刷新指标
+4. 关闭时写完剩余数据；MongoPipeline 批量刷新不再丢弃数据
+"""
+
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+
+from crawlo.pipelines.generic_sql import GenericSQLPipeline
+from crawlo.settings.setting_manager import SettingManager
+from crawlo.stats.collector import StatsCollector
+
+
+class _MemorySQLPipeline(GenericSQLPipeline):
+    """以内存列表代替数据库的 SQL Pipeline，批量写入可设置耗时"""
+
+    _PREFIX = 'MEMSQL'
+
+    def __init__(self, crawler, write_delay=0.0):
+        super().__init__(crawler)
+        self.write_delay = write_delay
+        self.batches = []
+
+    async def _initialize_pool(self):
+        self.pool = object()
+
+    async def _create_helper(self):
+        pass
+
+    async def _check_table_exists(self):
+        pass
+
+    async def _close_pool(self, pool):
+        pass
+
+    async def _do_insert(self, data):
+        self.batches.append([data])
+        return 1
+
+    async def _do_batch_insert(self, batch):
+        await asyncio.sleep(self.write_delay)
+        self.batches.append(list(batch))
+        return len(batch)
+
+    _do_batch_insert_no_tx = _do_batch_insert
+
+
+def _crawler(**settings):
+    settings_manager = SettingManager()
+    settings_manager.set('MEMSQL_USE_BATCH', True)
+    settings_manager.set('MEMSQL_TABLE', 'items')
+    for key, value in settings.items():
+        settings_manager.set(key, value)
+    crawler = Mock()
+    crawler.settings = settings_manager
+    crawler.spider = Mock()
+    crawler.spider.name = 'test'
+    crawler.spider.custom_settings = {}
+    crawler.spider.memsql_table = None
+    crawler.stats = StatsCollector(crawler)
+    return crawler
+
+
+def _written(pipeline):
+    return [row['i'] for batch in pipeline.batches for row in batch]
+
+
+class TestInlineFlush:
+
+    async def test_without_interval_flushes_in_process_item(self):
+        pipeline = _MemorySQLPipeline(_crawler(MEMSQL_BATCH_SIZE=3))
+        for i in range(3):
+            await pipeline.process_item({'i': i}, None)
+        assert pipeline._batch_writer is None
+        assert _written(pipeline) == [0, 1, 2]
+
+
+class TestBackgroundWriter:
+
+    async def test_size_and_interval_flush(self):
+        pipeline = _MemorySQLPipeline(_crawler(MEMSQL_BATCH_SIZE=3, MEMSQL_BATCH_FLUSH_INTERVAL=0.05))
+        for i in range(3):
+            await pipeline.process_item({'i': i}, None)
+        assert pipeline.batches == []  # 生产者不等待写入
+
+        await asyncio.sleep(0.01)
+        assert _written(pipeline) == [0, 1, 2]
+
+        await pipeline.process_item({'i': 3}, None)
+        await asyncio.sleep(0.01)
+        assert len(pipeline.batches) == 1
+
+        await asyncio.sleep(0.08)  # 不足一批的数据按间隔写出
+        assert [len(batch) for batch in pipeline.batches] == [3, 1]
+        await pipeline._cleanup_resources()
+
+    async def test_producers_continue_during_write(self):
+        pipeline = _MemorySQLPipeline(
+            _crawler(MEMSQL_BATCH_SIZE=5, MEMSQL_BATCH_FLUSH_INTERVAL=1, MEMSQL_MAX_BUFFER_SIZE=10),
+            write_delay=0.05,
+        )
+        for i in range(5):
+            await pipeline.process_item({'i': i}, None)
+        await asyncio.sleep(0.01)  # 第一批已交换出去，写入中
+
+        for i in range(5, 9):
+            await pipeline.process_item({'i': i}, None)
+        assert pipeline.batches == [] and len(pipeline.batch_buffer) == 4
+
+        await pipeline._cleanup_resources()
+        assert _written(pipeline) == list(range(9))
+
+    async def test_backpressure_and_metrics(self):
+        crawler = _crawler(MEMSQL_BATCH_SIZE=2, MEMSQL_BATCH_FLUSH_INTERVAL=1, MEMSQL_MAX_BUFFER_SIZE=2)
+        pipeline = _MemorySQLPipeline(crawler, write_delay=0.05)
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        for i in range(6):
+            await pipeline.process_item({'i': i}, None)
+        # 缓冲区上限 2、单批写入 50ms：第 5、6 条需等待前面的批次写完
+        assert loop.time() - started >= 0.05
+        assert len(pipeline.batch_buffer) <= 2
+
+        await pipeline._cleanup_resources()
+        assert _written(pipeline) == list(range(6))
+
+        stats = crawler.stats
+        assert stats.get_value('memsql/backpressure_waits') >= 1
+        assert stats.get_value('memsql/flush_count') == 3
+        assert stats.get_value('memsql/flush_queue_depth_max') == 2
+        assert stats.get_value('memsql/flush_latency_max') >= 0.05
+        assert stats.get_value('memsql/batch_items') == 6
+
+    async def test_writer_survives_flush_error(self):
+        crawler = _crawler(MEMSQL_BATCH_SIZE=1, MEMSQL_BATCH_FLUSH_INTERVAL=1)
+        pipeline = _MemorySQLPipeline(crawler)
+
+        async def boom(data):
+            raise RuntimeError('down')
+
+        pipeline._do_batch_insert = boom
+        pipeline._do_insert = boom
+        pipeline.fallback_threshold = 1
+        await pipeline.process_item({'i': 0}, None)
+        await asyncio.sleep(0.01)
+        assert crawler.stats.get_value('memsql/flush_errors') == 1
+        assert not pipeline._batch_writer.done()
+        await pipeline._cleanup_resources()
+
+
+class TestMongoFlush:
+
+    async def test_flush_writes_buffered_docs(self):
+        pytest.importorskip('pymongo')
+        from crawlo.pipelines.doc.mongo import MongoPipeline
+
+        pipeline = MongoPipeline(_crawler(MONGO_USE_BATCH=True, MONGO_BATCH_SIZE=2))
+        written = []
+
+        async def batch_upsert(docs):
+            written.extend(docs)
+            return len(docs)
+
+        pipeline._do_batch_upsert = batch_upsert
+        pipeline.batch_buffer.extend([{'a': 1}, {'a': 2}])
+        await pipeline._flush_batch(None)
+        assert written == [{'a': 1}, {'a': 2}]
@@ -0,0 +1,168 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+终端管道并发扇出测试（PIPELINE_SINKS）
+
+测试内容：
+1. 转换管道按顺序执行，sink 之间并发写出，process_item 不等待 sink 写完
+2. 队列满时只反压当前 sink；sink 异常 / 丢弃不影响其他 sink
+3. Processor.idle_async 计入 sink 队列；关闭时先写完队列
+4. 每个 sink 的队列深度 / 吞吐 / 延迟统计
+"""
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+from crawlo import Item
+from crawlo.items.exceptions import ItemDiscard
+from crawlo.pipelines.manager import PipelineManager
+
+
+class _Stats:
+    def __init__(self):
+        self.values = {}
+
+    def inc_value(self, key, count=1):
+        self.values[key] = self.values.get(key, 0) + count
+
+    def set_value(self, key, value):
+        self.values[key] = value
+
+    def get_value(self, key, default=None):
+        return self.values.get(key, default)
+
+
+class _Transform:
+    async def process_item(self, item, spider):
+        item['seen'] = item.get('seen', []) + ['transform']
+        return item
+
+
+class _Sink:
+    def __init__(self, delay=0.0, fail=False, discard=False):
+        self.delay = delay
+        self.fail = fail
+        self.discard = discard
+        self.items = []
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def process_item(self, item, spider):
+        await self.release.wait()
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError('sink down')
+        if self.discard:
+            raise ItemDiscard('duplicate')
+        self.items.append(item)
+        return item
+
+
+class _SlowSink(_Sink):
+    pass
+
+
+class _BrokenSink(_Sink):
+    pass
+
+
+def _crawler(**settings):
+    crawler = Mock()
+    crawler.spider = SimpleNamespace(name='test')
+    crawler.stats = _Stats()
+    crawler.subscriber.notify = AsyncMock()
+    crawler.settings.get.side_effect = lambda key, default=None: settings.get(key, default)
+    return crawler
+
+
+def _manager(crawler, pipelines):
+    """pipelines: [(path, instance)]；与 _initialize 相同地拆分串行管道与 sink"""
+    manager = PipelineManager(crawler)
+    manager.pipelines = [p for _, p in pipelines]
+    manager.pipeline_paths = [path for path, _ in pipelines]
+    manager._add_methods()
+    for sink in manager.sinks:
+        sink.start()
+    return manager
+
+
+def _item(i=0):
+    item = Item()
+    item['id'] = i
+    return item
+
+
+class TestFanOut:
+
+    async def test_transforms_in_order_sinks_concurrent(self):
+        slow, fast = _SlowSink(delay=0.05), _Sink(delay=0.05)
+        crawler = _crawler(PIPELINE_SINKS=['a.Slow', 'a.Fast'])
+        manager = _manager(crawler, [('a.Slow', slow), ('a.T', _Transform()), ('a.Fast', fast)])
+        assert len(manager.methods) == 1 and [s.name for s in manager.sinks] == ['_SlowSink', '_Sink']
+
+        await manager.process_item(_item())
+        assert manager.sink_pending == 2 and not slow.items  # 不等待 sink 写完
+        await asyncio.sleep(0.08)  # 两个 sink 并发：约 0.05 秒，而不是 0.05 + 0.05
+        assert slow.items[0]['seen'] == ['transform'] and fast.items[0] is slow.items[0]
+        assert manager.sink_pending == 0
+        await manager.close()
+
+    async def test_backpressure_and_error_isolation(self):
+        blocked, broken, ok = _SlowSink(), _BrokenSink(fail=True), _Sink(discard=True)
+        blocked.release.clear()
+        crawler = _crawler(PIPELINE_SINKS={'a.Blocked': 1, 'a.Broken': 2, 'a.Ok': 1}, PIPELINE_SINK_QUEUE_SIZE=2)
+        manager = _manager(crawler, [('a.Blocked', blocked), ('a.Broken', broken), ('a.Ok', ok)])
+
+        # 被卡住的 sink：1 条处理中 + 2 条排队，第 4 条 put 等待
+        for i in range(3):
+            await manager.process_item(_item(i))
+        fourth = asyncio.create_task(manager.process_item(_item(3)))
+        await asyncio.sleep(0.02)
+        assert not fourth.done()
+        values = crawler.stats.values
+        assert values['pipeline_sink/_BrokenSink/errors'] == 3
+        assert values['pipeline_sink/_Sink/discarded'] == 3
+        assert values['pipeline_sink/_SlowSink/put_blocked'] >= 1
+        assert values['pipeline_sink/_SlowSink/queue_depth_max'] == 2
+
+        blocked.release.set()
+        await fourth
+        await manager.close()
+        assert len(blocked.items) == 4
+        assert values['pipeline_sink/_BrokenSink/items'] == 4
+        assert values['pipeline_sink/_SlowSink/throughput'] > 0
+        assert 'pipeline_sink/_SlowSink/latency_p99' in values
+
+    async def test_close_drains_queues(self):
+        sink = _Sink(delay=0.01)
+        manager = _manager(_crawler(PIPELINE_SINKS=['a.Sink']), [('a.Sink', sink)])
+        for i in range(5):
+            await manager.process_item(_item(i))
+        await manager.close()
+        assert [item['id'] for item in sink.items] == [0, 1, 2, 3, 4]
+
+    async def test_processor_waits_for_sinks(self):
+        from crawlo.core.processor import Processor
+
+        sink = _Sink()
+        sink.release.clear()
+        crawler = _crawler(PIPELINE_SINKS=['a.Sink'])
+        manager = _manager(crawler, [('a.Sink', sink)])
+        processor = Processor(crawler)
+        processor.pipelines = manager
+        processor._sinks = tuple(manager.sinks)
+
+        await processor.enqueue(_item())
+        assert not await processor.idle_async()
+        sink.release.set()
+        await asyncio.sleep(0.01)
+        assert await processor.idle_async()
+        await manager.close()
+
+    async def test_disabled_by_default(self):
+        transform, sink = _Transform(), _Sink()
+        manager = _manager(_crawler(), [('a.T', transform), ('a.Sink', sink)])
+        assert manager.sinks == [] and len(manager.methods) == 2
+        await manager.process_item(_item())
+        assert len(sink.items) == 1
+        await manager.close()
@@ -0,0 +1,191 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+Processor 批量模式测试（PROCESSOR_BATCH_MODE）
+
+测试内容：
+1. 连续的 Item 整批交给 PipelineManager.process_items，Request 保持产出顺序逐个入队
+2. 攒满 PROCESSOR_BATCH_SIZE 时在 enqueue 内处理，不足一批的剩余数据在让出事件循环后处理
+3. 未实现 process_items 的管道逐条调用，单条出错 / 丢弃不影响同批其他 item；
+   整批出错时此前管道的丢弃通知照常发送
+4. GenericSQLPipeline 原生 process_items：整批追加缓冲区，一次刷新
+5. 后台循环每次唤醒用 get_nowait 取出至多一批
+"""
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+from crawlo import Item, Request
+from crawlo.core.processor import Processor
+from crawlo.items.exceptions import ItemDiscard
+from crawlo.pipelines.generic_sql import GenericSQLPipeline
+from crawlo.pipelines.manager import PipelineManager
+from crawlo.settings.setting_manager import SettingManager
+from crawlo.stats.collector import StatsCollector
+
+
+class _BatchRecorder:
+    """实现原生 process_items 的管道：记录每批大小，丢弃 id 为负数的 item"""
+
+    def __init__(self):
+        self.batches = []
+
+    async def process_item(self, item, spider):
+        self.batches.append([item['id']])
+        return item
+
+    async def process_items(self, items, spider):
+        self.batches.append([item['id'] for item in items])
+        return [item for item in items if item['id'] >= 0]
+
+
+class _FailingBatch(_BatchRecorder):
+    async def process_items(self, items, spider):
+        raise RuntimeError('sink down')
+
+
+class _PerItem:
+    def __init__(self):
+        self.seen = []
+
+    async def process_item(self, item, spider):
+        if item['id'] == 13:
+            raise RuntimeError('bad item')
+        if item['id'] == 7:
+            raise ItemDiscard('duplicate')
+        self.seen.append(item['id'])
+        return item
+
+
+class _MemorySQLPipeline(GenericSQLPipeline):
+    _PREFIX = 'MEMSQL'
+
+    def __init__(self, crawler):
+        super().__init__(crawler)
+        self.batches = []
+
+    async def _initialize_pool(self):
+        self.pool = object()
+
+    async def _create_helper(self):
+        pass
+
+    async def _check_table_exists(self):
+        pass
+
+    async def _close_pool(self, pool):
+        pass
+
+    async def _do_insert(self, data):
+        self.batches.append([data])
+        return 1
+
+    async def _do_batch_insert(self, batch):
+        self.batches.append(list(batch))
+        return len(batch)
+
+    _do_batch_insert_no_tx = _do_batch_insert
+
+
+def _crawler(**settings):
+    settings_manager = SettingManager()
+    settings_manager.set('PROCESSOR_BATCH_MODE', True)
+    for key, value in settings.items():
+        settings_manager.set(key, value)
+    crawler = Mock()
+    crawler.settings = settings_manager
+    crawler.spider = SimpleNamespace(name='test', custom_settings={}, memsql_table=None)
+    crawler.stats = StatsCollector(crawler)
+    crawler.subscriber.notify = AsyncMock()
+    crawler.engine.enqueue_request = AsyncMock()
+    return crawler
+
+
+def _processor(crawler, *pipelines):
+    manager = PipelineManager(crawler)
+    manager.pipelines = list(pipelines)
+    manager._add_methods()
+    processor = Processor(crawler)
+    processor.pipelines = manager
+    return processor
+
+
+def _item(i):
+    item = Item()
+    item['id'] = i
+    return item
+
+
+class TestBatchMode:
+
+    async def test_items_batched_requests_in_order(self):
+        crawler = _crawler(PROCESSOR_BATCH_SIZE=100)
+        recorder = _BatchRecorder()
+        processor = _processor(crawler, recorder)
+        order = []
+        crawler.engine.enqueue_request.side_effect = lambda request: order.append(list(recorder.batches))
+
+        for i in range(3):
+            await processor.enqueue(_item(i))
+        await processor.enqueue(Request('https://example.com/next'))
+        for i in (3, -1):
+            await processor.enqueue(_item(i))
+        assert recorder.batches == [] and not await processor.idle_async()
+
+        await asyncio.sleep(0)
+        assert recorder.batches == [[0, 1, 2], [3, -1]]
+        assert order == [[[0, 1, 2]]]  # Request 在前一批 item 之后入队
+        assert await processor.idle_async()
+        stats = processor.get_stats()
+        assert stats['items_processed'] == 5 and stats['requests_processed'] == 1
+        await asyncio.sleep(0)
+        events = [c.args[0] for c in crawler.subscriber.notify.await_args_list]
+        assert events.count('item_successful') == 4 and events.count('item_discard') == 1
+
+    async def test_full_batch_processed_inline(self):
+        recorder = _BatchRecorder()
+        processor = _processor(_crawler(PROCESSOR_BATCH_SIZE=3), recorder)
+        for i in range(4):
+            await processor.enqueue(_item(i))
+        assert recorder.batches == [[0, 1, 2]]
+        await processor.process_once()
+        assert recorder.batches == [[0, 1, 2], [3]]
+
+    async def test_per_item_fallback_isolates_errors(self):
+        crawler = _crawler(PROCESSOR_BATCH_SIZE=10)
+        per_item, recorder = _PerItem(), _BatchRecorder()
+        processor = _processor(crawler, per_item, recorder)
+        for i in (1, 7, 13, 2):
+            await processor.queue.put(_item(i))
+        await processor.process_once()
+        assert per_item.seen == [1, 2] and recorder.batches == [[1, 2]]
+        stats = processor.get_stats()
+        assert stats['errors'] == 1 and stats['items_processed'] == 3
+
+    async def test_batch_error_keeps_discard_notifications(self):
+        crawler = _crawler(PROCESSOR_BATCH_SIZE=10)
+        processor = _processor(crawler, _BatchRecorder(), _FailingBatch())
+        assert await processor.pipelines.process_items([_item(-1), _item(1), _item(2)]) == 2
+        await asyncio.sleep(0)
+        events = [c.args[0] for c in crawler.subscriber.notify.await_args_list]
+        assert events == ['item_discard']
+
+    async def test_run_loop_drains_batches(self):
+        recorder = _BatchRecorder()
+        processor = _processor(_crawler(PROCESSOR_BATCH_SIZE=3), recorder)
+        for i in range(7):
+            processor.queue.put_nowait(_item(i))
+        await processor.start()
+        await asyncio.sleep(0.01)
+        await processor.stop()
+        assert [len(batch) for batch in recorder.batches] == [3, 3, 1]
+
+
+class TestNativePipelineBatch:
+
+    async def test_generic_sql_appends_whole_batch(self):
+        crawler = _crawler(MEMSQL_USE_BATCH=True, MEMSQL_TABLE='items', MEMSQL_BATCH_SIZE=4)
+        pipeline = _MemorySQLPipeline(crawler)
+        items = [_item(i) for i in range(6)]
+        assert await pipeline.process_items(items, crawler.spider) == items
+        assert [[row['id'] for row in batch] for batch in pipeline.batches] == [[0, 1, 2, 3, 4, 5]]
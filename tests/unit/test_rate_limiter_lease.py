@@ -0,0 +1,101 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+DistributedRateLimiter 租约模式与 EVALSHA 测试
+
+测试内容：
+1. 脚本走 EVALSHA，NOSCRIPT 时回退 EVAL 一次
+2. 租约：一次往返预留多个令牌本地消费；租约大小受 rate × lease_ttl 限制
+3. 桶空时按 wait_ms 记录重试时间，期间不访问 Redis；wait_and_acquire 按 wait_ms 唤醒
+4. 到期 / 关闭时归还未使用令牌（需要 fakeredis + lupa）
+"""
+
+import time
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from crawlo.cluster.rate_limiter import DistributedRateLimiter
+
+
+@pytest.fixture
+def redis_client():
+    fakeredis = pytest.importorskip('fakeredis')
+    pytest.importorskip('lupa')
+    return fakeredis.FakeAsyncRedis()
+
+
+async def _tokens(redis_client, domain='a.com'):
+    return float(await redis_client.get(f'test:rate:{domain}'))
+
+
+class TestScriptCache:
+
+    async def test_evalsha_with_noscript_fallback(self):
+        client = Mock()
+        client.evalsha = AsyncMock(side_effect=[Exception('NOSCRIPT No matching script'), [1, 9]])
+        client.eval = AsyncMock(return_value=[1, 9])
+        limiter = DistributedRateLimiter(client, 'test', default_rate=10)
+
+        assert await limiter.acquire('a.com') is True
+        assert await limiter.acquire('a.com') is True
+        assert client.evalsha.await_count == 2
+        assert client.eval.await_count == 1
+
+    async def test_redis_error_allows(self):
+        client = Mock()
+        client.evalsha = AsyncMock(side_effect=ConnectionError('down'))
+        limiter = DistributedRateLimiter(client, 'test', default_rate=10)
+        assert await limiter.reserve('a.com') == 0.0
+
+
+class TestLease:
+
+    async def test_one_round_trip_per_lease(self, redis_client):
+        limiter = DistributedRateLimiter(redis_client, 'test', default_rate=100, default_capacity=100)
+        limiter.set_lease(20)
+
+        assert all([await limiter.acquire('a.com') for _ in range(20)])
+        assert limiter.script_calls == 1
+        assert await _tokens(redis_client) == pytest.approx(80, abs=1)
+
+    async def test_lease_bounded_by_rate(self, redis_client):
+        limiter = DistributedRateLimiter(redis_client, 'test', default_rate=5, default_capacity=100)
+        limiter.set_lease(50, lease_ttl=1.0)
+        await limiter.acquire('a.com')
+        assert limiter._leases['a.com'].tokens == 4
+
+    async def test_empty_bucket_waits_without_polling(self, redis_client):
+        limiter = DistributedRateLimiter(redis_client, 'test', default_rate=20, default_capacity=2)
+        limiter.set_lease(10)
+        assert await limiter.acquire('a.com') and await limiter.acquire('a.com')
+
+        wait = await limiter.reserve('a.com')
+        calls = limiter.script_calls
+        assert 0 < wait <= 0.06
+        assert await limiter.reserve('a.com') > 0
+        assert limiter.script_calls == calls
+
+        start = time.monotonic()
+        assert await limiter.wait_and_acquire('a.com', timeout=1.0) is True
+        assert time.monotonic() - start < 0.3
+
+    async def test_unused_tokens_returned(self, redis_client):
+        limiter = DistributedRateLimiter(redis_client, 'test', default_rate=1, default_capacity=10)
+        limiter.set_lease(10, lease_ttl=10)
+        await limiter.acquire('a.com')
+        assert limiter._leases['a.com'].tokens == 9
+        assert await _tokens(redis_client) == pytest.approx(0, abs=0.1)
+
+        assert await limiter.release_leases() == 9
+        assert await _tokens(redis_client) == pytest.approx(9, abs=0.1)
+
+    async def test_expired_lease_returned_on_renewal(self, redis_client):
+        limiter = DistributedRateLimiter(redis_client, 'test', default_rate=1, default_capacity=10)
+        limiter.set_lease(10, lease_ttl=10)
+        await limiter.acquire('a.com')
+        limiter._leases['a.com'].expires_at = 0.0
+
+        await limiter.acquire('a.com')
+        assert limiter.script_calls == 3   # 租约 + 归还 + 续租
+        assert limiter._leases['a.com'].tokens == 8
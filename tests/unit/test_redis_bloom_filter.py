@@ -0,0 +1,125 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+RedisBloomFilter 可扩展布隆过滤器测试
+
+测试内容：
+1. 层参数：容量按 growth 递增、误判率按 tightening 收紧、单层位数不超过 Redis 位图上限
+2. 位位置确定且在层范围内
+3. Lua 判重+写入：重复识别、写满扩容、误判率在目标范围内、脚本只发送一次（需要 fakeredis + lupa）
+4. SET → 布隆过滤器迁移
+5. Redis 异常时放行
+"""
+
+from unittest.mock import Mock
+
+import pytest
+
+from crawlo.filters import FILTER_MAP
+from crawlo.filters.redis_bloom_filter import MAX_BITS_PER_KEY, RedisBloomFilter
+from crawlo.http.request import Request
+from crawlo.settings.setting_manager import SettingManager
+
+
+def _requests(prefix, count):
+    return [Request(url=f'http://{prefix}.example.com/{i}') for i in range(count)]
+
+
+class TestLayerParams:
+
+    def test_layers_grow_and_tighten(self):
+        bloom = RedisBloomFilter('test:fp', capacity=1000, error_rate=0.01)
+        first, second = bloom._get_layer_params(0), bloom._get_layer_params(1)
+        assert first[0] == 1000 and second[0] == 2000
+        assert second[1] == pytest.approx(first[1] / 2)
+        assert second[3] >= first[3]
+
+    def test_layer_bits_capped_by_redis_bitmap_limit(self):
+        bloom = RedisBloomFilter('test:fp', capacity=2_000_000_000, error_rate=0.001)
+        capacity, _, bits, _ = bloom._get_layer_params(0)
+        assert bits <= MAX_BITS_PER_KEY
+        assert capacity < 2_000_000_000
+
+    def test_positions_deterministic_and_in_range(self):
+        bloom = RedisBloomFilter('test:fp', capacity=1000, error_rate=0.01)
+        bits = bloom._get_layer_params(0)[2]
+        positions = bloom._positions('abc', 0)
+        assert positions == bloom._positions('abc', 0)
+        assert positions != bloom._positions('abc', 1)
+        assert all(0 <= p < bits for p in positions)
+
+    @pytest.mark.parametrize('name, value', [
+        ('BLOOM_FILTER_CAPACITY', 0),
+        ('BLOOM_FILTER_ERROR_RATE', 0),
+        ('BLOOM_FILTER_ERROR_RATE', 1.5),
+        ('BLOOM_FILTER_TIGHTENING_RATIO', 1),
+    ])
+    def test_create_instance_validates_settings(self, name, value):
+        settings = SettingManager()
+        settings.set(name, value)
+        crawler = Mock(settings=settings)
+        crawler.spider.name = 'demo'
+        with pytest.raises(ValueError):
+            RedisBloomFilter.create_instance(crawler)
+
+    def test_registered_in_filter_map(self):
+        assert FILTER_MAP['redis_bloom'] is RedisBloomFilter
+
+    async def test_redis_error_allows_requests(self):
+        client = Mock()
+        client.eval = Mock(side_effect=ConnectionError('Redis connection lost'))
+        client.evalsha = Mock(side_effect=ConnectionError('Redis connection lost'))
+        bloom = RedisBloomFilter('test:fp', client=client, stats=Mock())
+        assert await bloom.requested_async(Request(url='http://example.com/a')) is False
+        assert await bloom.requested_many(_requests('a', 3)) == [False, False, False]
+
+
+class TestRedisBitmap:
+
+    @pytest.fixture
+    def redis_client(self):
+        fakeredis = pytest.importorskip('fakeredis')
+        pytest.importorskip('lupa')
+        return fakeredis.FakeAsyncRedis()
+
+    async def test_check_and_add(self, redis_client):
+        bloom = RedisBloomFilter('test:fp', client=redis_client, stats=Mock(), capacity=1000)
+        request = Request(url='http://example.com/a')
+
+        assert await bloom.requested_async(request) is False
+        assert await bloom.requested_async(request) is True
+        assert await bloom.contains_async(bloom._get_fingerprint(request)) is True
+
+    async def test_script_sent_once(self, redis_client):
+        redis_client.eval = Mock(wraps=redis_client.eval)
+        bloom = RedisBloomFilter('test:fp', client=redis_client, stats=Mock(), capacity=1000)
+        for i in range(3):
+            await bloom.requested_async(Request(url=f'http://example.com/{i}'))
+        assert redis_client.eval.call_count == 1  # 首次 NOSCRIPT 回退 EVAL，之后走 EVALSHA
+
+    async def test_scales_without_exceeding_error_rate(self, redis_client):
+        bloom = RedisBloomFilter('test:fp', client=redis_client, stats=Mock(), capacity=200, error_rate=0.01)
+        seen = _requests('seen', 1200)
+        for start in range(0, len(seen), 300):
+            await bloom.requested_many(seen[start:start + 300])
+
+        assert bloom._layers > 1
+        # 已写入的必然命中
+        assert all(await bloom.requested_many(seen[:300]))
+        # 未写入的误判率在目标附近
+        unseen = [bloom._get_fingerprint(r) for r in _requests('unseen', 1000)]
+        false_positive = sum(await bloom.probe_many(unseen)) / len(unseen)
+        assert false_positive < 0.02
+        assert bloom.get_bloom_stats()['estimated_false_positive_rate'] < 0.01
+
+    async def test_migrate_from_set(self, redis_client):
+        old = RedisBloomFilter('test:fp', stats=Mock())
+        fps = [old._get_fingerprint(r) for r in _requests('old', 300)]
+        await redis_client.sadd('test:fp', *fps)
+
+        bloom = RedisBloomFilter('test:fp', client=redis_client, stats=Mock(), capacity=1000)
+        migrated = await bloom.migrate_from_set(batch_size=100, delete_source=True)
+
+        assert migrated == 300
+        assert all(await bloom.probe_many(fps))
+        assert await redis_client.exists('test:fp') == 0
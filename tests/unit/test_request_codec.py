@@ -0,0 +1,142 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+RequestCodec 二进制请求编解码测试（需要 msgpack）
+
+测试内容：
+1. Request 往返：二进制 body、json_body / params 派生字段、auth、优先级
+2. 省略默认值与 exclude 字段；大载荷压缩
+3. 格式识别：未知字段 id 忽略、高版本拒绝、与 JSON / pickle 数据可区分
+4. encode_dict 无损；各后端（Stream / 优先级队列 / 磁盘队列 / SQLite 检查点）使用 codec 格式
+"""
+
+import pickle  # nosec B403
+
+import pytest
+
+from crawlo.http.request import Request
+from crawlo.utils.request.request_codec import RequestCodec, get_request_codec
+
+msgpack = pytest.importorskip('msgpack')
+
+
+@pytest.fixture
+def codec():
+    return RequestCodec()
+
+
+class TestRoundTrip:
+
+    def test_full_request(self, codec):
+        request = Request(
+            'https://example.com/item', method='PUT', body=b'\x00\xff binary',
+            headers={'X-Token': 'abc'}, cookies={'sid': '1'}, meta={'depth': 2, 'tags': ['a']},
+            cb_kwargs={'item_id': 7}, priority=10, dont_filter=True, timeout=5.0,
+            proxy='http://127.0.0.1:8080', auth=('user', 'pass'), verify=False, flags=['seed'],
+            encoding='gbk',
+        )
+        restored = codec.decode(codec.encode(request))
+        for attr in ('url', 'method', 'body', 'headers', 'cookies', 'meta', 'cb_kwargs', 'priority',
+                     'dont_filter', 'timeout', 'proxy', 'auth', 'verify', 'flags', 'encoding'):
+            assert getattr(restored, attr) == getattr(request, attr), attr
+
+    def test_derived_body_and_params(self, codec):
+        request = Request('https://example.com/api', json_body={'q': '中文'})
+        data = codec.encode(request)
+        assert request.body not in data
+        restored = codec.decode(data)
+        assert restored.body == request.body and restored.method == 'POST'
+
+        request = Request('https://example.com/list', params={'page': 2})
+        assert codec.decode(codec.encode(request)).url == 'https://example.com/list?page=2'
+
+    def test_defaults_omitted_and_exclude(self, codec):
+        request = Request('https://example.com/', headers={'A': 'b'})
+        fields = msgpack.unpackb(codec.encode(request)[2:], strict_map_key=False)
+        assert list(fields.values()) == ['https://example.com/', {'A': 'b'}]
+
+        stream_codec = RequestCodec(exclude=('headers',))
+        assert stream_codec.decode(stream_codec.encode(request)).headers == {}
+
+    def test_large_payload_compressed(self):
+        codec = RequestCodec(compress_threshold=256)
+        request = Request('https://example.com/', meta={'html': 'x' * 10000})
+        data = codec.encode(request)
+        assert len(data) < 1000 and data[1] & 0x0F
+        assert codec.decode(data).meta['html'] == 'x' * 10000
+
+
+class TestFormat:
+
+    def test_detection(self, codec):
+        assert RequestCodec.is_encoded(codec.encode(Request('https://example.com/')))
+        assert not RequestCodec.is_encoded(b'{"url": "https://example.com/"}')
+        assert not RequestCodec.is_encoded(msgpack.packb({'url': 'https://example.com/'}))
+        assert not RequestCodec.is_encoded('text')
+
+    def test_unknown_field_ignored_and_newer_version_rejected(self, codec):
+        payload = msgpack.packb({1: 'https://example.com/', 999: 'future'})
+        assert codec.decode(bytes((0xC1, 0x10)) + payload).url == 'https://example.com/'
+        with pytest.raises(ValueError):
+            codec.decode(bytes((0xC1, 0x20)) + payload)
+
+    def test_encode_dict_is_lossless(self, codec):
+        data = {'url': 'https://example.com/', 'method': 'GET', 'headers': {}, 'body': 'YWJj',
+                '_body_b64': True, '_callback': 'spiders.demo.parse'}
+        assert codec.decode_dict(codec.encode_dict(data)) == data
+
+    def test_shared_instance(self):
+        assert get_request_codec() is get_request_codec()
+        assert get_request_codec(exclude=('headers',)) is not get_request_codec()
+
+
+class TestBackends:
+
+    def test_stream_queue_codec_and_legacy_json(self, codec):
+        from crawlo.queue.backends.redis_stream import RedisStreamQueue
+
+        json_queue = RedisStreamQueue('redis://localhost:6379', serialization_format='json')
+        codec_queue = RedisStreamQueue('redis://localhost:6379', serialization_format='codec')
+        request = Request('https://example.com/a', meta={'depth': 1}, priority=5)
+
+        encoded = codec_queue._serialize_request(request)
+        assert RequestCodec.is_encoded(encoded)
+        assert len(encoded) < len(json_queue._serialize_request(request))
+        assert codec_queue._deserialize_request(encoded).meta == {'depth': 1}
+        # 切换格式后旧数据仍可读，反之亦然
+        assert codec_queue._deserialize_request(json_queue._serialize_request(request)).url == request.url
+        assert json_queue._deserialize_request(encoded).url == request.url
+        # codec 模式下无魔数的数据只按 JSON 解码，不调用 pickle
+        assert codec_queue._deserialize_request(pickle.dumps({'url': request.url})) is None
+
+    def test_priority_queue_codec(self, codec):
+        from crawlo.queue.backends.redis_priority import RedisPriorityQueue
+
+        queue = RedisPriorityQueue('redis://localhost:6379', serialization_format='codec')
+        queue._validate_serialization_format()
+        assert RequestCodec.is_encoded(queue._serialize_request(Request('https://example.com/')))
+
+    async def test_disk_queue_codec(self, codec, tmp_path):
+        from crawlo.queue.backends.disk import DiskQueue, DiskQueueConfig
+
+        queue = DiskQueue(DiskQueueConfig(path=str(tmp_path), serialization='codec'))
+        await queue.open()
+        try:
+            await queue.put(Request('https://example.com/d', meta={'depth': 3}))
+            await queue.put({'plain': 'item'})
+            assert (await queue.get()).meta == {'depth': 3}
+            assert await queue.get() == {'plain': 'item'}
+        finally:
+            await queue.close()
+
+    def test_sqlite_checkpoint_stores_codec(self, codec, tmp_path):
+        import sqlite3
+        from crawlo.checkpoint.storage import SqliteStorage
+
+        storage = SqliteStorage('demo', checkpoint_dir=str(tmp_path))
+        requests = [{'url': 'https://example.com/1', 'method': 'GET', 'meta': {'depth': 1}, 'priority': 0}]
+        assert storage.save({'requests': requests})
+        with sqlite3.connect(storage.filepath) as conn:
+            (raw,), = conn.execute('SELECT data FROM pending_requests').fetchall()
+        assert RequestCodec.is_encoded(raw)
+        assert storage.load()['requests'] == requests
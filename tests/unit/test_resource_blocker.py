@@ -0,0 +1,161 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+资源屏蔽器测试（预编译规则 + 上下文级路由）
+
+测试内容：
+1. 域名按标签边界后缀匹配（不再是子串匹配），带路径的黑名单条目按前缀匹配
+2. EasyList 风格规则：通配符、分隔符、资源类型选项、@@ 例外、不支持的语法跳过
+3. 路由每个上下文只安装一次；未登记 / 已注销的页面直接放行
+4. 原生模式：可表达部分通过 CDP 下发，剩余部分走路由；CDP 不可用时回退
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from crawlo.core.errors import NotConfiguredError
+from crawlo.downloader.resource_blocker import ResourceBlocker, load_block_rules, parse_rules
+from crawlo.settings.setting_manager import SettingManager
+
+
+class _Route:
+    def __init__(self, url, resource_type, page):
+        self.request = SimpleNamespace(url=url, resource_type=resource_type, frame=SimpleNamespace(page=page))
+        self.result = None
+
+    async def abort(self):
+        self.result = 'abort'
+
+    async def continue_(self):
+        self.result = 'continue'
+
+
+def _page():
+    page = Mock()
+    page.context = Mock()
+    page.context.route = AsyncMock()
+    return page
+
+
+class TestMatching:
+
+    def test_domain_suffix_on_label_boundary(self):
+        blocker = ResourceBlocker().compile((), block_ads=True)
+        assert blocker.blocks('https://stats.g.doubleclick.net/x', 'script')
+        assert blocker.blocks('https://user:pw@doubleclick.net:8443/x', 'script')
+        assert not blocker.blocks('https://notdoubleclick.net/x', 'script')
+        assert blocker.blocks('https://www.facebook.com/tr?id=1', 'image')
+        assert not blocker.blocks('https://www.facebook.com/page', 'document')
+
+    def test_resource_type_mask(self):
+        blocker = ResourceBlocker().compile({'image', 'font'})
+        assert blocker.blocks('https://a.com/x', 'image') and blocker.blocks('https://a.com/x', 'font')
+        assert not blocker.blocks('https://a.com/x', 'script')
+        assert not ResourceBlocker().compile(())
+
+    def test_easylist_rules(self):
+        rules = parse_rules([
+            '! comment', '[Adblock Plus 2.0]', 'example.com##.banner',
+            '||ads.example.com^',
+            '/banner/*.gif$image',
+            '|https://track.',
+            '||cdn.example.com/pixel^$~image',
+            '@@||ads.example.com/allowed^',
+            '||x.com^$third-party',
+            '/ad[0-9]+/',
+        ])
+        assert rules.domains == {'ads.example.com'} and rules.skipped == 2
+        blocker = ResourceBlocker(rules).compile(())
+        assert blocker.blocks('https://sub.ads.example.com/a.js', 'script')
+        assert not blocker.blocks('https://ads.example.com/allowed?x=1', 'script')
+        assert blocker.blocks('https://cdn.com/banner/top.gif', 'image')
+        assert not blocker.blocks('https://cdn.com/banner/top.gif', 'script')
+        assert blocker.blocks('https://track.example.org/p', 'xhr')
+        assert blocker.blocks('https://cdn.example.com/pixel?id=1', 'xhr')
+        assert not blocker.blocks('https://cdn.example.com/pixel?id=1', 'image')
+        assert not blocker.blocks('https://cdn.example.com/pixels', 'xhr')
+
+    def test_compiled_once_per_config(self):
+        blocker = ResourceBlocker()
+        assert blocker.compile(['image'], True) is blocker.compile({'image'}, True)
+        assert blocker.compile(['image'], True) is not blocker.compile(['image'], False)
+
+    def test_rules_from_settings(self, tmp_path):
+        path = tmp_path / 'easylist.txt'
+        path.write_text('||a.com^\n||b.com^\n', encoding='utf-8')
+        settings = SettingManager({'BROWSER_BLOCK_RULES': '||c.com^', 'PLAYWRIGHT_BLOCK_RULES_FILE': str(path)})
+        assert load_block_rules(settings, 'PLAYWRIGHT').domains == {'a.com', 'b.com', 'c.com'}
+        with pytest.raises(NotConfiguredError):
+            load_block_rules(SettingManager({'BROWSER_BLOCK_RULES_FILE': str(tmp_path / 'missing')}), 'PLAYWRIGHT')
+
+
+class TestContextRoute:
+
+    async def test_route_installed_once_per_context(self):
+        blocker = ResourceBlocker()
+        page_a, page_b = _page(), _page()
+        page_b.context = page_a.context
+        compiled = blocker.compile(['image'], True)
+        await blocker.activate(page_a, compiled)
+        await blocker.activate(page_b, compiled)
+        await blocker.activate(page_a, compiled)
+        page_a.context.route.assert_awaited_once()
+        handler = page_a.context.route.await_args.args[1]
+
+        route = _Route('https://a.com/x.png', 'image', page_a)
+        await handler(route)
+        assert route.result == 'abort'
+        route = _Route('https://a.com/', 'document', page_a)
+        await handler(route)
+        assert route.result == 'continue'
+
+        await blocker.deactivate(page_a)
+        route = _Route('https://a.com/x.png', 'image', page_a)
+        await handler(route)
+        assert route.result == 'continue'
+
+    async def test_empty_blocker_installs_nothing(self):
+        blocker = ResourceBlocker()
+        page = _page()
+        await blocker.activate(page, blocker.compile(()))
+        page.context.route.assert_not_awaited()
+
+
+class TestNative:
+
+    async def test_native_patterns_and_residual_route(self):
+        blocker = ResourceBlocker(parse_rules(['||ads.example.com^']), native=True)
+        page = _page()
+        session = AsyncMock()
+        page.context.new_cdp_session = AsyncMock(return_value=session)
+
+        await blocker.activate(page, blocker.compile(['image', 'xhr']))
+        _, params = session.send.await_args.args
+        assert '*.png' in params['urls'] and '*://*.ads.example.com/*' in params['urls']
+        # xhr 无法按扩展名表达，仍走上下文路由
+        handler = page.context.route.await_args.args[1]
+        route = _Route('https://a.com/api', 'xhr', page)
+        await handler(route)
+        assert route.result == 'abort'
+        route = _Route('https://a.com/x.png', 'image', page)
+        await handler(route)
+        assert route.result == 'continue'
+
+        sends = session.send.await_count
+        await blocker.activate(page, blocker.compile(['image', 'xhr']))
+        assert session.send.await_count == sends  # 通配符未变化，不重复下发
+        await blocker.deactivate(page)
+        assert session.send.await_args.args == ('Network.setBlockedURLs', {'urls': []})
+
+    async def test_falls_back_without_cdp(self):
+        blocker = ResourceBlocker(native=True)
+        page = _page()
+        page.context.new_cdp_session = AsyncMock(side_effect=RuntimeError('CDP session is only available in Chromium'))
+        await blocker.activate(page, blocker.compile(['image']))
+        assert blocker.native is False
+        handler = page.context.route.await_args.args[1]
+        route = _Route('https://a.com/x.png', 'image', page)
+        await handler(route)
+        assert route.result == 'abort'
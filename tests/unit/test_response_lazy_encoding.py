@@ -0,0 +1,135 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+Response 懒加载编码检测测试
+
+测试内容：
+1. 构造 Response、读取 status / body 不触发编码检测；首次 text 检测一次并缓存
+2. Content-Type charset / meta 声明走快速路径，与完整检测结果一致
+3. 同一主机的内容探测结果缓存在检测器实例中复用（LRU），解码验证失败时重新探测，
+   单字节兜底结果不缓存，不同检测器互不共享
+4. 设置 encoding 使 text 缓存失效
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from crawlo.http.response import Response
+from crawlo.utils.encoding import EncodingDetector
+
+GBK_PAGE = '<html><body><p>这是一个中文页面，用于测试编码探测。</p></body></html>'.encode('gbk') * 20
+UTF8_PAGE = '<html><body><p>这是一个中文页面。</p></body></html>'.encode('utf-8')
+
+
+@pytest.fixture
+def detector():
+    return EncodingDetector()
+
+
+def _response(url, body, detector):
+    response = Response(url, body=body)
+    response.encoding_detector = detector
+    return response
+
+
+class TestLazyEncoding:
+
+    def test_not_detected_until_text(self):
+        with patch.object(EncodingDetector, 'detect_declared', wraps=EncodingDetector.detect_declared) as detect:
+            response = Response('http://a.com/1', body=UTF8_PAGE)
+            assert response.status == 200 and response.body == UTF8_PAGE
+            assert detect.call_count == 0
+
+            assert '中文' in response.text
+            assert '中文' in response.css('p::text').get()
+            assert response.encoding
+            assert detect.call_count == 1
+
+    def test_setter_resets_text(self):
+        response = Response('http://a.com/1', body=GBK_PAGE, headers={'Content-Type': 'text/html; charset=utf-8'})
+        assert '中文' not in response.text
+        response.encoding = 'gbk'
+        assert '中文' in response.text
+
+    def test_request_encoding_wins(self):
+        from crawlo.http.request import Request
+        request = Request('http://a.com/1', encoding='gbk')
+        response = Response('http://a.com/1', body=UTF8_PAGE, request=request)
+        assert response.encoding == 'gbk'
+
+
+class TestFastPath:
+
+    @pytest.mark.parametrize('body, headers', [
+        (GBK_PAGE, {'Content-Type': 'text/html; charset=GBK'}),
+        (UTF8_PAGE, {'content-type': 'text/html; charset=utf-8'}),
+        (b'<meta charset="gb2312">' + GBK_PAGE, {}),
+        (b'\xef\xbb\xbf' + UTF8_PAGE, {'Content-Type': 'text/html; charset=gbk'}),
+        (b'<?xml version="1.0" encoding="utf-16"?>', {}),
+    ])
+    def test_matches_full_detection_without_sniffing(self, body, headers):
+        with patch.object(EncodingDetector, '_auto_detect_callback') as sniff:
+            encoding = EncodingDetector.detect_declared(body, headers)
+        assert sniff.call_count == 0
+        assert encoding == EncodingDetector.detect(body, headers)
+
+    def test_undeclared_needs_sniffing(self):
+        assert EncodingDetector.detect_declared(GBK_PAGE, {'Content-Type': 'text/html'}) is None
+
+
+class TestHostCache:
+
+    def test_repeat_pages_skip_sniffing(self, detector):
+        with patch.object(EncodingDetector, 'detect', wraps=EncodingDetector.detect) as detect:
+            first = _response('http://gbk.cn/1', GBK_PAGE, detector).encoding
+            second = _response('http://gbk.cn/2', GBK_PAGE, detector).encoding
+            assert detect.call_count == 1
+            assert first == second
+
+            # ASCII / UTF-8 页面按探测顺序直接判定，不被主机缓存覆盖
+            assert _response('http://gbk.cn/3', UTF8_PAGE, detector).encoding == EncodingDetector.detect(UTF8_PAGE)
+            assert _response('http://other.cn/1', GBK_PAGE, detector).encoding == first
+            assert detect.call_count == 3
+
+    def test_no_cache_without_detector(self):
+        with patch.object(EncodingDetector, 'detect', wraps=EncodingDetector.detect) as detect:
+            Response('http://gbk.cn/1', body=GBK_PAGE).encoding
+            Response('http://gbk.cn/2', body=GBK_PAGE).encoding
+            assert detect.call_count == 2
+
+    def test_detectors_do_not_share_entries(self):
+        first, second = EncodingDetector(), EncodingDetector()
+        first.detect_for_host(GBK_PAGE, host='gbk.cn')
+        assert 'gbk.cn' in first._host_encodings
+        assert 'gbk.cn' not in second._host_encodings
+
+    def test_cache_verified_by_decoding(self, detector):
+        detector._host_encodings['mixed.cn'] = 'ascii'
+        encoding = _response('http://mixed.cn/1', GBK_PAGE, detector).encoding
+        assert encoding == EncodingDetector.detect(GBK_PAGE)
+        assert detector._host_encodings['mixed.cn'] == encoding
+
+    def test_cache_bounded(self, detector):
+        with patch.object(EncodingDetector, 'HOST_CACHE_SIZE', 2):
+            for i in range(4):
+                detector.detect_for_host(GBK_PAGE, host=f'h{i}.cn')
+        assert list(detector._host_encodings) == ['h2.cn', 'h3.cn']
+
+    def test_cache_is_lru(self, detector):
+        with patch.object(EncodingDetector, 'HOST_CACHE_SIZE', 2):
+            detector.detect_for_host(GBK_PAGE, host='h0.cn')
+            detector.detect_for_host(GBK_PAGE, host='h1.cn')
+            detector.detect_for_host(GBK_PAGE, host='h0.cn')  # 命中后移到末尾
+            detector.detect_for_host(GBK_PAGE, host='h2.cn')
+        assert list(detector._host_encodings) == ['h0.cn', 'h2.cn']
+
+    def test_single_byte_guess_not_cached(self, detector):
+        latin = 'Caf\xe9 cr\xe8me br\xfbl\xe9e, na\xefve fa\xe7ade'.encode('latin-1')
+        encoding = detector.detect_for_host(latin, host='latin.fr')
+        assert encoding in EncodingDetector._SINGLE_BYTE_ENCODINGS
+        assert 'latin.fr' not in detector._host_encodings
+        # 声明的 charset 照常缓存
+        detector.detect_for_host(latin, {'Content-Type': 'text/html; charset=windows-1252'}, host='latin.fr')
+        assert detector._host_encodings['latin.fr'] == EncodingDetector.detect_declared(
+            latin, {'Content-Type': 'text/html; charset=windows-1252'})
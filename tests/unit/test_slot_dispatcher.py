@@ -0,0 +1,128 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+SlotDispatcher 槽位式派发测试
+
+测试内容：
+1. SlotGate 满载时挂起、任务完成后被唤醒（无轮询）
+2. SlotDispatcher 通过 Scheduler.next_requests 按空闲槽位批量出队
+3. QueueManager.get_batch 一次排空内存队列并释放信号量
+4. ENGINE_DISPATCHER_CLASS 可选择 SlotDispatcher
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+from crawlo.core.engine import Engine
+from crawlo.core.engine_dispatch import SlotDispatcher, SlotGate
+from crawlo.queue.backends.memory import SpiderPriorityQueue
+from crawlo.queue.queue_manager import QueueManager
+from crawlo.queue.queue_types import QueueType
+
+
+def _make_crawler(overrides=None):
+    overrides = overrides or {}
+    crawler = Mock()
+    crawler.settings = Mock()
+    crawler.settings.get = Mock(side_effect=lambda key, default=None: overrides.get(key, default))
+    return crawler
+
+
+class TestSlotGate:
+
+    async def test_wait_returns_immediately_when_free(self):
+        gate = SlotGate(2)
+        await asyncio.wait_for(gate.wait_for_slot(), timeout=0.1)
+        assert gate.free == 2
+
+    async def test_wakes_on_task_completion(self):
+        gate = SlotGate(1)
+        release = asyncio.Event()
+        task = asyncio.create_task(release.wait())
+        gate.occupy(task)
+        assert gate.free == 0
+
+        waiter = asyncio.create_task(gate.wait_for_slot())
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+
+        release.set()
+        await asyncio.wait_for(waiter, timeout=0.5)
+        assert gate.inflight == 0
+
+
+class TestSlotDispatcher:
+
+    def _make_engine(self):
+        engine = Engine(_make_crawler(), dispatcher_cls=SlotDispatcher)
+        engine.scheduler = Mock()
+        return engine
+
+    async def test_next_batch_limited_by_free_slots(self):
+        engine = self._make_engine()
+        engine.scheduler.next_requests = AsyncMock(return_value=['r1', 'r2'])
+        dispatcher = engine._dispatcher
+
+        requests = await dispatcher.next_batch(batch_size=50, max_inflight=4)
+
+        assert requests == ['r1', 'r2']
+        engine.scheduler.next_requests.assert_awaited_once_with(4)
+
+    async def test_dispatch_respects_capacity(self):
+        engine = self._make_engine()
+        dispatcher = engine._dispatcher
+        release = asyncio.Event()
+        started = []
+
+        async def fake_crawl(request):
+            started.append(request)
+            await release.wait()
+
+        engine._crawl = fake_crawl
+
+        dispatch = asyncio.create_task(dispatcher.dispatch_requests(['a', 'b', 'c'], 2))
+        await asyncio.sleep(0.01)
+        assert started == ['a', 'b']
+        assert not dispatch.done()
+
+        release.set()
+        await asyncio.wait_for(dispatch, timeout=0.5)
+        await asyncio.gather(*engine._background_tasks)
+        assert started == ['a', 'b', 'c']
+
+    def test_selected_by_settings(self):
+        crawler = _make_crawler({
+            'ENGINE_DISPATCHER_CLASS': 'crawlo.core.engine_dispatch.SlotDispatcher',
+        })
+        engine = Engine(crawler)
+        assert isinstance(engine._dispatcher, SlotDispatcher)
+
+
+class TestQueueManagerGetBatch:
+
+    def _make_manager(self, max_size=10):
+        manager = QueueManager.__new__(QueueManager)
+        manager._queue = SpiderPriorityQueue()
+        manager._queue_type = QueueType.MEMORY
+        manager._queue_semaphore = asyncio.Semaphore(max_size)
+        manager._queue_not_full = asyncio.Condition()
+        manager._logger = Mock()
+        return manager
+
+    async def test_drains_in_priority_order(self):
+        manager = self._make_manager()
+        for priority in (3, 1, 2):
+            await manager._queue_semaphore.acquire()
+            await manager._queue.put((priority, Mock(url=f'http://example.com/{priority}')))
+
+        requests = await manager.get_batch(2)
+
+        assert [r.url for r in requests] == ['http://example.com/1', 'http://example.com/2']
+        assert await manager._queue.size() == 1
+        # 取出 2 个元素 → 释放 2 个信号量
+        assert manager._queue_semaphore._value == 10 - 1
+
+    async def test_empty_queue_returns_immediately(self):
+        manager = self._make_manager()
+        requests = await asyncio.wait_for(manager.get_batch(8), timeout=0.05)
+        assert requests == []
@@ -0,0 +1,185 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+SQL 管道批量写入路径测试
+
+测试内容：
+1. PostgreSQL：每个列集合一条缓存的预编译语句 + 一次 executemany，不再逐行 execute
+2. PostgreSQL PG_BULK_MODE='copy'：COPY 到临时表后集合式 INSERT ... ON CONFLICT，按冲突列去重保留最后一行
+3. SQLite 事务路径使用 executemany，失败整体回滚
+4. MySQL 多行 VALUES 按 MYSQL_ROWS_PER_STATEMENT 拆分
+"""
+
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+
+from crawlo.core.errors import PipelineInitError
+from crawlo.settings.setting_manager import SettingManager
+
+
+def _crawler(**settings):
+    return SimpleNamespace(
+        settings=SettingManager(settings),
+        spider=SimpleNamespace(name='bulk', custom_settings={}),
+        subscriber=Mock(),
+        stats=Mock(),
+    )
+
+
+class _FakeConnection:
+    """记录调用的 asyncpg 连接替身"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def execute(self, sql, *args):
+        self.calls.append(('execute', sql, args))
+        return 'INSERT 0 1'
+
+    async def executemany(self, sql, rows):
+        self.calls.append(('executemany', sql, list(rows)))
+
+    async def copy_records_to_table(self, table, *, records, columns):
+        self.calls.append(('copy', table, list(records), columns))
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+
+class _FakePool:
+    def __init__(self):
+        self.conn = _FakeConnection()
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.conn
+
+
+def _pg(**settings):
+    pytest.importorskip('asyncpg')
+    from crawlo.pipelines.sql.postgresql import PostgreSQLPipeline
+    settings.setdefault('PG_CONFLICT_COLUMNS', ('url',))
+    settings.setdefault('PG_UPDATE_COLUMNS', ('title',))
+    pipeline = PostgreSQLPipeline(_crawler(**settings))
+    pipeline.pool = _FakePool()
+    return pipeline
+
+
+_ROWS = [
+    {'url': 'u1', 'title': 'a'},
+    {'url': 'u2', 'title': 'b'},
+    {'url': 'u1', 'title': 'c'},
+    {'url': 'u3', 'title': 'd', 'price': 1},
+]
+
+
+class TestPostgreSQLBulk:
+
+    async def test_executemany_per_column_set(self):
+        pipeline = _pg()
+        assert await pipeline._do_batch_insert(_ROWS) == 4
+
+        calls = pipeline.pool.conn.calls
+        assert [c[0] for c in calls] == ['executemany', 'executemany']
+        sql, rows = calls[0][1], calls[0][2]
+        assert sql == ('INSERT INTO "bulk_items" ("url", "title") VALUES ($1, $2) '
+                       'ON CONFLICT ("url") DO UPDATE SET "title" = EXCLUDED."title"')
+        assert rows == [('u1', 'a'), ('u2', 'b'), ('u1', 'c')]
+        assert calls[1][2] == [('u3', 'd', 1)]
+
+    async def test_sql_built_once(self):
+        pipeline = _pg(PG_INSERT_IGNORE=True)
+        await pipeline._do_batch_insert_no_tx(_ROWS[:2])
+        await pipeline._do_insert({'url': 'u9', 'title': 'z'})
+        assert len(pipeline._sql_cache) == 1
+        sql = pipeline.pool.conn.calls[-1][1]
+        assert sql.endswith('ON CONFLICT DO NOTHING') and pipeline.pool.conn.calls[-1][2] == ('u9', 'z')
+
+    async def test_copy_mode(self):
+        pipeline = _pg(PG_BULK_MODE='copy')
+        assert await pipeline._do_batch_insert(_ROWS[:3]) == 3
+
+        (_, create, _), (_, tmp, records, columns), (_, insert, _) = pipeline.pool.conn.calls
+        assert create == ('CREATE TEMP TABLE "_crawlo_bulk_0" ON COMMIT DROP AS '
+                          'SELECT "url", "title" FROM "bulk_items" WITH NO DATA')
+        assert (tmp, columns) == ('_crawlo_bulk_0', ['url', 'title'])
+        assert records == [('u1', 'c'), ('u2', 'b')]
+        assert insert == ('INSERT INTO "bulk_items" ("url", "title") SELECT "url", "title" FROM "_crawlo_bulk_0" '
+                          'ON CONFLICT ("url") DO UPDATE SET "title" = EXCLUDED."title"')
+
+    async def test_copy_mode_not_used_without_transaction(self):
+        pipeline = _pg(PG_BULK_MODE='copy')
+        await pipeline._do_batch_insert_no_tx(_ROWS[:2])
+        assert [c[0] for c in pipeline.pool.conn.calls] == ['executemany']
+
+    def test_invalid_bulk_mode(self):
+        with pytest.raises(PipelineInitError):
+            _pg(PG_BULK_MODE='bulk')
+
+
+class TestSQLiteBulk:
+
+    async def _pipeline(self, tmp_path):
+        aiosqlite = pytest.importorskip('aiosqlite')
+        from crawlo.pipelines.sql.sqlite import SQLitePipeline
+        pipeline = SQLitePipeline(_crawler(SQLITE_INSERT_IGNORE=False, SQLITE_USE_TRANSACTION=True))
+        pipeline.pool = await aiosqlite.connect(str(tmp_path / 'bulk.db'))
+        await pipeline.pool.execute('CREATE TABLE bulk_items (url TEXT PRIMARY KEY, title TEXT)')
+        await pipeline.pool.commit()
+        return pipeline
+
+    async def test_transaction_uses_executemany(self, tmp_path):
+        pipeline = await self._pipeline(tmp_path)
+        executemany = pipeline.pool.executemany
+        calls = []
+
+        async def counting_executemany(sql, params):
+            calls.append(len(params))
+            return await executemany(sql, params)
+
+        pipeline.pool.executemany = counting_executemany
+        try:
+            assert await pipeline._do_batch_insert([{'url': f'u{i}', 'title': 't'} for i in range(50)]) == 50
+            assert calls == [50]
+        finally:
+            await pipeline.pool.close()
+
+    async def test_transaction_rolls_back(self, tmp_path):
+        pipeline = await self._pipeline(tmp_path)
+        try:
+            with pytest.raises(Exception):
+                await pipeline._do_batch_insert([{'url': 'u1', 'title': 'a'}, {'url': 'u1', 'title': 'b'}])
+            cursor = await pipeline.pool.execute('SELECT COUNT(*) FROM bulk_items')
+            assert (await cursor.fetchone())[0] == 0
+        finally:
+            await pipeline.pool.close()
+
+
+class TestMySQLBulk:
+
+    async def test_rows_per_statement(self):
+        from crawlo.pipelines.sql.mysql import MySQLPipeline
+        from crawlo.utils.db.sql_builder import SQLBuilder
+        pipeline = MySQLPipeline(_crawler(MYSQL_ROWS_PER_STATEMENT=2, MYSQL_INSERT_IGNORE=True))
+        statements = []
+
+        class _Cursor:
+            rowcount = 0
+
+            async def execute(self, sql, params):
+                statements.append((sql, params))
+                self.rowcount = sql.count('(%s, %s)')
+
+        @asynccontextmanager
+        async def transaction():
+            yield _Cursor()
+
+        pipeline._helper = SimpleNamespace(transaction=transaction, _sql_builder=SQLBuilder)
+        assert await pipeline._do_batch_insert([{'url': f'u{i}', 'title': 't'} for i in range(5)]) == 5
+        assert len(statements) == 3
+        assert statements[0][0].startswith('INSERT IGNORE INTO `bulk_items` (`title`, `url`) VALUES (%s, %s), (%s, %s)')
+        assert statements[2][1] == ['t', 'u4']
@@ -0,0 +1,206 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+BufferedRedisStatsBackend（STATS_BACKEND = 'redis_buffered'）测试（需要 fakeredis）
+
+测试内容：
+1. inc_value / set_value 不访问 Redis，同一 key 的增量合并，一个周期一次 pipeline
+2. 按 flush_interval 定时写入；累计 max_pending 个 key 提前写入
+3. 同一周期内 set 与 inc 交错时以本地视图为准；浮点增量走 HINCRBYFLOAT
+4. 写入失败时内容放回缓冲；close() 在后台最终写入，wait_closed() 等待完成并关闭自有客户端，
+   关闭后不再记录；客户端所属的循环已关闭时跳过最终写入；clear() 删除 Redis HASH
+"""
+
+import asyncio
+
+import pytest
+
+from crawlo.stats.backends import BufferedRedisStatsBackend, StatsBackendFactory
+
+
+@pytest.fixture
+def redis_client():
+    fakeredis = pytest.importorskip('fakeredis')
+    return fakeredis.FakeAsyncRedis(decode_responses=True)
+
+
+def _backend(redis_client, **kwargs):
+    kwargs.setdefault('flush_interval', 10000)
+    return BufferedRedisStatsBackend(redis_client, key='test:stats', **kwargs)
+
+
+def _count_pipelines(redis_client):
+    calls = {'execute': 0}
+    original_pipeline = redis_client.pipeline
+
+    def pipeline(*args, **kwargs):
+        pipe = original_pipeline(*args, **kwargs)
+        execute = pipe.execute
+
+        async def counting_execute(*a, **kw):
+            calls['execute'] += 1
+            return await execute(*a, **kw)
+
+        pipe.execute = counting_execute
+        return pipe
+
+    redis_client.pipeline = pipeline
+    return calls
+
+
+class TestBuffering:
+
+    async def test_increments_coalesced_into_one_pipeline(self, redis_client):
+        backend = _backend(redis_client)
+        calls = _count_pipelines(redis_client)
+        for _ in range(100):
+            backend.inc_value('response_received_count')
+            backend.inc_value('response_status_code/200')
+        backend.set_value('start_time', '2026-10-17 08:00:00')
+
+        assert await redis_client.hgetall('test:stats') == {} and backend.pending_keys == 3
+        assert backend.get_value('response_received_count') == 100
+        assert await backend.flush() == 3
+        assert calls['execute'] == 1
+        assert await redis_client.hgetall('test:stats') == {
+            'response_received_count': '100',
+            'response_status_code/200': '100',
+            'start_time': '2026-10-17 08:00:00',
+        }
+        backend.close()
+        await backend.wait_closed()
+
+    async def test_flushes_on_interval(self, redis_client):
+        backend = _backend(redis_client, flush_interval=20)
+        backend.inc_value('item_successful_count', 3)
+        await asyncio.sleep(0.1)
+        assert await redis_client.hget('test:stats', 'item_successful_count') == '3'
+        assert backend.pending_keys == 0
+
+    async def test_flushes_early_when_pending_full(self, redis_client):
+        backend = _backend(redis_client, max_pending=3)
+        for i in range(3):
+            backend.inc_value(f'k{i}')
+        await asyncio.sleep(0.01)
+        assert await redis_client.hlen('test:stats') == 3
+        backend.close()
+        await backend.wait_closed()
+
+    async def test_set_and_inc_interleaved(self, redis_client):
+        await redis_client.hset('test:stats', mapping={'a': 50, 'b': 50})
+        backend = _backend(redis_client)
+        backend.inc_value('a', 5)
+        backend.set_value('a', 1)      # set 覆盖此前的增量
+        backend.set_value('b', 10)
+        backend.inc_value('b', 2)      # set 之后的增量折叠进 gauge
+        backend.inc_value('elapsed', 0.5)
+        await backend.flush()
+        assert await redis_client.hmget('test:stats', ['a', 'b', 'elapsed']) == ['1', '12', '0.5']
+        backend.close()
+        await backend.wait_closed()
+
+    async def test_failed_flush_restores_buffer(self, redis_client):
+        backend = _backend(redis_client)
+        backend.inc_value('a', 2)
+        backend.set_value('g', 'x')
+        original_pipeline = redis_client.pipeline
+
+        def broken_pipeline(*args, **kwargs):
+            pipe = original_pipeline(*args, **kwargs)
+
+            async def execute(*a, **kw):
+                backend.inc_value('a', 1)  # 写入失败期间的新增量
+                raise ConnectionError('connection lost')
+
+            pipe.execute = execute
+            return pipe
+
+        redis_client.pipeline = broken_pipeline
+        assert await backend.flush() == 0
+        redis_client.pipeline = original_pipeline
+        assert await backend.flush() == 2
+        assert await redis_client.hmget('test:stats', ['a', 'g']) == ['3', 'x']
+        backend.close()
+        await backend.wait_closed()
+
+
+class TestLifecycle:
+
+    async def test_close_starts_final_flush(self, redis_client):
+        backend = _backend(redis_client)
+        backend.append_value('errors', 'timeout')
+        backend.inc_value('retry_count')
+        assert backend.close() is None
+        backend.close()
+        await backend.wait_closed()
+        await backend.wait_closed()
+        assert await redis_client.hmget('test:stats', ['errors', 'retry_count']) == ['["timeout"]', '1']
+        assert backend.flush_count == 1
+
+    async def test_records_ignored_after_close(self, redis_client):
+        backend = _backend(redis_client)
+        backend.inc_value('a')
+        backend.close()
+        backend.inc_value('a')
+        backend.set_value('b', 1)
+        assert backend.get_stats() == {'a': 1}
+        await backend.wait_closed()
+        assert backend.pending_keys == 0
+        assert await redis_client.hgetall('test:stats') == {'a': '1'}
+        assert backend.flush_count == 1
+
+    def test_close_skips_flush_when_loop_gone(self, redis_client):
+        backend = _backend(redis_client)
+
+        async def record():
+            backend.inc_value('a')
+
+        asyncio.run(record())
+        backend.close()
+        assert backend.pending_keys == 1 and backend.flush_count == 0
+
+    async def test_final_flush_closes_owned_client(self, redis_client):
+        closed = []
+        original_aclose = redis_client.aclose
+
+        async def aclose():
+            closed.append(True)
+            await original_aclose()
+
+        redis_client.aclose = aclose
+        borrowed = _backend(redis_client)
+        borrowed.inc_value('a')
+        borrowed.close()
+        await borrowed.wait_closed()
+        assert not closed
+
+        owned = _backend(redis_client, owns_client=True)
+        owned.inc_value('a')
+        owned.close()
+        await owned.wait_closed()
+        assert closed == [True]
+
+    async def test_clear_deletes_hash(self, redis_client):
+        await redis_client.hset('test:stats', 'stale', 1)
+        backend = _backend(redis_client)
+        backend.clear()
+        backend.inc_value('fresh')
+        await backend.flush()
+        assert await redis_client.hgetall('test:stats') == {'fresh': '1'}
+        backend.close()
+        await backend.wait_closed()
+
+    def test_factory_type(self, redis_client):
+        backend = StatsBackendFactory.create('redis_buffered', redis_client=redis_client)
+        assert isinstance(backend, BufferedRedisStatsBackend)
+
+    async def test_collector_wait_closed_flushes(self, redis_client):
+        from crawlo.stats.collector import StatsCollector
+
+        collector = StatsCollector.__new__(StatsCollector)
+        collector._dump, collector._closed = False, False
+        collector.backend = _backend(redis_client)
+        collector.inc_value('item_successful_count', 2)
+        collector.close()
+        await collector.wait_closed()
+        assert await redis_client.hget('test:stats', 'item_successful_count') == '2'
@@ -0,0 +1,227 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+RedisStreamQueue 批量入队与 ACK 合并测试（需要 fakeredis + lupa）
+
+测试内容：
+1. put_batch 一次 pipeline 写入，按 priority 路由到高优 / 普通 Stream
+2. ACK 攒满条数后一次脚本调用提交（EVALSHA，脚本只发送一次），不足时按间隔提交
+3. RETRY 类 nack 合并提交：重新入队并累加 retry_count，超限转入死信
+4. 未提交的 ACK 在进程退出后仍在 PEL 中，可被其他 Consumer 回收
+5. QueueManager.put_batch 受剩余容量约束，Scheduler 批量入队走 put_batch
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from crawlo.http.request import Request
+from crawlo.queue.backends.redis_stream import RedisStreamQueue
+from crawlo.queue.task_tracker import TaskResult
+
+
+@pytest.fixture
+def redis_client():
+    fakeredis = pytest.importorskip('fakeredis')
+    pytest.importorskip('lupa')
+    return fakeredis.FakeAsyncRedis()
+
+
+async def _queue(redis_client, consumer='worker-a', delivery_count_limit=3):
+    queue = RedisStreamQueue(
+        'redis://localhost:6379', project_name='test', spider_name='batch',
+        consumer_name=consumer, block_timeout=50, consumer_idle_timeout=60000,
+        delivery_count_limit=delivery_count_limit,
+    )
+    queue._redis = redis_client
+    queue._connected = True
+    await queue._ensure_consumer_groups()
+    return queue
+
+
+def _requests(count, priority=0, prefix='low'):
+    return [(Request(url=f'http://example.com/{prefix}/{i}'), priority) for i in range(count)]
+
+
+def _count_evals(redis_client, command='evalsha'):
+    """记录脚本调用：evalsha 每次提交一条；eval 只在服务端未缓存脚本时发送"""
+    calls = []
+    original = getattr(redis_client, command)
+
+    async def counting_eval(*args, **kwargs):
+        calls.append(args)
+        return await original(*args, **kwargs)
+
+    setattr(redis_client, command, counting_eval)
+    return calls
+
+
+async def _receive(queue, count):
+    return [await queue.get_with_receipt(timeout=0.05) for _ in range(count)]
+
+
+class TestPutBatch:
+
+    async def test_routes_by_priority(self, redis_client):
+        queue = await _queue(redis_client)
+        items = _requests(3) + _requests(2, priority=-1, prefix='high')
+        assert await queue.put_batch(items, batch_size=2) == 5
+        assert await redis_client.xlen(queue.stream) == 3
+        assert await redis_client.xlen(queue.high_stream) == 2
+
+        urls = [request.url for request, _ in await _receive(queue, 5)]
+        assert urls[:2] == ['http://example.com/high/0', 'http://example.com/high/1']
+
+    async def test_failed_batch_returns_prefix(self, redis_client):
+        queue = await _queue(redis_client)
+        original = queue._serialize_request
+
+        def serialize(request):
+            if request.url.endswith('/3'):
+                raise ValueError('boom')
+            return original(request)
+
+        queue._serialize_request = serialize
+        assert await queue.put_batch(_requests(6), batch_size=2) == 2
+        assert await redis_client.xlen(queue.stream) == 2
+
+
+class TestAckBatch:
+
+    async def test_flush_on_size_uses_one_script_call(self, redis_client):
+        queue = await _queue(redis_client)
+        await queue.put_batch(_requests(4))
+        queue.set_ack_batch(4, interval_ms=10000)
+        received = await _receive(queue, 4)
+        evals = _count_evals(redis_client)
+
+        for _, message_id in received[:3]:
+            assert await queue.ack(message_id)
+        assert queue.pending_acks == 3 and not evals
+        assert (await redis_client.xpending(queue.stream, queue.group_name))['pending'] == 4
+
+        await queue.ack(received[3][1])
+        assert queue.pending_acks == 0 and len(evals) == 1
+        assert (await redis_client.xpending(queue.stream, queue.group_name))['pending'] == 0
+        assert await redis_client.xlen(queue.stream) == 0
+
+    async def test_script_body_sent_once(self, redis_client):
+        queue = await _queue(redis_client)
+        await queue.put_batch(_requests(4))
+        queue.set_ack_batch(2)
+        received = await _receive(queue, 4)
+        script_sends = _count_evals(redis_client, 'eval')
+
+        for _, message_id in received:
+            await queue.ack(message_id)
+        assert queue.pending_acks == 0 and len(script_sends) == 1
+
+    async def test_flush_on_interval(self, redis_client):
+        queue = await _queue(redis_client)
+        await queue.put_batch(_requests(1))
+        queue.set_ack_batch(100, interval_ms=20)
+        (_, message_id), = await _receive(queue, 1)
+
+        await queue.ack(message_id)
+        assert queue.pending_acks == 1
+        await asyncio.sleep(0.06)
+        assert queue.pending_acks == 0
+        assert await redis_client.xlen(queue.stream) == 0
+
+    async def test_retry_and_dead_letter(self, redis_client):
+        queue = await _queue(redis_client, delivery_count_limit=2)
+        await queue.put_batch(_requests(2))
+        queue.set_ack_batch(10)
+        (_, first), (_, second) = await _receive(queue, 2)
+
+        assert await queue.nack(first, error='timeout')
+        assert await queue.nack(second, error='timeout', result=TaskResult.ACK)
+        assert await queue.flush_acks() == 2
+        (_, fields), = await redis_client.xrange(queue.stream)
+        assert fields[b'retry_count'] == b'1' and fields[b'last_error'] == b'timeout'
+
+        request, retried = await queue.get_with_receipt(timeout=0.05)
+        assert request.url == 'http://example.com/low/0'
+        await queue.nack(retried, error='timeout again')
+        await queue.flush_acks()
+
+        assert await redis_client.xlen(queue.stream) == 0
+        dead = await redis_client.xrange(queue.failed_stream)
+        assert len(dead) == 1
+        assert dead[0][1][b'dead_reason'] == b'timeout again'
+
+    async def test_unflushed_acks_are_reclaimed_after_crash(self, redis_client):
+        queue = await _queue(redis_client)
+        await queue.put_batch(_requests(3))
+        queue.set_ack_batch(10, interval_ms=10000)
+        for _, message_id in await _receive(queue, 3):
+            await queue.ack(message_id)
+        assert queue.pending_acks == 3  # 进程在此处崩溃：缓冲丢失
+
+        other = await _queue(redis_client, consumer='worker-b')
+        other._has_xautoclaim = True
+        claimed = await other.claim_pending(min_idle_ms=0, count=10)
+        assert sorted(request.url for _, request, _ in claimed) == [
+            f'http://example.com/low/{i}' for i in range(3)
+        ]
+        queue._ack_flush_task.cancel()
+
+    async def test_close_flushes(self, redis_client):
+        queue = await _queue(redis_client)
+        await queue.put_batch(_requests(2))
+        queue.set_ack_batch(10, interval_ms=10000)
+        for _, message_id in await _receive(queue, 2):
+            await queue.ack(message_id)
+
+        redis_client.aclose = AsyncMock()
+        await queue.close()
+        assert await redis_client.xlen(queue.stream) == 0
+        assert (await redis_client.xpending(queue.stream, queue.group_name))['pending'] == 0
+
+
+class TestQueueManagerBatch:
+
+    def _manager(self, queue, max_queue_size=100):
+        from crawlo.queue.queue_manager import QueueConfig, QueueManager
+        manager = QueueManager(QueueConfig(queue_type='memory', max_queue_size=max_queue_size))
+        manager._queue = queue
+        return manager
+
+    async def test_put_batch_respects_capacity(self, redis_client):
+        queue = await _queue(redis_client)
+        manager = self._manager(queue, max_queue_size=10)
+        manager.size = AsyncMock(return_value=7)
+
+        assert await manager.put_batch(_requests(5)) == 3
+        assert await queue.size() == 3
+        manager.size.return_value = 10
+        assert await manager.put_batch(_requests(1)) == 0
+
+    async def test_put_batch_requires_stream_queue(self):
+        manager = self._manager(Mock())
+        assert await manager.put_batch(_requests(2)) == 0
+        assert await manager.flush_acks() == 0
+
+    async def test_scheduler_enqueues_remainder_individually(self, redis_client):
+        from crawlo.core.scheduling.task_scheduler import Scheduler
+        from crawlo.queue.queue_manager import QueueType
+
+        queue = await _queue(redis_client)
+        manager = self._manager(queue)
+        manager.put_batch = AsyncMock(return_value=2)
+        manager.put = AsyncMock(return_value=True)
+
+        scheduler = Scheduler.__new__(Scheduler)
+        scheduler.queue_manager = manager
+        manager._queue_type = QueueType.REDIS_STREAM
+        scheduler.priority = 0
+        scheduler._get_enqueue_full_policy = Mock(return_value='drop_with_counter')
+        scheduler._resolve_put_timeout = Mock(return_value=1.0)
+
+        requests = [request for request, _ in _requests(3)]
+        results = await scheduler._put_requests(requests)
+        assert list(results.values()) == [True, True, True]
+        assert len(manager.put_batch.await_args.args[0]) == 3
+        manager.put.assert_awaited_once()
+        assert manager.put.await_args.args[0] is requests[2]
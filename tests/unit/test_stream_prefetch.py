@@ -0,0 +1,120 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+RedisStreamQueue 预取消费测试（需要 fakeredis）
+
+测试内容：
+1. 一次补充读取高优 / 普通 Stream（合计不超过空闲额度），出队仍高优优先
+2. 本地缓冲有上限，降到一半时后台补充
+3. 关闭时未交付的缓冲消息以 XCLAIM IDLE 交还，其他 Consumer 可立即回收
+4. 未开启预取或指定其他 consumer_name 时保持逐条读取
+"""
+
+import asyncio
+
+import pytest
+
+from crawlo.http.request import Request
+from crawlo.queue.backends.redis_stream import RedisStreamQueue
+
+
+@pytest.fixture
+def redis_client():
+    fakeredis = pytest.importorskip('fakeredis')
+    return fakeredis.FakeAsyncRedis()
+
+
+async def _queue(redis_client, consumer='worker-a', block_timeout=200):
+    queue = RedisStreamQueue(
+        'redis://localhost:6379', project_name='test', spider_name='prefetch',
+        consumer_name=consumer, block_timeout=block_timeout, consumer_idle_timeout=60000,
+    )
+    queue._redis = redis_client
+    queue._connected = True
+    await queue._ensure_consumer_groups()
+    return queue
+
+
+async def _put(queue, count, priority=0, prefix='low'):
+    for i in range(count):
+        assert await queue.put(Request(url=f'http://example.com/{prefix}/{i}'), priority=priority)
+
+
+class TestPrefetch:
+
+    async def test_single_read_across_streams_keeps_priority(self, redis_client):
+        queue = await _queue(redis_client)
+        await _put(queue, 3)
+        await _put(queue, 2, priority=-1, prefix='high')
+        queue.set_prefetch(6)
+
+        urls = [(await queue.get_blocking(timeout=1)).url]
+        assert queue.prefetch_reads == 1 and queue.prefetched == 4
+        urls += [(await queue.get_blocking(timeout=1)).url for _ in range(4)]
+        assert urls[:2] == ['http://example.com/high/0', 'http://example.com/high/1']
+        assert urls[2:] == [f'http://example.com/low/{i}' for i in range(3)]
+        await queue.release_prefetched()
+
+    async def test_refill_never_exceeds_free_slots(self, redis_client):
+        queue = await _queue(redis_client)
+        await _put(queue, 5)
+        await _put(queue, 3, priority=-1, prefix='high')
+
+        msgs = await queue._read_many(4)
+        assert sum(len(entries) for _, entries in msgs) == 4
+        pending = await redis_client.xpending(queue._stream, queue._group_name)
+        assert pending['pending'] == 1  # 普通 Stream 只读剩余额度，不多投递到 PEL
+
+    async def test_buffer_bounded_and_refilled(self, redis_client):
+        queue = await _queue(redis_client)
+        await _put(queue, 20)
+        queue.set_prefetch(4)
+
+        request, message_id = await queue.get_with_receipt(timeout=1)
+        assert request.url == 'http://example.com/low/0'
+        assert queue.prefetched == 3
+        assert await queue.ack(message_id)
+
+        for _ in range(2):
+            await queue.get(timeout=1)
+        await asyncio.sleep(0.05)  # 降到一半以下后由后台任务补满
+        assert queue.prefetched == 4
+        assert queue.prefetch_reads == 2
+        await queue.release_prefetched()
+
+    async def test_release_makes_buffered_messages_claimable(self, redis_client):
+        queue = await _queue(redis_client)
+        await _put(queue, 5)
+        queue.set_prefetch(5)
+        assert (await queue.get_blocking(timeout=1)).url == 'http://example.com/low/0'
+
+        assert await queue.release_prefetched() == 4
+        assert queue.prefetched == 0
+
+        other = await _queue(redis_client, consumer='worker-b')
+        other._has_xautoclaim = True
+        claimed = await other.claim_pending(min_idle_ms=queue.consumer_idle_timeout, count=10)
+        assert sorted(request.url for _, request, _ in claimed) == [
+            f'http://example.com/low/{i}' for i in range(1, 5)
+        ]
+
+    async def test_empty_wait_returns_none(self, redis_client):
+        queue = await _queue(redis_client, block_timeout=50)
+        queue.set_prefetch(4)
+        assert await queue.get(timeout=0.05) is None
+        await _put(queue, 1)
+        assert (await queue.get_blocking(timeout=1)).url == 'http://example.com/low/0'
+        await queue.release_prefetched()
+
+
+class TestWithoutPrefetch:
+
+    async def test_reads_one_by_one(self, redis_client):
+        queue = await _queue(redis_client)
+        await _put(queue, 2)
+        assert (await queue.get(timeout=0.05)).url == 'http://example.com/low/0'
+        assert queue.prefetch_reads == 0
+
+        queue.set_prefetch(4)
+        assert (await queue.get(consumer_name='worker-x', timeout=0.05)).url == 'http://example.com/low/1'
+        assert queue.prefetched == 0
@@ -0,0 +1,172 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+流式响应体落盘测试
+
+测试内容：
+1. BodySpool 阈值内留在内存，超过阈值落盘；超过上限抛 OverflowError 并删除临时文件
+2. Response.from_file：body 懒加载、iter_bytes 分块读文件、close / 回收时删除自有临时文件
+3. HttpXDownloader / AioHttpDownloader 在 meta['stream'] 或 DOWNLOAD_STREAM_THRESHOLD 下分块读取
+4. FileMiddleware / FileDownloader.save_response 直接复制落盘文件
+"""
+
+import gc
+import os
+from unittest.mock import Mock, patch
+
+import httpx
+import pytest
+
+from crawlo.downloader.aiohttp_downloader import AioHttpDownloader
+from crawlo.downloader.httpx_downloader import HttpXDownloader
+from crawlo.http.body_spool import BodySpool
+from crawlo.http.request import Request
+from crawlo.http.response import Response
+from crawlo.middleware.file_middleware import FileMiddleware
+from crawlo.settings.setting_manager import SettingManager
+from crawlo.utils.file_downloader import FileDownloader
+
+PDF = b'%PDF-1.4 ' + b'x' * 300_000
+
+
+def _crawler(**settings):
+    settings_manager = SettingManager()
+    for key, value in settings.items():
+        settings_manager.set(key, value)
+    crawler = Mock()
+    crawler.settings = settings_manager
+    return crawler
+
+
+async def _spooled_response(tmp_path, body=PDF, **kwargs):
+    spool = BodySpool(threshold=1024, directory=str(tmp_path))
+    for start in range(0, len(body), 8192):
+        await spool.write(body[start:start + 8192])
+    return await spool.to_response('http://example.com/doc.pdf', **kwargs)
+
+
+class TestBodySpool:
+
+    async def test_small_body_stays_in_memory(self, tmp_path):
+        spool = BodySpool(threshold=1024, directory=str(tmp_path))
+        await spool.write(b'<html>ok</html>')
+        response = await spool.to_response('http://example.com/')
+
+        assert response.body_path is None
+        assert response.body == b'<html>ok</html>'
+        assert os.listdir(tmp_path) == []
+
+    async def test_large_body_spills_to_file(self, tmp_path):
+        response = await _spooled_response(tmp_path)
+
+        assert response.body_path and os.path.dirname(response.body_path) == str(tmp_path)
+        assert response._body is None
+        assert response.body_size == len(PDF)
+        assert b''.join(response.iter_bytes(4096)) == PDF
+        assert response._body is None
+        assert response.body == PDF
+
+    async def test_overflow_discards_temp_file(self, tmp_path):
+        spool = BodySpool(threshold=10, max_size=100, directory=str(tmp_path))
+        await spool.write(b'x' * 50)
+        with pytest.raises(OverflowError):
+            await spool.write(b'x' * 60)
+        await spool.discard()
+        assert os.listdir(tmp_path) == []
+
+
+class TestFileBackedResponse:
+
+    async def test_close_and_gc_remove_owned_file(self, tmp_path):
+        response = await _spooled_response(tmp_path)
+        path = response.body_path
+        response.close()
+        assert not os.path.exists(path)
+
+        response = await _spooled_response(tmp_path)
+        path = response.body_path
+        del response
+        gc.collect()
+        assert not os.path.exists(path)
+
+    async def test_text_and_encoding_from_file(self, tmp_path):
+        html = '<html><head><meta charset="gbk"></head><body>中文</body></html>'.encode('gbk')
+        path = tmp_path / 'page.html'
+        path.write_bytes(html)
+        response = Response.from_file('http://example.com/', str(path))
+
+        assert response.encoding.lower() in ('gbk', 'gb18030')
+        assert '中文' in response.text
+        response.close()
+        assert path.exists()
+
+
+class TestStreamingDownloaders:
+
+    async def test_httpx_streams_when_requested(self, tmp_path):
+        crawler = _crawler(DOWNLOAD_STREAM_THRESHOLD=1024, DOWNLOAD_STREAM_DIR=str(tmp_path),
+                           DOWNLOAD_MAXSIZE=1024, DOWNLOAD_STREAM_MAXSIZE=len(PDF))
+        downloader = HttpXDownloader(crawler)
+        with patch('crawlo.downloader.MiddlewareManager.create_instance'):
+            downloader.open()
+        await downloader._client.aclose()
+        downloader._client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(200, content=PDF))
+        )
+
+        response = await downloader.download(Request(url='http://example.com/doc.pdf'))
+        assert response.body_path and response.body_size == len(PDF)
+
+        with pytest.raises(OverflowError):   # meta['stream']=False 仍按 DOWNLOAD_MAXSIZE 整体读取
+            await downloader.download(Request(url='http://example.com/b', meta={'stream': False}))
+        await downloader.close()
+
+    def test_stream_maxsize_defaults_to_download_maxsize(self):
+        assert HttpXDownloader(_crawler(DOWNLOAD_MAXSIZE=2048))._stream_maxsize == 2048
+        crawler = _crawler(DOWNLOAD_MAXSIZE=2048, DOWNLOAD_STREAM_MAXSIZE=4096)
+        assert HttpXDownloader(crawler)._stream_maxsize == 4096
+
+    async def test_aiohttp_streams_with_meta(self, tmp_path):
+        downloader = AioHttpDownloader(_crawler(DOWNLOAD_STREAM_DIR=str(tmp_path)))
+        downloader.max_download_size = 1024
+
+        async def iter_chunked(size):
+            for start in range(0, len(PDF), size):
+                yield PDF[start:start + size]
+
+        resp = Mock(url='http://example.com/doc.pdf', status=200,
+                    headers={'Content-Type': 'application/pdf', 'Content-Length': str(len(PDF))})
+        resp.content.iter_chunked = iter_chunked
+        request = Request(url='http://example.com/doc.pdf', meta={'stream': True})
+
+        response = await downloader._process_response(request, resp)
+        assert response.body_size == len(PDF)
+        assert response.body_path is None  # 未配置阈值时按 1MB 落盘
+        assert response.body == PDF
+
+
+class TestAttachmentConsumers:
+
+    async def test_file_middleware_copies_spooled_body(self, tmp_path):
+        out = tmp_path / 'out'
+        middleware = FileMiddleware(_crawler(ATTACHMENT_DOWNLOAD_DIR=str(out)))
+        request = Request(url='http://example.com/doc.pdf', meta={'download_attachment': True})
+        response = await _spooled_response(tmp_path, headers={'Content-Type': 'application/pdf'},
+                                           request=request)
+
+        await middleware.process_response(request, response, None)
+        info = request.meta['attachment_info']
+        assert info['size'] == len(PDF)
+        assert open(info['filepath'], 'rb').read() == PDF
+        assert response._body is None
+
+    async def test_file_downloader_save_response(self, tmp_path):
+        downloader = FileDownloader(download_dir=str(tmp_path / 'out'))
+        response = await _spooled_response(tmp_path, headers={'content-type': 'application/pdf'})
+
+        result = await downloader.save_response(response)
+        assert result['success'] and result['filename'] == 'doc.pdf'
+        assert open(result['filepath'], 'rb').read() == PDF
+
+        too_small = await downloader.save_response(response, filename='b.pdf', max_file_size=10)
+        assert too_small['success'] is False